@@ -170,7 +170,12 @@ def handle_jobs_submit(
     stderr = job.get("stderr", "")
 
     # Show result
-    if status == "succeeded":
+    if status in ("queued", "running"):
+        renderer.info(
+            f"Job {job_id} {status} on [bold]{node_name}[/bold]. "
+            f"Use /jobs show {job_id} to follow it."
+        )
+    elif status == "succeeded":
         lines = [
             f"[green]✓ Job completed successfully[/green]",
             f"  Job ID: {job_id}",
@@ -538,6 +538,7 @@ def azure_dashboard(request):
     
     Shows:
     - Azure connection status
+    - Costs over the last 30 days (from the local cost store)
     - Available flows
     - Recent operations
     """
@@ -567,6 +568,16 @@ def azure_dashboard(request):
             "error": str(e),
         }
     
+    # Costs come from the local store (kept current by the cost tools and
+    # the sync_azure_costs command), so the page never waits on Cost Management
+    cost_overview = None
+    if azure_status.get("subscription_id"):
+        try:
+            from mcp_tools_core.tools.azure.cost_store import CostStore
+            cost_overview = CostStore().overview(azure_status["subscription_id"], days=30)
+        except Exception:
+            pass
+    
     # Get available Azure flow tools
     azure_flows = [
         {
@@ -619,6 +630,7 @@ def azure_dashboard(request):
     return render(request, "dashboard/azure.html", {
         "page_title": "Azure",
         "azure_status": azure_status,
+        "cost_overview": cost_overview,
         "azure_flows": azure_flows,
         "recent_logs": recent_logs,
         "resource_groups": resource_groups,
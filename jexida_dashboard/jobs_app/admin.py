@@ -8,7 +8,7 @@ from mcp_tools_core.models import WorkerNode, Job
 class WorkerNodeAdmin(admin.ModelAdmin):
     """Admin for WorkerNode model."""
 
-    list_display = ["name", "host", "user", "ssh_port", "is_active", "last_seen", "created_at"]
+    list_display = ["name", "host", "user", "ssh_port", "max_concurrent_jobs", "is_active", "last_seen", "created_at"]
     list_filter = ["is_active", "tags"]
     search_fields = ["name", "host", "tags"]
     readonly_fields = ["created_at", "updated_at", "last_seen"]
@@ -21,6 +21,6 @@ class JobAdmin(admin.ModelAdmin):
     list_display = ["id", "target_node", "status", "exit_code", "duration_ms", "created_at"]
     list_filter = ["status", "target_node"]
     search_fields = ["command", "id"]
-    readonly_fields = ["id", "created_at", "updated_at"]
+    readonly_fields = ["id", "created_at", "started_at", "finished_at", "updated_at"]
     raw_id_fields = ["target_node"]
 
@@ -132,7 +132,7 @@ def job_submit(request):
             loop.close()
 
         if result.success:
-            messages.success(request, f"Job submitted successfully on {node_name}")
+            messages.success(request, f"Job queued on {node_name}")
             return redirect("jobs:detail", job_id=result.job.id)
         else:
             messages.error(request, f"Job failed: {result.error}")
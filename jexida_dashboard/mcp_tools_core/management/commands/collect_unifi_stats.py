@@ -0,0 +1,73 @@
+"""Collect UniFi per-port and per-radio statistics on an interval.
+
+Samples stat/device every --interval seconds into the UniFiPortStat
+table, rolling finished hours into hourly rows and pruning old raw rows.
+
+Usage:
+    python manage.py collect_unifi_stats --interval 60
+    python manage.py collect_unifi_stats --once
+"""
+
+import asyncio
+import logging
+
+from django.core.management.base import BaseCommand
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Django management command to run the UniFi stats collector."""
+
+    help = "Sample UniFi port/radio statistics into the local timeseries table"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=60,
+            help="Seconds between samples (default: 60)",
+        )
+        parser.add_argument(
+            "--site",
+            type=str,
+            default=None,
+            help="UniFi site ID (defaults to configured site)",
+        )
+        parser.add_argument(
+            "--raw-retention-hours",
+            type=int,
+            default=48,
+            help="Hours of raw samples to keep (default: 48)",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Take a single sample and exit",
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command execution."""
+        try:
+            asyncio.run(self.run_collector(options))
+        except KeyboardInterrupt:
+            self.stdout.write("UniFi stats collector stopped")
+
+    async def run_collector(self, options):
+        """Sample until interrupted (or once with --once)."""
+        from mcp_tools_core.tools.unifi.port_stats import collect_port_stats
+
+        while True:
+            try:
+                summary = await collect_port_stats(options["site"], options["raw_retention_hours"])
+                self.stdout.write(
+                    f"Stored {summary['samples_stored']} samples from {summary['devices']} devices "
+                    f"({summary['rollups_created']} rollups, {summary['raw_pruned']} pruned)"
+                )
+            except Exception as e:
+                logger.error(f"UniFi stats collection failed: {e}")
+                self.stderr.write(f"Collection failed: {e}")
+
+            if options["once"]:
+                return
+            await asyncio.sleep(options["interval"])
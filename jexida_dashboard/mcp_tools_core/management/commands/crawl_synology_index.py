@@ -0,0 +1,87 @@
+"""Crawl Synology NAS shared folders into the local metadata index.
+
+Re-crawls are incremental: folders whose mtime is unchanged are not
+re-listed. Use --full periodically to pick up in-place file edits.
+
+Usage:
+    python manage.py crawl_synology_index --interval 3600
+    python manage.py crawl_synology_index --once --full
+    python manage.py crawl_synology_index --once --root /photos --root /backups
+"""
+
+import asyncio
+import logging
+
+from django.core.management.base import BaseCommand
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Django management command to maintain the Synology file index."""
+
+    help = "Crawl Synology NAS folders into the local SQLite metadata index"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=3600,
+            help="Seconds between crawls (default: 3600)",
+        )
+        parser.add_argument(
+            "--root",
+            action="append",
+            default=[],
+            help="Folder to crawl (repeatable; defaults to all shared folders)",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=4,
+            help="Folders listed in parallel (default: 4)",
+        )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Re-list every folder, ignoring folder mtimes",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Crawl once and exit",
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command execution."""
+        try:
+            asyncio.run(self.run_crawler(options))
+        except KeyboardInterrupt:
+            self.stdout.write("Synology index crawler stopped")
+
+    async def run_crawler(self, options):
+        """Crawl until interrupted (or once with --once)."""
+        from mcp_tools_core.tools.synology.client import SynologyClient
+        from mcp_tools_core.tools.synology.file_index import crawl_index, get_file_index
+
+        index = get_file_index()
+        while True:
+            try:
+                async with SynologyClient() as client:
+                    stats = await crawl_index(
+                        client, index,
+                        roots=options["root"] or None,
+                        concurrency=options["concurrency"],
+                        full=options["full"],
+                    )
+                self.stdout.write(
+                    f"Listed {stats['folders_listed']} folders, skipped {stats['folders_skipped']} unchanged, "
+                    f"indexed {stats['entries_indexed']} entries ({stats['errors']} errors)"
+                )
+            except Exception as e:
+                logger.error(f"Synology index crawl failed: {e}")
+                self.stderr.write(f"Crawl failed: {e}")
+
+            if options["once"]:
+                return
+            await asyncio.sleep(options["interval"])
@@ -0,0 +1,81 @@
+"""Ingest new Synology Log Center entries on an interval.
+
+Each run fetches only entries newer than the stored cursor per log type
+and inserts them into the SynologyLogEntry table, where
+synology_query_logs can search them locally.
+
+Usage:
+    python manage.py ingest_synology_logs --interval 300
+    python manage.py ingest_synology_logs --once --log-type connection
+"""
+
+import asyncio
+import logging
+
+from django.core.management.base import BaseCommand
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Django management command to run the Synology log ingestion loop."""
+
+    help = "Incrementally ingest Synology Log Center entries into the local log table"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=300,
+            help="Seconds between ingestion runs (default: 300)",
+        )
+        parser.add_argument(
+            "--log-type",
+            action="append",
+            default=[],
+            help="Log type to ingest (repeatable; default: connection and transfer)",
+        )
+        parser.add_argument(
+            "--max-entries",
+            type=int,
+            default=20000,
+            help="Maximum new entries per log type per run (default: 20000)",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Run once and exit",
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command execution."""
+        try:
+            asyncio.run(self.run_ingestion(options))
+        except KeyboardInterrupt:
+            self.stdout.write("Synology log ingestion stopped")
+
+    async def run_ingestion(self, options):
+        """Ingest until interrupted (or once with --once)."""
+        from mcp_tools_core.tools.synology.client import SynologyClient
+        from mcp_tools_core.tools.synology.log_ingest import DEFAULT_LOG_TYPES, ingest_logs
+
+        log_types = options["log_type"] or list(DEFAULT_LOG_TYPES)
+        while True:
+            try:
+                async with SynologyClient() as client:
+                    for log_type in log_types:
+                        try:
+                            stats = await ingest_logs(client, log_type, max_entries=options["max_entries"])
+                            self.stdout.write(
+                                f"{log_type}: stored {stats['stored']} new entries ({stats['pages']} pages)"
+                            )
+                        except Exception as e:
+                            logger.error(f"Synology {log_type} log ingestion failed: {e}")
+                            self.stderr.write(f"{log_type}: ingestion failed: {e}")
+            except Exception as e:
+                logger.error(f"Synology log ingestion failed: {e}")
+                self.stderr.write(f"Ingestion failed: {e}")
+
+            if options["once"]:
+                return
+            await asyncio.sleep(options["interval"])
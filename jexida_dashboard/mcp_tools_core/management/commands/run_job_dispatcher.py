@@ -0,0 +1,48 @@
+"""Run queued jobs on worker nodes.
+
+submit_job starts a dispatcher in the submitting process, but jobs queued
+from a process that then exits (or from the admin) wait for the next
+dispatcher to poll. This command runs one in the foreground, e.g. as a
+systemd service next to the MCP server.
+
+Usage:
+    python manage.py run_job_dispatcher
+    python manage.py run_job_dispatcher --once --workers 4
+"""
+
+import asyncio
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    """Django management command to run the job dispatcher."""
+
+    help = "Run queued jobs on worker nodes, respecting per-node concurrency limits"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Jobs to run at once (default: JOB_WORKERS)",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Run until the queue is empty, then exit",
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command execution."""
+        from mcp_tools_core.tools.jobs.dispatcher import JOB_WORKERS, JobDispatcher
+
+        dispatcher = JobDispatcher(workers=options["workers"] or JOB_WORKERS)
+        self.stdout.write(f"Job dispatcher running {dispatcher.workers} job(s) at a time")
+        try:
+            if options["once"]:
+                asyncio.run(dispatcher.drain())
+            else:
+                asyncio.run(dispatcher.run_forever())
+        except KeyboardInterrupt:
+            self.stdout.write("Job dispatcher stopped")
@@ -0,0 +1,83 @@
+"""Sample Synology NAS utilization into the ring-buffer history.
+
+Polls SYNO.Core.System.Utilization every --interval seconds, downsamples
+into minute and hour tiers and writes the state file every
+--persist-interval seconds (and on exit). The synology_*_utilization_*
+tools read the state file.
+
+Usage:
+    python manage.py sample_synology_utilization --interval 10
+    python manage.py sample_synology_utilization --once
+"""
+
+import asyncio
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Django management command to run the Synology utilization sampler."""
+
+    help = "Sample Synology NAS utilization into the local ring-buffer history"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=10,
+            help="Seconds between samples (default: 10)",
+        )
+        parser.add_argument(
+            "--persist-interval",
+            type=int,
+            default=300,
+            help="Seconds between writes of the state file (default: 300)",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Take a single sample, save and exit",
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command execution."""
+        try:
+            asyncio.run(self.run_sampler(options))
+        except KeyboardInterrupt:
+            self.stdout.write("Synology utilization sampler stopped")
+
+    async def run_sampler(self, options):
+        """Sample until interrupted (or once with --once)."""
+        from mcp_tools_core.tools.synology.client import SynologyClient
+        from mcp_tools_core.tools.synology.utilization import (
+            UtilizationHistory,
+            default_state_path,
+            sample_utilization,
+        )
+
+        history = UtilizationHistory.load(default_state_path())
+        last_saved = time.monotonic()
+        try:
+            while True:
+                try:
+                    # Sessions are pooled, so a client per sample reuses the login
+                    async with SynologyClient() as client:
+                        metrics = await sample_utilization(client, history)
+                    logger.debug(f"Sampled {len(metrics)} utilization metrics")
+                except Exception as e:
+                    logger.error(f"Synology utilization sample failed: {e}")
+                    self.stderr.write(f"Sample failed: {e}")
+
+                if options["once"]:
+                    return
+                if time.monotonic() - last_saved >= options["persist_interval"]:
+                    await asyncio.to_thread(history.save)
+                    last_saved = time.monotonic()
+                    self.stdout.write(f"Saved {len(history.series)} metrics to {history.path}")
+                await asyncio.sleep(options["interval"])
+        finally:
+            history.save()
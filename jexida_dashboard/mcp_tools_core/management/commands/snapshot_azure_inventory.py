@@ -0,0 +1,69 @@
+"""Take scheduled snapshots of the Azure resource inventory.
+
+Each run stores every resource of the configured subscriptions, read
+through Resource Graph, so azure_resources_diff_inventory can answer
+"what changed since yesterday?" from local data.
+
+Usage:
+    python manage.py snapshot_azure_inventory --once
+    python manage.py snapshot_azure_inventory --interval 21600 --subscription <id> --subscription <id>
+"""
+
+import asyncio
+import logging
+
+from django.core.management.base import BaseCommand
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Django management command to snapshot the Azure resource inventory."""
+
+    help = "Snapshot all Azure resources across subscriptions for inventory diffs"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--subscription",
+            action="append",
+            default=[],
+            help="Subscription ID (repeatable; default: AZURE_INVENTORY_SUBSCRIPTIONS or the configured subscription)",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=6 * 3600,
+            help="Seconds between snapshots (default: 21600)",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Take one snapshot and exit",
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command execution."""
+        try:
+            asyncio.run(self.run_snapshots(options))
+        except KeyboardInterrupt:
+            self.stdout.write("Azure inventory snapshots stopped")
+
+    async def run_snapshots(self, options):
+        """Snapshot until interrupted (or once with --once)."""
+        from mcp_tools_core.tools.azure.inventory import take_snapshot
+
+        while True:
+            try:
+                snapshot = await take_snapshot(options["subscription"] or None)
+                self.stdout.write(
+                    f"Snapshot {snapshot['id']}: {snapshot['resource_count']} resources from "
+                    f"{len(snapshot['subscriptions'])} subscription(s)"
+                    f"{' (unchanged)' if snapshot['unchanged'] else ''}"
+                )
+            except Exception as e:
+                logger.error(f"Azure inventory snapshot failed: {e}")
+                self.stderr.write(f"Snapshot failed: {e}")
+
+            if options["once"]:
+                return
+            await asyncio.sleep(options["interval"])
@@ -0,0 +1,80 @@
+"""Keep the local Azure cost store up to date.
+
+Each run fetches only days the store is missing plus the last few days,
+which Azure still revises. The cost tools and the Azure dashboard then
+read from the store without waiting on Cost Management.
+
+Usage:
+    python manage.py sync_azure_costs --days 90 --once
+    python manage.py sync_azure_costs --interval 21600 --subscription <id>
+"""
+
+import asyncio
+import logging
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Django management command to backfill and refresh stored Azure costs."""
+
+    help = "Incrementally backfill and refresh the local Azure daily cost store"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=90,
+            help="Days of history to keep available (default: 90)",
+        )
+        parser.add_argument(
+            "--subscription",
+            action="append",
+            default=[],
+            help="Subscription ID (repeatable; default: the configured subscription)",
+        )
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=6 * 3600,
+            help="Seconds between runs (default: 21600)",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Run once and exit",
+        )
+
+    def handle(self, *args, **options):
+        """Handle the command execution."""
+        try:
+            asyncio.run(self.run_sync(options))
+        except KeyboardInterrupt:
+            self.stdout.write("Azure cost sync stopped")
+
+    async def run_sync(self, options):
+        """Sync until interrupted (or once with --once)."""
+        from mcp_tools_core.tools.azure.auth import get_subscription_id
+        from mcp_tools_core.tools.azure.cost_store import ensure_costs, utc_today
+
+        subscriptions = options["subscription"] or [get_subscription_id()]
+        while True:
+            to_day = utc_today()
+            from_day = to_day - timedelta(days=options["days"] - 1)
+            for subscription_id in subscriptions:
+                try:
+                    stats = await ensure_costs(subscription_id, from_day, to_day)
+                    self.stdout.write(
+                        f"{subscription_id}: stored {stats['fetched_rows']} rows "
+                        f"({stats['fetched_ranges']} queries)"
+                    )
+                except Exception as e:
+                    logger.error(f"Azure cost sync for {subscription_id} failed: {e}")
+                    self.stderr.write(f"{subscription_id}: sync failed: {e}")
+
+            if options["once"]:
+                return
+            await asyncio.sleep(options["interval"])
@@ -0,0 +1,60 @@
+"""Migration to add persisted network scan history.
+
+This migration creates the database tables for:
+- mcp_network_scans: One row per scanned subnet per network_scan_local run
+- mcp_network_scan_results: Host/port observations keyed by (ip, mac, port, protocol, seen_at)
+"""
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mcp_tools_core', '0005_add_job_description'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NetworkScan',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subnet', models.CharField(db_index=True, help_text='Subnet that was scanned in CIDR notation', max_length=50)),
+                ('ports', models.CharField(blank=True, help_text='Port specification used for the scan', max_length=255)),
+                ('incremental', models.BooleanField(default=False, help_text='Whether only new/changed hosts were port-scanned')),
+                ('hosts_up', models.IntegerField(default=0, help_text='Number of hosts found up in the subnet')),
+                ('scanned_at', models.DateTimeField(auto_now_add=True, db_index=True, help_text='When the scan completed')),
+            ],
+            options={
+                'verbose_name': 'Network Scan',
+                'verbose_name_plural': 'Network Scans',
+                'db_table': 'mcp_network_scans',
+                'ordering': ['-scanned_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='NetworkScanResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ip', models.GenericIPAddressField(help_text='Host IP address')),
+                ('mac', models.CharField(blank=True, help_text='Host MAC address if available', max_length=17)),
+                ('hostname', models.CharField(blank=True, help_text='Hostname if resolved', max_length=255)),
+                ('vendor', models.CharField(blank=True, help_text='Hardware vendor from MAC lookup', max_length=255)),
+                ('port', models.IntegerField(default=0, help_text='Open port number (0 = host-only observation)')),
+                ('protocol', models.CharField(blank=True, help_text='Port protocol (tcp/udp)', max_length=10)),
+                ('service', models.CharField(blank=True, help_text='Detected service name', max_length=100)),
+                ('version', models.CharField(blank=True, help_text='Detected service banner/version', max_length=255)),
+                ('carried_forward', models.BooleanField(default=False, help_text='True if copied from the previous scan instead of re-scanned')),
+                ('seen_at', models.DateTimeField(help_text='When this observation was made')),
+                ('scan', models.ForeignKey(help_text='The scan this observation belongs to', on_delete=django.db.models.deletion.CASCADE, related_name='results', to='mcp_tools_core.networkscan')),
+            ],
+            options={
+                'verbose_name': 'Network Scan Result',
+                'verbose_name_plural': 'Network Scan Results',
+                'db_table': 'mcp_network_scan_results',
+                'ordering': ['ip', 'port'],
+                'indexes': [models.Index(fields=['ip', 'mac', 'port', 'protocol', 'seen_at'], name='mcp_scanres_key_idx')],
+            },
+        ),
+    ]
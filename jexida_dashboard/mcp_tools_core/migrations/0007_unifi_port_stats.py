@@ -0,0 +1,45 @@
+"""Migration to add the UniFi port/radio statistics timeseries table.
+
+This migration creates the database table for:
+- mcp_unifi_port_stats: Raw and hourly-rollup samples per switch port and AP radio
+"""
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mcp_tools_core', '0006_network_scan_history'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UniFiPortStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('device_mac', models.CharField(help_text='MAC address of the switch or AP', max_length=17)),
+                ('kind', models.CharField(choices=[('port', 'Switch port'), ('radio', 'AP radio')], default='port', help_text='Whether this row describes a switch port or an AP radio', max_length=5)),
+                ('port_idx', models.IntegerField(help_text='Port index (switch) or radio index (AP)')),
+                ('name', models.CharField(blank=True, help_text="Port name or radio band (e.g., 'ng', 'na')", max_length=100)),
+                ('resolution', models.CharField(choices=[('raw', 'Raw sample'), ('hour', 'Hourly rollup')], default='raw', help_text='Raw sample or rollup tier', max_length=4)),
+                ('ts', models.DateTimeField(help_text='Sample time (bucket start for rollups)')),
+                ('rx_bytes', models.BigIntegerField(default=0, help_text='Receive byte counter')),
+                ('tx_bytes', models.BigIntegerField(default=0, help_text='Transmit byte counter')),
+                ('rx_errors', models.BigIntegerField(default=0, help_text='Receive error counter')),
+                ('tx_errors', models.BigIntegerField(default=0, help_text='Transmit error counter')),
+                ('poe_power', models.FloatField(default=0.0, help_text='PoE draw in watts (peak for rollups)')),
+                ('num_sta', models.IntegerField(default=0, help_text='Connected clients (average for rollups)')),
+                ('rx_rate', models.FloatField(blank=True, help_text='Receive rate in bytes/s', null=True)),
+                ('tx_rate', models.FloatField(blank=True, help_text='Transmit rate in bytes/s', null=True)),
+                ('error_rate', models.FloatField(blank=True, help_text='Errors per second (rx + tx)', null=True)),
+            ],
+            options={
+                'verbose_name': 'UniFi Port Stat',
+                'verbose_name_plural': 'UniFi Port Stats',
+                'db_table': 'mcp_unifi_port_stats',
+                'ordering': ['-ts'],
+                'indexes': [models.Index(fields=['device_mac', 'kind', 'port_idx', 'resolution', 'ts'], name='mcp_unifistat_series_idx'), models.Index(fields=['resolution', 'ts'], name='mcp_unifistat_res_ts_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+"""Migration to add the local Synology log table.
+
+This migration creates the database table for:
+- mcp_synology_log_entries: Log Center entries ingested incrementally per NAS and log type
+"""
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mcp_tools_core', '0007_unifi_port_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SynologyLogEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nas', models.CharField(help_text="NAS host the entry came from (e.g., 'nas.local:5001')", max_length=255)),
+                ('log_type', models.CharField(help_text="Log Center log type (e.g., 'connection', 'transfer')", max_length=32)),
+                ('logged_at', models.DateTimeField(help_text='When the event was logged on the NAS')),
+                ('level', models.CharField(blank=True, help_text="Severity reported by DSM (e.g., 'info', 'warn', 'err')", max_length=16)),
+                ('user', models.CharField(blank=True, help_text='User associated with the event', max_length=128)),
+                ('ip', models.CharField(blank=True, help_text='Client IP address associated with the event', max_length=45)),
+                ('event', models.CharField(blank=True, help_text='Event type', max_length=255)),
+                ('description', models.TextField(blank=True, help_text='Log message')),
+                ('fingerprint', models.CharField(help_text="SHA-1 of the entry's fields, unique per NAS and log type", max_length=40)),
+                ('ingested_at', models.DateTimeField(auto_now_add=True, help_text='When the entry was stored locally')),
+            ],
+            options={
+                'verbose_name': 'Synology Log Entry',
+                'verbose_name_plural': 'Synology Log Entries',
+                'db_table': 'mcp_synology_log_entries',
+                'ordering': ['-logged_at'],
+                'indexes': [models.Index(fields=['nas', 'log_type', 'logged_at'], name='mcp_synolog_type_time_idx'), models.Index(fields=['level', 'logged_at'], name='mcp_synolog_level_time_idx'), models.Index(fields=['user', 'logged_at'], name='mcp_synolog_user_time_idx'), models.Index(fields=['ip', 'logged_at'], name='mcp_synolog_ip_time_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='synologylogentry',
+            constraint=models.UniqueConstraint(fields=('nas', 'log_type', 'fingerprint'), name='mcp_synolog_unique_entry'),
+        ),
+    ]
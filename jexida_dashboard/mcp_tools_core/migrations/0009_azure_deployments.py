@@ -0,0 +1,77 @@
+"""Track ARM deployments started by the Azure tools and their per-resource operations.
+"""
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mcp_tools_core', '0008_synology_log_entries'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AzureDeployment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('handle', models.CharField(help_text='Deployment handle returned to callers (UUID)', max_length=36, unique=True)),
+                ('subscription_id', models.CharField(help_text='Azure subscription ID', max_length=64)),
+                ('scope', models.CharField(choices=[('resource_group', 'Resource Group'), ('subscription', 'Subscription')], default='resource_group', help_text='Deployment scope', max_length=20)),
+                ('resource_group', models.CharField(blank=True, help_text='Target resource group (resource group scope only)', max_length=90)),
+                ('deployment_name', models.CharField(help_text='ARM deployment name', max_length=64)),
+                ('provisioning_state', models.CharField(default='Accepted', help_text='Latest ARM provisioning state of the deployment', max_length=32)),
+                ('correlation_id', models.CharField(blank=True, help_text='ARM correlation ID', max_length=64)),
+                ('outputs', models.JSONField(blank=True, default=dict, help_text='Template outputs once the deployment succeeded')),
+                ('error', models.TextField(blank=True, help_text='Error message if the deployment or tracking failed')),
+                ('sequence', models.IntegerField(default=0, help_text='Last progress sequence number issued for this deployment')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='When the deployment was started')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='When the tracker last recorded a change')),
+                ('finished_at', models.DateTimeField(blank=True, help_text='When the deployment reached a terminal state', null=True)),
+            ],
+            options={
+                'verbose_name': 'Azure Deployment',
+                'verbose_name_plural': 'Azure Deployments',
+                'db_table': 'mcp_azure_deployments',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='AzureDeploymentOperation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('operation_id', models.CharField(help_text='ARM deployment operation ID', max_length=64)),
+                ('resource_type', models.CharField(blank=True, help_text='Target resource type', max_length=255)),
+                ('resource_name', models.CharField(blank=True, help_text='Target resource name', max_length=255)),
+                ('provisioning_state', models.CharField(blank=True, help_text='Operation provisioning state', max_length=32)),
+                ('status_code', models.CharField(blank=True, help_text='HTTP status code reported for the operation', max_length=32)),
+                ('status_message', models.TextField(blank=True, help_text='Status or error message (truncated)')),
+                ('sequence', models.IntegerField(default=0, help_text='Progress sequence number of the latest change')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='When the change was recorded')),
+                ('deployment', models.ForeignKey(help_text='Deployment this operation belongs to', on_delete=django.db.models.deletion.CASCADE, related_name='operations', to='mcp_tools_core.azuredeployment')),
+            ],
+            options={
+                'verbose_name': 'Azure Deployment Operation',
+                'verbose_name_plural': 'Azure Deployment Operations',
+                'db_table': 'mcp_azure_deployment_operations',
+                'ordering': ['sequence'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='azuredeployment',
+            index=models.Index(fields=['provisioning_state'], name='mcp_azdeploy_state_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='azuredeployment',
+            index=models.Index(fields=['subscription_id', 'deployment_name'], name='mcp_azdeploy_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='azuredeploymentoperation',
+            index=models.Index(fields=['deployment', 'sequence'], name='mcp_azdeployop_seq_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='azuredeploymentoperation',
+            constraint=models.UniqueConstraint(fields=('deployment', 'operation_id'), name='mcp_azdeployop_unique_op'),
+        ),
+    ]
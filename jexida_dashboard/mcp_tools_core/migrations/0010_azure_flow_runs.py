@@ -0,0 +1,35 @@
+"""Add AzureFlowRun for resumable Azure flow runs.
+"""
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mcp_tools_core', '0009_azure_deployments'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AzureFlowRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('run_id', models.CharField(help_text='Run identifier returned to callers (UUID)', max_length=36, unique=True)),
+                ('flow', models.CharField(help_text='Flow tool name', max_length=100)),
+                ('status', models.CharField(choices=[('running', 'Running'), ('succeeded', 'Succeeded'), ('failed', 'Failed')], default='running', help_text='Overall run status', max_length=20)),
+                ('params', models.JSONField(blank=True, default=dict, help_text='Flow input parameters')),
+                ('steps', models.JSONField(blank=True, default=dict, help_text='Step name -> {status, result, error, duration_seconds}')),
+                ('error', models.TextField(blank=True, help_text='Error message if the run failed')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='When the run started')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='When a step last finished')),
+            ],
+            options={
+                'verbose_name': 'Azure Flow Run',
+                'verbose_name_plural': 'Azure Flow Runs',
+                'db_table': 'mcp_azure_flow_runs',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['flow', 'created_at'], name='mcp_azflowrun_flow_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,52 @@
+"""Add the local Azure cost store (daily costs and coverage).
+"""
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mcp_tools_core', '0010_azure_flow_runs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AzureCostCoverage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subscription_id', models.CharField(help_text='Azure subscription ID', max_length=64, unique=True)),
+                ('first_day', models.DateField(help_text='First stored day')),
+                ('last_day', models.DateField(help_text='Last stored day')),
+                ('refreshed_at', models.DateTimeField(help_text='When the most recent days were last fetched')),
+            ],
+            options={
+                'verbose_name': 'Azure Cost Coverage',
+                'verbose_name_plural': 'Azure Cost Coverage',
+                'db_table': 'mcp_azure_cost_coverage',
+            },
+        ),
+        migrations.CreateModel(
+            name='AzureCostDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subscription_id', models.CharField(help_text='Azure subscription ID', max_length=64)),
+                ('resource_group', models.CharField(blank=True, help_text='Resource group name (lowercase; empty for subscription-level charges)', max_length=90)),
+                ('service_name', models.CharField(blank=True, help_text="Azure service name (e.g., 'Storage', 'Virtual Machines')", max_length=128)),
+                ('day', models.DateField(help_text='Usage date (UTC)')),
+                ('cost', models.FloatField(default=0.0, help_text='Actual cost for the day')),
+                ('currency', models.CharField(default='USD', help_text='Billing currency', max_length=8)),
+            ],
+            options={
+                'verbose_name': 'Azure Daily Cost',
+                'verbose_name_plural': 'Azure Daily Costs',
+                'db_table': 'mcp_azure_cost_daily',
+                'ordering': ['-day'],
+                'indexes': [models.Index(fields=['subscription_id', 'day'], name='mcp_azcost_sub_day_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='azurecostdaily',
+            constraint=models.UniqueConstraint(fields=('subscription_id', 'resource_group', 'service_name', 'day'), name='mcp_azcost_unique_day'),
+        ),
+    ]
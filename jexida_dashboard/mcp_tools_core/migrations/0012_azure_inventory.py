@@ -0,0 +1,59 @@
+"""Add Azure inventory snapshots and their resources.
+"""
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mcp_tools_core', '0011_azure_cost_store'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AzureInventorySnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('taken_at', models.DateTimeField(db_index=True, help_text='When the snapshot was taken')),
+                ('subscriptions', models.JSONField(default=list, help_text='Subscription IDs included (lowercase)')),
+                ('resource_count', models.IntegerField(default=0, help_text='Number of resources')),
+                ('content_hash', models.CharField(db_index=True, help_text='SHA-256 over all resource content hashes', max_length=64)),
+                ('duration_seconds', models.FloatField(default=0.0, help_text='Time taken to query and store the snapshot')),
+            ],
+            options={
+                'verbose_name': 'Azure Inventory Snapshot',
+                'verbose_name_plural': 'Azure Inventory Snapshots',
+                'db_table': 'mcp_azure_inventory_snapshots',
+                'ordering': ['-taken_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='AzureInventoryResource',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resource_id', models.CharField(help_text='Full resource ID (lowercase)', max_length=1024)),
+                ('subscription_id', models.CharField(help_text='Azure subscription ID (lowercase)', max_length=64)),
+                ('resource_group', models.CharField(blank=True, help_text='Resource group name (lowercase)', max_length=90)),
+                ('name', models.CharField(help_text='Resource name', max_length=255)),
+                ('resource_type', models.CharField(help_text='Resource type (lowercase, e.g. microsoft.web/sites)', max_length=255)),
+                ('location', models.CharField(blank=True, help_text='Azure region', max_length=64)),
+                ('tags', models.JSONField(blank=True, default=dict, help_text='Resource tags')),
+                ('sku', models.JSONField(blank=True, default=dict, help_text='SKU (name, tier, capacity, ...) if the resource has one')),
+                ('provisioning_state', models.CharField(blank=True, help_text='Provisioning state', max_length=64)),
+                ('content_hash', models.CharField(help_text='SHA-256 of the fields above, for change detection', max_length=64)),
+                ('snapshot', models.ForeignKey(help_text='Snapshot this row belongs to', on_delete=django.db.models.deletion.CASCADE, related_name='resources', to='mcp_tools_core.azureinventorysnapshot')),
+            ],
+            options={
+                'verbose_name': 'Azure Inventory Resource',
+                'verbose_name_plural': 'Azure Inventory Resources',
+                'db_table': 'mcp_azure_inventory_resources',
+                'indexes': [models.Index(fields=['snapshot', 'resource_type'], name='mcp_azinv_snap_type_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='azureinventoryresource',
+            constraint=models.UniqueConstraint(fields=('snapshot', 'resource_id'), name='mcp_azinv_unique_resource'),
+        ),
+    ]
@@ -0,0 +1,83 @@
+"""Queue jobs for the dispatcher: job timeout and start/finish times, per-node concurrency.
+
+Also updates the submit_job tool, which now returns once the job is queued.
+"""
+
+from django.db import migrations, models
+
+
+SUBMIT_JOB_TOOL = {
+    "description": (
+        "Queue a shell command as a job on a worker node and return right away. "
+        "A dispatcher runs it (respecting the node's concurrency limit); "
+        "follow it with get_job or list_jobs, or set wait_seconds to wait for the result."
+    ),
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "node_name": {
+                "type": "string",
+                "description": "Name of the worker node to run the job on"
+            },
+            "command": {
+                "type": "string",
+                "description": "Shell command to execute on the worker node"
+            },
+            "description": {
+                "type": "string",
+                "description": "Optional human-readable description of what this job does"
+            },
+            "timeout": {
+                "type": "integer",
+                "description": "Command timeout in seconds (default: 5 minutes)",
+                "default": 300
+            },
+            "wait_seconds": {
+                "type": "integer",
+                "description": "Wait up to this many seconds for the job to finish (default: 0, return once queued)",
+                "default": 0
+            }
+        },
+        "required": ["node_name", "command"]
+    },
+}
+
+
+def update_submit_job_tool(apps, schema_editor):
+    Tool = apps.get_model("mcp_tools_core", "Tool")
+    Tool.objects.filter(name="submit_job").update(**SUBMIT_JOB_TOOL)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mcp_tools_core', '0012_azure_inventory'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='finished_at',
+            field=models.DateTimeField(blank=True, help_text='When the job finished', null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='started_at',
+            field=models.DateTimeField(blank=True, help_text='When a dispatcher started running the job', null=True),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='timeout',
+            field=models.PositiveIntegerField(default=300, help_text='Command timeout in seconds'),
+        ),
+        migrations.AddField(
+            model_name='workernode',
+            name='max_concurrent_jobs',
+            field=models.PositiveIntegerField(default=2, help_text='Jobs the dispatcher runs on this node at the same time'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['status', 'created_at'], name='mcp_jobs_status_idx'),
+        ),
+        migrations.RunPython(update_submit_job_tool, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+"""Add the stream mode inputs to the seeded synology_list_files tool."""
+
+from django.db import migrations
+
+
+LIST_FILES_INPUT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "folder_path": {"type": "string", "default": "/"},
+        "offset": {"type": "integer", "default": 0},
+        "limit": {
+            "type": "integer",
+            "description": "Maximum items to return (stream mode: 0 = up to 20000, also the upper bound)",
+            "default": 100
+        },
+        "sort_by": {"type": "string", "default": "name"},
+        "sort_direction": {"type": "string", "default": "asc"},
+        "stream": {
+            "type": "boolean",
+            "description": "Page through the whole folder and return NDJSON chunks instead of a files list",
+            "default": False
+        },
+        "chunk_size": {
+            "type": "integer",
+            "description": "Items per NDJSON chunk in stream mode",
+            "default": 500
+        }
+    },
+    "required": []
+}
+
+
+def update_list_files_tool(apps, schema_editor):
+    Tool = apps.get_model("mcp_tools_core", "Tool")
+    Tool.objects.filter(name="synology_list_files").update(input_schema=LIST_FILES_INPUT_SCHEMA)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mcp_tools_core', '0013_job_queue'),
+    ]
+
+    operations = [
+        migrations.RunPython(update_list_files_tool, migrations.RunPython.noop),
+    ]
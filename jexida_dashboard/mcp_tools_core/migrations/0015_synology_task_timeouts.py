@@ -0,0 +1,49 @@
+"""Add timeout_seconds to the seeded FileStation task tools.
+
+delete, move and search now poll their NAS task with an overall deadline
+and stop the task when it passes.
+"""
+
+from django.db import migrations
+
+
+TIMEOUT_PROPERTIES = {
+    "synology_delete_files": {
+        "type": "number",
+        "description": "Stop the delete task on the NAS if it has not finished by then",
+        "default": 600
+    },
+    "synology_move_files": {
+        "type": "number",
+        "description": "Stop the move task on the NAS if it has not finished by then",
+        "default": 3600
+    },
+    "synology_search_files": {
+        "type": "number",
+        "description": "Stop the search task on the NAS if it has not finished by then",
+        "default": 120
+    },
+}
+
+
+def add_timeout_inputs(apps, schema_editor):
+    Tool = apps.get_model("mcp_tools_core", "Tool")
+    for tool in Tool.objects.filter(name__in=TIMEOUT_PROPERTIES):
+        schema = dict(tool.input_schema or {"type": "object", "required": []})
+        schema["properties"] = {
+            **schema.get("properties", {}),
+            "timeout_seconds": TIMEOUT_PROPERTIES[tool.name],
+        }
+        tool.input_schema = schema
+        tool.save(update_fields=["input_schema"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mcp_tools_core', '0014_synology_list_files_stream'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_timeout_inputs, migrations.RunPython.noop),
+    ]
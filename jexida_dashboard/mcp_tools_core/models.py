@@ -7,6 +7,8 @@ This module defines the core models for:
 - Fact: Persistent memory/knowledge store
 - WorkerNode: Remote worker nodes for job execution
 - Job: Jobs dispatched to worker nodes
+- NetworkScan / NetworkScanResult: Persisted nmap scan history
+- UniFiPortStat: Per-port and per-radio UniFi statistics timeseries
 """
 
 import uuid
@@ -276,6 +278,10 @@ class WorkerNode(models.Model):
         default=True,
         help_text="Whether this node is available for jobs",
     )
+    max_concurrent_jobs = models.PositiveIntegerField(
+        default=2,
+        help_text="Jobs the dispatcher runs on this node at the same time",
+    )
     last_seen = models.DateTimeField(
         null=True,
         blank=True,
@@ -369,6 +375,20 @@ class Job(models.Model):
         blank=True,
         help_text="Execution duration in milliseconds",
     )
+    timeout = models.PositiveIntegerField(
+        default=300,
+        help_text="Command timeout in seconds",
+    )
+    started_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When a dispatcher started running the job",
+    )
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the job finished",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -377,6 +397,9 @@ class Job(models.Model):
         ordering = ["-created_at"]
         verbose_name = "Job"
         verbose_name_plural = "Jobs"
+        indexes = [
+            models.Index(fields=["status", "created_at"], name="mcp_jobs_status_idx"),
+        ]
 
     def __str__(self):
         cmd_preview = self.command[:50] + "..." if len(self.command) > 50 else self.command
@@ -387,3 +410,694 @@ class Job(models.Model):
         """Check if the job has finished (succeeded, failed, or lost)."""
         return self.status in (self.STATUS_SUCCEEDED, self.STATUS_FAILED, self.STATUS_LOST)
 
+
+
+class NetworkScan(models.Model):
+    """A single network_scan_local run against one subnet.
+
+    Each scanned subnet gets its own NetworkScan so that change detection
+    can always compare a subnet against its own previous run.
+    """
+
+    subnet = models.CharField(
+        max_length=50,
+        db_index=True,
+        help_text="Subnet that was scanned in CIDR notation",
+    )
+    ports = models.CharField(
+        max_length=255,
+        blank=True,
+        help_text="Port specification used for the scan",
+    )
+    incremental = models.BooleanField(
+        default=False,
+        help_text="Whether only new/changed hosts were port-scanned",
+    )
+    hosts_up = models.IntegerField(
+        default=0,
+        help_text="Number of hosts found up in the subnet",
+    )
+    scanned_at = models.DateTimeField(
+        auto_now_add=True,
+        db_index=True,
+        help_text="When the scan completed",
+    )
+
+    class Meta:
+        db_table = "mcp_network_scans"
+        ordering = ["-scanned_at"]
+        verbose_name = "Network Scan"
+        verbose_name_plural = "Network Scans"
+
+    def __str__(self):
+        return f"{self.subnet} @ {self.scanned_at.strftime('%Y-%m-%d %H:%M')} ({self.hosts_up} up)"
+
+
+class NetworkScanResult(models.Model):
+    """One observed (host, port) pair from a network scan.
+
+    Hosts without open ports are stored with port=0 and an empty protocol
+    so that host presence is tracked even when nothing is listening.
+    """
+
+    scan = models.ForeignKey(
+        NetworkScan,
+        on_delete=models.CASCADE,
+        related_name="results",
+        help_text="The scan this observation belongs to",
+    )
+    ip = models.GenericIPAddressField(
+        help_text="Host IP address",
+    )
+    mac = models.CharField(
+        max_length=17,
+        blank=True,
+        help_text="Host MAC address if available",
+    )
+    hostname = models.CharField(
+        max_length=255,
+        blank=True,
+        help_text="Hostname if resolved",
+    )
+    vendor = models.CharField(
+        max_length=255,
+        blank=True,
+        help_text="Hardware vendor from MAC lookup",
+    )
+    port = models.IntegerField(
+        default=0,
+        help_text="Open port number (0 = host-only observation)",
+    )
+    protocol = models.CharField(
+        max_length=10,
+        blank=True,
+        help_text="Port protocol (tcp/udp)",
+    )
+    service = models.CharField(
+        max_length=100,
+        blank=True,
+        help_text="Detected service name",
+    )
+    version = models.CharField(
+        max_length=255,
+        blank=True,
+        help_text="Detected service banner/version",
+    )
+    carried_forward = models.BooleanField(
+        default=False,
+        help_text="True if copied from the previous scan instead of re-scanned",
+    )
+    seen_at = models.DateTimeField(
+        help_text="When this observation was made",
+    )
+
+    class Meta:
+        db_table = "mcp_network_scan_results"
+        ordering = ["ip", "port"]
+        verbose_name = "Network Scan Result"
+        verbose_name_plural = "Network Scan Results"
+        indexes = [
+            models.Index(
+                fields=["ip", "mac", "port", "protocol", "seen_at"],
+                name="mcp_scanres_key_idx",
+            ),
+        ]
+
+    def __str__(self):
+        if self.port:
+            return f"{self.ip}:{self.port}/{self.protocol} ({self.service or 'unknown'})"
+        return f"{self.ip} (host)"
+
+
+class UniFiPortStat(models.Model):
+    """One statistics sample for a UniFi switch port or AP radio.
+
+    Raw samples hold controller counters plus rates computed from the
+    delta to the previous sample. Hourly rollups aggregate raw samples
+    (average rates, peak PoE, average clients) so history can be kept
+    long after the raw rows are pruned.
+    """
+
+    KIND_PORT = "port"
+    KIND_RADIO = "radio"
+
+    KIND_CHOICES = [
+        (KIND_PORT, "Switch port"),
+        (KIND_RADIO, "AP radio"),
+    ]
+
+    RESOLUTION_RAW = "raw"
+    RESOLUTION_HOUR = "hour"
+
+    RESOLUTION_CHOICES = [
+        (RESOLUTION_RAW, "Raw sample"),
+        (RESOLUTION_HOUR, "Hourly rollup"),
+    ]
+
+    device_mac = models.CharField(
+        max_length=17,
+        help_text="MAC address of the switch or AP",
+    )
+    kind = models.CharField(
+        max_length=5,
+        choices=KIND_CHOICES,
+        default=KIND_PORT,
+        help_text="Whether this row describes a switch port or an AP radio",
+    )
+    port_idx = models.IntegerField(
+        help_text="Port index (switch) or radio index (AP)",
+    )
+    name = models.CharField(
+        max_length=100,
+        blank=True,
+        help_text="Port name or radio band (e.g., 'ng', 'na')",
+    )
+    resolution = models.CharField(
+        max_length=4,
+        choices=RESOLUTION_CHOICES,
+        default=RESOLUTION_RAW,
+        help_text="Raw sample or rollup tier",
+    )
+    ts = models.DateTimeField(
+        help_text="Sample time (bucket start for rollups)",
+    )
+    rx_bytes = models.BigIntegerField(default=0, help_text="Receive byte counter")
+    tx_bytes = models.BigIntegerField(default=0, help_text="Transmit byte counter")
+    rx_errors = models.BigIntegerField(default=0, help_text="Receive error counter")
+    tx_errors = models.BigIntegerField(default=0, help_text="Transmit error counter")
+    poe_power = models.FloatField(default=0.0, help_text="PoE draw in watts (peak for rollups)")
+    num_sta = models.IntegerField(default=0, help_text="Connected clients (average for rollups)")
+    rx_rate = models.FloatField(null=True, blank=True, help_text="Receive rate in bytes/s")
+    tx_rate = models.FloatField(null=True, blank=True, help_text="Transmit rate in bytes/s")
+    error_rate = models.FloatField(null=True, blank=True, help_text="Errors per second (rx + tx)")
+
+    class Meta:
+        db_table = "mcp_unifi_port_stats"
+        ordering = ["-ts"]
+        verbose_name = "UniFi Port Stat"
+        verbose_name_plural = "UniFi Port Stats"
+        indexes = [
+            models.Index(
+                fields=["device_mac", "kind", "port_idx", "resolution", "ts"],
+                name="mcp_unifistat_series_idx",
+            ),
+            models.Index(fields=["resolution", "ts"], name="mcp_unifistat_res_ts_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.device_mac} {self.kind} {self.port_idx} @ {self.ts.isoformat()} ({self.resolution})"
+
+
+class SynologyLogEntry(models.Model):
+    """One Synology Log Center entry ingested into the local table.
+
+    Entries are fetched incrementally per NAS and log type (only those
+    newer than the stored cursor) so log queries and correlation with
+    other sources run locally. The fingerprint identifies an entry within
+    its NAS and log type and makes re-ingestion idempotent.
+    """
+
+    nas = models.CharField(
+        max_length=255,
+        help_text="NAS host the entry came from (e.g., 'nas.local:5001')",
+    )
+    log_type = models.CharField(
+        max_length=32,
+        help_text="Log Center log type (e.g., 'connection', 'transfer')",
+    )
+    logged_at = models.DateTimeField(
+        help_text="When the event was logged on the NAS",
+    )
+    level = models.CharField(
+        max_length=16,
+        blank=True,
+        help_text="Severity reported by DSM (e.g., 'info', 'warn', 'err')",
+    )
+    user = models.CharField(
+        max_length=128,
+        blank=True,
+        help_text="User associated with the event",
+    )
+    ip = models.CharField(
+        max_length=45,
+        blank=True,
+        help_text="Client IP address associated with the event",
+    )
+    event = models.CharField(
+        max_length=255,
+        blank=True,
+        help_text="Event type",
+    )
+    description = models.TextField(
+        blank=True,
+        help_text="Log message",
+    )
+    fingerprint = models.CharField(
+        max_length=40,
+        help_text="SHA-1 of the entry's fields, unique per NAS and log type",
+    )
+    ingested_at = models.DateTimeField(
+        auto_now_add=True,
+        help_text="When the entry was stored locally",
+    )
+
+    class Meta:
+        db_table = "mcp_synology_log_entries"
+        ordering = ["-logged_at"]
+        verbose_name = "Synology Log Entry"
+        verbose_name_plural = "Synology Log Entries"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["nas", "log_type", "fingerprint"],
+                name="mcp_synolog_unique_entry",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["nas", "log_type", "logged_at"], name="mcp_synolog_type_time_idx"),
+            models.Index(fields=["level", "logged_at"], name="mcp_synolog_level_time_idx"),
+            models.Index(fields=["user", "logged_at"], name="mcp_synolog_user_time_idx"),
+            models.Index(fields=["ip", "logged_at"], name="mcp_synolog_ip_time_idx"),
+        ]
+
+    def __str__(self):
+        return f"[{self.log_type}] {self.logged_at.isoformat()} {self.user or '-'} {self.event}"
+
+
+class AzureDeployment(models.Model):
+    """An ARM deployment started by the MCP tools and followed in the background.
+
+    The deploy tools create the row and return its handle right away; the
+    deployment tracker polls ARM until the deployment reaches a terminal
+    state, recording per-resource operations as AzureDeploymentOperation
+    rows. Non-terminal rows are picked up again after a restart.
+    """
+
+    SCOPE_CHOICES = [
+        ("resource_group", "Resource Group"),
+        ("subscription", "Subscription"),
+    ]
+
+    handle = models.CharField(
+        max_length=36,
+        unique=True,
+        help_text="Deployment handle returned to callers (UUID)",
+    )
+    subscription_id = models.CharField(
+        max_length=64,
+        help_text="Azure subscription ID",
+    )
+    scope = models.CharField(
+        max_length=20,
+        choices=SCOPE_CHOICES,
+        default="resource_group",
+        help_text="Deployment scope",
+    )
+    resource_group = models.CharField(
+        max_length=90,
+        blank=True,
+        help_text="Target resource group (resource group scope only)",
+    )
+    deployment_name = models.CharField(
+        max_length=64,
+        help_text="ARM deployment name",
+    )
+    provisioning_state = models.CharField(
+        max_length=32,
+        default="Accepted",
+        help_text="Latest ARM provisioning state of the deployment",
+    )
+    correlation_id = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text="ARM correlation ID",
+    )
+    outputs = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Template outputs once the deployment succeeded",
+    )
+    error = models.TextField(
+        blank=True,
+        help_text="Error message if the deployment or tracking failed",
+    )
+    sequence = models.IntegerField(
+        default=0,
+        help_text="Last progress sequence number issued for this deployment",
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        help_text="When the deployment was started",
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        help_text="When the tracker last recorded a change",
+    )
+    finished_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the deployment reached a terminal state",
+    )
+
+    class Meta:
+        db_table = "mcp_azure_deployments"
+        ordering = ["-created_at"]
+        verbose_name = "Azure Deployment"
+        verbose_name_plural = "Azure Deployments"
+        indexes = [
+            models.Index(fields=["provisioning_state"], name="mcp_azdeploy_state_idx"),
+            models.Index(fields=["subscription_id", "deployment_name"], name="mcp_azdeploy_name_idx"),
+        ]
+
+    def __str__(self):
+        target = self.resource_group or self.subscription_id
+        return f"{self.deployment_name} ({target}): {self.provisioning_state}"
+
+
+class AzureDeploymentOperation(models.Model):
+    """Latest state of one operation (usually one resource) in a deployment.
+
+    ``sequence`` is taken from the deployment's counter each time the
+    operation changes, so progress can be streamed from any point with
+    ``sequence > cursor``.
+    """
+
+    deployment = models.ForeignKey(
+        AzureDeployment,
+        on_delete=models.CASCADE,
+        related_name="operations",
+        help_text="Deployment this operation belongs to",
+    )
+    operation_id = models.CharField(
+        max_length=64,
+        help_text="ARM deployment operation ID",
+    )
+    resource_type = models.CharField(
+        max_length=255,
+        blank=True,
+        help_text="Target resource type",
+    )
+    resource_name = models.CharField(
+        max_length=255,
+        blank=True,
+        help_text="Target resource name",
+    )
+    provisioning_state = models.CharField(
+        max_length=32,
+        blank=True,
+        help_text="Operation provisioning state",
+    )
+    status_code = models.CharField(
+        max_length=32,
+        blank=True,
+        help_text="HTTP status code reported for the operation",
+    )
+    status_message = models.TextField(
+        blank=True,
+        help_text="Status or error message (truncated)",
+    )
+    sequence = models.IntegerField(
+        default=0,
+        help_text="Progress sequence number of the latest change",
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        help_text="When the change was recorded",
+    )
+
+    class Meta:
+        db_table = "mcp_azure_deployment_operations"
+        ordering = ["sequence"]
+        verbose_name = "Azure Deployment Operation"
+        verbose_name_plural = "Azure Deployment Operations"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["deployment", "operation_id"],
+                name="mcp_azdeployop_unique_op",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["deployment", "sequence"], name="mcp_azdeployop_seq_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.resource_type}/{self.resource_name}: {self.provisioning_state}"
+
+
+class AzureFlowRun(models.Model):
+    """Checkpoint of an Azure orchestration flow run.
+
+    The flow engine records each step's outcome as it finishes so a failed
+    run can be resumed: steps that already succeeded are not run again and
+    their recorded results feed the remaining steps.
+    """
+
+    STATUS_CHOICES = [
+        ("running", "Running"),
+        ("succeeded", "Succeeded"),
+        ("failed", "Failed"),
+    ]
+
+    run_id = models.CharField(
+        max_length=36,
+        unique=True,
+        help_text="Run identifier returned to callers (UUID)",
+    )
+    flow = models.CharField(
+        max_length=100,
+        help_text="Flow tool name",
+    )
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default="running",
+        help_text="Overall run status",
+    )
+    params = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Flow input parameters",
+    )
+    steps = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Step name -> {status, result, error, duration_seconds}",
+    )
+    error = models.TextField(
+        blank=True,
+        help_text="Error message if the run failed",
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        help_text="When the run started",
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        help_text="When a step last finished",
+    )
+
+    class Meta:
+        db_table = "mcp_azure_flow_runs"
+        ordering = ["-created_at"]
+        verbose_name = "Azure Flow Run"
+        verbose_name_plural = "Azure Flow Runs"
+        indexes = [
+            models.Index(fields=["flow", "created_at"], name="mcp_azflowrun_flow_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.flow} {self.run_id}: {self.status}"
+
+
+class AzureCostDaily(models.Model):
+    """Actual cost of one service in one resource group on one day.
+
+    Filled incrementally from Cost Management by the cost store: only days
+    outside the subscription's covered range, and the last few days (which
+    Azure still revises), are fetched. Cost summaries and top-N queries
+    are answered from this table.
+    """
+
+    subscription_id = models.CharField(
+        max_length=64,
+        help_text="Azure subscription ID",
+    )
+    resource_group = models.CharField(
+        max_length=90,
+        blank=True,
+        help_text="Resource group name (lowercase; empty for subscription-level charges)",
+    )
+    service_name = models.CharField(
+        max_length=128,
+        blank=True,
+        help_text="Azure service name (e.g., 'Storage', 'Virtual Machines')",
+    )
+    day = models.DateField(
+        help_text="Usage date (UTC)",
+    )
+    cost = models.FloatField(
+        default=0.0,
+        help_text="Actual cost for the day",
+    )
+    currency = models.CharField(
+        max_length=8,
+        default="USD",
+        help_text="Billing currency",
+    )
+
+    class Meta:
+        db_table = "mcp_azure_cost_daily"
+        ordering = ["-day"]
+        verbose_name = "Azure Daily Cost"
+        verbose_name_plural = "Azure Daily Costs"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["subscription_id", "resource_group", "service_name", "day"],
+                name="mcp_azcost_unique_day",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["subscription_id", "day"], name="mcp_azcost_sub_day_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.resource_group or '-'} {self.service_name}: {self.cost:.2f} {self.currency}"
+
+
+class AzureCostCoverage(models.Model):
+    """Contiguous range of days already stored in AzureCostDaily for a subscription."""
+
+    subscription_id = models.CharField(
+        max_length=64,
+        unique=True,
+        help_text="Azure subscription ID",
+    )
+    first_day = models.DateField(
+        help_text="First stored day",
+    )
+    last_day = models.DateField(
+        help_text="Last stored day",
+    )
+    refreshed_at = models.DateTimeField(
+        help_text="When the most recent days were last fetched",
+    )
+
+    class Meta:
+        db_table = "mcp_azure_cost_coverage"
+        verbose_name = "Azure Cost Coverage"
+        verbose_name_plural = "Azure Cost Coverage"
+
+    def __str__(self):
+        return f"{self.subscription_id}: {self.first_day} .. {self.last_day}"
+
+
+class AzureInventorySnapshot(models.Model):
+    """Resource inventory of a set of subscriptions at one point in time.
+
+    Taken from Resource Graph by the inventory job. content_hash covers
+    every resource's content hash, so two snapshots with the same hash
+    hold the same inventory and diff to nothing without reading rows.
+    """
+
+    taken_at = models.DateTimeField(
+        db_index=True,
+        help_text="When the snapshot was taken",
+    )
+    subscriptions = models.JSONField(
+        default=list,
+        help_text="Subscription IDs included (lowercase)",
+    )
+    resource_count = models.IntegerField(
+        default=0,
+        help_text="Number of resources",
+    )
+    content_hash = models.CharField(
+        max_length=64,
+        db_index=True,
+        help_text="SHA-256 over all resource content hashes",
+    )
+    duration_seconds = models.FloatField(
+        default=0.0,
+        help_text="Time taken to query and store the snapshot",
+    )
+
+    class Meta:
+        db_table = "mcp_azure_inventory_snapshots"
+        ordering = ["-taken_at"]
+        verbose_name = "Azure Inventory Snapshot"
+        verbose_name_plural = "Azure Inventory Snapshots"
+
+    def __str__(self):
+        return f"{self.taken_at:%Y-%m-%d %H:%M} ({self.resource_count} resources)"
+
+
+class AzureInventoryResource(models.Model):
+    """One resource as it was in an inventory snapshot."""
+
+    snapshot = models.ForeignKey(
+        AzureInventorySnapshot,
+        on_delete=models.CASCADE,
+        related_name="resources",
+        help_text="Snapshot this row belongs to",
+    )
+    resource_id = models.CharField(
+        max_length=1024,
+        help_text="Full resource ID (lowercase)",
+    )
+    subscription_id = models.CharField(
+        max_length=64,
+        help_text="Azure subscription ID (lowercase)",
+    )
+    resource_group = models.CharField(
+        max_length=90,
+        blank=True,
+        help_text="Resource group name (lowercase)",
+    )
+    name = models.CharField(
+        max_length=255,
+        help_text="Resource name",
+    )
+    resource_type = models.CharField(
+        max_length=255,
+        help_text="Resource type (lowercase, e.g. microsoft.web/sites)",
+    )
+    location = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text="Azure region",
+    )
+    tags = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="Resource tags",
+    )
+    sku = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text="SKU (name, tier, capacity, ...) if the resource has one",
+    )
+    provisioning_state = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text="Provisioning state",
+    )
+    content_hash = models.CharField(
+        max_length=64,
+        help_text="SHA-256 of the fields above, for change detection",
+    )
+
+    class Meta:
+        db_table = "mcp_azure_inventory_resources"
+        verbose_name = "Azure Inventory Resource"
+        verbose_name_plural = "Azure Inventory Resources"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["snapshot", "resource_id"],
+                name="mcp_azinv_unique_resource",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["snapshot", "resource_type"], name="mcp_azinv_snap_type_idx"),
+        ]
+
+    def __str__(self):
+        return self.resource_id
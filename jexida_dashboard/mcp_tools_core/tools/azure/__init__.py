@@ -4,14 +4,20 @@ Contains Azure-related MCP tools organized by function:
 
 Phase 1 (Implemented):
 - auth: Authentication and credential management
+- token_cache: Access tokens persisted under DATA_DIR and refreshed ahead of expiry
 - core: Subscriptions, resource groups, locations
 - resources: Generic ARM resource operations
+- resource_graph: Paged, cached Resource Graph queries across subscriptions
+- inventory: Stored resource inventory snapshots and diffs between them
 - deployments: ARM/Bicep deployments
+- deployment_tracker: Background tracking of ARM deployments
 - app_platform: App Service and Functions
 - data: Storage accounts and SQL
 - monitoring: Metrics, logs, and alerts
 - cost: Cost management and analysis
+- cost_store: Local store of daily costs with incremental backfill
 - cli: Azure CLI command execution (existing)
+- cli_worker: Warm Azure CLI worker processes and read-only result cache
 - monitor: HTTP health probes (existing)
 
 Phase 2 (Stubs):
@@ -23,15 +29,21 @@ Phase 2 (Stubs):
 
 # Existing tools
 from . import cli
+from . import cli_worker
 from . import cost
+from . import cost_store
 from . import monitor
 from . import utils
 
 # Phase 1: Core infrastructure tools
 from . import auth
+from . import token_cache
 from . import core
 from . import resources
+from . import resource_graph
+from . import inventory
 from . import deployments
+from . import deployment_tracker
 from . import app_platform
 from . import data
 from . import monitoring
@@ -47,6 +59,8 @@ from .auth import (
     get_azure_credential,
     get_subscription_id,
     get_credential_and_subscription,
+    get_management_client,
+    close_management_clients,
     AzureError,
     AzureAuthError,
     AzureConfigError,
@@ -70,6 +84,9 @@ from .resources import (
     azure_resources_delete_resource,
     azure_resources_list_by_type,
     azure_resources_search,
+    azure_resources_snapshot_inventory,
+    azure_resources_list_inventory_snapshots,
+    azure_resources_diff_inventory,
 )
 
 from .deployments import (
@@ -77,6 +94,7 @@ from .deployments import (
     azure_deployments_deploy_to_subscription,
     azure_deployments_get_status,
     azure_deployments_list,
+    azure_deployments_watch,
 )
 
 from .app_platform import (
@@ -97,6 +115,7 @@ from .data import (
 
 from .monitoring import (
     azure_monitoring_get_metrics,
+    azure_monitoring_get_metrics_batch,
     azure_monitoring_query_logs,
     azure_monitoring_list_alerts,
 )
@@ -104,6 +123,7 @@ from .monitoring import (
 from .cost import (
     azure_cost_get_summary,
     azure_cost_get_top_cost_drivers,
+    azure_cost_query,
 )
 
 # Flows: High-level orchestration tools
@@ -119,14 +139,20 @@ from .flows import (
 __all__ = [
     # Modules
     "auth",
+    "token_cache",
     "cli",
+    "cli_worker",
     "core",
     "resources",
+    "resource_graph",
+    "inventory",
     "deployments",
+    "deployment_tracker",
     "app_platform",
     "data",
     "monitoring",
     "cost",
+    "cost_store",
     "monitor",
     "utils",
     "network",
@@ -138,6 +164,8 @@ __all__ = [
     "get_azure_credential",
     "get_subscription_id",
     "get_credential_and_subscription",
+    "get_management_client",
+    "close_management_clients",
     "AzureError",
     "AzureAuthError",
     "AzureConfigError",
@@ -159,12 +187,16 @@ __all__ = [
     "azure_resources_delete_resource",
     "azure_resources_list_by_type",
     "azure_resources_search",
+    "azure_resources_snapshot_inventory",
+    "azure_resources_list_inventory_snapshots",
+    "azure_resources_diff_inventory",
     
     # Deployments tools
     "azure_deployments_deploy_to_resource_group",
     "azure_deployments_deploy_to_subscription",
     "azure_deployments_get_status",
     "azure_deployments_list",
+    "azure_deployments_watch",
     
     # App Platform tools
     "azure_app_platform_create_app_service_plan",
@@ -182,12 +214,14 @@ __all__ = [
     
     # Monitoring tools
     "azure_monitoring_get_metrics",
+    "azure_monitoring_get_metrics_batch",
     "azure_monitoring_query_logs",
     "azure_monitoring_list_alerts",
     
     # Cost tools
     "azure_cost_get_summary",
     "azure_cost_get_top_cost_drivers",
+    "azure_cost_query",
     
     # Flow tools (orchestration)
     "flows",
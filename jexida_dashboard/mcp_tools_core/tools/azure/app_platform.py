@@ -13,10 +13,12 @@ from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, Field
 
 from .auth import (
-    get_credential_and_subscription,
+    get_management_client,
+    get_subscription_id,
     AzureError,
     wrap_azure_error,
 )
+from .utils import run_blocking
 
 logger = logging.getLogger(__name__)
 
@@ -187,8 +189,8 @@ async def azure_app_platform_create_app_service_plan(
         from azure.mgmt.web import WebSiteManagementClient
         from azure.mgmt.web.models import AppServicePlan, SkuDescription
         
-        credential, subscription_id = get_credential_and_subscription(params.subscription_id)
-        client = WebSiteManagementClient(credential, subscription_id)
+        subscription_id = get_subscription_id(params.subscription_id)
+        client = get_management_client(WebSiteManagementClient, subscription_id)
         
         # Build SKU
         sku = SkuDescription(
@@ -205,12 +207,13 @@ async def azure_app_platform_create_app_service_plan(
         )
         
         # Create plan
-        poller = client.app_service_plans.begin_create_or_update(
+        poller = await run_blocking(
+            client.app_service_plans.begin_create_or_update,
             params.resource_group,
             params.name,
             plan,
         )
-        result = poller.result()
+        result = await run_blocking(poller.result)
         
         logger.info(f"Created App Service plan: {result.name}")
         
@@ -264,11 +267,11 @@ async def azure_app_platform_create_web_app(
         from azure.mgmt.web import WebSiteManagementClient
         from azure.mgmt.web.models import Site, SiteConfig
         
-        credential, subscription_id = get_credential_and_subscription(params.subscription_id)
-        client = WebSiteManagementClient(credential, subscription_id)
+        subscription_id = get_subscription_id(params.subscription_id)
+        client = get_management_client(WebSiteManagementClient, subscription_id)
         
         # Get the App Service plan
-        plan = client.app_service_plans.get(params.resource_group, params.plan_name)
+        plan = await run_blocking(client.app_service_plans.get, params.resource_group, params.plan_name)
         
         # Build site config
         site_config = SiteConfig()
@@ -287,12 +290,13 @@ async def azure_app_platform_create_web_app(
         )
         
         # Create web app
-        poller = client.web_apps.begin_create_or_update(
+        poller = await run_blocking(
+            client.web_apps.begin_create_or_update,
             params.resource_group,
             params.name,
             site,
         )
-        result = poller.result()
+        result = await run_blocking(poller.result)
         
         logger.info(f"Created web app: {result.name}")
         
@@ -343,8 +347,8 @@ async def azure_app_platform_update_web_app_settings(
         from azure.mgmt.web import WebSiteManagementClient
         from azure.mgmt.web.models import StringDictionary, ConnectionStringDictionary
         
-        credential, subscription_id = get_credential_and_subscription(params.subscription_id)
-        client = WebSiteManagementClient(credential, subscription_id)
+        subscription_id = get_subscription_id(params.subscription_id)
+        client = get_management_client(WebSiteManagementClient, subscription_id)
         
         settings_updated = 0
         conn_strings_updated = 0
@@ -352,7 +356,8 @@ async def azure_app_platform_update_web_app_settings(
         # Update app settings
         if params.app_settings:
             # Get existing settings first
-            existing = client.web_apps.list_application_settings(
+            existing = await run_blocking(
+                client.web_apps.list_application_settings,
                 params.resource_group,
                 params.name
             )
@@ -362,7 +367,8 @@ async def azure_app_platform_update_web_app_settings(
             merged.update(params.app_settings)
             
             # Update
-            client.web_apps.update_application_settings(
+            await run_blocking(
+                client.web_apps.update_application_settings,
                 params.resource_group,
                 params.name,
                 StringDictionary(properties=merged)
@@ -386,7 +392,8 @@ async def azure_app_platform_update_web_app_settings(
                     type=conn_type
                 )
             
-            client.web_apps.update_connection_strings(
+            await run_blocking(
+                client.web_apps.update_connection_strings,
                 params.resource_group,
                 params.name,
                 ConnectionStringDictionary(properties=conn_dict)
@@ -437,11 +444,11 @@ async def azure_app_platform_restart_web_app(
     try:
         from azure.mgmt.web import WebSiteManagementClient
         
-        credential, subscription_id = get_credential_and_subscription(params.subscription_id)
-        client = WebSiteManagementClient(credential, subscription_id)
+        subscription_id = get_subscription_id(params.subscription_id)
+        client = get_management_client(WebSiteManagementClient, subscription_id)
         
         # Restart the web app
-        client.web_apps.restart(params.resource_group, params.name)
+        await run_blocking(client.web_apps.restart, params.resource_group, params.name)
         
         logger.info(f"Restarted web app: {params.name}")
         
@@ -495,8 +502,8 @@ async def azure_app_platform_create_function_app(
         from azure.mgmt.web import WebSiteManagementClient
         from azure.mgmt.web.models import Site, SiteConfig, NameValuePair
         
-        credential, subscription_id = get_credential_and_subscription(params.subscription_id)
-        client = WebSiteManagementClient(credential, subscription_id)
+        subscription_id = get_subscription_id(params.subscription_id)
+        client = get_management_client(WebSiteManagementClient, subscription_id)
         
         # Get storage account connection string
         # Note: In a real implementation, you'd fetch this from the storage account
@@ -527,7 +534,7 @@ async def azure_app_platform_create_function_app(
         # Get plan if specified
         server_farm_id = None
         if params.plan_name:
-            plan = client.app_service_plans.get(params.resource_group, params.plan_name)
+            plan = await run_blocking(client.app_service_plans.get, params.resource_group, params.plan_name)
             server_farm_id = plan.id
         
         # Build site
@@ -540,12 +547,13 @@ async def azure_app_platform_create_function_app(
         )
         
         # Create function app
-        poller = client.web_apps.begin_create_or_update(
+        poller = await run_blocking(
+            client.web_apps.begin_create_or_update,
             params.resource_group,
             params.name,
             site,
         )
-        result = poller.result()
+        result = await run_blocking(poller.result)
         
         logger.info(f"Created Function App: {result.name}")
         
@@ -8,10 +8,13 @@ Environment Variables:
     AZURE_CLIENT_ID: Service principal client ID
     AZURE_CLIENT_SECRET: Service principal client secret
     AZURE_SUBSCRIPTION_ID: Default Azure subscription ID
+    AZURE_TOKEN_CACHE: Set to 0 to keep tokens in memory only (see token_cache)
 """
 
+import atexit
 import logging
 import os
+import threading
 from typing import Optional, Tuple, Any, Dict
 
 logger = logging.getLogger(__name__)
@@ -102,6 +105,10 @@ def get_azure_credential():
     4. Visual Studio Code
     5. Azure PowerShell
     
+    The credential is wrapped in a CachingCredential, so tokens are shared
+    with other processes through a file under DATA_DIR and refreshed in
+    the background before they expire.
+    
     Returns:
         Azure credential object
         
@@ -127,20 +134,30 @@ def get_azure_credential():
     client_id = os.environ.get("AZURE_CLIENT_ID")
     client_secret = os.environ.get("AZURE_CLIENT_SECRET")
     
-    try:
+    def new_credential():
         if tenant_id and client_id and client_secret:
             # Use explicit service principal credentials
-            logger.info("Using ClientSecretCredential with service principal")
-            _credential_cache = ClientSecretCredential(
+            return ClientSecretCredential(
                 tenant_id=tenant_id,
                 client_id=client_id,
                 client_secret=client_secret,
             )
-        else:
-            # Use DefaultAzureCredential for flexible auth
-            logger.info("Using DefaultAzureCredential")
-            _credential_cache = DefaultAzureCredential()
+        # Use DefaultAzureCredential for flexible auth
+        return DefaultAzureCredential()
+    
+    try:
+        credential = new_credential()
+        logger.info(f"Using {type(credential).__name__}")
+        
+        if os.environ.get("AZURE_TOKEN_CACHE", "1") != "0":
+            from .token_cache import CachingCredential, TokenFileStore, default_cache_path
+            
+            identity = f"{type(credential).__name__}:{tenant_id or ''}:{client_id or ''}"
+            credential = CachingCredential(
+                credential, TokenFileStore(default_cache_path()), identity, factory=new_credential,
+            )
         
+        _credential_cache = credential
         return _credential_cache
         
     except Exception as e:
@@ -209,10 +226,119 @@ def get_tenant_id() -> Optional[str]:
 def clear_credential_cache():
     """Clear the cached credential.
     
+    Pooled management clients hold the old credential, so they are closed
+    as well and rebuilt on next use.
+    
     Useful for testing or when credentials change.
     """
     global _credential_cache
-    _credential_cache = None
+    close_management_clients()
+    credential, _credential_cache = _credential_cache, None
+    if credential is not None and hasattr(credential, "close"):
+        credential.close()
+
+
+# =============================================================================
+# Management Client Pool
+# =============================================================================
+
+# One client per (client class, subscription), all sharing one HTTP
+# transport, so repeated tool calls reuse keep-alive connections to
+# management.azure.com instead of a new pipeline and TLS handshake each time
+_client_cache: Dict[Tuple[type, Optional[str]], Any] = {}
+_client_lock = threading.Lock()
+_shared_session = None
+_shared_transport = None
+
+# Keep-alive connections per host; matches the SDK thread pool so every
+# worker can hold a connection
+AZURE_HTTP_POOL_SIZE = int(os.environ.get("AZURE_HTTP_POOL_SIZE", os.environ.get("AZURE_SDK_MAX_WORKERS", "16")))
+
+
+def _get_shared_transport():
+    """Create (once) the transport shared by all pooled clients.
+    
+    Must be called with _client_lock held.
+    """
+    global _shared_session, _shared_transport
+    
+    if _shared_transport is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from azure.core.pipeline.transport import RequestsTransport
+        
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=AZURE_HTTP_POOL_SIZE,
+            pool_maxsize=AZURE_HTTP_POOL_SIZE,
+        )
+        session.mount("https://", adapter)
+        # session_owner=False: closing one client must not close the
+        # session under the others; close_management_clients() does that
+        _shared_transport = RequestsTransport(session=session, session_owner=False)
+        _shared_session = session
+    
+    return _shared_transport
+
+
+def get_management_client(client_class: type, subscription_id: Optional[str] = None) -> Any:
+    """Get a pooled Azure SDK client.
+    
+    Args:
+        client_class: SDK client class, e.g. ResourceManagementClient
+        subscription_id: Subscription for subscription-scoped clients;
+            None for clients that only take a credential
+            (SubscriptionClient, CostManagementClient, ResourceGraphClient)
+        
+    Returns:
+        A client shared by all callers with the same class and subscription
+        
+    Raises:
+        AzureAuthError: If no valid credential could be obtained
+    """
+    key = (client_class, subscription_id)
+    client = _client_cache.get(key)
+    if client is not None:
+        return client
+    
+    credential = get_azure_credential()
+    
+    with _client_lock:
+        client = _client_cache.get(key)
+        if client is None:
+            transport = _get_shared_transport()
+            if subscription_id:
+                client = client_class(credential, subscription_id, transport=transport)
+            else:
+                client = client_class(credential, transport=transport)
+            _client_cache[key] = client
+            logger.debug(f"Created pooled {client_class.__name__} for {subscription_id or 'tenant'}")
+        return client
+
+
+def close_management_clients() -> None:
+    """Close all pooled clients and the shared connection pool.
+    
+    Runs at interpreter exit; the next get_management_client() call
+    builds fresh clients.
+    """
+    global _shared_session, _shared_transport
+    
+    with _client_lock:
+        clients = list(_client_cache.values())
+        _client_cache.clear()
+        session, _shared_session, _shared_transport = _shared_session, None, None
+    
+    for client in clients:
+        try:
+            client.close()
+        except Exception as e:
+            logger.debug(f"Error closing {type(client).__name__}: {e}")
+    if session is not None:
+        session.close()
+
+
+atexit.register(close_management_clients)
 
 
 # =============================================================================
@@ -0,0 +1,55 @@
+"""Long-lived Azure CLI worker process.
+
+Started by cli_worker.AzWorkerPool under the Python interpreter that has
+azure-cli installed (usually not this service's). It imports
+azure.cli.core once, then runs one command per JSON line on stdin and
+answers with one JSON line on stdout:
+    -> {"args": ["group", "list", "--subscription", "..."]}
+    <- {"stdout": "...", "stderr": "...", "exit_code": 0}
+The first line written is {"ready": true}, or {"error": "..."} before
+exiting if azure-cli cannot be imported.
+
+Must not import anything from this package: it runs as a plain script.
+"""
+
+import contextlib
+import io
+import json
+import sys
+
+
+def _reply(stream, message):
+    stream.write(json.dumps(message) + "\n")
+    stream.flush()
+
+
+def main():
+    protocol = sys.stdout
+    try:
+        from azure.cli.core import get_default_cli
+    except Exception as e:
+        _reply(protocol, {"error": f"azure-cli is not importable by {sys.executable}: {e}"})
+        return 1
+    _reply(protocol, {"ready": True})
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        args = json.loads(line)["args"]
+        out, err = io.StringIO(), io.StringIO()
+        # Anything az prints outside out_file must not reach the protocol stream
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            try:
+                # A fresh CLI object per command; the expensive imports stay loaded
+                exit_code = get_default_cli().invoke(args, out_file=out)
+            except SystemExit as e:
+                exit_code = e.code if isinstance(e.code, int) else 1
+            except Exception as e:
+                err.write(f"{type(e).__name__}: {e}\n")
+                exit_code = 1
+        _reply(protocol, {"stdout": out.getvalue(), "stderr": err.getvalue(), "exit_code": exit_code or 0})
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,20 +1,25 @@
 """Azure CLI tool implementation.
 
 Provides the azure_cli_run tool for executing Azure CLI commands safely.
+Commands run on warm Azure CLI workers when available, and results of
+read-only commands are cached briefly (see cli_worker).
 """
 
 import asyncio
 import logging
 import subprocess
+import time
 from typing import Optional
 
 from pydantic import BaseModel, Field, field_validator
 
+from .cli_worker import AZURE_CLI_WARM, CliResult, get_cli_cache, get_cli_pool, is_read_only
 from .utils import (
     AZURE_CLI_TIMEOUT,
     CommandLengthError,
     CommandSanitizationError,
     build_az_command,
+    run_blocking,
     sanitize_command,
     validate_subscription_id,
 )
@@ -35,6 +40,10 @@ class AzureCliInput(BaseModel):
         default=False,
         description="If true, return the command that would be executed without running it"
     )
+    use_cache: bool = Field(
+        default=True,
+        description="Reuse a recent result of the same read-only (list/show/get) command"
+    )
 
     @field_validator("subscription_id")
     @classmethod
@@ -63,16 +72,69 @@ class AzureCliOutput(BaseModel):
         default=None,
         description="The full command that was executed (for dry_run mode)"
     )
+    cached: bool = Field(
+        default=False,
+        description="Whether the result is a recent cached result of the same read-only command"
+    )
+    warm: bool = Field(
+        default=False,
+        description="Whether the command ran on a warm Azure CLI worker"
+    )
+    duration_ms: int = Field(
+        default=0,
+        description="Time spent on this call in milliseconds"
+    )
+    time_saved_ms: int = Field(
+        default=0,
+        description="Estimated time saved versus spawning az (cache hit: the original run; warm: measured az startup)"
+    )
+
+
+async def _run_cold(cmd_args: list) -> CliResult:
+    """Spawn az for one command."""
+    started = time.monotonic()
+    process = await asyncio.create_subprocess_exec(
+        *cmd_args,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+
+    try:
+        stdout, stderr = await asyncio.wait_for(
+            process.communicate(),
+            timeout=AZURE_CLI_TIMEOUT
+        )
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.communicate()
+        return CliResult(
+            "",
+            f"Command timed out after {AZURE_CLI_TIMEOUT} seconds",
+            -1,
+            time.monotonic() - started,
+        )
+
+    return CliResult(
+        stdout.decode("utf-8", errors="replace"),
+        stderr.decode("utf-8", errors="replace"),
+        process.returncode,
+        time.monotonic() - started,
+    )
 
 
 async def azure_cli_run(params: AzureCliInput) -> AzureCliOutput:
     """Execute an Azure CLI command.
 
+    Read-only commands (list, show, get) are answered from a short-lived
+    cache keyed by command and subscription; any other command clears that
+    subscription's cached results. Commands run on a warm worker process
+    with azure-cli already loaded, or by spawning az if none is available.
+
     Args:
         params: Validated input parameters
 
     Returns:
-        Command execution result
+        Command execution result, with timing and time saved
     """
     logger.info(
         f"azure_cli_run called: subscription_id={params.subscription_id}, dry_run={params.dry_run}"
@@ -96,43 +158,50 @@ async def azure_cli_run(params: AzureCliInput) -> AzureCliOutput:
                 command_executed=command_str
             )
 
-        # Execute command
-        process = await asyncio.create_subprocess_exec(
-            *cmd_args,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-
-        try:
-            stdout, stderr = await asyncio.wait_for(
-                process.communicate(),
-                timeout=AZURE_CLI_TIMEOUT
-            )
-        except asyncio.TimeoutError:
-            process.kill()
-            await process.communicate()
-            logger.error(f"Command timed out after {AZURE_CLI_TIMEOUT} seconds")
-            return AzureCliOutput(
-                stdout="",
-                stderr=f"Command timed out after {AZURE_CLI_TIMEOUT} seconds",
-                exit_code=-1,
-                command_executed=command_str
-            )
-
-        exit_code = process.returncode
-        stdout_str = stdout.decode("utf-8", errors="replace")
-        stderr_str = stderr.decode("utf-8", errors="replace")
+        cache = get_cli_cache()
+        read_only = is_read_only(sanitized_command)
+        if read_only and params.use_cache:
+            hit = cache.get(sanitized_command, params.subscription_id)
+            if hit is not None:
+                logger.info("Returning cached result of read-only command")
+                return AzureCliOutput(
+                    stdout=hit.stdout,
+                    stderr=hit.stderr,
+                    exit_code=hit.exit_code,
+                    command_executed=command_str,
+                    cached=True,
+                    time_saved_ms=int(hit.duration * 1000),
+                )
 
-        if exit_code == 0:
-            logger.info(f"Command succeeded with exit code {exit_code}")
+        # Execute command
+        result = None
+        pool = get_cli_pool() if AZURE_CLI_WARM else None
+        if pool is not None and pool.available():
+            result = await run_blocking(pool.run, cmd_args[1:], AZURE_CLI_TIMEOUT)
+        warm = result is not None
+        if result is None:
+            result = await _run_cold(cmd_args)
+
+        if result.exit_code == -1:
+            logger.error(result.stderr)
+        elif result.exit_code == 0:
+            logger.info(f"Command succeeded with exit code {result.exit_code}")
         else:
-            logger.warning(f"Command failed with exit code {exit_code}")
+            logger.warning(f"Command failed with exit code {result.exit_code}")
+
+        if not read_only:
+            cache.invalidate(params.subscription_id)
+        elif result.exit_code == 0:
+            cache.put(sanitized_command, params.subscription_id, result)
 
         return AzureCliOutput(
-            stdout=stdout_str,
-            stderr=stderr_str,
-            exit_code=exit_code,
-            command_executed=command_str
+            stdout=result.stdout,
+            stderr=result.stderr,
+            exit_code=result.exit_code,
+            command_executed=command_str,
+            warm=warm,
+            duration_ms=int(result.duration * 1000),
+            time_saved_ms=int(pool.startup_seconds * 1000) if warm else 0,
         )
 
     except CommandSanitizationError as e:
@@ -0,0 +1,305 @@
+"""Warm Azure CLI execution and read-only result caching.
+
+Every `az` process pays one to two seconds of Python startup and module
+loading before it does any work. AzWorkerPool keeps up to
+AZURE_CLI_WORKERS long-lived az_worker.py processes, each with
+azure.cli.core already imported, and sends commands to them instead.
+The workers run under the interpreter that azure-cli is installed into
+(AZURE_CLI_PYTHON, or the one named by the `az` launcher script). If
+that interpreter cannot import azure-cli, the pool reports itself
+unavailable and azure_cli_run falls back to spawning `az`.
+
+CliResultCache keeps successful results of read-only commands (verb
+list, show or get) for AZURE_CLI_CACHE_SECONDS, keyed by command and
+subscription. Any other command clears that subscription's entries, so
+a create followed by a list sees the new resource.
+"""
+
+import atexit
+import json
+import logging
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .utils import get_azure_cli_path
+
+logger = logging.getLogger(__name__)
+
+
+AZURE_CLI_WARM = os.environ.get("AZURE_CLI_WARM", "1") != "0"
+AZURE_CLI_WORKERS = int(os.environ.get("AZURE_CLI_WORKERS", "2"))
+AZURE_CLI_CACHE_SECONDS = float(os.environ.get("AZURE_CLI_CACHE_SECONDS", "30"))
+
+READ_ONLY_VERBS = {"list", "show", "get"}
+
+# Seconds a worker may take to import azure-cli and report ready
+WORKER_STARTUP_TIMEOUT = 60
+# After a failed start, spawn `az` directly for this long before retrying
+WORKER_RETRY_SECONDS = 300
+
+WORKER_SCRIPT = str(Path(__file__).with_name("az_worker.py"))
+
+_LAUNCHER_RE = re.compile(r"(\S*python[\w.]*)\s+-\w*m\s+azure\.cli\b")
+
+
+@dataclass
+class CliResult:
+    """Output of one az command and how long it took."""
+    stdout: str
+    stderr: str
+    exit_code: int
+    duration: float = 0.0
+
+
+# =============================================================================
+# Command classification and cache
+# =============================================================================
+
+def command_verb(command: str) -> str:
+    """The last command word before any option (e.g. 'list' in 'vm list -g x')."""
+    verb = ""
+    for token in command.split():
+        if token.startswith("-"):
+            break
+        verb = token
+    return verb.lower()
+
+
+def is_read_only(command: str) -> bool:
+    return command_verb(command) in READ_ONLY_VERBS
+
+
+class CliResultCache:
+    """Short-lived results of read-only commands by (command, subscription)."""
+
+    def __init__(self, ttl: float = AZURE_CLI_CACHE_SECONDS):
+        self.ttl = ttl
+        self._entries: Dict[Tuple[str, str], Tuple[float, CliResult]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(command: str, subscription_id: str) -> Tuple[str, str]:
+        return " ".join(command.split()), subscription_id.lower()
+
+    def get(self, command: str, subscription_id: str) -> Optional[CliResult]:
+        key = self._key(command, subscription_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return None
+            return entry[1]
+
+    def put(self, command: str, subscription_id: str, result: CliResult) -> None:
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[self._key(command, subscription_id)] = (time.monotonic() + self.ttl, result)
+
+    def invalidate(self, subscription_id: str) -> None:
+        """Drop every cached result for a subscription."""
+        subscription_id = subscription_id.lower()
+        with self._lock:
+            for key in [k for k in self._entries if k[1] == subscription_id]:
+                del self._entries[key]
+
+
+# =============================================================================
+# Worker processes
+# =============================================================================
+
+def find_cli_python() -> str:
+    """Interpreter that azure-cli is installed into.
+
+    AZURE_CLI_PYTHON if set; otherwise the interpreter the `az` launcher
+    runs (`/opt/az/bin/python3 -Im azure.cli` or a python shebang);
+    otherwise this interpreter.
+    """
+    configured = os.environ.get("AZURE_CLI_PYTHON")
+    if configured:
+        return configured
+    try:
+        with open(get_azure_cli_path(), "r", errors="replace") as f:
+            head = f.read(4096)
+    except OSError:
+        return sys.executable
+    match = _LAUNCHER_RE.search(head)
+    if match:
+        return match.group(1)
+    first_line = head.splitlines()[0] if head else ""
+    if first_line.startswith("#!") and "python" in first_line:
+        return first_line[2:].strip().split()[0]
+    return sys.executable
+
+
+class WorkerError(Exception):
+    """The worker died or timed out while running a command."""
+
+
+class WorkerUnavailable(WorkerError):
+    """No worker could take the command; it was not run."""
+
+
+class AzWorker:
+    """One az_worker.py process handling one command at a time."""
+
+    def __init__(self, python: str, script: str = WORKER_SCRIPT):
+        started = time.monotonic()
+        self.process = subprocess.Popen(
+            [python, script],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1,
+        )
+        try:
+            ready = self._read_line(WORKER_STARTUP_TIMEOUT)
+        except WorkerError as e:
+            raise WorkerUnavailable(str(e))
+        if not ready.get("ready"):
+            self.close()
+            raise WorkerUnavailable(ready.get("error") or "Azure CLI worker did not start")
+        self.startup_seconds = time.monotonic() - started
+
+    def _read_line(self, timeout: float) -> dict:
+        """Read one reply, killing the worker if none arrives in time."""
+        timer = threading.Timer(timeout, self.process.kill)
+        timer.start()
+        try:
+            line = self.process.stdout.readline()
+        finally:
+            timer.cancel()
+        if not line:
+            self.close()
+            raise WorkerError("Azure CLI worker exited" if self.process.poll() is not None else "no reply")
+        return json.loads(line)
+
+    def run(self, args: List[str], timeout: float) -> CliResult:
+        started = time.monotonic()
+        try:
+            self.process.stdin.write(json.dumps({"args": args}) + "\n")
+            self.process.stdin.flush()
+        except OSError as e:
+            self.close()
+            raise WorkerUnavailable(f"Azure CLI worker is gone: {e}")
+        reply = self._read_line(timeout)
+        return CliResult(reply["stdout"], reply["stderr"], int(reply["exit_code"]), time.monotonic() - started)
+
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def close(self) -> None:
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+
+
+class AzWorkerPool:
+    """Up to `size` warm workers, started on first use."""
+
+    def __init__(self, size: int = AZURE_CLI_WORKERS, python: Optional[str] = None, script: str = WORKER_SCRIPT):
+        self.size = max(1, size)
+        self.python = python
+        self.script = script
+        self._idle: List[AzWorker] = []
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._unavailable_until = 0.0
+        self._startup_samples: List[float] = []
+
+    @property
+    def startup_seconds(self) -> float:
+        """Mean measured worker startup, i.e. what a cold `az` run pays first."""
+        samples = self._startup_samples
+        return sum(samples) / len(samples) if samples else 0.0
+
+    def available(self) -> bool:
+        return time.monotonic() >= self._unavailable_until
+
+    def _checkout(self) -> AzWorker:
+        with self._lock:
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.alive():
+                    return worker
+        try:
+            worker = AzWorker(self.python or find_cli_python(), self.script)
+        except (OSError, WorkerUnavailable, ValueError) as e:
+            self._unavailable_until = time.monotonic() + WORKER_RETRY_SECONDS
+            logger.warning(f"Warm Azure CLI unavailable, spawning az per command: {e}")
+            raise WorkerUnavailable(str(e))
+        with self._lock:
+            self._startup_samples = (self._startup_samples + [worker.startup_seconds])[-20:]
+        logger.info(f"Started Azure CLI worker in {worker.startup_seconds:.2f}s")
+        return worker
+
+    def run(self, args: List[str], timeout: float) -> Optional[CliResult]:
+        """Run az args (without the leading 'az') on a warm worker.
+
+        Returns None when the command could not be handed to a worker, so
+        the caller spawns `az` instead. Once a command was sent it is never
+        retried (it may not be idempotent): a timeout kills the worker and
+        is reported with exit code -1 like a cold run, a crash with -5.
+        """
+        if not self.available():
+            return None
+        with self._slots:
+            started = time.monotonic()
+            try:
+                worker = self._checkout()
+                result = worker.run(args, timeout)
+            except WorkerUnavailable:
+                return None
+            except (WorkerError, ValueError) as e:
+                elapsed = time.monotonic() - started
+                if elapsed >= timeout:
+                    return CliResult("", f"Command timed out after {int(timeout)} seconds", -1, elapsed)
+                logger.error(f"Azure CLI worker failed while running a command: {e}")
+                return CliResult("", f"Azure CLI worker failed: {e}", -5, elapsed)
+            with self._lock:
+                self._idle.append(worker)
+            return result
+
+    def close(self) -> None:
+        with self._lock:
+            workers, self._idle = self._idle, []
+        for worker in workers:
+            worker.close()
+
+
+_pool: Optional[AzWorkerPool] = None
+_pool_lock = threading.Lock()
+_cache = CliResultCache()
+
+
+def get_cli_pool() -> AzWorkerPool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = AzWorkerPool()
+        return _pool
+
+
+def get_cli_cache() -> CliResultCache:
+    return _cache
+
+
+def close_cli_pool() -> None:
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close()
+
+
+atexit.register(close_cli_pool)
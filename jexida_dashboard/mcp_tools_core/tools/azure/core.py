@@ -13,7 +13,7 @@ from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, Field
 
 from .auth import (
-    get_credential_and_subscription,
+    get_management_client,
     get_azure_config,
     get_subscription_id,
     get_tenant_id,
@@ -22,6 +22,8 @@ from .auth import (
     AzureConfigError,
     wrap_azure_error,
 )
+from .token_cache import get_token_stats
+from .utils import run_blocking
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +46,10 @@ class AzureCoreGetConnectionInfoOutput(BaseModel):
     auth_method: str = Field(default="", description="Authentication method being used")
     is_valid: bool = Field(default=False, description="Whether configuration is valid")
     message: str = Field(default="", description="Configuration status message")
+    token_cache: Dict[str, Any] = Field(
+        default_factory=dict,
+        description="Token cache counters for this process (hits, fetches, fetch latency in seconds)"
+    )
     error: str = Field(default="", description="Error message if failed")
 
 
@@ -171,7 +177,8 @@ async def azure_core_get_connection_info(
 ) -> AzureCoreGetConnectionInfoOutput:
     """Get current Azure connection information.
     
-    Returns the active subscription ID, tenant ID, and authentication status.
+    Returns the active subscription ID, tenant ID, authentication status,
+    and token cache counters for this process.
     Does not include secrets.
     
     Returns:
@@ -197,6 +204,7 @@ async def azure_core_get_connection_info(
             auth_method=auth_method,
             is_valid=is_valid,
             message=message,
+            token_cache=get_token_stats(),
         )
         
     except Exception as e:
@@ -219,13 +227,11 @@ async def azure_core_list_subscriptions(
     
     try:
         from azure.mgmt.resource import SubscriptionClient
-        from .auth import get_azure_credential
         
-        credential = get_azure_credential()
-        client = SubscriptionClient(credential)
+        client = get_management_client(SubscriptionClient)
         
         subscriptions = []
-        for sub in client.subscriptions.list():
+        for sub in await run_blocking(lambda: list(client.subscriptions.list())):
             subscriptions.append(SubscriptionInfo(
                 subscription_id=sub.subscription_id,
                 display_name=sub.display_name,
@@ -272,11 +278,11 @@ async def azure_core_list_locations(
     try:
         from azure.mgmt.resource import SubscriptionClient
         
-        credential, subscription_id = get_credential_and_subscription(params.subscription_id)
-        client = SubscriptionClient(credential)
+        subscription_id = get_subscription_id(params.subscription_id)
+        client = get_management_client(SubscriptionClient)
         
         locations = []
-        for loc in client.subscriptions.list_locations(subscription_id):
+        for loc in await run_blocking(lambda: list(client.subscriptions.list_locations(subscription_id))):
             locations.append(LocationInfo(
                 name=loc.name,
                 display_name=loc.display_name or loc.name,
@@ -322,11 +328,11 @@ async def azure_core_list_resource_groups(
     try:
         from azure.mgmt.resource import ResourceManagementClient
         
-        credential, subscription_id = get_credential_and_subscription(params.subscription_id)
-        client = ResourceManagementClient(credential, subscription_id)
+        subscription_id = get_subscription_id(params.subscription_id)
+        client = get_management_client(ResourceManagementClient, subscription_id)
         
         resource_groups = []
-        for rg in client.resource_groups.list():
+        for rg in await run_blocking(lambda: list(client.resource_groups.list())):
             resource_groups.append(ResourceGroupInfo(
                 name=rg.name,
                 location=rg.location,
@@ -378,12 +384,12 @@ async def azure_core_create_resource_group(
         from azure.mgmt.resource import ResourceManagementClient
         from azure.mgmt.resource.resources.models import ResourceGroup
         
-        credential, subscription_id = get_credential_and_subscription(params.subscription_id)
-        client = ResourceManagementClient(credential, subscription_id)
+        subscription_id = get_subscription_id(params.subscription_id)
+        client = get_management_client(ResourceManagementClient, subscription_id)
         
         # Check if RG already exists
         try:
-            existing = client.resource_groups.get(params.name)
+            existing = await run_blocking(client.resource_groups.get, params.name)
             logger.info(f"Resource group {params.name} already exists")
             return AzureCoreCreateResourceGroupOutput(
                 success=True,
@@ -402,7 +408,7 @@ async def azure_core_create_resource_group(
             tags=params.tags,
         )
         
-        result = client.resource_groups.create_or_update(params.name, rg_params)
+        result = await run_blocking(client.resource_groups.create_or_update, params.name, rg_params)
         
         logger.info(f"Created resource group: {result.name}")
         
@@ -459,11 +465,11 @@ async def azure_core_delete_resource_group(
     try:
         from azure.mgmt.resource import ResourceManagementClient
         
-        credential, subscription_id = get_credential_and_subscription(params.subscription_id)
-        client = ResourceManagementClient(credential, subscription_id)
+        subscription_id = get_subscription_id(params.subscription_id)
+        client = get_management_client(ResourceManagementClient, subscription_id)
         
         # Start async delete operation
-        poller = client.resource_groups.begin_delete(params.name)
+        poller = await run_blocking(client.resource_groups.begin_delete, params.name)
         
         logger.info(f"Initiated deletion of resource group: {params.name}")
         
@@ -3,21 +3,28 @@
 Provides MCP tools for:
 - Getting cost summaries
 - Getting top cost drivers
+- Querying stored daily costs with grouping and time rollups
+
+Summaries and resource group / service breakdowns are answered from the
+local cost store (cost_store.py), which only fetches missing and recent
+days from Cost Management.
 """
 
 import logging
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from enum import Enum
 from typing import List, Optional, Dict, Any
 
 from pydantic import BaseModel, Field, field_validator
 
 from .auth import (
-    get_credential_and_subscription,
+    get_management_client,
+    get_subscription_id,
     AzureError,
     wrap_azure_error,
 )
-from .utils import validate_subscription_id
+from .cost_store import GROUP_BY_FIELDS, ROLLUPS, ensure_costs, limit_groups, query_costs
+from .utils import run_blocking, validate_subscription_id
 
 logger = logging.getLogger(__name__)
 
@@ -77,6 +84,7 @@ class AzureCostOutput(BaseModel):
         default=False,
         description="Indicates if this is mock/stub data"
     )
+    data_as_of: str = Field(default="", description="When the most recent days were last fetched from Azure")
     error: str = Field(default="", description="Error message if failed")
 
 
@@ -115,6 +123,60 @@ class AzureCostGetTopCostDriversOutput(BaseModel):
     scope: str = Field(default="", description="Scope queried")
     time_period: Dict[str, str] = Field(default_factory=dict, description="Time period queried")
     is_mock_data: bool = Field(default=False, description="Whether this is mock data")
+    data_as_of: str = Field(default="", description="When stored costs were last refreshed (empty for live queries)")
+    error: str = Field(default="", description="Error message if failed")
+
+
+class AzureCostQueryInput(BaseModel):
+    """Input schema for azure_cost_query."""
+    subscription_id: Optional[str] = Field(
+        default=None,
+        description="Subscription ID (uses default if not provided)"
+    )
+    from_date: Optional[str] = Field(
+        default=None,
+        description="First day (YYYY-MM-DD, default 30 days ago)"
+    )
+    to_date: Optional[str] = Field(
+        default=None,
+        description="Last day (YYYY-MM-DD, default today)"
+    )
+    resource_group: Optional[str] = Field(
+        default=None,
+        description="Only costs in this resource group"
+    )
+    group_by: str = Field(
+        default="resource_group",
+        description="Grouping: resource_group, service, or none"
+    )
+    rollup: str = Field(
+        default="none",
+        description="Time rollup: none, day, week, or month"
+    )
+    top_n: int = Field(
+        default=0,
+        description="Keep the top N groups and fold the rest into 'Other' (0 = all)"
+    )
+
+
+class CostRow(BaseModel):
+    """Cost of one group in one period."""
+    period: str = Field(default="", description="Period start (YYYY-MM-DD), empty without rollup")
+    name: str = Field(description="Group name")
+    cost: float = Field(description="Cost amount")
+
+
+class AzureCostQueryOutput(BaseModel):
+    """Output schema for azure_cost_query."""
+    success: bool = Field(description="Whether the request succeeded")
+    subscription_id: str = Field(default="", description="Subscription queried")
+    from_date: str = Field(default="", description="First day")
+    to_date: str = Field(default="", description="Last day")
+    total_cost: float = Field(default=0.0, description="Total cost for the window")
+    currency: str = Field(default="USD", description="Currency code")
+    rows: List[CostRow] = Field(default_factory=list, description="Costs by period and group")
+    data_as_of: str = Field(default="", description="When the most recent days were last fetched from Azure")
+    stale: bool = Field(default=False, description="Whether a refresh failed and stored data was used")
     error: str = Field(default="", description="Error message if failed")
 
 
@@ -194,7 +256,8 @@ def _generate_mock_cost_data(
 async def azure_cost_get_summary(params: AzureCostInput) -> AzureCostOutput:
     """Get Azure cost summary.
 
-    Uses Azure Cost Management API to retrieve cost data.
+    Answered from the local cost store, which fetches only missing and
+    recent days from the Cost Management API.
     Falls back to mock data if API is not available.
 
     Args:
@@ -209,67 +272,27 @@ async def azure_cost_get_summary(params: AzureCostInput) -> AzureCostOutput:
     )
 
     try:
-        from azure.mgmt.costmanagement import CostManagementClient
-        from azure.mgmt.costmanagement.models import (
-            QueryDefinition,
-            QueryDataset,
-            QueryAggregation,
-            QueryGrouping,
-            QueryTimePeriod,
-            ExportType,
-            TimeframeType,
-        )
-        
-        credential, subscription_id = get_credential_and_subscription(params.subscription_id)
-        client = CostManagementClient(credential)
-        
-        # Build scope
-        if params.resource_group:
-            scope = f"/subscriptions/{subscription_id}/resourceGroups/{params.resource_group}"
-            grouping = [QueryGrouping(type="Dimension", name="ServiceName")]
-        else:
-            scope = f"/subscriptions/{subscription_id}"
-            grouping = [QueryGrouping(type="Dimension", name="ResourceGroup")]
+        subscription_id = get_subscription_id(params.subscription_id)
         
         # Get date range
         from_date, to_date = _get_time_period_dates(params.time_period)
+        from_day, to_day = date.fromisoformat(from_date), date.fromisoformat(to_date)
         
-        # Build query
-        query = QueryDefinition(
-            type=ExportType.ACTUAL_COST,
-            timeframe=TimeframeType.CUSTOM,
-            time_period=QueryTimePeriod(
-                from_property=datetime.fromisoformat(from_date),
-                to=datetime.fromisoformat(to_date),
-            ),
-            dataset=QueryDataset(
-                granularity="None",
-                aggregation={
-                    "totalCost": QueryAggregation(name="Cost", function="Sum")
-                },
-                grouping=grouping,
-            ),
+        # Fetch what the store is missing, then answer locally
+        sync = await ensure_costs(subscription_id, from_day, to_day)
+        rows, currency = await query_costs(
+            subscription_id,
+            from_day,
+            to_day,
+            resource_group=params.resource_group,
+            group_by="service" if params.resource_group else "resource_group",
         )
         
-        # Execute query
-        result = client.query.usage(scope, query)
-        
-        # Parse results
-        breakdown = []
-        total_cost = 0.0
-        currency = "USD"
-        
-        if result.rows:
-            for row in result.rows:
-                # Row format: [cost, name, currency]
-                if len(row) >= 2:
-                    cost = float(row[0]) if row[0] else 0.0
-                    name = str(row[1]) if len(row) > 1 else "Unknown"
-                    if len(row) > 2:
-                        currency = str(row[2])
-                    
-                    breakdown.append(CostBreakdownItem(name=name, cost=round(cost, 2)))
-                    total_cost += cost
+        breakdown = [
+            CostBreakdownItem(name=row["name"] or "Unknown", cost=round(row["cost"], 2))
+            for row in rows
+        ]
+        total_cost = sum(row["cost"] for row in rows)
         
         # Sort by cost descending
         breakdown.sort(key=lambda x: x.cost, reverse=True)
@@ -283,6 +306,7 @@ async def azure_cost_get_summary(params: AzureCostInput) -> AzureCostOutput:
             breakdown=breakdown,
             time_period=params.time_period.value,
             is_mock_data=False,
+            data_as_of=sync["refreshed_at"],
         )
         
     except ImportError:
@@ -313,11 +337,88 @@ async def azure_cost_get_summary(params: AzureCostInput) -> AzureCostOutput:
         )
 
 
+# Cost driver groupings the local store can answer; others query Azure directly
+STORED_GROUPINGS = {
+    "ResourceGroup": "resource_group",
+    "ServiceName": "service",
+}
+
+
+def _parse_cost_scope(scope: str) -> tuple:
+    """Extract (subscription_id, resource_group) from a cost scope."""
+    scope_parts = scope.strip("/").split("/")
+    subscription_id = None
+    resource_group = None
+    for i, part in enumerate(scope_parts):
+        if i + 1 >= len(scope_parts):
+            break
+        if part.lower() == "subscriptions":
+            subscription_id = scope_parts[i + 1]
+        elif part.lower() == "resourcegroups":
+            resource_group = scope_parts[i + 1]
+    return subscription_id, resource_group
+
+
+async def _query_cost_drivers_live(scope: str, from_date: datetime, to_date: datetime, dimension: str) -> tuple:
+    """Query Cost Management directly for one grouping dimension.
+
+    Returns:
+        (list of (name, cost), currency)
+    """
+    from azure.mgmt.costmanagement import CostManagementClient
+    from azure.mgmt.costmanagement.models import (
+        QueryDefinition,
+        QueryDataset,
+        QueryAggregation,
+        QueryGrouping,
+        QueryTimePeriod,
+        ExportType,
+        TimeframeType,
+    )
+    
+    client = get_management_client(CostManagementClient)
+    
+    # Build query
+    query = QueryDefinition(
+        type=ExportType.ACTUAL_COST,
+        timeframe=TimeframeType.CUSTOM,
+        time_period=QueryTimePeriod(
+            from_property=from_date,
+            to=to_date,
+        ),
+        dataset=QueryDataset(
+            granularity="None",
+            aggregation={
+                "totalCost": QueryAggregation(name="Cost", function="Sum")
+            },
+            grouping=[QueryGrouping(type="Dimension", name=dimension)],
+        ),
+    )
+    
+    # Execute query
+    result = await run_blocking(client.query.usage, scope, query)
+    
+    # Parse results
+    totals = []
+    currency = "USD"
+    for row in result.rows or []:
+        if len(row) >= 2:
+            cost = float(row[0]) if row[0] else 0.0
+            name = str(row[1]) if len(row) > 1 else "Unknown"
+            if len(row) > 2:
+                currency = str(row[2])
+            totals.append((name, cost))
+    return totals, currency
+
+
 async def azure_cost_get_top_cost_drivers(
     params: AzureCostGetTopCostDriversInput
 ) -> AzureCostGetTopCostDriversOutput:
     """Get top cost drivers for a scope.
 
+    ResourceGroup and ServiceName groupings are answered from the local
+    cost store; ResourceType and ResourceId query Cost Management directly.
+
     Args:
         params.scope: Cost scope (subscription or resource group)
         params.time_period: Time period with from/to dates
@@ -330,24 +431,8 @@ async def azure_cost_get_top_cost_drivers(
     logger.info(f"Getting top {params.top_n} cost drivers for scope: {params.scope}")
     
     try:
-        from azure.mgmt.costmanagement import CostManagementClient
-        from azure.mgmt.costmanagement.models import (
-            QueryDefinition,
-            QueryDataset,
-            QueryAggregation,
-            QueryGrouping,
-            QueryTimePeriod,
-            ExportType,
-            TimeframeType,
-        )
-        
         # Extract subscription from scope
-        scope_parts = params.scope.strip("/").split("/")
-        subscription_id = None
-        for i, part in enumerate(scope_parts):
-            if part.lower() == "subscriptions" and i + 1 < len(scope_parts):
-                subscription_id = scope_parts[i + 1]
-                break
+        subscription_id, resource_group = _parse_cost_scope(params.scope)
         
         if not subscription_id:
             return AzureCostGetTopCostDriversOutput(
@@ -356,61 +441,31 @@ async def azure_cost_get_top_cost_drivers(
                 error="Could not extract subscription ID from scope",
             )
         
-        credential, _ = get_credential_and_subscription(subscription_id)
-        client = CostManagementClient(credential)
-        
         # Parse dates
         from_date = datetime.fromisoformat(params.time_period.get("from", ""))
         to_date = datetime.fromisoformat(params.time_period.get("to", ""))
         
-        # Map group_by to dimension name
-        dimension_map = {
-            "ResourceGroup": "ResourceGroup",
-            "ServiceName": "ServiceName",
-            "ResourceType": "ResourceType",
-            "ResourceId": "ResourceId",
-        }
-        dimension = dimension_map.get(params.group_by, "ResourceGroup")
-        
-        # Build query
-        query = QueryDefinition(
-            type=ExportType.ACTUAL_COST,
-            timeframe=TimeframeType.CUSTOM,
-            time_period=QueryTimePeriod(
-                from_property=from_date,
-                to=to_date,
-            ),
-            dataset=QueryDataset(
-                granularity="None",
-                aggregation={
-                    "totalCost": QueryAggregation(name="Cost", function="Sum")
-                },
-                grouping=[QueryGrouping(type="Dimension", name=dimension)],
-            ),
-        )
-        
-        # Execute query
-        result = client.query.usage(params.scope, query)
-        
-        # Parse results
-        cost_drivers = []
-        total_cost = 0.0
-        currency = "USD"
+        data_as_of = ""
+        if params.group_by in STORED_GROUPINGS:
+            sync = await ensure_costs(subscription_id, from_date.date(), to_date.date())
+            rows, currency = await query_costs(
+                subscription_id,
+                from_date.date(),
+                to_date.date(),
+                resource_group=resource_group,
+                group_by=STORED_GROUPINGS[params.group_by],
+            )
+            totals = [(row["name"] or "Unknown", row["cost"]) for row in rows]
+            data_as_of = sync["refreshed_at"]
+        else:
+            dimension = params.group_by if params.group_by in ("ResourceType", "ResourceId") else "ResourceGroup"
+            totals, currency = await _query_cost_drivers_live(params.scope, from_date, to_date, dimension)
         
-        if result.rows:
-            for row in result.rows:
-                if len(row) >= 2:
-                    cost = float(row[0]) if row[0] else 0.0
-                    name = str(row[1]) if len(row) > 1 else "Unknown"
-                    if len(row) > 2:
-                        currency = str(row[2])
-                    
-                    cost_drivers.append(CostDriver(
-                        name=name,
-                        cost=round(cost, 2),
-                        currency=currency,
-                    ))
-                    total_cost += cost
+        total_cost = sum(cost for _, cost in totals)
+        cost_drivers = [
+            CostDriver(name=name, cost=round(cost, 2), currency=currency)
+            for name, cost in totals
+        ]
         
         # Sort by cost descending and take top N
         cost_drivers.sort(key=lambda x: x.cost, reverse=True)
@@ -431,6 +486,7 @@ async def azure_cost_get_top_cost_drivers(
             scope=params.scope,
             time_period=params.time_period,
             is_mock_data=False,
+            data_as_of=data_as_of,
         )
         
     except ImportError:
@@ -468,3 +524,77 @@ async def azure_cost_get_top_cost_drivers(
             time_period=params.time_period,
             error=wrapped.message,
         )
+
+
+async def azure_cost_query(params: AzureCostQueryInput) -> AzureCostQueryOutput:
+    """Query stored daily costs with grouping and time rollups.
+
+    Missing and recent days are fetched first; everything else is
+    answered from the local cost store.
+
+    Args:
+        params.subscription_id: Subscription ID
+        params.from_date: First day (default 30 days ago)
+        params.to_date: Last day (default today)
+        params.resource_group: Optional resource group filter
+        params.group_by: resource_group, service, or none
+        params.rollup: none, day, week, or month
+        params.top_n: Keep the top N groups (0 = all)
+
+    Returns:
+        Costs by period and group
+    """
+    logger.info(f"Querying costs: group_by={params.group_by}, rollup={params.rollup}")
+    
+    if params.group_by not in GROUP_BY_FIELDS:
+        return AzureCostQueryOutput(
+            success=False,
+            error=f"group_by must be one of: {', '.join(GROUP_BY_FIELDS)}",
+        )
+    if params.rollup not in ROLLUPS:
+        return AzureCostQueryOutput(
+            success=False,
+            error=f"rollup must be one of: {', '.join(ROLLUPS)}",
+        )
+    
+    try:
+        subscription_id = get_subscription_id(params.subscription_id)
+        to_day = date.fromisoformat(params.to_date) if params.to_date else datetime.now().date()
+        from_day = date.fromisoformat(params.from_date) if params.from_date else to_day - timedelta(days=30)
+        if from_day > to_day:
+            return AzureCostQueryOutput(success=False, error="from_date must not be after to_date")
+        
+        sync = await ensure_costs(subscription_id, from_day, to_day)
+        rows, currency = await query_costs(
+            subscription_id,
+            from_day,
+            to_day,
+            resource_group=params.resource_group,
+            group_by=params.group_by,
+            rollup=params.rollup,
+        )
+        
+        return AzureCostQueryOutput(
+            success=True,
+            subscription_id=subscription_id,
+            from_date=from_day.isoformat(),
+            to_date=to_day.isoformat(),
+            total_cost=round(sum(row["cost"] for row in rows), 2),
+            currency=currency,
+            rows=[
+                CostRow(period=row["period"], name=row["name"], cost=round(row["cost"], 2))
+                for row in limit_groups(rows, params.top_n)
+            ],
+            data_as_of=sync["refreshed_at"],
+            stale=sync["stale"],
+        )
+        
+    except ValueError as e:
+        return AzureCostQueryOutput(success=False, error=str(e))
+    except AzureError as e:
+        logger.error(f"Azure error querying costs: {e}")
+        return AzureCostQueryOutput(success=False, error=str(e))
+    except Exception as e:
+        logger.error(f"Failed to query costs: {e}")
+        wrapped = wrap_azure_error(e)
+        return AzureCostQueryOutput(success=False, error=wrapped.message)
@@ -0,0 +1,466 @@
+"""Local store of Azure daily costs.
+
+Cost Management queries are slow (seconds) and heavily throttled, so the
+cost tools answer from a local table of daily costs per (subscription,
+resource group, service, day) instead of querying the whole window on
+every call. ensure_costs() fetches only what the store is missing:
+- Days outside the subscription's covered range (backfill and new days);
+  backfill is fetched newest-first, next to the covered range, and the
+  range only grows by chunks that touch it, so a failed chunk never
+  leaves an unfetched hole inside the coverage
+- The last AZURE_COST_REVISION_DAYS days, which Azure still revises,
+  once they were fetched more than AZURE_COST_REFRESH_SECONDS ago
+query_costs() then groups and rolls up the stored rows locally.
+
+Usage:
+    await ensure_costs(sub_id, date(2024, 11, 1), date(2024, 11, 30))
+    rows, currency = await query_costs(sub_id, date(2024, 11, 1), date(2024, 11, 30), group_by="service")
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from asgiref.sync import sync_to_async
+
+from .auth import get_management_client
+from .utils import run_blocking
+
+logger = logging.getLogger(__name__)
+
+
+COST_REVISION_DAYS = int(os.environ.get("AZURE_COST_REVISION_DAYS", "3"))
+COST_REFRESH_SECONDS = int(os.environ.get("AZURE_COST_REFRESH_SECONDS", str(6 * 3600)))
+
+# Days per Cost Management query; ranges are split further if a result is paged
+FETCH_CHUNK_DAYS = 14
+
+GROUP_BY_FIELDS = {
+    "resource_group": "resource_group",
+    "service": "service_name",
+    "none": None,
+}
+ROLLUPS = ("none", "day", "week", "month")
+
+COST_COLUMNS = ("Cost", "PreTaxCost", "CostUSD", "totalCost")
+RESOURCE_GROUP_COLUMNS = ("ResourceGroup", "ResourceGroupName")
+
+
+@dataclass
+class Coverage:
+    """Contiguous range of stored days for a subscription."""
+    first_day: date
+    last_day: date
+    refreshed_at: datetime
+
+    def covers(self, from_day: date, to_day: date) -> bool:
+        return self.first_day <= from_day and to_day <= self.last_day
+
+
+def utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+# =============================================================================
+# Fetch planning and parsing
+# =============================================================================
+
+def _merge_ranges(ranges: List[Tuple[date, date]]) -> List[Tuple[date, date]]:
+    merged: List[Tuple[date, date]] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def extend_coverage(first_day: date, last_day: date, start: date, end: date) -> Tuple[date, date]:
+    """Covered range after storing [start, end]; unchanged unless the chunk touches it."""
+    if start > last_day + timedelta(days=1) or end < first_day - timedelta(days=1):
+        return first_day, last_day
+    return min(first_day, start), max(last_day, end)
+
+
+def _chunk_range(start: date, end: date, days: int) -> List[Tuple[date, date]]:
+    chunks = []
+    while start <= end:
+        chunk_end = min(end, start + timedelta(days=days - 1))
+        chunks.append((start, chunk_end))
+        start = chunk_end + timedelta(days=1)
+    return chunks
+
+
+def plan_fetch(
+    from_day: date,
+    to_day: date,
+    coverage: Optional[Coverage],
+    today: date,
+    now: datetime,
+) -> List[Tuple[date, date]]:
+    """Date ranges to fetch so the store can answer [from_day, to_day].
+
+    Gaps between the window and the covered range are fetched too, so
+    coverage stays contiguous. Recent days are re-fetched when stale.
+    Days before the covered range come first, newest chunk first, so
+    every chunk is adjacent to what is stored when it arrives.
+
+    Returns:
+        Inclusive (start, end) ranges of at most FETCH_CHUNK_DAYS days
+    """
+    to_day = min(to_day, today)
+    if from_day > to_day:
+        return []
+
+    backfill: List[Tuple[date, date]] = []
+    if coverage is None:
+        ranges = [(from_day, to_day)]
+    else:
+        ranges = []
+        if from_day < coverage.first_day:
+            backfill = _chunk_range(from_day, coverage.first_day - timedelta(days=1), FETCH_CHUNK_DAYS)[::-1]
+        if to_day > coverage.last_day:
+            ranges.append((coverage.last_day + timedelta(days=1), to_day))
+
+        revision_start = max(today - timedelta(days=COST_REVISION_DAYS), coverage.first_day)
+        stale = (now - coverage.refreshed_at).total_seconds() >= COST_REFRESH_SECONDS
+        if stale and to_day >= revision_start and revision_start <= coverage.last_day:
+            ranges.append((revision_start, coverage.last_day))
+
+    chunks = backfill
+    for start, end in _merge_ranges(ranges):
+        chunks.extend(_chunk_range(start, end, FETCH_CHUNK_DAYS))
+    return chunks
+
+
+def _parse_usage_date(value: Any) -> Optional[date]:
+    """UsageDate comes back as 20241101 (int) or '2024-11-01T00:00:00'."""
+    if value is None:
+        return None
+    text = str(value)
+    try:
+        if text.isdigit() and len(text) == 8:
+            return date(int(text[:4]), int(text[4:6]), int(text[6:]))
+        return date.fromisoformat(text[:10])
+    except ValueError:
+        return None
+
+
+def parse_cost_rows(columns: Sequence[str], rows: Sequence[Sequence[Any]]) -> List[Dict[str, Any]]:
+    """Turn a daily, RG x service grouped query result into store rows.
+
+    Args:
+        columns: Result column names
+        rows: Result rows
+
+    Returns:
+        Dicts with resource_group, service_name, day, cost, currency;
+        duplicate keys (e.g. resource group case variants) are summed
+    """
+    index = {name: i for i, name in enumerate(columns)}
+
+    def column(*names: str) -> Optional[int]:
+        return next((index[n] for n in names if n in index), None)
+
+    cost_i = column(*COST_COLUMNS)
+    day_i = column("UsageDate")
+    rg_i = column(*RESOURCE_GROUP_COLUMNS)
+    service_i = column("ServiceName")
+    currency_i = column("Currency")
+    if cost_i is None or day_i is None:
+        raise ValueError(f"Unexpected cost query columns: {list(columns)}")
+
+    merged: Dict[Tuple[str, str, date], Dict[str, Any]] = {}
+    for row in rows:
+        day = _parse_usage_date(row[day_i])
+        if day is None:
+            continue
+        resource_group = str(row[rg_i] or "").lower() if rg_i is not None else ""
+        service_name = str(row[service_i] or "") if service_i is not None else ""
+        key = (resource_group, service_name, day)
+        entry = merged.setdefault(key, {
+            "resource_group": resource_group,
+            "service_name": service_name,
+            "day": day,
+            "cost": 0.0,
+            "currency": str(row[currency_i]) if currency_i is not None and row[currency_i] else "USD",
+        })
+        entry["cost"] += float(row[cost_i] or 0.0)
+    return list(merged.values())
+
+
+def _fetch_daily_costs(subscription_id: str, start: date, end: date) -> List[Dict[str, Any]]:
+    """Blocking: daily costs per resource group and service for [start, end]."""
+    from azure.mgmt.costmanagement import CostManagementClient
+    from azure.mgmt.costmanagement.models import (
+        QueryDefinition,
+        QueryDataset,
+        QueryAggregation,
+        QueryGrouping,
+        QueryTimePeriod,
+        ExportType,
+        TimeframeType,
+    )
+
+    client = get_management_client(CostManagementClient)
+    query = QueryDefinition(
+        type=ExportType.ACTUAL_COST,
+        timeframe=TimeframeType.CUSTOM,
+        time_period=QueryTimePeriod(
+            from_property=datetime.combine(start, time.min),
+            to=datetime.combine(end, time(23, 59, 59)),
+        ),
+        dataset=QueryDataset(
+            granularity="Daily",
+            aggregation={
+                "totalCost": QueryAggregation(name="Cost", function="Sum")
+            },
+            grouping=[
+                QueryGrouping(type="Dimension", name="ResourceGroup"),
+                QueryGrouping(type="Dimension", name="ServiceName"),
+            ],
+        ),
+    )
+    result = client.query.usage(f"/subscriptions/{subscription_id}", query)
+
+    if getattr(result, "next_link", None) and start < end:
+        # Paged result: fetch the halves separately rather than follow the link
+        middle = start + (end - start) // 2
+        return (
+            _fetch_daily_costs(subscription_id, start, middle)
+            + _fetch_daily_costs(subscription_id, middle + timedelta(days=1), end)
+        )
+    if getattr(result, "next_link", None):
+        logger.warning(f"Cost query for {subscription_id} on {start} was truncated")
+
+    columns = [c.name for c in (result.columns or [])]
+    return parse_cost_rows(columns, result.rows or [])
+
+
+# =============================================================================
+# Persistence
+# =============================================================================
+
+class CostStore:
+    """ORM access to the cost tables (synchronous; wrap with sync_to_async)."""
+
+    def coverage(self, subscription_id: str) -> Optional[Coverage]:
+        from mcp_tools_core.models import AzureCostCoverage
+
+        row = AzureCostCoverage.objects.filter(subscription_id=subscription_id).first()
+        if row is None:
+            return None
+        return Coverage(row.first_day, row.last_day, row.refreshed_at)
+
+    def replace(
+        self,
+        subscription_id: str,
+        start: date,
+        end: date,
+        rows: List[Dict[str, Any]],
+        refreshed: bool,
+    ) -> None:
+        """Replace the stored days [start, end] and extend the coverage if they touch it."""
+        from django.db import transaction
+        from django.utils import timezone as dj_timezone
+        from mcp_tools_core.models import AzureCostCoverage, AzureCostDaily
+
+        with transaction.atomic():
+            AzureCostDaily.objects.filter(
+                subscription_id=subscription_id, day__gte=start, day__lte=end,
+            ).delete()
+            AzureCostDaily.objects.bulk_create([
+                AzureCostDaily(subscription_id=subscription_id, **row) for row in rows
+            ])
+
+            coverage = AzureCostCoverage.objects.select_for_update().filter(subscription_id=subscription_id).first()
+            if coverage is None:
+                AzureCostCoverage.objects.create(
+                    subscription_id=subscription_id,
+                    first_day=start,
+                    last_day=end,
+                    refreshed_at=dj_timezone.now(),
+                )
+                return
+            coverage.first_day, coverage.last_day = extend_coverage(
+                coverage.first_day, coverage.last_day, start, end,
+            )
+            if refreshed:
+                coverage.refreshed_at = dj_timezone.now()
+            coverage.save()
+
+    def query(
+        self,
+        subscription_id: str,
+        from_day: date,
+        to_day: date,
+        resource_group: Optional[str] = None,
+        group_by: str = "resource_group",
+        rollup: str = "none",
+    ) -> Tuple[List[Dict[str, Any]], str]:
+        """Costs grouped by group_by and rolled up by period.
+
+        Returns:
+            (rows of {period, name, cost} sorted by period then cost, currency)
+        """
+        from django.db.models import Sum
+        from django.db.models.functions import TruncMonth, TruncWeek
+        from mcp_tools_core.models import AzureCostDaily
+
+        if group_by not in GROUP_BY_FIELDS:
+            raise ValueError(f"group_by must be one of: {', '.join(GROUP_BY_FIELDS)}")
+        if rollup not in ROLLUPS:
+            raise ValueError(f"rollup must be one of: {', '.join(ROLLUPS)}")
+
+        qs = AzureCostDaily.objects.filter(subscription_id=subscription_id, day__gte=from_day, day__lte=to_day)
+        if resource_group:
+            qs = qs.filter(resource_group=resource_group.lower())
+
+        fields = []
+        if rollup == "day":
+            fields.append("day")
+        elif rollup in ("week", "month"):
+            qs = qs.annotate(period=TruncWeek("day") if rollup == "week" else TruncMonth("day"))
+            fields.append("period")
+        group_field = GROUP_BY_FIELDS[group_by]
+        if group_field:
+            fields.append(group_field)
+
+        rows = []
+        for row in qs.values(*fields).annotate(cost=Sum("cost")):
+            period = row.get("day") or row.get("period")
+            rows.append({
+                "period": str(period)[:10] if period else "",
+                "name": row[group_field] if group_field else "total",
+                "cost": row["cost"] or 0.0,
+            })
+        rows.sort(key=lambda r: (r["period"], -r["cost"]))
+
+        currency = qs.values_list("currency", flat=True).first() or "USD"
+        return rows, currency
+
+    def overview(self, subscription_id: str, days: int = 30, top_n: int = 5) -> Optional[Dict[str, Any]]:
+        """Totals for the dashboard: top resource groups and daily totals over the last days."""
+        coverage = self.coverage(subscription_id)
+        if coverage is None:
+            return None
+
+        to_day = min(coverage.last_day, utc_today())
+        from_day = to_day - timedelta(days=days - 1)
+        by_group, currency = self.query(subscription_id, from_day, to_day, group_by="resource_group")
+        daily, _ = self.query(subscription_id, from_day, to_day, group_by="none", rollup="day")
+
+        total = sum(r["cost"] for r in by_group)
+        by_group.sort(key=lambda r: -r["cost"])
+        peak = max((r["cost"] for r in daily), default=0.0)
+        return {
+            "total": round(total, 2),
+            "currency": currency,
+            "from_day": from_day,
+            "to_day": to_day,
+            "refreshed_at": coverage.refreshed_at,
+            "top_resource_groups": [
+                {
+                    "name": r["name"] or "(no resource group)",
+                    "cost": round(r["cost"], 2),
+                    "percentage": round(r["cost"] / total * 100, 1) if total else 0.0,
+                }
+                for r in by_group[:top_n]
+            ],
+            "daily": [
+                {"day": r["period"], "cost": round(r["cost"], 2), "height": round(r["cost"] / peak * 100) if peak else 0}
+                for r in daily
+            ],
+        }
+
+
+# =============================================================================
+# Public API
+# =============================================================================
+
+def limit_groups(rows: List[Dict[str, Any]], top_n: int) -> List[Dict[str, Any]]:
+    """Keep the top_n groups by total cost; fold the rest into 'Other' per period."""
+    if top_n <= 0:
+        return rows
+    totals: Dict[str, float] = {}
+    for row in rows:
+        totals[row["name"]] = totals.get(row["name"], 0.0) + row["cost"]
+    keep = set(sorted(totals, key=lambda name: -totals[name])[:top_n])
+    if len(keep) == len(totals):
+        return rows
+
+    limited = [row for row in rows if row["name"] in keep]
+    other: Dict[str, float] = {}
+    for row in rows:
+        if row["name"] not in keep:
+            other[row["period"]] = other.get(row["period"], 0.0) + row["cost"]
+    limited.extend({"period": period, "name": "Other", "cost": cost} for period, cost in other.items())
+    limited.sort(key=lambda r: (r["period"], r["name"] == "Other", -r["cost"]))
+    return limited
+
+
+async def ensure_costs(
+    subscription_id: str,
+    from_day: date,
+    to_day: date,
+    store: Optional[CostStore] = None,
+    fetch: Callable[[str, date, date], List[Dict[str, Any]]] = _fetch_daily_costs,
+) -> Dict[str, Any]:
+    """Make the store able to answer [from_day, to_day] for a subscription.
+
+    Fetches only missing days and stale recent days. If a fetch fails but
+    the window is already stored, the stored (possibly stale) data is used.
+
+    Returns:
+        {"fetched_ranges": int, "fetched_rows": int, "stale": bool, "refreshed_at": str}
+
+    Raises:
+        Exception: The fetch error, if the window cannot be answered locally
+    """
+    store = store or CostStore()
+    today = utc_today()
+    coverage = await sync_to_async(store.coverage)(subscription_id)
+    ranges = plan_fetch(from_day, to_day, coverage, today, datetime.now(timezone.utc))
+
+    fetched_rows = 0
+    stale = False
+    for start, end in ranges:
+        try:
+            rows = await run_blocking(fetch, subscription_id, start, end)
+        except Exception as e:
+            coverage = await sync_to_async(store.coverage)(subscription_id)
+            if coverage is None or not coverage.covers(from_day, min(to_day, today)):
+                raise
+            logger.warning(f"Cost refresh for {subscription_id} failed, serving stored data: {e}")
+            stale = True
+            break
+        revised = end >= today - timedelta(days=COST_REVISION_DAYS)
+        await sync_to_async(store.replace)(subscription_id, start, end, rows, revised)
+        fetched_rows += len(rows)
+
+    if ranges:
+        logger.info(f"Fetched {fetched_rows} cost rows for {subscription_id} in {len(ranges)} range(s)")
+        coverage = await sync_to_async(store.coverage)(subscription_id)
+
+    return {
+        "fetched_ranges": len(ranges),
+        "fetched_rows": fetched_rows,
+        "stale": stale,
+        "refreshed_at": coverage.refreshed_at.isoformat() if coverage else "",
+    }
+
+
+async def query_costs(
+    subscription_id: str,
+    from_day: date,
+    to_day: date,
+    resource_group: Optional[str] = None,
+    group_by: str = "resource_group",
+    rollup: str = "none",
+    store: Optional[CostStore] = None,
+) -> Tuple[List[Dict[str, Any]], str]:
+    """Grouped and rolled-up costs from the store (see CostStore.query)."""
+    store = store or CostStore()
+    return await sync_to_async(store.query)(subscription_id, from_day, to_day, resource_group, group_by, rollup)
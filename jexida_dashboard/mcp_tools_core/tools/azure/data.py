@@ -13,10 +13,12 @@ from typing import Optional, Dict, Any
 from pydantic import BaseModel, Field
 
 from .auth import (
-    get_credential_and_subscription,
+    get_management_client,
+    get_subscription_id,
     AzureError,
     wrap_azure_error,
 )
+from .utils import run_blocking
 
 logger = logging.getLogger(__name__)
 
@@ -257,8 +259,8 @@ async def azure_data_create_storage_account(
             AccessTier,
         )
         
-        credential, subscription_id = get_credential_and_subscription(params.subscription_id)
-        client = StorageManagementClient(credential, subscription_id)
+        subscription_id = get_subscription_id(params.subscription_id)
+        client = get_management_client(StorageManagementClient, subscription_id)
         
         # Build parameters
         sku = Sku(name=params.sku)
@@ -275,12 +277,13 @@ async def azure_data_create_storage_account(
             create_params.access_tier = getattr(AccessTier, params.access_tier.upper(), AccessTier.HOT)
         
         # Create storage account
-        poller = client.storage_accounts.begin_create(
+        poller = await run_blocking(
+            client.storage_accounts.begin_create,
             params.resource_group,
             params.name,
             create_params,
         )
-        result = poller.result()
+        result = await run_blocking(poller.result)
         
         # Get primary endpoint
         primary_endpoint = ""
@@ -337,8 +340,8 @@ async def azure_data_create_blob_container(
         from azure.mgmt.storage import StorageManagementClient
         from azure.mgmt.storage.models import BlobContainer, PublicAccess
         
-        credential, subscription_id = get_credential_and_subscription(params.subscription_id)
-        client = StorageManagementClient(credential, subscription_id)
+        subscription_id = get_subscription_id(params.subscription_id)
+        client = get_management_client(StorageManagementClient, subscription_id)
         
         # Map public access level
         public_access_map = {
@@ -354,7 +357,8 @@ async def azure_data_create_blob_container(
         # Create container
         container = BlobContainer(public_access=public_access)
         
-        result = client.blob_containers.create(
+        result = await run_blocking(
+            client.blob_containers.create,
             params.resource_group,
             params.account_name,
             params.container_name,
@@ -426,8 +430,8 @@ async def azure_data_create_sql_server(
                 error=str(e),
             )
         
-        credential, subscription_id = get_credential_and_subscription(params.subscription_id)
-        client = SqlManagementClient(credential, subscription_id)
+        subscription_id = get_subscription_id(params.subscription_id)
+        client = get_management_client(SqlManagementClient, subscription_id)
         
         # Build server parameters
         server = Server(
@@ -439,12 +443,13 @@ async def azure_data_create_sql_server(
         )
         
         # Create server
-        poller = client.servers.begin_create_or_update(
+        poller = await run_blocking(
+            client.servers.begin_create_or_update,
             params.resource_group,
             params.name,
             server,
         )
-        result = poller.result()
+        result = await run_blocking(poller.result)
         
         logger.info(f"Created SQL server: {result.name}")
         
@@ -498,11 +503,11 @@ async def azure_data_create_sql_database(
         from azure.mgmt.sql import SqlManagementClient
         from azure.mgmt.sql.models import Database, Sku
         
-        credential, subscription_id = get_credential_and_subscription(params.subscription_id)
-        client = SqlManagementClient(credential, subscription_id)
+        subscription_id = get_subscription_id(params.subscription_id)
+        client = get_management_client(SqlManagementClient, subscription_id)
         
         # Get server location
-        server = client.servers.get(params.resource_group, params.server_name)
+        server = await run_blocking(client.servers.get, params.resource_group, params.server_name)
         
         # Build database parameters
         database = Database(
@@ -515,13 +520,14 @@ async def azure_data_create_sql_database(
             database.max_size_bytes = params.max_size_bytes
         
         # Create database
-        poller = client.databases.begin_create_or_update(
+        poller = await run_blocking(
+            client.databases.begin_create_or_update,
             params.resource_group,
             params.server_name,
             params.database_name,
             database,
         )
-        result = poller.result()
+        result = await run_blocking(poller.result)
         
         logger.info(f"Created SQL database: {result.name}")
         
@@ -573,8 +579,8 @@ async def azure_data_set_sql_firewall_rule_allow_azure_services(
         from azure.mgmt.sql import SqlManagementClient
         from azure.mgmt.sql.models import FirewallRule
         
-        credential, subscription_id = get_credential_and_subscription(params.subscription_id)
-        client = SqlManagementClient(credential, subscription_id)
+        subscription_id = get_subscription_id(params.subscription_id)
+        client = get_management_client(SqlManagementClient, subscription_id)
         
         # Create the special "Allow Azure Services" rule
         # This uses 0.0.0.0 for both start and end IP
@@ -585,7 +591,8 @@ async def azure_data_set_sql_firewall_rule_allow_azure_services(
             end_ip_address="0.0.0.0",
         )
         
-        result = client.firewall_rules.create_or_update(
+        result = await run_blocking(
+            client.firewall_rules.create_or_update,
             params.resource_group,
             params.server_name,
             rule_name,
@@ -0,0 +1,460 @@
+"""Background tracking of ARM deployments.
+
+ARM deployments take minutes. Instead of blocking a tool call on
+poller.result(), the deploy tools start the deployment without an SDK
+poller and hand it to the tracker, which:
+- Polls the deployment and its deployment_operations with backoff
+  (fast while something is changing, slower while nothing is)
+- Persists the deployment state and the latest state of every operation
+  (AzureDeployment / AzureDeploymentOperation), numbering each change so
+  progress can be streamed from any cursor
+- Picks up deployments that were still running when the process stopped
+- Gives up after TRACK_TIMEOUT, recording the local terminal state
+  'TimedOut' so the deployment is not picked up again on every restart
+
+Tool calls run in short-lived event loops, so the tracker runs its own
+loop in a daemon thread.
+
+Usage:
+    handle = await start_deployment("resource_group", sub_id, "rg-app", "app-1", body)
+    record = await wait_for_deployment(handle, timeout=1800, on_progress=print)
+"""
+
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+
+from .auth import get_management_client
+from .utils import run_blocking
+
+logger = logging.getLogger(__name__)
+
+
+# Not an ARM state: the tracker stopped following the deployment
+TIMED_OUT_STATE = "TimedOut"
+TERMINAL_STATES = ("Succeeded", "Failed", "Canceled", TIMED_OUT_STATE)
+FAILED_STATES = ("Failed", "Canceled", TIMED_OUT_STATE)
+
+INITIAL_INTERVAL = 5.0
+MAX_INTERVAL = 30.0
+BACKOFF_FACTOR = 1.5
+TRACK_TIMEOUT = 6 * 3600
+WATCH_POLL_INTERVAL = 1.0
+
+STATUS_MESSAGE_LIMIT = 1000
+
+
+# =============================================================================
+# SDK object helpers
+# =============================================================================
+
+def operation_state(op: Any) -> Dict[str, str]:
+    """Flatten an SDK DeploymentOperation into the fields we persist."""
+    props = getattr(op, "properties", None)
+    target = getattr(props, "target_resource", None) if props else None
+    message = getattr(props, "status_message", None) if props else None
+    return {
+        "operation_id": getattr(op, "operation_id", None) or "",
+        "resource_type": (getattr(target, "resource_type", None) or "") if target else "",
+        "resource_name": (getattr(target, "resource_name", None) or "") if target else "",
+        "provisioning_state": (getattr(props, "provisioning_state", None) or "") if props else "",
+        "status_code": str(getattr(props, "status_code", None) or "") if props else "",
+        "status_message": str(message)[:STATUS_MESSAGE_LIMIT] if message else "",
+    }
+
+
+def deployment_state(deployment: Any) -> Dict[str, Any]:
+    """Flatten an SDK DeploymentExtended into the fields we persist."""
+    props = getattr(deployment, "properties", None)
+    outputs = {}
+    raw_outputs = getattr(props, "outputs", None) if props else None
+    if isinstance(raw_outputs, dict):
+        for key, val in raw_outputs.items():
+            outputs[key] = val.get("value") if isinstance(val, dict) else val
+
+    error = getattr(props, "error", None) if props else None
+    if error is not None:
+        error = getattr(error, "message", None) or str(error)
+
+    return {
+        "provisioning_state": (getattr(props, "provisioning_state", None) or "") if props else "",
+        "correlation_id": (getattr(props, "correlation_id", None) or "") if props else "",
+        "outputs": outputs,
+        "error": error or "",
+    }
+
+
+def changed_operations(
+    known: Dict[str, Tuple[str, str, str]],
+    fetched: List[Dict[str, str]],
+) -> List[Dict[str, str]]:
+    """Operations that are new or whose state, status code or message changed.
+
+    Args:
+        known: operation_id -> (provisioning_state, status_code, status_message)
+        fetched: Flattened operations from the latest poll
+    """
+    changed = []
+    for op in fetched:
+        if not op["operation_id"]:
+            continue
+        current = (op["provisioning_state"], op["status_code"], op["status_message"])
+        if known.get(op["operation_id"]) != current:
+            changed.append(op)
+    return changed
+
+
+def next_interval(interval: float, changed: bool) -> float:
+    """Poll again soon after a change, back off while nothing happens."""
+    if changed:
+        return INITIAL_INTERVAL
+    return min(interval * BACKOFF_FACTOR, MAX_INTERVAL)
+
+
+# =============================================================================
+# Persistence
+# =============================================================================
+
+def _deployment_dict(record) -> Dict[str, Any]:
+    return {
+        "handle": record.handle,
+        "subscription_id": record.subscription_id,
+        "scope": record.scope,
+        "resource_group": record.resource_group,
+        "deployment_name": record.deployment_name,
+        "provisioning_state": record.provisioning_state,
+        "correlation_id": record.correlation_id,
+        "outputs": record.outputs or {},
+        "error": record.error,
+        "sequence": record.sequence,
+        "finished": record.provisioning_state in TERMINAL_STATES,
+        "created_at": record.created_at.isoformat() if record.created_at else "",
+        "finished_at": record.finished_at.isoformat() if record.finished_at else "",
+    }
+
+
+def _operation_dict(op) -> Dict[str, Any]:
+    return {
+        "sequence": op.sequence,
+        "operation_id": op.operation_id,
+        "resource_type": op.resource_type,
+        "resource_name": op.resource_name,
+        "provisioning_state": op.provisioning_state,
+        "status_code": op.status_code,
+        "status_message": op.status_message,
+        "updated_at": op.updated_at.isoformat() if op.updated_at else "",
+    }
+
+
+class DeploymentStore:
+    """ORM access for tracked deployments (synchronous; wrap with sync_to_async)."""
+
+    def create(self, scope: str, subscription_id: str, resource_group: str, deployment_name: str) -> str:
+        from mcp_tools_core.models import AzureDeployment
+
+        handle = str(uuid.uuid4())
+        AzureDeployment.objects.create(
+            handle=handle,
+            scope=scope,
+            subscription_id=subscription_id,
+            resource_group=resource_group or "",
+            deployment_name=deployment_name,
+        )
+        return handle
+
+    def get(self, handle: str) -> Optional[Dict[str, Any]]:
+        from mcp_tools_core.models import AzureDeployment
+
+        record = AzureDeployment.objects.filter(handle=handle).first()
+        return _deployment_dict(record) if record else None
+
+    def known_operations(self, handle: str) -> Dict[str, Tuple[str, str, str]]:
+        from mcp_tools_core.models import AzureDeploymentOperation
+
+        return {
+            op_id: (state, code, message)
+            for op_id, state, code, message in AzureDeploymentOperation.objects.filter(
+                deployment__handle=handle,
+            ).values_list("operation_id", "provisioning_state", "status_code", "status_message")
+        }
+
+    def record(self, handle: str, state: Dict[str, Any], operations: List[Dict[str, str]]) -> int:
+        """Store a poll result; returns the deployment's new sequence number."""
+        from django.db import transaction
+        from django.utils import timezone
+        from mcp_tools_core.models import AzureDeployment, AzureDeploymentOperation
+
+        with transaction.atomic():
+            record = AzureDeployment.objects.select_for_update().get(handle=handle)
+            for op in operations:
+                record.sequence += 1
+                AzureDeploymentOperation.objects.update_or_create(
+                    deployment=record,
+                    operation_id=op["operation_id"],
+                    defaults={**op, "sequence": record.sequence},
+                )
+
+            changed = bool(operations)
+            for field in ("provisioning_state", "correlation_id", "outputs", "error"):
+                value = state.get(field)
+                if value is not None and value != getattr(record, field) and (value or field == "error"):
+                    setattr(record, field, value)
+                    changed = True
+            if changed and not operations:
+                record.sequence += 1
+            if record.provisioning_state in TERMINAL_STATES and record.finished_at is None:
+                record.finished_at = timezone.now()
+            if changed:
+                record.save()
+            return record.sequence
+
+    def set_error(self, handle: str, error: str) -> None:
+        self.record(handle, {"error": error}, [])
+
+    def mark_timed_out(self, handle: str, error: str) -> None:
+        """Give up on a deployment; it no longer counts as pending."""
+        self.record(handle, {"provisioning_state": TIMED_OUT_STATE, "error": error}, [])
+
+    def pending_handles(self) -> List[str]:
+        from mcp_tools_core.models import AzureDeployment
+
+        return list(
+            AzureDeployment.objects.exclude(provisioning_state__in=TERMINAL_STATES).values_list("handle", flat=True)
+        )
+
+    def events(self, handle: str, after: int = 0) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """The deployment and its operation changes with sequence > after."""
+        from mcp_tools_core.models import AzureDeploymentOperation
+
+        deployment = self.get(handle)
+        if deployment is None:
+            return None, []
+        ops = AzureDeploymentOperation.objects.filter(deployment__handle=handle, sequence__gt=after)
+        return deployment, [_operation_dict(op) for op in ops.order_by("sequence")]
+
+
+# =============================================================================
+# ARM access
+# =============================================================================
+
+def _resource_client(subscription_id: str):
+    from azure.mgmt.resource import ResourceManagementClient
+
+    return get_management_client(ResourceManagementClient, subscription_id)
+
+
+def _fetch(deployment: Dict[str, Any]) -> Tuple[Any, List[Any]]:
+    """Blocking: current deployment and all its operations."""
+    client = _resource_client(deployment["subscription_id"])
+    name = deployment["deployment_name"]
+    if deployment["scope"] == "subscription":
+        result = client.deployments.get_at_subscription_scope(name)
+        ops = list(client.deployment_operations.list_at_subscription_scope(name))
+    else:
+        result = client.deployments.get(deployment["resource_group"], name)
+        ops = list(client.deployment_operations.list(deployment["resource_group"], name))
+    return result, ops
+
+
+async def start_deployment(
+    scope: str,
+    subscription_id: str,
+    resource_group: Optional[str],
+    deployment_name: str,
+    deployment: Any,
+    store: Optional[DeploymentStore] = None,
+) -> str:
+    """Submit an ARM deployment and start tracking it.
+
+    The submit call returns once ARM has accepted the deployment; no SDK
+    poller is kept (polling=False), the tracker follows it instead.
+
+    Args:
+        scope: 'resource_group' or 'subscription'
+        subscription_id: Subscription ID
+        resource_group: Target resource group (resource_group scope)
+        deployment_name: ARM deployment name
+        deployment: SDK Deployment model
+        store: Persistence (defaults to the ORM store)
+
+    Returns:
+        Deployment handle
+    """
+    store = store or DeploymentStore()
+    client = _resource_client(subscription_id)
+
+    if scope == "subscription":
+        await run_blocking(
+            client.deployments.begin_create_or_update_at_subscription_scope,
+            deployment_name,
+            deployment,
+            polling=False,
+        )
+    else:
+        await run_blocking(
+            client.deployments.begin_create_or_update,
+            resource_group,
+            deployment_name,
+            deployment,
+            polling=False,
+        )
+
+    handle = await sync_to_async(store.create)(scope, subscription_id, resource_group or "", deployment_name)
+    get_deployment_tracker().track(handle)
+    logger.info(f"Started deployment {deployment_name} ({handle})")
+    return handle
+
+
+async def wait_for_deployment(
+    handle: str,
+    timeout: float = 3600,
+    on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+    store: Optional[DeploymentStore] = None,
+) -> Dict[str, Any]:
+    """Wait until a tracked deployment finishes, reporting operation changes.
+
+    Args:
+        handle: Deployment handle
+        timeout: Seconds to wait before returning the unfinished record
+        on_progress: Called with each operation change as it is recorded
+        store: Persistence (defaults to the ORM store)
+
+    Returns:
+        The deployment record (check 'finished')
+    """
+    store = store or DeploymentStore()
+    deadline = time.monotonic() + timeout
+    cursor = 0
+    while True:
+        deployment, events = await sync_to_async(store.events)(handle, cursor)
+        if deployment is None:
+            raise KeyError(f"Unknown deployment handle: {handle}")
+        for event in events:
+            cursor = max(cursor, event["sequence"])
+            if on_progress:
+                on_progress(event)
+        if deployment["finished"] or time.monotonic() >= deadline:
+            return deployment
+        await asyncio.sleep(WATCH_POLL_INTERVAL)
+
+
+# =============================================================================
+# Tracker
+# =============================================================================
+
+class DeploymentTracker:
+    """Follows deployments in a daemon thread with its own event loop."""
+
+    def __init__(self, store: Optional[DeploymentStore] = None, fetch: Callable = _fetch):
+        self.store = store or DeploymentStore()
+        self.fetch = fetch
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._active: set = set()
+        self._guard = threading.Lock()
+
+    def _ensure_loop(self) -> Tuple[asyncio.AbstractEventLoop, bool]:
+        with self._guard:
+            if self._thread is not None and self._thread.is_alive():
+                return self._loop, False
+            loop = asyncio.new_event_loop()
+            self._loop = loop
+            self._thread = threading.Thread(target=loop.run_forever, name="azure-deployment-tracker", daemon=True)
+            self._thread.start()
+            return loop, True
+
+    def track(self, handle: str) -> None:
+        """Start following a deployment (no-op if already followed)."""
+        loop, started = self._ensure_loop()
+        if started:
+            asyncio.run_coroutine_threadsafe(self._resume(), loop)
+        with self._guard:
+            if handle in self._active:
+                return
+            self._active.add(handle)
+        asyncio.run_coroutine_threadsafe(self.follow(handle), loop)
+
+    def resume(self) -> None:
+        """Start the tracker and pick up unfinished deployments from the database."""
+        loop, _ = self._ensure_loop()
+        asyncio.run_coroutine_threadsafe(self._resume(), loop)
+
+    async def _resume(self) -> None:
+        try:
+            handles = await sync_to_async(self.store.pending_handles)()
+        except Exception as e:
+            logger.warning(f"Could not load unfinished deployments: {e}")
+            return
+        for handle in handles:
+            with self._guard:
+                if handle in self._active:
+                    continue
+                self._active.add(handle)
+            asyncio.ensure_future(self.follow(handle))
+
+    async def poll_once(self, handle: str) -> Dict[str, Any]:
+        """Fetch the deployment once and persist what changed.
+
+        Returns:
+            The stored deployment plus 'changed' (whether anything changed)
+        """
+        deployment = await sync_to_async(self.store.get)(handle)
+        if deployment is None:
+            raise KeyError(f"Unknown deployment handle: {handle}")
+
+        result, ops = await run_blocking(self.fetch, deployment)
+        state = deployment_state(result)
+        known = await sync_to_async(self.store.known_operations)(handle)
+        changes = changed_operations(known, [operation_state(op) for op in ops])
+        if state["provisioning_state"] not in TERMINAL_STATES:
+            # Only a failed deployment carries a meaningful error
+            state["error"] = None
+        sequence = await sync_to_async(self.store.record)(handle, state, changes)
+
+        updated = dict(deployment, **{k: v for k, v in state.items() if v is not None})
+        updated["sequence"] = sequence
+        updated["finished"] = updated["provisioning_state"] in TERMINAL_STATES
+        updated["changed"] = sequence != deployment["sequence"]
+        return updated
+
+    async def follow(self, handle: str, timeout: float = TRACK_TIMEOUT) -> None:
+        """Poll a deployment with backoff until it reaches a terminal state."""
+        started = time.monotonic()
+        interval = INITIAL_INTERVAL
+        try:
+            while time.monotonic() - started < timeout:
+                try:
+                    deployment = await self.poll_once(handle)
+                    if deployment["finished"]:
+                        logger.info(f"Deployment {deployment['deployment_name']} {deployment['provisioning_state']}")
+                        return
+                    interval = next_interval(interval, deployment["changed"])
+                except KeyError:
+                    return
+                except Exception as e:
+                    logger.warning(f"Polling deployment {handle} failed: {e}")
+                    interval = next_interval(interval, False)
+                await asyncio.sleep(interval)
+
+            await sync_to_async(self.store.mark_timed_out)(
+                handle, f"Stopped tracking after {timeout:.0f}s; check azure_deployments_get_status"
+            )
+        finally:
+            with self._guard:
+                self._active.discard(handle)
+
+
+_tracker: Optional[DeploymentTracker] = None
+
+
+def get_deployment_tracker() -> DeploymentTracker:
+    """Get the process-wide deployment tracker."""
+    global _tracker
+    if _tracker is None:
+        _tracker = DeploymentTracker()
+    return _tracker
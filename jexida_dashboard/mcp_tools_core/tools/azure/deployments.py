@@ -5,19 +5,37 @@ Provides MCP tools for:
 - Deploying ARM templates at subscription scope
 - Getting deployment status
 - Listing deployments
+- Watching the progress of tracked deployments
+
+Deployments are started without blocking: the deploy tools return a
+handle as soon as ARM accepts the deployment, and the deployment tracker
+follows it in the background (see deployment_tracker.py).
 """
 
+import asyncio
 import logging
+import time
 from datetime import datetime
 from typing import Optional, List, Dict, Any
 
+from asgiref.sync import sync_to_async
 from pydantic import BaseModel, Field
 
 from .auth import (
-    get_credential_and_subscription,
+    get_management_client,
+    get_subscription_id,
     AzureError,
     wrap_azure_error,
 )
+from .deployment_tracker import (
+    FAILED_STATES,
+    WATCH_POLL_INTERVAL,
+    DeploymentStore,
+    get_deployment_tracker,
+    start_deployment,
+    wait_for_deployment,
+)
+from .utils import run_blocking
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +61,14 @@ class AzureDeploymentsDeployToResourceGroupInput(BaseModel):
         default=None,
         description="Subscription ID (uses default if not provided)"
     )
+    wait_for_completion: bool = Field(
+        default=False,
+        description="Wait for the deployment to finish instead of returning its handle right away"
+    )
+    timeout_seconds: int = Field(
+        default=3600,
+        description="Maximum seconds to wait when wait_for_completion is set"
+    )
 
 
 class DeploymentOutput(BaseModel):
@@ -55,6 +81,7 @@ class DeploymentOutput(BaseModel):
 class AzureDeploymentsDeployToResourceGroupOutput(BaseModel):
     """Output schema for azure_deployments_deploy_to_resource_group."""
     success: bool = Field(description="Whether deployment was initiated successfully")
+    handle: str = Field(default="", description="Tracking handle for azure_deployments_watch")
     deployment_name: str = Field(default="", description="Deployment name")
     resource_group: str = Field(default="", description="Target resource group")
     provisioning_state: str = Field(default="", description="Deployment provisioning state")
@@ -82,11 +109,20 @@ class AzureDeploymentsDeployToSubscriptionInput(BaseModel):
         default=None,
         description="Subscription ID (uses default if not provided)"
     )
+    wait_for_completion: bool = Field(
+        default=False,
+        description="Wait for the deployment to finish instead of returning its handle right away"
+    )
+    timeout_seconds: int = Field(
+        default=3600,
+        description="Maximum seconds to wait when wait_for_completion is set"
+    )
 
 
 class AzureDeploymentsDeployToSubscriptionOutput(BaseModel):
     """Output schema for azure_deployments_deploy_to_subscription."""
     success: bool = Field(description="Whether deployment was initiated successfully")
+    handle: str = Field(default="", description="Tracking handle for azure_deployments_watch")
     deployment_name: str = Field(default="", description="Deployment name")
     location: str = Field(default="", description="Deployment location")
     provisioning_state: str = Field(default="", description="Deployment provisioning state")
@@ -139,6 +175,46 @@ class AzureDeploymentsGetStatusOutput(BaseModel):
     error_details: Dict[str, Any] = Field(default_factory=dict, description="Detailed error info")
 
 
+class AzureDeploymentsWatchInput(BaseModel):
+    """Input schema for azure_deployments_watch."""
+    handle: str = Field(description="Deployment handle returned by a deploy tool")
+    after_sequence: int = Field(
+        default=0,
+        description="Only return progress recorded after this sequence number (the previous call's 'sequence')"
+    )
+    wait_seconds: int = Field(
+        default=20,
+        ge=0,
+        le=120,
+        description="Wait up to this many seconds for new progress before returning"
+    )
+
+
+class DeploymentProgressEvent(BaseModel):
+    """A change in the state of one deployment operation."""
+    sequence: int = Field(description="Progress sequence number")
+    operation_id: str = Field(default="", description="Operation ID")
+    resource_type: str = Field(default="", description="Target resource type")
+    resource_name: str = Field(default="", description="Target resource name")
+    provisioning_state: str = Field(default="", description="Operation state")
+    status_code: str = Field(default="", description="HTTP status code")
+    status_message: str = Field(default="", description="Status message")
+    updated_at: str = Field(default="", description="When the change was recorded")
+
+
+class AzureDeploymentsWatchOutput(BaseModel):
+    """Output schema for azure_deployments_watch."""
+    success: bool = Field(description="Whether the deployment was found")
+    handle: str = Field(default="", description="Deployment handle")
+    deployment_name: str = Field(default="", description="Deployment name")
+    provisioning_state: str = Field(default="", description="Deployment state")
+    finished: bool = Field(default=False, description="Whether the deployment reached a terminal state")
+    sequence: int = Field(default=0, description="Latest sequence number; pass as after_sequence to continue")
+    events: List[DeploymentProgressEvent] = Field(default_factory=list, description="Operation changes since after_sequence")
+    outputs: List[DeploymentOutput] = Field(default_factory=list, description="Deployment outputs (when finished)")
+    error: str = Field(default="", description="Error message if failed")
+
+
 class AzureDeploymentsListInput(BaseModel):
     """Input schema for azure_deployments_list."""
     scope: str = Field(
@@ -212,6 +288,21 @@ def _extract_outputs(outputs: Any) -> List[DeploymentOutput]:
     return result
 
 
+def _tracked_result(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Output fields for a tracked deployment record."""
+    failed = record["provisioning_state"] in FAILED_STATES
+    return {
+        "success": not failed,
+        "handle": record["handle"],
+        "deployment_name": record["deployment_name"],
+        "provisioning_state": record["provisioning_state"],
+        "timestamp": record["finished_at"] or record["created_at"],
+        "correlation_id": record["correlation_id"],
+        "outputs": [DeploymentOutput(key=k, value=v) for k, v in record["outputs"].items()],
+        "error": (record["error"] or f"Deployment {record['provisioning_state']}") if failed else "",
+    }
+
+
 def _format_duration(start: Optional[datetime], end: Optional[datetime]) -> str:
     """Format deployment duration as human-readable string."""
     if not start or not end:
@@ -245,22 +336,22 @@ async def azure_deployments_deploy_to_resource_group(
         params.parameters: Template parameters
         params.mode: Deployment mode (Incremental or Complete)
         params.subscription_id: Subscription ID
+        params.wait_for_completion: Wait for the deployment to finish
+        params.timeout_seconds: Maximum wait when waiting
         
     Returns:
-        Deployment result with outputs
+        Deployment handle, or the final result when waiting
     """
     logger.info(f"Deploying to resource group: {params.resource_group}, deployment: {params.deployment_name}")
     
     try:
-        from azure.mgmt.resource import ResourceManagementClient
         from azure.mgmt.resource.resources.models import (
             DeploymentMode,
             Deployment,
             DeploymentProperties,
         )
         
-        credential, subscription_id = get_credential_and_subscription(params.subscription_id)
-        client = ResourceManagementClient(credential, subscription_id)
+        subscription_id = get_subscription_id(params.subscription_id)
         
         # Format parameters
         formatted_params = _format_parameters_for_deployment(params.parameters)
@@ -279,29 +370,30 @@ async def azure_deployments_deploy_to_resource_group(
             )
         )
         
-        # Start deployment
-        poller = client.deployments.begin_create_or_update(
+        # Start deployment; the tracker follows it from here
+        handle = await start_deployment(
+            "resource_group",
+            subscription_id,
             params.resource_group,
             params.deployment_name,
             deployment,
         )
         
-        # Wait for result (with timeout awareness)
-        result = poller.result()
-        
-        # Extract outputs
-        outputs = _extract_outputs(result.properties.outputs if result.properties else None)
+        if not params.wait_for_completion:
+            return AzureDeploymentsDeployToResourceGroupOutput(
+                success=True,
+                handle=handle,
+                deployment_name=params.deployment_name,
+                resource_group=params.resource_group,
+                provisioning_state="Accepted",
+            )
         
-        logger.info(f"Deployment completed: {params.deployment_name}, state: {result.properties.provisioning_state}")
+        record = await wait_for_deployment(handle, timeout=params.timeout_seconds)
+        logger.info(f"Deployment {params.deployment_name}: {record['provisioning_state']}")
         
         return AzureDeploymentsDeployToResourceGroupOutput(
-            success=True,
-            deployment_name=result.name,
             resource_group=params.resource_group,
-            provisioning_state=result.properties.provisioning_state if result.properties else "",
-            timestamp=result.properties.timestamp.isoformat() if result.properties and result.properties.timestamp else "",
-            correlation_id=result.properties.correlation_id if result.properties else "",
-            outputs=outputs,
+            **_tracked_result(record),
         )
         
     except AzureError as e:
@@ -346,22 +438,22 @@ async def azure_deployments_deploy_to_subscription(
         params.parameters: Template parameters
         params.mode: Deployment mode (Incremental or Complete)
         params.subscription_id: Subscription ID
+        params.wait_for_completion: Wait for the deployment to finish
+        params.timeout_seconds: Maximum wait when waiting
         
     Returns:
-        Deployment result with outputs
+        Deployment handle, or the final result when waiting
     """
     logger.info(f"Deploying at subscription scope: {params.deployment_name}")
     
     try:
-        from azure.mgmt.resource import ResourceManagementClient
         from azure.mgmt.resource.resources.models import (
             DeploymentMode,
             Deployment,
             DeploymentProperties,
         )
         
-        credential, subscription_id = get_credential_and_subscription(params.subscription_id)
-        client = ResourceManagementClient(credential, subscription_id)
+        subscription_id = get_subscription_id(params.subscription_id)
         
         # Format parameters
         formatted_params = _format_parameters_for_deployment(params.parameters)
@@ -381,28 +473,30 @@ async def azure_deployments_deploy_to_subscription(
             )
         )
         
-        # Start subscription-level deployment
-        poller = client.deployments.begin_create_or_update_at_subscription_scope(
+        # Start subscription-level deployment; the tracker follows it from here
+        handle = await start_deployment(
+            "subscription",
+            subscription_id,
+            None,
             params.deployment_name,
             deployment,
         )
         
-        # Wait for result
-        result = poller.result()
-        
-        # Extract outputs
-        outputs = _extract_outputs(result.properties.outputs if result.properties else None)
+        if not params.wait_for_completion:
+            return AzureDeploymentsDeployToSubscriptionOutput(
+                success=True,
+                handle=handle,
+                deployment_name=params.deployment_name,
+                location=params.location,
+                provisioning_state="Accepted",
+            )
         
-        logger.info(f"Subscription deployment completed: {params.deployment_name}")
+        record = await wait_for_deployment(handle, timeout=params.timeout_seconds)
+        logger.info(f"Subscription deployment {params.deployment_name}: {record['provisioning_state']}")
         
         return AzureDeploymentsDeployToSubscriptionOutput(
-            success=True,
-            deployment_name=result.name,
             location=params.location,
-            provisioning_state=result.properties.provisioning_state if result.properties else "",
-            timestamp=result.properties.timestamp.isoformat() if result.properties and result.properties.timestamp else "",
-            correlation_id=result.properties.correlation_id if result.properties else "",
-            outputs=outputs,
+            **_tracked_result(record),
         )
         
     except AzureError as e:
@@ -450,14 +544,14 @@ async def azure_deployments_get_status(
     try:
         from azure.mgmt.resource import ResourceManagementClient
         
-        credential, subscription_id = get_credential_and_subscription(params.subscription_id)
-        client = ResourceManagementClient(credential, subscription_id)
+        subscription_id = get_subscription_id(params.subscription_id)
+        client = get_management_client(ResourceManagementClient, subscription_id)
         
         # Get deployment based on scope
         if params.scope == "subscription":
-            deployment = client.deployments.get_at_subscription_scope(params.deployment_name)
+            deployment = await run_blocking(client.deployments.get_at_subscription_scope, params.deployment_name)
         else:
-            deployment = client.deployments.get(params.resource_group, params.deployment_name)
+            deployment = await run_blocking(client.deployments.get, params.resource_group, params.deployment_name)
         
         props = deployment.properties
         
@@ -478,7 +572,7 @@ async def azure_deployments_get_status(
             else:
                 ops = client.deployment_operations.list(params.resource_group, params.deployment_name)
             
-            for op in list(ops)[:10]:  # Limit to 10 operations
+            for op in (await run_blocking(list, ops))[:10]:  # Limit to 10 operations
                 op_props = op.properties if op.properties else None
                 operations.append(DeploymentOperation(
                     id=op.id or "",
@@ -520,6 +614,63 @@ async def azure_deployments_get_status(
         )
 
 
+async def azure_deployments_watch(
+    params: AzureDeploymentsWatchInput
+) -> AzureDeploymentsWatchOutput:
+    """Stream the progress of a tracked deployment.
+    
+    Long-polls: returns as soon as new progress is recorded, the deployment
+    finishes, or wait_seconds pass. Call again with after_sequence set to
+    the returned sequence to continue.
+    
+    Args:
+        params.handle: Deployment handle from a deploy tool
+        params.after_sequence: Cursor from the previous call
+        params.wait_seconds: Maximum time to wait for new progress
+        
+    Returns:
+        Deployment state and operation changes since the cursor
+    """
+    store = DeploymentStore()
+    deadline = time.monotonic() + params.wait_seconds
+    
+    try:
+        while True:
+            record, events = await sync_to_async(store.events)(params.handle, params.after_sequence)
+            if record is None:
+                return AzureDeploymentsWatchOutput(
+                    success=False,
+                    handle=params.handle,
+                    error=f"Unknown deployment handle: {params.handle}",
+                )
+            if not record["finished"]:
+                # Picks the deployment up again if this process was restarted
+                get_deployment_tracker().track(params.handle)
+            if record["finished"] or record["sequence"] > params.after_sequence or time.monotonic() >= deadline:
+                break
+            await asyncio.sleep(WATCH_POLL_INTERVAL)
+        
+        return AzureDeploymentsWatchOutput(
+            success=True,
+            handle=params.handle,
+            deployment_name=record["deployment_name"],
+            provisioning_state=record["provisioning_state"],
+            finished=record["finished"],
+            sequence=record["sequence"],
+            events=[DeploymentProgressEvent(**event) for event in events],
+            outputs=[DeploymentOutput(key=k, value=v) for k, v in record["outputs"].items()],
+            error=record["error"],
+        )
+        
+    except Exception as e:
+        logger.error(f"Failed to watch deployment {params.handle}: {e}")
+        return AzureDeploymentsWatchOutput(
+            success=False,
+            handle=params.handle,
+            error=str(e),
+        )
+
+
 async def azure_deployments_list(
     params: AzureDeploymentsListInput
 ) -> AzureDeploymentsListOutput:
@@ -546,8 +697,8 @@ async def azure_deployments_list(
     try:
         from azure.mgmt.resource import ResourceManagementClient
         
-        credential, subscription_id = get_credential_and_subscription(params.subscription_id)
-        client = ResourceManagementClient(credential, subscription_id)
+        subscription_id = get_subscription_id(params.subscription_id)
+        client = get_management_client(ResourceManagementClient, subscription_id)
         
         deployments = []
         
@@ -559,7 +710,7 @@ async def azure_deployments_list(
                 top=params.top
             )
         
-        for deployment in items:
+        for deployment in await run_blocking(list, items):
             props = deployment.properties
             deployments.append(DeploymentSummary(
                 name=deployment.name,
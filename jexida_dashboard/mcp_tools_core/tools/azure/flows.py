@@ -10,12 +10,24 @@ These flows are designed to be:
 - Idempotent where possible (ensure vs always create)
 - Return consistent structured output
 - Be callable from CLI, web dashboard, or other MCP orchestrations
+
+Multi-resource flows are described as a DAG of steps and run by
+run_flow(): each step starts as soon as the steps it depends on have
+succeeded (up to AZURE_FLOW_MAX_CONCURRENCY at a time), a failed step
+only skips the steps downstream of it, and every step outcome is
+checkpointed so a failed run can be resumed with resume_run_id.
 """
 
+import asyncio
 import json
 import logging
-from typing import Optional, Dict, Any, List
+import os
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from typing import Optional, Dict, Any, List, Awaitable, Callable, Tuple
 
+from asgiref.sync import sync_to_async
 from pydantic import BaseModel, Field
 
 from .auth import AzureError, wrap_azure_error
@@ -82,6 +94,287 @@ def build_default_tags(
     return tags
 
 
+# =============================================================================
+# Flow Engine
+# =============================================================================
+
+FLOW_MAX_CONCURRENCY = int(os.environ.get("AZURE_FLOW_MAX_CONCURRENCY", "4"))
+
+STEP_SUCCEEDED = "succeeded"
+STEP_FAILED = "failed"
+STEP_SKIPPED = "skipped"
+STEP_RESUMED = "resumed"  # succeeded in an earlier run of the same flow
+
+StepResults = Dict[str, Dict[str, Any]]
+
+
+class StepFailed(Exception):
+    """A step finished without raising but did not succeed."""
+
+
+@dataclass
+class FlowStep:
+    """One unit of work in a flow.
+
+    ``run`` receives the results (as dicts) of the steps that have already
+    succeeded, keyed by step name, and returns a tool output or dict.
+    A tool output with ``success=False`` fails the step.
+    """
+    name: str
+    run: Callable[[StepResults], Awaitable[Any]]
+    depends_on: Tuple[str, ...] = ()
+    description: str = ""
+    required: bool = True
+
+
+@dataclass
+class StepResult:
+    """Outcome of one step."""
+    name: str
+    status: str
+    result: Dict[str, Any] = field(default_factory=dict)
+    error: str = ""
+    duration_seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.status in (STEP_SUCCEEDED, STEP_RESUMED)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def validate_flow(steps: List[FlowStep]) -> None:
+    """Check step names are unique, dependencies exist and there are no cycles.
+
+    Raises:
+        ValueError: If the flow is malformed
+    """
+    names = [s.name for s in steps]
+    if len(set(names)) != len(names):
+        raise ValueError(f"Duplicate step names in flow: {names}")
+
+    for step in steps:
+        unknown = [d for d in step.depends_on if d not in names]
+        if unknown:
+            raise ValueError(f"Step '{step.name}' depends on unknown step(s): {', '.join(unknown)}")
+
+    remaining = {s.name: set(s.depends_on) for s in steps}
+    while remaining:
+        ready = [name for name, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f"Flow has a dependency cycle between: {', '.join(sorted(remaining))}")
+        for name in ready:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+
+
+def _step_output(value: Any) -> Dict[str, Any]:
+    """Turn a step's return value into a result dict, failing on success=False."""
+    if getattr(value, "success", True) is False:
+        raise StepFailed(getattr(value, "error", "") or "Step reported failure")
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    if isinstance(value, dict):
+        return value
+    return {} if value is None else {"value": value}
+
+
+async def run_flow(
+    steps: List[FlowStep],
+    max_concurrency: int = FLOW_MAX_CONCURRENCY,
+    completed: Optional[StepResults] = None,
+    on_step: Optional[Callable[[StepResult], Awaitable[None]]] = None,
+) -> Dict[str, StepResult]:
+    """Run a DAG of steps, each as soon as its dependencies have succeeded.
+
+    Args:
+        steps: Flow steps
+        max_concurrency: Maximum steps running at once
+        completed: Results of steps that succeeded in an earlier run; these
+            are not run again
+        on_step: Awaited with each StepResult as it is decided
+
+    Returns:
+        Step name -> StepResult, in step order. Steps downstream of a
+        failed step are skipped; independent branches still run.
+    """
+    validate_flow(steps)
+    completed = completed or {}
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    results: Dict[str, StepResult] = {}
+    outputs: StepResults = {}
+    running: Dict[asyncio.Task, str] = {}
+
+    async def report(result: StepResult) -> None:
+        results[result.name] = result
+        if result.ok:
+            outputs[result.name] = result.result
+        if on_step:
+            try:
+                await on_step(result)
+            except Exception as e:
+                logger.warning(f"Could not record flow step {result.name}: {e}")
+
+    async def execute(step: FlowStep) -> StepResult:
+        async with semaphore:
+            started = time.monotonic()
+            try:
+                data = _step_output(await step.run(dict(outputs)))
+                status, error = STEP_SUCCEEDED, ""
+            except StepFailed as e:
+                data, status, error = {}, STEP_FAILED, str(e)
+            except Exception as e:
+                data, status, error = {}, STEP_FAILED, f"{type(e).__name__}: {e}"
+            if error:
+                logger.warning(f"Flow step {step.name} failed: {error}")
+            return StepResult(step.name, status, data, error, round(time.monotonic() - started, 3))
+
+    for step in steps:
+        if step.name in completed:
+            await report(StepResult(step.name, STEP_RESUMED, completed[step.name]))
+
+    while True:
+        # Skipping a step can make its own dependents skippable, so repeat
+        changed = True
+        while changed:
+            changed = False
+            for step in steps:
+                if step.name in results or step.name in running.values():
+                    continue
+                blocked = [d for d in step.depends_on if d in results and not results[d].ok]
+                if blocked:
+                    await report(StepResult(step.name, STEP_SKIPPED, error=f"Skipped: '{blocked[0]}' did not succeed"))
+                    changed = True
+                elif all(d in outputs for d in step.depends_on):
+                    running[asyncio.ensure_future(execute(step))] = step.name
+
+        if not running:
+            break
+        done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            running.pop(task)
+            await report(task.result())
+
+    return {step.name: results[step.name] for step in steps}
+
+
+def flow_error(steps: List[FlowStep], results: Dict[str, StepResult]) -> str:
+    """Error message for the flow ('' if every required step succeeded).
+
+    Reports the first failed required step, or the first skipped one if
+    only a non-required step failed upstream.
+    """
+    unfinished = [s for s in steps if s.required and not results[s.name].ok]
+    if not unfinished:
+        return ""
+    step = min(unfinished, key=lambda s: results[s.name].status != STEP_FAILED)
+    return f"Failed to {step.description or step.name}: {results[step.name].error}"
+
+
+class FlowRunStore:
+    """Checkpoints of flow runs in AzureFlowRun (synchronous; wrap with sync_to_async)."""
+
+    def create(self, flow: str, params: Dict[str, Any]) -> str:
+        from mcp_tools_core.models import AzureFlowRun
+
+        run_id = str(uuid.uuid4())
+        AzureFlowRun.objects.create(run_id=run_id, flow=flow, params=params)
+        return run_id
+
+    def load(self, run_id: str) -> Optional[Dict[str, Any]]:
+        from mcp_tools_core.models import AzureFlowRun
+
+        run = AzureFlowRun.objects.filter(run_id=run_id).first()
+        if run is None:
+            return None
+        return {"run_id": run.run_id, "flow": run.flow, "params": run.params, "status": run.status, "steps": run.steps}
+
+    def save_step(self, run_id: str, result: StepResult) -> None:
+        from django.db import transaction
+        from mcp_tools_core.models import AzureFlowRun
+
+        with transaction.atomic():
+            run = AzureFlowRun.objects.select_for_update().get(run_id=run_id)
+            run.steps = {**run.steps, result.name: result.to_dict()}
+            run.save(update_fields=["steps", "updated_at"])
+
+    def finish(self, run_id: str, error: str) -> None:
+        from mcp_tools_core.models import AzureFlowRun
+
+        AzureFlowRun.objects.filter(run_id=run_id).update(status="failed" if error else "succeeded", error=error)
+
+
+async def run_checkpointed_flow(
+    flow: str,
+    steps: List[FlowStep],
+    params: Dict[str, Any],
+    resume_run_id: Optional[str] = None,
+    store: Optional[FlowRunStore] = None,
+) -> Tuple[str, Dict[str, StepResult], str]:
+    """Run a flow, checkpointing each step, optionally resuming an earlier run.
+
+    Args:
+        flow: Flow tool name
+        steps: Flow steps
+        params: Flow input (stored with the run)
+        resume_run_id: Earlier run of the same flow to continue
+        store: Checkpoint store (defaults to the ORM store)
+
+    Returns:
+        (run_id, step results, error); run_id is '' if checkpointing is unavailable
+
+    Raises:
+        ValueError: If resume_run_id is unknown, belongs to another flow, or
+            was started with different params (its completed step results
+            would not match the steps rebuilt from these params)
+    """
+    store = store or FlowRunStore()
+    completed: StepResults = {}
+
+    if resume_run_id:
+        previous = await sync_to_async(store.load)(resume_run_id)
+        if previous is None or previous["flow"] != flow:
+            raise ValueError(f"No {flow} run with id {resume_run_id}")
+        # Compare as stored (JSON round trip), so tuples and lists match
+        stored, given = previous.get("params") or {}, json.loads(json.dumps(params, default=str))
+        changed = sorted(k for k in set(stored) | set(given) if stored.get(k) != given.get(k))
+        if changed:
+            raise ValueError(
+                f"Run {resume_run_id} was started with different parameters ({', '.join(changed)}); "
+                "resume it with the same parameters or start a new run"
+            )
+        run_id = resume_run_id
+        completed = {
+            name: step["result"]
+            for name, step in previous["steps"].items()
+            if step["status"] in (STEP_SUCCEEDED, STEP_RESUMED)
+        }
+        logger.info(f"Resuming {flow} run {run_id}; {len(completed)} step(s) already done")
+    else:
+        try:
+            run_id = await sync_to_async(store.create)(flow, params)
+        except Exception as e:
+            logger.warning(f"Flow run will not be resumable, checkpointing failed: {e}")
+            run_id = ""
+
+    async def checkpoint(result: StepResult) -> None:
+        if run_id and result.status != STEP_RESUMED:
+            await sync_to_async(store.save_step)(run_id, result)
+
+    results = await run_flow(steps, completed=completed, on_step=checkpoint)
+    error = flow_error(steps, results)
+
+    if run_id:
+        try:
+            await sync_to_async(store.finish)(run_id, error)
+        except Exception as e:
+            logger.warning(f"Could not record flow run {run_id}: {e}")
+
+    return run_id, results, error
+
+
 # =============================================================================
 # Flow Input/Output Schemas
 # =============================================================================
@@ -114,6 +407,10 @@ class AzureFlowCreateAppEnvironmentInput(BaseModel):
         default="PYTHON|3.11",
         description="Runtime stack (e.g., 'PYTHON|3.11', 'NODE|18-lts')"
     )
+    resume_run_id: Optional[str] = Field(
+        default=None,
+        description="Run ID of a failed earlier run to resume with the same parameters; steps that succeeded are not repeated"
+    )
 
 
 class CreatedResource(BaseModel):
@@ -125,6 +422,14 @@ class CreatedResource(BaseModel):
     details: Dict[str, Any] = Field(default_factory=dict, description="Additional details")
 
 
+class FlowStepStatus(BaseModel):
+    """Outcome of one flow step."""
+    name: str = Field(description="Step name")
+    status: str = Field(description="succeeded, failed, skipped, or resumed")
+    error: str = Field(default="", description="Error message if the step failed or was skipped")
+    duration_seconds: float = Field(default=0.0, description="Time the step took")
+
+
 class AzureFlowCreateAppEnvironmentOutput(BaseModel):
     """Output schema for azure_flow_create_app_environment."""
     ok: bool = Field(description="Whether the flow completed successfully")
@@ -137,6 +442,8 @@ class AzureFlowCreateAppEnvironmentOutput(BaseModel):
         default_factory=list,
         description="List of created/found resources"
     )
+    run_id: str = Field(default="", description="Run ID (pass as resume_run_id to resume a failed run)")
+    steps: List[FlowStepStatus] = Field(default_factory=list, description="Per-step outcome")
     summary: str = Field(default="", description="Human-readable summary")
 
 
@@ -169,6 +476,10 @@ class AzureFlowAddDataServicesInput(BaseModel):
         default="dev",
         description="Environment name for naming convention"
     )
+    resume_run_id: Optional[str] = Field(
+        default=None,
+        description="Run ID of a failed earlier run to resume with the same parameters; steps that succeeded are not repeated"
+    )
 
 
 class AzureFlowAddDataServicesOutput(BaseModel):
@@ -185,6 +496,8 @@ class AzureFlowAddDataServicesOutput(BaseModel):
         default_factory=list,
         description="List of created/found resources"
     )
+    run_id: str = Field(default="", description="Run ID (pass as resume_run_id to resume a failed run)")
+    steps: List[FlowStepStatus] = Field(default_factory=list, description="Per-step outcome")
     summary: str = Field(default="", description="Human-readable summary")
 
 
@@ -220,9 +533,21 @@ class AzureFlowDeployStandardTemplateOutput(BaseModel):
         description="Deployment outputs"
     )
     correlation_id: str = Field(default="", description="Deployment correlation ID")
+    handle: str = Field(default="", description="Tracking handle for azure_deployments_watch")
+    progress: List[str] = Field(
+        default_factory=list,
+        description="Operation progress observed while waiting"
+    )
     summary: str = Field(default="", description="Human-readable summary")
 
 
+def _step_statuses(results: Dict[str, StepResult]) -> List[FlowStepStatus]:
+    return [
+        FlowStepStatus(name=r.name, status=r.status, error=r.error, duration_seconds=r.duration_seconds)
+        for r in results.values()
+    ]
+
+
 # =============================================================================
 # Flow Implementations
 # =============================================================================
@@ -234,8 +559,8 @@ async def azure_flow_create_app_environment(
     
     Creates:
     1. Resource Group
-    2. App Service Plan
-    3. Web App
+    2. App Service Plan (after 1)
+    3. Web App (after 2)
     
     Resources are named using a deterministic convention based on base_name
     and environment. The flow is idempotent - existing resources are reused.
@@ -260,37 +585,20 @@ async def azure_flow_create_app_environment(
         AzureAppPlatformCreateWebAppInput,
     )
     
-    resources = []
     names = build_resource_names(params.base_name, params.environment)
     tags = build_default_tags(params.environment, extra_tags=params.tags)
     
-    try:
-        # Step 1: Create Resource Group
-        logger.info(f"Step 1: Creating resource group {names['resource_group']}")
-        rg_result = await azure_core_create_resource_group(
+    async def create_resource_group(results: StepResults):
+        return await azure_core_create_resource_group(
             AzureCoreCreateResourceGroupInput(
                 name=names["resource_group"],
                 location=params.location,
                 tags=tags,
             )
         )
-        
-        if not rg_result.success:
-            return AzureFlowCreateAppEnvironmentOutput(
-                ok=False,
-                error=f"Failed to create resource group: {rg_result.error}",
-            )
-        
-        resources.append(CreatedResource(
-            name=names["resource_group"],
-            type="Microsoft.Resources/resourceGroups",
-            status="created" if rg_result.created else "existing",
-            details={"location": params.location},
-        ))
-        
-        # Step 2: Create App Service Plan
-        logger.info(f"Step 2: Creating App Service plan {names['app_service_plan']}")
-        plan_result = await azure_app_platform_create_app_service_plan(
+    
+    async def create_app_service_plan(results: StepResults):
+        return await azure_app_platform_create_app_service_plan(
             AzureAppPlatformCreateAppServicePlanInput(
                 resource_group=names["resource_group"],
                 name=names["app_service_plan"],
@@ -299,26 +607,9 @@ async def azure_flow_create_app_environment(
                 is_linux=params.is_linux,
             )
         )
-        
-        if not plan_result.success:
-            return AzureFlowCreateAppEnvironmentOutput(
-                ok=False,
-                error=f"Failed to create App Service plan: {plan_result.error}",
-                resource_group=names["resource_group"],
-                resources=resources,
-            )
-        
-        resources.append(CreatedResource(
-            name=names["app_service_plan"],
-            type="Microsoft.Web/serverfarms",
-            resource_id=plan_result.resource_id,
-            status="created",
-            details={"sku": plan_result.sku_name, "tier": plan_result.sku_tier},
-        ))
-        
-        # Step 3: Create Web App
-        logger.info(f"Step 3: Creating web app {names['web_app']}")
-        app_result = await azure_app_platform_create_web_app(
+    
+    async def create_web_app(results: StepResults):
+        return await azure_app_platform_create_web_app(
             AzureAppPlatformCreateWebAppInput(
                 resource_group=names["resource_group"],
                 name=names["web_app"],
@@ -327,29 +618,66 @@ async def azure_flow_create_app_environment(
                 https_only=True,
             )
         )
+    
+    steps = [
+        FlowStep("resource_group", create_resource_group, description="create resource group"),
+        FlowStep("app_service_plan", create_app_service_plan, ("resource_group",),
+                 description="create App Service plan"),
+        FlowStep("web_app", create_web_app, ("app_service_plan",), description="create web app"),
+    ]
+    
+    try:
+        run_id, results, error = await run_checkpointed_flow(
+            "azure_flow_create_app_environment",
+            steps,
+            params.model_dump(exclude={"resume_run_id"}),
+            resume_run_id=params.resume_run_id,
+        )
         
-        if not app_result.success:
+        resources = []
+        rg = results["resource_group"]
+        if rg.ok:
+            resources.append(CreatedResource(
+                name=names["resource_group"],
+                type="Microsoft.Resources/resourceGroups",
+                status="created" if rg.result.get("created") else "existing",
+                details={"location": params.location},
+            ))
+        plan = results["app_service_plan"]
+        if plan.ok:
+            resources.append(CreatedResource(
+                name=names["app_service_plan"],
+                type="Microsoft.Web/serverfarms",
+                resource_id=plan.result.get("resource_id", ""),
+                status="created",
+                details={"sku": plan.result.get("sku_name", ""), "tier": plan.result.get("sku_tier", "")},
+            ))
+        app = results["web_app"]
+        web_app_url = ""
+        if app.ok:
+            web_app_url = f"https://{app.result.get('default_hostname', '')}"
+            resources.append(CreatedResource(
+                name=names["web_app"],
+                type="Microsoft.Web/sites",
+                resource_id=app.result.get("resource_id", ""),
+                status="created",
+                details={
+                    "hostname": app.result.get("default_hostname", ""),
+                    "state": app.result.get("state", ""),
+                },
+            ))
+        
+        if error:
             return AzureFlowCreateAppEnvironmentOutput(
                 ok=False,
-                error=f"Failed to create web app: {app_result.error}",
-                resource_group=names["resource_group"],
-                app_service_plan=names["app_service_plan"],
+                error=error,
+                resource_group=names["resource_group"] if rg.ok else "",
+                app_service_plan=names["app_service_plan"] if plan.ok else "",
                 resources=resources,
+                run_id=run_id,
+                steps=_step_statuses(results),
             )
         
-        resources.append(CreatedResource(
-            name=names["web_app"],
-            type="Microsoft.Web/sites",
-            resource_id=app_result.resource_id,
-            status="created",
-            details={
-                "hostname": app_result.default_hostname,
-                "state": app_result.state,
-            },
-        ))
-        
-        web_app_url = f"https://{app_result.default_hostname}"
-        
         summary = (
             f"Successfully created app environment '{params.base_name}' in {params.location}:\n"
             f"  - Resource Group: {names['resource_group']}\n"
@@ -367,22 +695,24 @@ async def azure_flow_create_app_environment(
             web_app=names["web_app"],
             web_app_url=web_app_url,
             resources=resources,
+            run_id=run_id,
+            steps=_step_statuses(results),
             summary=summary,
         )
         
+    except ValueError as e:
+        return AzureFlowCreateAppEnvironmentOutput(ok=False, error=str(e))
     except AzureError as e:
         logger.error(f"Azure error in create_app_environment: {e}")
         return AzureFlowCreateAppEnvironmentOutput(
             ok=False,
             error=str(e),
-            resources=resources,
         )
     except Exception as e:
         logger.error(f"Unexpected error in create_app_environment: {e}")
         return AzureFlowCreateAppEnvironmentOutput(
             ok=False,
             error=f"Unexpected error: {str(e)}",
-            resources=resources,
         )
 
 
@@ -391,12 +721,10 @@ async def azure_flow_add_data_services(
 ) -> AzureFlowAddDataServicesOutput:
     """Add data services to an existing environment.
     
-    Creates:
-    1. Storage Account (if include_storage=True)
-    2. Blob Container (if include_storage=True)
-    3. SQL Server (if include_sql=True)
-    4. SQL Database (if include_sql=True)
-    5. SQL Firewall Rule for Azure Services (if include_sql=True)
+    Creates, as two independent chains that run concurrently:
+    - Storage Account, then Blob Container (if include_storage=True)
+    - SQL Server, then SQL Database and the firewall rule for Azure
+      services (if include_sql=True); the firewall rule is non-fatal
     
     Args:
         params: Flow configuration
@@ -419,168 +747,155 @@ async def azure_flow_add_data_services(
         AzureDataSetSqlFirewallRuleInput,
     )
     
-    resources = []
     names = build_resource_names(params.base_name, params.environment)
     tags = build_default_tags(params.environment, extra_tags=params.tags)
     
-    storage_account = ""
-    storage_endpoint = ""
-    blob_container = ""
-    sql_server = ""
-    sql_server_fqdn = ""
-    sql_database = ""
+    async def create_storage_account(results: StepResults):
+        return await azure_data_create_storage_account(
+            AzureDataCreateStorageAccountInput(
+                resource_group=params.resource_group,
+                name=names["storage_account"],
+                location=params.location,
+                sku="Standard_LRS",
+                kind="StorageV2",
+                tags=tags,
+            )
+        )
     
-    try:
-        # Storage Account
-        if params.include_storage:
-            logger.info(f"Creating storage account {names['storage_account']}")
-            
-            storage_result = await azure_data_create_storage_account(
-                AzureDataCreateStorageAccountInput(
-                    resource_group=params.resource_group,
-                    name=names["storage_account"],
-                    location=params.location,
-                    sku="Standard_LRS",
-                    kind="StorageV2",
-                    tags=tags,
-                )
+    async def create_blob_container(results: StepResults):
+        return await azure_data_create_blob_container(
+            AzureDataCreateBlobContainerInput(
+                resource_group=params.resource_group,
+                account_name=names["storage_account"],
+                container_name=names["blob_container"],
+                public_access="None",
             )
-            
-            if not storage_result.success:
-                return AzureFlowAddDataServicesOutput(
-                    ok=False,
-                    error=f"Failed to create storage account: {storage_result.error}",
-                    resources=resources,
-                )
-            
+        )
+    
+    async def create_sql_server(results: StepResults):
+        return await azure_data_create_sql_server(
+            AzureDataCreateSqlServerInput(
+                resource_group=params.resource_group,
+                name=names["sql_server"],
+                location=params.location,
+                admin_login=params.sql_admin_login,
+                admin_password_secret_ref=params.sql_admin_password_secret_ref,
+                tags=tags,
+            )
+        )
+    
+    async def create_sql_database(results: StepResults):
+        return await azure_data_create_sql_database(
+            AzureDataCreateSqlDatabaseInput(
+                resource_group=params.resource_group,
+                server_name=names["sql_server"],
+                database_name=names["sql_database"],
+                sku_name="Basic",
+            )
+        )
+    
+    async def set_sql_firewall_rule(results: StepResults):
+        return await azure_data_set_sql_firewall_rule_allow_azure_services(
+            AzureDataSetSqlFirewallRuleInput(
+                resource_group=params.resource_group,
+                server_name=names["sql_server"],
+            )
+        )
+    
+    steps = []
+    if params.include_storage:
+        steps += [
+            FlowStep("storage_account", create_storage_account, description="create storage account"),
+            FlowStep("blob_container", create_blob_container, ("storage_account",),
+                     description="create blob container"),
+        ]
+    if params.include_sql:
+        steps += [
+            FlowStep("sql_server", create_sql_server, description="create SQL server"),
+            FlowStep("sql_database", create_sql_database, ("sql_server",), description="create SQL database"),
+            FlowStep("sql_firewall_rule", set_sql_firewall_rule, ("sql_server",),
+                     description="set SQL firewall rule", required=False),
+        ]
+    
+    try:
+        run_id, results, error = await run_checkpointed_flow(
+            "azure_flow_add_data_services",
+            steps,
+            params.model_dump(exclude={"resume_run_id"}),
+            resume_run_id=params.resume_run_id,
+        )
+        
+        def succeeded(name: str) -> Optional[Dict[str, Any]]:
+            return results[name].result if name in results and results[name].ok else None
+        
+        resources = []
+        storage_account = storage_endpoint = blob_container = ""
+        sql_server = sql_server_fqdn = sql_database = ""
+        
+        storage = succeeded("storage_account")
+        if storage is not None:
             storage_account = names["storage_account"]
-            storage_endpoint = storage_result.primary_endpoint
-            
+            storage_endpoint = storage.get("primary_endpoint", "")
             resources.append(CreatedResource(
                 name=storage_account,
                 type="Microsoft.Storage/storageAccounts",
-                resource_id=storage_result.resource_id,
+                resource_id=storage.get("resource_id", ""),
                 status="created",
                 details={"endpoint": storage_endpoint},
             ))
-            
-            # Blob Container
-            logger.info(f"Creating blob container {names['blob_container']}")
-            
-            container_result = await azure_data_create_blob_container(
-                AzureDataCreateBlobContainerInput(
-                    resource_group=params.resource_group,
-                    account_name=storage_account,
-                    container_name=names["blob_container"],
-                    public_access="None",
-                )
-            )
-            
-            if not container_result.success:
-                return AzureFlowAddDataServicesOutput(
-                    ok=False,
-                    error=f"Failed to create blob container: {container_result.error}",
-                    storage_account=storage_account,
-                    storage_endpoint=storage_endpoint,
-                    resources=resources,
-                )
-            
+        container = succeeded("blob_container")
+        if container is not None:
             blob_container = names["blob_container"]
-            
             resources.append(CreatedResource(
                 name=blob_container,
                 type="Microsoft.Storage/blobContainers",
-                resource_id=container_result.resource_id,
+                resource_id=container.get("resource_id", ""),
                 status="created",
             ))
-        
-        # SQL Server and Database
-        if params.include_sql:
-            logger.info(f"Creating SQL server {names['sql_server']}")
-            
-            sql_server_result = await azure_data_create_sql_server(
-                AzureDataCreateSqlServerInput(
-                    resource_group=params.resource_group,
-                    name=names["sql_server"],
-                    location=params.location,
-                    admin_login=params.sql_admin_login,
-                    admin_password_secret_ref=params.sql_admin_password_secret_ref,
-                    tags=tags,
-                )
-            )
-            
-            if not sql_server_result.success:
-                return AzureFlowAddDataServicesOutput(
-                    ok=False,
-                    error=f"Failed to create SQL server: {sql_server_result.error}",
-                    storage_account=storage_account,
-                    storage_endpoint=storage_endpoint,
-                    blob_container=blob_container,
-                    resources=resources,
-                )
-            
+        server = succeeded("sql_server")
+        if server is not None:
             sql_server = names["sql_server"]
-            sql_server_fqdn = sql_server_result.fqdn
-            
+            sql_server_fqdn = server.get("fqdn", "")
             resources.append(CreatedResource(
                 name=sql_server,
                 type="Microsoft.Sql/servers",
-                resource_id=sql_server_result.resource_id,
+                resource_id=server.get("resource_id", ""),
                 status="created",
                 details={"fqdn": sql_server_fqdn},
             ))
-            
-            # SQL Database
-            logger.info(f"Creating SQL database {names['sql_database']}")
-            
-            db_result = await azure_data_create_sql_database(
-                AzureDataCreateSqlDatabaseInput(
-                    resource_group=params.resource_group,
-                    server_name=sql_server,
-                    database_name=names["sql_database"],
-                    sku_name="Basic",
-                )
-            )
-            
-            if not db_result.success:
-                return AzureFlowAddDataServicesOutput(
-                    ok=False,
-                    error=f"Failed to create SQL database: {db_result.error}",
-                    storage_account=storage_account,
-                    storage_endpoint=storage_endpoint,
-                    blob_container=blob_container,
-                    sql_server=sql_server,
-                    sql_server_fqdn=sql_server_fqdn,
-                    resources=resources,
-                )
-            
+        database = succeeded("sql_database")
+        if database is not None:
             sql_database = names["sql_database"]
-            
             resources.append(CreatedResource(
                 name=sql_database,
                 type="Microsoft.Sql/databases",
-                resource_id=db_result.resource_id,
+                resource_id=database.get("resource_id", ""),
+                status="created",
+            ))
+        firewall = succeeded("sql_firewall_rule")
+        if firewall is not None:
+            resources.append(CreatedResource(
+                name=firewall.get("rule_name", ""),
+                type="Microsoft.Sql/firewallRules",
                 status="created",
             ))
-            
-            # Firewall rule
-            logger.info("Setting SQL firewall rule for Azure services")
-            
-            fw_result = await azure_data_set_sql_firewall_rule_allow_azure_services(
-                AzureDataSetSqlFirewallRuleInput(
-                    resource_group=params.resource_group,
-                    server_name=sql_server,
-                )
+        elif "sql_firewall_rule" in results:
+            logger.warning(f"Firewall rule failed (non-fatal): {results['sql_firewall_rule'].error}")
+        
+        if error:
+            return AzureFlowAddDataServicesOutput(
+                ok=False,
+                error=error,
+                storage_account=storage_account,
+                storage_endpoint=storage_endpoint,
+                blob_container=blob_container,
+                sql_server=sql_server,
+                sql_server_fqdn=sql_server_fqdn,
+                sql_database=sql_database,
+                resources=resources,
+                run_id=run_id,
+                steps=_step_statuses(results),
             )
-            
-            if not fw_result.success:
-                logger.warning(f"Firewall rule failed (non-fatal): {fw_result.error}")
-            else:
-                resources.append(CreatedResource(
-                    name=fw_result.rule_name,
-                    type="Microsoft.Sql/firewallRules",
-                    status="created",
-                ))
         
         # Build summary
         summary_parts = [f"Added data services to '{params.resource_group}':"]
@@ -604,22 +919,24 @@ async def azure_flow_add_data_services(
             sql_server_fqdn=sql_server_fqdn,
             sql_database=sql_database,
             resources=resources,
+            run_id=run_id,
+            steps=_step_statuses(results),
             summary=summary,
         )
         
+    except ValueError as e:
+        return AzureFlowAddDataServicesOutput(ok=False, error=str(e))
     except AzureError as e:
         logger.error(f"Azure error in add_data_services: {e}")
         return AzureFlowAddDataServicesOutput(
             ok=False,
             error=str(e),
-            resources=resources,
         )
     except Exception as e:
         logger.error(f"Unexpected error in add_data_services: {e}")
         return AzureFlowAddDataServicesOutput(
             ok=False,
             error=f"Unexpected error: {str(e)}",
-            resources=resources,
         )
 
 
@@ -641,6 +958,7 @@ async def azure_flow_deploy_standard_template(
     """
     logger.info(f"Deploying template to {params.resource_group}: {params.deployment_name}")
     
+    from .deployment_tracker import FAILED_STATES, wait_for_deployment
     from .deployments import (
         azure_deployments_deploy_to_resource_group,
         AzureDeploymentsDeployToResourceGroupInput,
@@ -701,16 +1019,47 @@ async def azure_flow_deploy_standard_template(
                 deployment_name=params.deployment_name,
             )
         
-        # Build outputs dict
-        outputs = {}
-        for output in deploy_result.outputs:
-            outputs[output.key] = output.value
+        if not params.wait_for_completion:
+            return AzureFlowDeployStandardTemplateOutput(
+                ok=True,
+                deployment_name=params.deployment_name,
+                provisioning_state=deploy_result.provisioning_state,
+                handle=deploy_result.handle,
+                summary=(
+                    f"Deployment '{params.deployment_name}' started in {params.resource_group}; "
+                    f"follow it with azure_deployments_watch (handle {deploy_result.handle})"
+                ),
+            )
+        
+        # Follow the tracked deployment, collecting per-resource progress
+        progress = []
+        
+        def on_progress(event: Dict[str, Any]) -> None:
+            line = f"{event['resource_type']}/{event['resource_name']}: {event['provisioning_state']}"
+            if event["status_message"] and event["provisioning_state"] == "Failed":
+                line += f" ({event['status_message'][:200]})"
+            progress.append(line)
+        
+        record = await wait_for_deployment(deploy_result.handle, on_progress=on_progress)
+        outputs = record["outputs"]
+        state = record["provisioning_state"]
+        
+        if state in FAILED_STATES:
+            return AzureFlowDeployStandardTemplateOutput(
+                ok=False,
+                error=f"Deployment {state.lower()}: {record['error']}",
+                deployment_name=params.deployment_name,
+                provisioning_state=state,
+                correlation_id=record["correlation_id"],
+                handle=deploy_result.handle,
+                progress=progress,
+            )
         
         # Build summary
         summary = (
-            f"Deployment '{params.deployment_name}' completed:\n"
+            f"Deployment '{params.deployment_name}' {'completed' if record['finished'] else 'still running'}:\n"
             f"  - Resource Group: {params.resource_group}\n"
-            f"  - State: {deploy_result.provisioning_state}\n"
+            f"  - State: {state}\n"
             f"  - Mode: {params.mode}"
         )
         
@@ -719,14 +1068,16 @@ async def azure_flow_deploy_standard_template(
             for key, value in outputs.items():
                 summary += f"\n    - {key}: {value}"
         
-        logger.info(f"Deployment completed: {deploy_result.provisioning_state}")
+        logger.info(f"Deployment {params.deployment_name}: {state}")
         
         return AzureFlowDeployStandardTemplateOutput(
             ok=True,
             deployment_name=params.deployment_name,
-            provisioning_state=deploy_result.provisioning_state,
+            provisioning_state=state,
             outputs=outputs,
-            correlation_id=deploy_result.correlation_id,
+            correlation_id=record["correlation_id"],
+            handle=deploy_result.handle,
+            progress=progress,
             summary=summary,
         )
         
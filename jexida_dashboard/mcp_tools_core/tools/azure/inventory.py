@@ -0,0 +1,359 @@
+"""Azure resource inventory snapshots and diffs.
+
+take_snapshot() reads every resource of the configured subscriptions
+through Resource Graph (one paged query instead of a list call per type)
+and stores id, type, location, tags, SKU and provisioning state in
+AzureInventoryResource rows under an AzureInventorySnapshot. Each row
+carries a hash of its content and the snapshot a hash over all of them,
+so diff_snapshots() compares two snapshots locally:
+- Identical snapshot hashes mean nothing changed; no rows are read
+- Otherwise (resource_id, content_hash) pairs are compared and only the
+  added, removed and modified resources are loaded
+- Only subscriptions present in both snapshots are compared, so adding
+  a subscription to the job does not show its resources as added
+
+Snapshots older than AZURE_INVENTORY_RETENTION_DAYS are pruned when a
+new one is stored; the latest snapshot is always kept.
+
+Usage:
+    snapshot = await take_snapshot(["sub-a", "sub-b"])
+    diff = await diff_snapshots()  # previous snapshot -> latest
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from asgiref.sync import sync_to_async
+
+from .auth import get_subscription_id
+from .resource_graph import GraphQueryStats, PageFetch, _fetch_page, iter_graph_pages
+
+logger = logging.getLogger(__name__)
+
+
+INVENTORY_RETENTION_DAYS = int(os.environ.get("AZURE_INVENTORY_RETENTION_DAYS", "30"))
+
+INVENTORY_QUERY = (
+    "Resources "
+    "| project id, name, type, location, resourceGroup, subscriptionId, tags, sku, "
+    "provisioningState = tostring(properties.provisioningState)"
+)
+
+# Fields that make up a resource's content hash; a change in any is a modification
+HASHED_FIELDS = ("name", "resource_type", "location", "tags", "sku", "provisioning_state")
+
+# Rows per IN (...) lookup, below SQLite's variable limit
+LOOKUP_CHUNK = 500
+
+
+def configured_subscriptions() -> List[str]:
+    """AZURE_INVENTORY_SUBSCRIPTIONS (comma-separated), else the default subscription."""
+    configured = [s.strip() for s in os.environ.get("AZURE_INVENTORY_SUBSCRIPTIONS", "").split(",") if s.strip()]
+    return configured or [get_subscription_id()]
+
+
+# =============================================================================
+# Normalization and hashing
+# =============================================================================
+
+def normalize_resource(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Store fields of one Resource Graph row.
+
+    IDs, types, groups and regions are lowercased since ARM treats them
+    case-insensitively and returns them in varying case.
+    """
+    sku = row.get("sku")
+    return {
+        "resource_id": str(row.get("id") or "").lower(),
+        "subscription_id": str(row.get("subscriptionId") or "").lower(),
+        "resource_group": str(row.get("resourceGroup") or "").lower(),
+        "name": str(row.get("name") or ""),
+        "resource_type": str(row.get("type") or "").lower(),
+        "location": str(row.get("location") or "").lower(),
+        "tags": dict(row.get("tags") or {}),
+        "sku": dict(sku) if isinstance(sku, dict) else {},
+        "provisioning_state": str(row.get("provisioningState") or ""),
+    }
+
+
+def resource_hash(resource: Dict[str, Any]) -> str:
+    content = {field: resource.get(field) for field in HASHED_FIELDS}
+    return hashlib.sha256(json.dumps(content, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
+def snapshot_hash(hashes: Dict[str, str]) -> str:
+    """Hash over (resource_id, content_hash) pairs, independent of order."""
+    digest = hashlib.sha256()
+    for resource_id in sorted(hashes):
+        digest.update(f"{resource_id}:{hashes[resource_id]}\n".encode())
+    return digest.hexdigest()
+
+
+def diff_hashes(old: Dict[str, str], new: Dict[str, str]) -> Tuple[List[str], List[str], List[str]]:
+    """(added, removed, modified) resource IDs, each sorted."""
+    added = sorted(new.keys() - old.keys())
+    removed = sorted(old.keys() - new.keys())
+    modified = sorted(rid for rid in old.keys() & new.keys() if old[rid] != new[rid])
+    return added, removed, modified
+
+
+def changed_fields(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Field -> {before, after} for every hashed field that differs."""
+    return {
+        field: {"before": before.get(field), "after": after.get(field)}
+        for field in HASHED_FIELDS
+        if before.get(field) != after.get(field)
+    }
+
+
+# =============================================================================
+# Persistence
+# =============================================================================
+
+def _snapshot_info(row) -> Dict[str, Any]:
+    return {
+        "id": row.id,
+        "taken_at": row.taken_at,
+        "subscriptions": list(row.subscriptions),
+        "resource_count": row.resource_count,
+        "content_hash": row.content_hash,
+        "duration_seconds": row.duration_seconds,
+    }
+
+
+class InventoryStore:
+    """ORM access to the inventory tables (synchronous; wrap with sync_to_async)."""
+
+    def save(
+        self,
+        taken_at: datetime,
+        subscriptions: List[str],
+        resources: List[Dict[str, Any]],
+        content_hash: str,
+        duration_seconds: float,
+    ) -> Dict[str, Any]:
+        """Store a snapshot; each resource dict carries its content_hash."""
+        from django.db import transaction
+        from mcp_tools_core.models import AzureInventoryResource, AzureInventorySnapshot
+
+        with transaction.atomic():
+            snapshot = AzureInventorySnapshot.objects.create(
+                taken_at=taken_at,
+                subscriptions=subscriptions,
+                resource_count=len(resources),
+                content_hash=content_hash,
+                duration_seconds=duration_seconds,
+            )
+            AzureInventoryResource.objects.bulk_create(
+                [AzureInventoryResource(snapshot=snapshot, **resource) for resource in resources],
+                batch_size=1000,
+            )
+        return _snapshot_info(snapshot)
+
+    def snapshots(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Most recent snapshots first."""
+        from mcp_tools_core.models import AzureInventorySnapshot
+
+        return [_snapshot_info(row) for row in AzureInventorySnapshot.objects.order_by("-taken_at", "-id")[:limit]]
+
+    def get(self, snapshot_id: int) -> Optional[Dict[str, Any]]:
+        from mcp_tools_core.models import AzureInventorySnapshot
+
+        row = AzureInventorySnapshot.objects.filter(id=snapshot_id).first()
+        return _snapshot_info(row) if row else None
+
+    def previous(self, snapshot: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """The snapshot taken before `snapshot`."""
+        from django.db.models import Q
+        from mcp_tools_core.models import AzureInventorySnapshot
+
+        row = AzureInventorySnapshot.objects.filter(
+            Q(taken_at__lt=snapshot["taken_at"]) | Q(taken_at=snapshot["taken_at"], id__lt=snapshot["id"])
+        ).order_by("-taken_at", "-id").first()
+        return _snapshot_info(row) if row else None
+
+    def hashes(
+        self,
+        snapshot_id: int,
+        subscriptions: Optional[Sequence[str]] = None,
+        resource_type: Optional[str] = None,
+    ) -> Dict[str, str]:
+        """resource_id -> content_hash, read from the (snapshot, ...) index."""
+        from mcp_tools_core.models import AzureInventoryResource
+
+        qs = AzureInventoryResource.objects.filter(snapshot_id=snapshot_id)
+        if subscriptions is not None:
+            qs = qs.filter(subscription_id__in=list(subscriptions))
+        if resource_type:
+            qs = qs.filter(resource_type=resource_type.lower())
+        return dict(qs.values_list("resource_id", "content_hash"))
+
+    def resources(self, snapshot_id: int, resource_ids: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """Stored fields of the given resources by ID."""
+        from mcp_tools_core.models import AzureInventoryResource
+
+        fields = ("resource_id", "subscription_id", "resource_group") + HASHED_FIELDS
+        found: Dict[str, Dict[str, Any]] = {}
+        ids = list(resource_ids)
+        for start in range(0, len(ids), LOOKUP_CHUNK):
+            qs = AzureInventoryResource.objects.filter(
+                snapshot_id=snapshot_id, resource_id__in=ids[start:start + LOOKUP_CHUNK],
+            )
+            for row in qs.values(*fields):
+                found[row["resource_id"]] = row
+        return found
+
+    def prune(self, before: datetime) -> int:
+        """Delete snapshots taken before `before`, except the latest; returns how many."""
+        from mcp_tools_core.models import AzureInventorySnapshot
+
+        latest = AzureInventorySnapshot.objects.order_by("-taken_at", "-id").values_list("id", flat=True).first()
+        qs = AzureInventorySnapshot.objects.filter(taken_at__lt=before).exclude(id=latest)
+        count = qs.count()
+        if count:
+            qs.delete()
+        return count
+
+
+# =============================================================================
+# Public API
+# =============================================================================
+
+async def take_snapshot(
+    subscription_ids: Optional[Sequence[str]] = None,
+    store: Optional[InventoryStore] = None,
+    fetch: PageFetch = _fetch_page,
+) -> Dict[str, Any]:
+    """Query all resources of the subscriptions and store them as a snapshot.
+
+    Args:
+        subscription_ids: Subscriptions to include (default: configured_subscriptions())
+        store: Inventory store
+        fetch: Resource Graph page fetcher
+
+    Returns:
+        Snapshot info, plus "unchanged" (same content as the previous
+        snapshot) and "pruned" (old snapshots deleted)
+
+    Raises:
+        ValueError: Resource Graph reported a truncated result; storing it
+            would show the missing resources as removed
+    """
+    store = store or InventoryStore()
+    subscriptions = sorted({s.lower() for s in (subscription_ids or configured_subscriptions())})
+    started = time.monotonic()
+    taken_at = datetime.now(timezone.utc)
+
+    stats = GraphQueryStats()
+    resources: Dict[str, Dict[str, Any]] = {}
+    async for page in iter_graph_pages(INVENTORY_QUERY, subscriptions, use_cache=False, stats=stats, fetch=fetch):
+        for row in page:
+            resource = normalize_resource(row)
+            if resource["resource_id"]:
+                resources[resource["resource_id"]] = resource
+    if stats.result_truncated:
+        raise ValueError("Resource Graph truncated the inventory result; snapshot not stored")
+
+    for resource in resources.values():
+        resource["content_hash"] = resource_hash(resource)
+    content_hash = snapshot_hash({rid: r["content_hash"] for rid, r in resources.items()})
+
+    previous = (await sync_to_async(store.snapshots)(1) or [None])[0]
+    snapshot = await sync_to_async(store.save)(
+        taken_at, subscriptions, list(resources.values()), content_hash, time.monotonic() - started,
+    )
+    pruned = 0
+    if INVENTORY_RETENTION_DAYS > 0:
+        pruned = await sync_to_async(store.prune)(taken_at - timedelta(days=INVENTORY_RETENTION_DAYS))
+
+    snapshot["unchanged"] = bool(
+        previous and previous["content_hash"] == content_hash and previous["subscriptions"] == subscriptions
+    )
+    snapshot["pruned"] = pruned
+    logger.info(
+        f"Stored inventory snapshot {snapshot['id']}: {len(resources)} resources from "
+        f"{len(subscriptions)} subscription(s) in {snapshot['duration_seconds']:.1f}s"
+    )
+    return snapshot
+
+
+async def list_snapshots(limit: int = 20, store: Optional[InventoryStore] = None) -> List[Dict[str, Any]]:
+    """Stored snapshots, most recent first."""
+    store = store or InventoryStore()
+    return await sync_to_async(store.snapshots)(limit)
+
+
+async def diff_snapshots(
+    from_snapshot_id: Optional[int] = None,
+    to_snapshot_id: Optional[int] = None,
+    resource_type: Optional[str] = None,
+    store: Optional[InventoryStore] = None,
+) -> Dict[str, Any]:
+    """Added, removed and modified resources between two snapshots.
+
+    Args:
+        from_snapshot_id: Older snapshot (default: the one before to_snapshot_id)
+        to_snapshot_id: Newer snapshot (default: the latest)
+        resource_type: Only compare resources of this type
+        store: Inventory store
+
+    Returns:
+        {"from": info, "to": info, "subscriptions": compared subscriptions,
+         "added": [resource], "removed": [resource],
+         "modified": [resource with "changes"]}
+
+    Raises:
+        ValueError: A snapshot does not exist
+    """
+    store = store or InventoryStore()
+
+    if to_snapshot_id is None:
+        latest = await sync_to_async(store.snapshots)(1)
+        if not latest:
+            raise ValueError("No inventory snapshots have been taken yet")
+        to_snapshot = latest[0]
+    else:
+        to_snapshot = await sync_to_async(store.get)(to_snapshot_id)
+        if to_snapshot is None:
+            raise ValueError(f"Inventory snapshot {to_snapshot_id} not found")
+
+    if from_snapshot_id is None:
+        from_snapshot = await sync_to_async(store.previous)(to_snapshot)
+        if from_snapshot is None:
+            raise ValueError(f"No inventory snapshot before {to_snapshot['id']} to compare with")
+    else:
+        from_snapshot = await sync_to_async(store.get)(from_snapshot_id)
+        if from_snapshot is None:
+            raise ValueError(f"Inventory snapshot {from_snapshot_id} not found")
+
+    common = sorted(set(from_snapshot["subscriptions"]) & set(to_snapshot["subscriptions"]))
+    result: Dict[str, Any] = {
+        "from": from_snapshot,
+        "to": to_snapshot,
+        "subscriptions": common,
+        "added": [],
+        "removed": [],
+        "modified": [],
+    }
+    same_scope = from_snapshot["subscriptions"] == to_snapshot["subscriptions"]
+    if same_scope and from_snapshot["content_hash"] == to_snapshot["content_hash"]:
+        return result
+
+    scope = None if same_scope else common
+    old = await sync_to_async(store.hashes)(from_snapshot["id"], scope, resource_type)
+    new = await sync_to_async(store.hashes)(to_snapshot["id"], scope, resource_type)
+    added, removed, modified = diff_hashes(old, new)
+
+    before = await sync_to_async(store.resources)(from_snapshot["id"], removed + modified)
+    after = await sync_to_async(store.resources)(to_snapshot["id"], added + modified)
+    result["added"] = [after[rid] for rid in added]
+    result["removed"] = [before[rid] for rid in removed]
+    result["modified"] = [
+        dict(after[rid], changes=changed_fields(before[rid], after[rid])) for rid in modified
+    ]
+    return result
@@ -2,26 +2,36 @@
 
 Provides MCP tools for:
 - Getting metrics for resources
+- Getting aligned, downsampled metrics for many resources at once
 - Querying Log Analytics workspaces
 - Listing active alerts
 """
 
+import asyncio
 import logging
-from datetime import datetime, timedelta
-from typing import Optional, List, Dict, Any
+import math
+import os
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Optional, List, Dict, Any, Tuple
 
 from pydantic import BaseModel, Field
 
 from .auth import (
-    get_credential_and_subscription,
-    get_azure_credential,
+    get_management_client,
+    get_subscription_id,
     AzureError,
     wrap_azure_error,
 )
+from .utils import run_blocking
 
 logger = logging.getLogger(__name__)
 
 
+# Resources whose metrics are fetched at the same time by azure_monitoring_get_metrics_batch
+METRICS_MAX_CONCURRENCY = int(os.environ.get("AZURE_METRICS_MAX_CONCURRENCY", "8"))
+
+
 # =============================================================================
 # Input/Output Schemas
 # =============================================================================
@@ -75,6 +85,80 @@ class AzureMonitoringGetMetricsOutput(BaseModel):
     error: str = Field(default="", description="Error message if failed")
 
 
+class AzureMonitoringGetMetricsBatchInput(BaseModel):
+    """Input schema for azure_monitoring_get_metrics_batch."""
+    resource_ids: Optional[List[str]] = Field(
+        default=None,
+        description="Full Azure resource IDs (or use resource_group and resource_type)"
+    )
+    resource_group: Optional[str] = Field(
+        default=None,
+        description="Resource group whose resources of resource_type are queried"
+    )
+    resource_type: Optional[str] = Field(
+        default=None,
+        description="Resource type within resource_group (e.g., 'Microsoft.Web/sites')"
+    )
+    subscription_id: Optional[str] = Field(
+        default=None,
+        description="Subscription of resource_group (uses default if not provided)"
+    )
+    metric_names: List[str] = Field(
+        description="List of metric names to retrieve (e.g., ['Percentage CPU'])"
+    )
+    timespan: str = Field(
+        default="PT1H",
+        description="ISO 8601 duration ending now (e.g., 'PT1H', 'P1D')"
+    )
+    interval: str = Field(
+        default="PT5M",
+        description="Metric granularity requested from Azure"
+    )
+    aggregation: str = Field(
+        default="Average",
+        description="Aggregation: Average, Total, Count, Maximum, or Minimum"
+    )
+    max_points: int = Field(
+        default=500,
+        description="Budget of data points across all series; series are downsampled to fit"
+    )
+
+
+class MetricSeries(BaseModel):
+    """One metric timeseries of one resource on the shared time grid."""
+    resource_id: str = Field(description="Resource ID")
+    resource_name: str = Field(default="", description="Resource name")
+    metric: str = Field(description="Metric name")
+    unit: str = Field(default="", description="Metric unit")
+    dimensions: Dict[str, str] = Field(
+        default_factory=dict,
+        description="Dimension values of this timeseries when Azure splits the metric (one series each)"
+    )
+    values: List[Optional[float]] = Field(
+        default_factory=list,
+        description="One value per timestamp (null where Azure had no data)"
+    )
+
+
+class MetricQueryError(BaseModel):
+    """A resource whose metrics could not be fetched."""
+    resource_id: str = Field(description="Resource ID")
+    error: str = Field(description="Error message")
+
+
+class AzureMonitoringGetMetricsBatchOutput(BaseModel):
+    """Output schema for azure_monitoring_get_metrics_batch."""
+    success: bool = Field(description="Whether the request succeeded")
+    timestamps: List[str] = Field(default_factory=list, description="Shared ISO 8601 timestamps for all series")
+    interval: str = Field(default="", description="Interval between returned points after downsampling")
+    source_interval: str = Field(default="", description="Interval requested from Azure")
+    aggregation: str = Field(default="", description="Aggregation of the values")
+    series: List[MetricSeries] = Field(default_factory=list, description="Aligned series")
+    resources: int = Field(default=0, description="Resources queried")
+    errors: List[MetricQueryError] = Field(default_factory=list, description="Resources that failed")
+    error: str = Field(default="", description="Error message if failed")
+
+
 class AzureMonitoringQueryLogsInput(BaseModel):
     """Input schema for azure_monitoring_query_logs."""
     workspace_id: str = Field(
@@ -182,14 +266,14 @@ async def azure_monitoring_get_metrics(
                 error="Could not parse subscription ID from resource ID",
             )
         
-        credential = get_azure_credential()
-        client = MonitorManagementClient(credential, subscription_id)
+        client = get_management_client(MonitorManagementClient, subscription_id)
         
         # Build aggregation list
         aggregations = params.aggregation or ["Average"]
         
         # Query metrics
-        response = client.metrics.list(
+        response = await run_blocking(
+            client.metrics.list,
             resource_uri=params.resource_id,
             metricnames=",".join(params.metric_names),
             timespan=params.timespan,
@@ -248,6 +332,277 @@ async def azure_monitoring_get_metrics(
         )
 
 
+# =============================================================================
+# Series alignment and downsampling
+# =============================================================================
+
+_DURATION_RE = re.compile(
+    r"^P(?:(?P<days>\d+)D)?(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+)S)?)?$"
+)
+
+# Aggregation name -> (MetricValue attribute, how points combine when downsampling)
+AGGREGATIONS = {
+    "Average": ("average", lambda values: sum(values) / len(values)),
+    "Total": ("total", sum),
+    "Count": ("count", sum),
+    "Maximum": ("maximum", max),
+    "Minimum": ("minimum", min),
+}
+
+
+def parse_duration(value: str) -> timedelta:
+    """Parse an ISO 8601 duration of days, hours, minutes and seconds."""
+    match = _DURATION_RE.match(value.strip().upper())
+    if not match or not any(match.groupdict().values()):
+        raise ValueError(f"Unsupported ISO 8601 duration: {value!r} (use e.g. PT5M, PT1H, P1D)")
+    duration = timedelta(**{k: int(v) for k, v in match.groupdict().items() if v})
+    if duration <= timedelta(0):
+        raise ValueError(f"Duration must be positive: {value!r}")
+    return duration
+
+
+def format_duration(duration: timedelta) -> str:
+    """Format a timedelta as an ISO 8601 duration (e.g. PT15M, P1DT12H)."""
+    days = duration.days
+    hours, rest = divmod(duration.seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    time_part = "".join(f"{n}{unit}" for n, unit in ((hours, "H"), (minutes, "M"), (seconds, "S")) if n)
+    if not (days or time_part):
+        return "PT0S"
+    return "P" + (f"{days}D" if days else "") + (f"T{time_part}" if time_part else "")
+
+
+def metric_window(timespan: timedelta, interval: timedelta, now: datetime) -> Tuple[datetime, int]:
+    """Start and point count of a grid of `interval` steps ending at `now`.
+
+    The end is floored to a multiple of the interval so every resource is
+    queried for the same absolute window.
+    """
+    step = interval.total_seconds()
+    end = datetime.fromtimestamp(math.floor(now.timestamp() / step) * step, tz=timezone.utc)
+    count = max(1, math.ceil(timespan / interval))
+    return end - count * interval, count
+
+
+def align_points(
+    points: List[Tuple[datetime, Optional[float]]],
+    start: datetime,
+    interval: timedelta,
+    count: int,
+) -> List[Optional[float]]:
+    """Place (timestamp, value) points on the grid; missing slots are None."""
+    values: List[Optional[float]] = [None] * count
+    for timestamp, value in points:
+        if value is None:
+            continue
+        index = round((timestamp - start) / interval)
+        if 0 <= index < count:
+            values[index] = value
+    return values
+
+
+def downsample_factor(count: int, series: int, max_points: int) -> int:
+    """Grid points merged per returned point so all series fit in max_points."""
+    per_series = max(1, max_points // max(1, series))
+    return max(1, math.ceil(count / per_series))
+
+
+def downsample(values: List[Optional[float]], factor: int, aggregation: str) -> List[Optional[float]]:
+    """Merge each run of `factor` points with the aggregation's combine rule."""
+    if factor <= 1:
+        return list(values)
+    combine = AGGREGATIONS[aggregation][1]
+    result: List[Optional[float]] = []
+    for i in range(0, len(values), factor):
+        bucket = [v for v in values[i:i + factor] if v is not None]
+        result.append(combine(bucket) if bucket else None)
+    return result
+
+
+def _subscription_from_resource_id(resource_id: str) -> Optional[str]:
+    parts = resource_id.strip("/").split("/")
+    for i, part in enumerate(parts):
+        if part.lower() == "subscriptions" and i + 1 < len(parts):
+            return parts[i + 1]
+    return None
+
+
+async def _list_resource_ids(subscription_id: str, resource_group: str, resource_type: str) -> List[str]:
+    from azure.mgmt.resource import ResourceManagementClient
+
+    client = get_management_client(ResourceManagementClient, subscription_id)
+    resources = await run_blocking(lambda: list(client.resources.list_by_resource_group(
+        resource_group,
+        filter=f"resourceType eq '{resource_type}'",
+    )))
+    return [resource.id for resource in resources]
+
+
+def _timeseries_dimensions(ts: Any) -> Dict[str, str]:
+    """Dimension name -> value of one metric timeseries."""
+    return {
+        (meta.name.value if meta.name else ""): meta.value or ""
+        for meta in (ts.metadatavalues or [])
+    }
+
+
+def _fetch_metric_points(
+    resource_id: str,
+    metric_names: List[str],
+    timespan: str,
+    interval: str,
+    aggregation: str,
+) -> List[Tuple[str, str, Dict[str, str], List[Tuple[datetime, Optional[float]]]]]:
+    """Fetch one resource's metrics (blocking).
+
+    Returns (name, unit, dimensions, points) per timeseries. A metric split
+    by dimension has one timeseries per dimension value; they are kept
+    apart rather than merged onto one grid. A metric without data yields
+    one empty series.
+    """
+    from azure.mgmt.monitor import MonitorManagementClient
+
+    subscription_id = _subscription_from_resource_id(resource_id)
+    if not subscription_id:
+        raise ValueError("Could not parse subscription ID from resource ID")
+    client = get_management_client(MonitorManagementClient, subscription_id)
+    response = client.metrics.list(
+        resource_uri=resource_id,
+        metricnames=",".join(metric_names),
+        timespan=timespan,
+        interval=interval,
+        aggregation=aggregation,
+    )
+    attribute = AGGREGATIONS[aggregation][0]
+    metrics = []
+    for metric in response.value:
+        name = metric.name.value if metric.name else ""
+        unit = metric.unit.value if metric.unit else ""
+        timeseries = metric.timeseries or []
+        if not timeseries:
+            metrics.append((name, unit, {}, []))
+        for ts in timeseries:
+            points = [
+                (point.time_stamp, getattr(point, attribute))
+                for point in (ts.data or [])
+                if point.time_stamp
+            ]
+            metrics.append((name, unit, _timeseries_dimensions(ts), points))
+    return metrics
+
+
+async def azure_monitoring_get_metrics_batch(
+    params: AzureMonitoringGetMetricsBatchInput
+) -> AzureMonitoringGetMetricsBatchOutput:
+    """Get the same metrics for many resources on one time grid.
+    
+    Resources are queried concurrently (up to AZURE_METRICS_MAX_CONCURRENCY
+    at once) for the same absolute window, so every series shares one list
+    of timestamps. Series are then downsampled with the aggregation's own
+    rule (mean for Average, sum for Total/Count, max/min) until all of them
+    fit in max_points. A resource that fails is reported in errors without
+    failing the others.
+    
+    Args:
+        params.resource_ids: Resource IDs to query
+        params.resource_group: Or a resource group...
+        params.resource_type: ...and resource type to list resources from
+        params.metric_names: Metric names
+        params.timespan: ISO 8601 duration ending now
+        params.interval: Metric granularity requested from Azure
+        params.aggregation: Single aggregation type
+        params.max_points: Point budget across all series
+        
+    Returns:
+        Shared timestamps and one value list per resource, metric and
+        timeseries (dimension value)
+    """
+    try:
+        aggregation = params.aggregation.capitalize()
+        if aggregation not in AGGREGATIONS:
+            raise ValueError(f"aggregation must be one of: {', '.join(AGGREGATIONS)}")
+        timespan = parse_duration(params.timespan)
+        interval = parse_duration(params.interval)
+        
+        resource_ids = list(dict.fromkeys(params.resource_ids or []))
+        if not resource_ids:
+            if not (params.resource_group and params.resource_type):
+                raise ValueError("Provide resource_ids, or resource_group and resource_type")
+            subscription_id = get_subscription_id(params.subscription_id)
+            resource_ids = await _list_resource_ids(subscription_id, params.resource_group, params.resource_type)
+        
+        logger.info(f"Getting metrics {params.metric_names} for {len(resource_ids)} resources")
+        
+        start, count = metric_window(timespan, interval, datetime.now(timezone.utc))
+        absolute_timespan = f"{start.isoformat()}/{(start + count * interval).isoformat()}"
+        semaphore = asyncio.Semaphore(METRICS_MAX_CONCURRENCY)
+        
+        async def fetch(resource_id: str):
+            async with semaphore:
+                return await run_blocking(
+                    _fetch_metric_points,
+                    resource_id,
+                    params.metric_names,
+                    absolute_timespan,
+                    params.interval,
+                    aggregation,
+                )
+        
+        results = await asyncio.gather(*(fetch(rid) for rid in resource_ids), return_exceptions=True)
+        
+        fetched = []
+        errors = []
+        for resource_id, result in zip(resource_ids, results):
+            if isinstance(result, BaseException):
+                message = str(result) if isinstance(result, AzureError) else wrap_azure_error(result).message
+                logger.warning(f"Failed to get metrics for {resource_id}: {message}")
+                errors.append(MetricQueryError(resource_id=resource_id, error=message))
+            else:
+                fetched.extend((resource_id, *metric) for metric in result)
+        
+        factor = downsample_factor(count, len(fetched), params.max_points)
+        series = [
+            MetricSeries(
+                resource_id=resource_id,
+                resource_name=resource_id.rstrip("/").split("/")[-1],
+                metric=name,
+                unit=unit,
+                dimensions=dimensions,
+                values=downsample(align_points(points, start, interval, count), factor, aggregation),
+            )
+            for resource_id, name, unit, dimensions, points in fetched
+        ]
+        timestamps = [(start + i * interval).isoformat() for i in range(0, count, factor)]
+        
+        logger.info(f"Retrieved {len(series)} series of {len(timestamps)} points ({len(errors)} failed)")
+        
+        return AzureMonitoringGetMetricsBatchOutput(
+            success=bool(series) or not errors,
+            timestamps=timestamps,
+            interval=format_duration(interval * factor),
+            source_interval=format_duration(interval),
+            aggregation=aggregation,
+            series=series,
+            resources=len(resource_ids),
+            errors=errors,
+            error=errors[0].error if errors and not series else "",
+        )
+        
+    except AzureError as e:
+        logger.error(f"Azure error getting batch metrics: {e}")
+        return AzureMonitoringGetMetricsBatchOutput(
+            success=False,
+            error=str(e),
+        )
+    except Exception as e:
+        logger.error(f"Failed to get batch metrics: {e}")
+        wrapped = wrap_azure_error(e)
+        return AzureMonitoringGetMetricsBatchOutput(
+            success=False,
+            error=wrapped.message,
+        )
+
+
 async def azure_monitoring_query_logs(
     params: AzureMonitoringQueryLogsInput
 ) -> AzureMonitoringQueryLogsOutput:
@@ -273,8 +628,7 @@ async def azure_monitoring_query_logs(
     try:
         from azure.monitor.query import LogsQueryClient, LogsQueryStatus
         
-        credential = get_azure_credential()
-        client = LogsQueryClient(credential)
+        client = get_management_client(LogsQueryClient)
         
         # Parse timespan into timedelta
         # Simple parsing for common formats
@@ -295,7 +649,8 @@ async def azure_monitoring_query_logs(
                 timespan_td = timedelta(days=days)
         
         # Execute query
-        response = client.query_workspace(
+        response = await run_blocking(
+            client.query_workspace,
             workspace_id=params.workspace_id,
             query=params.kusto_query,
             timespan=timespan_td,
@@ -381,8 +736,8 @@ async def azure_monitoring_list_alerts(
     try:
         from azure.mgmt.alertsmanagement import AlertsManagementClient
         
-        credential, subscription_id = get_credential_and_subscription(params.subscription_id)
-        client = AlertsManagementClient(credential, subscription_id)
+        subscription_id = get_subscription_id(params.subscription_id)
+        client = get_management_client(AlertsManagementClient, subscription_id)
         
         # Build filter
         filter_str = params.filter
@@ -399,7 +754,7 @@ async def azure_monitoring_list_alerts(
         else:
             alert_list = client.alerts.get_all()
         
-        for alert in alert_list:
+        for alert in await run_blocking(list, alert_list):
             props = alert.properties if hasattr(alert, 'properties') else None
             essentials = props.essentials if props and hasattr(props, 'essentials') else None
             
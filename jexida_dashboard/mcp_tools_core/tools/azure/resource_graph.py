@@ -0,0 +1,311 @@
+"""Paged Azure Resource Graph queries.
+
+Resource Graph returns at most 1000 rows per response and a $skipToken
+for the rest, so a single request silently truncates large inventories.
+iter_graph_pages() follows the skip tokens and yields one page at a time,
+so callers can stream results instead of holding them all in memory:
+- Subscriptions are split into batches of AZURE_GRAPH_SUBSCRIPTION_BATCH
+  and the batches are queried in parallel (AZURE_GRAPH_MAX_CONCURRENCY)
+- Paging stops once `limit` rows have been produced
+- Complete results of up to GRAPH_CACHE_MAX_ROWS rows are cached for
+  AZURE_GRAPH_CACHE_SECONDS, keyed by the normalized query text
+stream_ndjson() drives the same pages from synchronous code (Django views)
+as newline-delimited JSON.
+
+Usage:
+    stats = GraphQueryStats()
+    async for row in iter_graph_rows(query, ["sub-a", "sub-b"], stats=stats):
+        ...
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .auth import get_management_client, wrap_azure_error
+from .utils import run_blocking
+
+logger = logging.getLogger(__name__)
+
+
+# Largest page Resource Graph will return
+GRAPH_PAGE_SIZE = 1000
+
+GRAPH_MAX_CONCURRENCY = int(os.environ.get("AZURE_GRAPH_MAX_CONCURRENCY", "4"))
+GRAPH_SUBSCRIPTION_BATCH = int(os.environ.get("AZURE_GRAPH_SUBSCRIPTION_BATCH", "100"))
+GRAPH_CACHE_SECONDS = float(os.environ.get("AZURE_GRAPH_CACHE_SECONDS", "60"))
+
+# Larger results are streamed but not cached
+GRAPH_CACHE_MAX_ROWS = 5000
+GRAPH_CACHE_MAX_ENTRIES = 128
+
+# (subscriptions, query, top, skip_token) -> (rows, next skip_token, total_records, result_truncated)
+PageFetch = Callable[[List[str], str, int, Optional[str]], Tuple[List[Dict[str, Any]], Optional[str], int, bool]]
+
+
+@dataclass
+class GraphQueryStats:
+    """Filled in while a query is iterated."""
+    subscriptions: int = 0
+    total_records: int = 0
+    rows: int = 0
+    pages: int = 0
+    cached: bool = False
+    has_more: bool = False
+    result_truncated: bool = False
+
+
+# =============================================================================
+# Query normalization and cache
+# =============================================================================
+
+def normalize_kql(query: str) -> str:
+    """Collapse whitespace and drop // comments outside string literals.
+
+    Queries that differ only in layout share a cache entry; string
+    literals are left untouched since KQL comparisons can be exact.
+    """
+    out: List[str] = []
+    quote = ""
+    i = 0
+    while i < len(query):
+        ch = query[i]
+        if quote:
+            out.append(ch)
+            if ch == "\\" and i + 1 < len(query):
+                out.append(query[i + 1])
+                i += 1
+            elif ch == quote:
+                quote = ""
+        elif ch in ("'", '"'):
+            quote = ch
+            out.append(ch)
+        elif query.startswith("//", i):
+            end = query.find("\n", i)
+            i = len(query) if end < 0 else end
+            continue
+        elif ch.isspace():
+            if out and out[-1] != " ":
+                out.append(" ")
+        else:
+            out.append(ch)
+        i += 1
+    return "".join(out).strip()
+
+
+_cache: Dict[Tuple[str, Tuple[str, ...], Optional[int]], Tuple[float, List[Dict[str, Any]], GraphQueryStats]] = {}
+_cache_lock = threading.Lock()
+
+
+def _cache_get(key) -> Optional[Tuple[List[Dict[str, Any]], GraphQueryStats]]:
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is None:
+            return None
+        expires, rows, stats = entry
+        if expires < time.monotonic():
+            del _cache[key]
+            return None
+        return rows, stats
+
+
+def _cache_put(key, rows: List[Dict[str, Any]], stats: GraphQueryStats) -> None:
+    if GRAPH_CACHE_SECONDS <= 0:
+        return
+    with _cache_lock:
+        _cache.pop(key, None)
+        while len(_cache) >= GRAPH_CACHE_MAX_ENTRIES:
+            del _cache[next(iter(_cache))]
+        _cache[key] = (time.monotonic() + GRAPH_CACHE_SECONDS, rows, stats)
+
+
+def clear_graph_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
+
+
+# =============================================================================
+# Paging
+# =============================================================================
+
+def _fetch_page(
+    subscriptions: List[str], query: str, top: int, skip_token: Optional[str]
+) -> Tuple[List[Dict[str, Any]], Optional[str], int, bool]:
+    """Run one Resource Graph request (blocking)."""
+    from azure.mgmt.resourcegraph import ResourceGraphClient
+    from azure.mgmt.resourcegraph.models import QueryRequest, QueryRequestOptions
+
+    client = get_management_client(ResourceGraphClient)
+    result = client.resources(QueryRequest(
+        subscriptions=subscriptions,
+        query=query,
+        options=QueryRequestOptions(top=top, skip_token=skip_token, result_format="objectArray"),
+    ))
+    rows = [row if isinstance(row, dict) else {"data": str(row)} for row in (result.data or [])]
+    truncated = str(result.result_truncated or "").lower() == "true"
+    return rows, result.skip_token, result.total_records or len(rows), truncated
+
+
+async def iter_graph_pages(
+    query: str,
+    subscription_ids: Sequence[str],
+    limit: Optional[int] = None,
+    use_cache: bool = True,
+    stats: Optional[GraphQueryStats] = None,
+    fetch: PageFetch = _fetch_page,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Yield pages of query results across all subscriptions.
+
+    Args:
+        query: Resource Graph (KQL) query; include the id column so the
+            service can page it
+        subscription_ids: Subscriptions to search, split into parallel batches
+        limit: Stop after this many rows (None for all)
+        use_cache: Serve and store results in the short-lived query cache
+        stats: Filled in with counts while iterating
+
+    Raises:
+        Exception: The first failed request; pending requests are cancelled
+    """
+    stats = stats if stats is not None else GraphQueryStats()
+    subscriptions = sorted(set(subscription_ids))
+    stats.subscriptions = len(subscriptions)
+    key = (normalize_kql(query), tuple(subscriptions), limit)
+
+    if use_cache:
+        hit = _cache_get(key)
+        if hit is not None:
+            rows, cached_stats = hit
+            stats.total_records = cached_stats.total_records
+            stats.has_more = cached_stats.has_more
+            stats.result_truncated = cached_stats.result_truncated
+            stats.cached = True
+            for start in range(0, len(rows), GRAPH_PAGE_SIZE):
+                page = rows[start:start + GRAPH_PAGE_SIZE]
+                stats.pages += 1
+                stats.rows += len(page)
+                yield page
+            return
+
+    batches = [
+        subscriptions[i:i + GRAPH_SUBSCRIPTION_BATCH]
+        for i in range(0, len(subscriptions), GRAPH_SUBSCRIPTION_BATCH)
+    ]
+    semaphore = asyncio.Semaphore(GRAPH_MAX_CONCURRENCY)
+    # Bounded so a slow consumer pauses the fetchers instead of buffering everything
+    queue: asyncio.Queue = asyncio.Queue(maxsize=GRAPH_MAX_CONCURRENCY)
+    fetched = [0]
+    exhausted = [0]
+
+    async def run_batch(batch: List[str]) -> None:
+        try:
+            skip_token = None
+            first = True
+            async with semaphore:
+                while True:
+                    top = GRAPH_PAGE_SIZE if limit is None else min(GRAPH_PAGE_SIZE, limit - fetched[0])
+                    if top <= 0:
+                        break
+                    rows, skip_token, total, truncated = await run_blocking(fetch, batch, query, top, skip_token)
+                    fetched[0] += len(rows)
+                    if first:
+                        stats.total_records += total
+                        first = False
+                    stats.result_truncated = stats.result_truncated or truncated
+                    done = not skip_token or not rows
+                    if done:
+                        exhausted[0] += 1
+                    await queue.put(rows)
+                    if done:
+                        break
+            await queue.put(None)
+        except Exception as e:
+            await queue.put(e)
+
+    tasks = [asyncio.ensure_future(run_batch(batch)) for batch in batches]
+    collected: Optional[List[Dict[str, Any]]] = [] if use_cache else None
+    try:
+        running = len(tasks)
+        while running:
+            item = await queue.get()
+            if item is None:
+                running -= 1
+                continue
+            if isinstance(item, Exception):
+                raise item
+            page = item
+            if limit is not None and stats.rows + len(page) >= limit:
+                page = page[:limit - stats.rows]
+                stats.has_more = len(page) < len(item) or exhausted[0] < len(batches)
+                running = 0
+            if not page:
+                continue
+            stats.pages += 1
+            stats.rows += len(page)
+            if collected is not None:
+                collected.extend(page)
+                if len(collected) > GRAPH_CACHE_MAX_ROWS:
+                    collected = None
+            yield page
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    logger.info(
+        f"Resource Graph query returned {stats.rows} rows in {stats.pages} page(s) "
+        f"from {len(subscriptions)} subscription(s)"
+    )
+    if collected is not None:
+        _cache_put(key, collected, GraphQueryStats(**asdict(stats)))
+
+
+async def iter_graph_rows(
+    query: str,
+    subscription_ids: Sequence[str],
+    limit: Optional[int] = None,
+    use_cache: bool = True,
+    stats: Optional[GraphQueryStats] = None,
+    fetch: PageFetch = _fetch_page,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Yield query results one row at a time (see iter_graph_pages)."""
+    async for page in iter_graph_pages(query, subscription_ids, limit, use_cache, stats, fetch):
+        for row in page:
+            yield row
+
+
+def stream_ndjson(
+    query: str,
+    subscription_ids: Sequence[str],
+    limit: Optional[int] = None,
+    use_cache: bool = True,
+    fetch: PageFetch = _fetch_page,
+) -> Iterator[str]:
+    """Yield query results as NDJSON from synchronous code.
+
+    Each page is fetched on a private event loop only when the previous one
+    has been consumed. One JSON object per row, then a final
+    {"_meta": {...}} line with the stats, or {"_error": "..."} on failure.
+    """
+    stats = GraphQueryStats()
+    loop = asyncio.new_event_loop()
+    pages = iter_graph_pages(query, subscription_ids, limit, use_cache, stats, fetch)
+    try:
+        while True:
+            try:
+                page = loop.run_until_complete(pages.__anext__())
+            except StopAsyncIteration:
+                break
+            yield "".join(json.dumps(row, default=str) + "\n" for row in page)
+        yield json.dumps({"_meta": asdict(stats)}) + "\n"
+    except Exception as e:
+        logger.error(f"Resource Graph NDJSON stream failed: {e}")
+        yield json.dumps({"_error": wrap_azure_error(e).message}) + "\n"
+    finally:
+        loop.run_until_complete(pages.aclose())
+        loop.close()
@@ -4,7 +4,8 @@ Provides MCP tools for:
 - Getting resources by ID
 - Deleting resources
 - Listing resources by type
-- Searching resources with Resource Graph
+- Searching resources with Resource Graph (paged, across subscriptions)
+- Inventory snapshots across subscriptions and diffs between them
 """
 
 import logging
@@ -13,11 +14,15 @@ from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, Field
 
 from .auth import (
-    get_credential_and_subscription,
+    get_management_client,
+    get_subscription_id,
     AzureError,
     AzureNotFoundError,
     wrap_azure_error,
 )
+from .inventory import diff_snapshots, list_snapshots, take_snapshot
+from .resource_graph import GraphQueryStats, iter_graph_pages
+from .utils import run_blocking
 
 logger = logging.getLogger(__name__)
 
@@ -113,9 +118,17 @@ class AzureResourcesSearchInput(BaseModel):
         default=None,
         description="Subscription ID to search (uses default if not provided)"
     )
+    subscription_ids: Optional[List[str]] = Field(
+        default=None,
+        description="Subscriptions to search in parallel (overrides subscription_id)"
+    )
     top: int = Field(
         default=100,
-        description="Maximum number of results to return"
+        description="Maximum number of results to return (0 for all; pages past 1000 automatically)"
+    )
+    use_cache: bool = Field(
+        default=True,
+        description="Reuse results of the same query from the last AZURE_GRAPH_CACHE_SECONDS"
     )
 
 
@@ -125,10 +138,114 @@ class AzureResourcesSearchOutput(BaseModel):
     resources: List[Dict[str, Any]] = Field(default_factory=list, description="Search results")
     count: int = Field(default=0, description="Number of results")
     total_records: int = Field(default=0, description="Total matching records")
+    has_more: bool = Field(default=False, description="Whether more results exist beyond top")
+    pages: int = Field(default=0, description="Result pages read")
+    subscriptions: int = Field(default=0, description="Subscriptions searched")
+    cached: bool = Field(default=False, description="Whether results came from the query cache")
+    result_truncated: bool = Field(
+        default=False,
+        description="Whether Resource Graph could not page the results (project the id column)"
+    )
     query: str = Field(default="", description="Query executed")
     error: str = Field(default="", description="Error message if failed")
 
 
+class AzureResourcesSnapshotInventoryInput(BaseModel):
+    """Input schema for azure_resources_snapshot_inventory."""
+    subscription_ids: Optional[List[str]] = Field(
+        default=None,
+        description="Subscriptions to include (default: AZURE_INVENTORY_SUBSCRIPTIONS or the default subscription)"
+    )
+
+
+class InventorySnapshotInfo(BaseModel):
+    """A stored inventory snapshot."""
+    id: int = Field(description="Snapshot ID")
+    taken_at: str = Field(description="When the snapshot was taken (ISO 8601, UTC)")
+    subscriptions: List[str] = Field(default_factory=list, description="Subscriptions included")
+    resource_count: int = Field(default=0, description="Number of resources")
+    content_hash: str = Field(default="", description="Hash of the snapshot's content")
+    duration_seconds: float = Field(default=0.0, description="Time taken to take the snapshot")
+
+
+class AzureResourcesSnapshotInventoryOutput(BaseModel):
+    """Output schema for azure_resources_snapshot_inventory."""
+    success: bool = Field(description="Whether the snapshot was stored")
+    snapshot: Optional[InventorySnapshotInfo] = Field(default=None, description="The new snapshot")
+    unchanged: bool = Field(default=False, description="Whether the content equals the previous snapshot")
+    pruned: int = Field(default=0, description="Old snapshots deleted by retention")
+    error: str = Field(default="", description="Error message if failed")
+
+
+class AzureResourcesListInventorySnapshotsInput(BaseModel):
+    """Input schema for azure_resources_list_inventory_snapshots."""
+    limit: int = Field(
+        default=20,
+        description="Maximum number of snapshots to return (most recent first)"
+    )
+
+
+class AzureResourcesListInventorySnapshotsOutput(BaseModel):
+    """Output schema for azure_resources_list_inventory_snapshots."""
+    success: bool = Field(description="Whether the request succeeded")
+    snapshots: List[InventorySnapshotInfo] = Field(default_factory=list, description="Snapshots, most recent first")
+    count: int = Field(default=0, description="Number of snapshots returned")
+    error: str = Field(default="", description="Error message if failed")
+
+
+class AzureResourcesDiffInventoryInput(BaseModel):
+    """Input schema for azure_resources_diff_inventory."""
+    from_snapshot_id: Optional[int] = Field(
+        default=None,
+        description="Older snapshot (default: the one before to_snapshot_id)"
+    )
+    to_snapshot_id: Optional[int] = Field(
+        default=None,
+        description="Newer snapshot (default: the latest)"
+    )
+    resource_type: Optional[str] = Field(
+        default=None,
+        description="Only compare resources of this type (e.g., Microsoft.Web/sites)"
+    )
+    max_items: int = Field(
+        default=200,
+        description="Maximum resources listed per change kind (counts are always complete)"
+    )
+
+
+class InventoryResource(BaseModel):
+    """A resource as stored in an inventory snapshot."""
+    id: str = Field(description="Resource ID (lowercase)")
+    name: str = Field(description="Resource name")
+    type: str = Field(description="Resource type (lowercase)")
+    resource_group: str = Field(default="", description="Resource group")
+    subscription_id: str = Field(default="", description="Subscription ID")
+    location: str = Field(default="", description="Region")
+    tags: Dict[str, Any] = Field(default_factory=dict, description="Tags")
+    sku: Dict[str, Any] = Field(default_factory=dict, description="SKU")
+    provisioning_state: str = Field(default="", description="Provisioning state")
+    changes: Dict[str, Dict[str, Any]] = Field(
+        default_factory=dict,
+        description="For modified resources: field -> {before, after}"
+    )
+
+
+class AzureResourcesDiffInventoryOutput(BaseModel):
+    """Output schema for azure_resources_diff_inventory."""
+    success: bool = Field(description="Whether the diff succeeded")
+    from_snapshot: Optional[InventorySnapshotInfo] = Field(default=None, description="Older snapshot")
+    to_snapshot: Optional[InventorySnapshotInfo] = Field(default=None, description="Newer snapshot")
+    subscriptions: List[str] = Field(default_factory=list, description="Subscriptions compared (in both snapshots)")
+    added: List[InventoryResource] = Field(default_factory=list, description="Resources only in the newer snapshot")
+    removed: List[InventoryResource] = Field(default_factory=list, description="Resources only in the older snapshot")
+    modified: List[InventoryResource] = Field(default_factory=list, description="Resources whose content changed")
+    added_count: int = Field(default=0, description="Number of added resources")
+    removed_count: int = Field(default=0, description="Number of removed resources")
+    modified_count: int = Field(default=0, description="Number of modified resources")
+    truncated: bool = Field(default=False, description="Whether a list was cut at max_items")
+    error: str = Field(default="", description="Error message if failed")
+
+
 # =============================================================================
 # Tool Implementations
 # =============================================================================
@@ -175,7 +292,6 @@ async def azure_resources_get_resource(
     
     try:
         from azure.mgmt.resource import ResourceManagementClient
-        from .auth import get_azure_credential
         
         # Parse resource ID to get subscription
         parsed = _parse_resource_id(params.resource_id)
@@ -187,11 +303,11 @@ async def azure_resources_get_resource(
                 error="Could not parse subscription ID from resource ID",
             )
         
-        credential = get_azure_credential()
-        client = ResourceManagementClient(credential, subscription_id)
+        client = get_management_client(ResourceManagementClient, subscription_id)
         
         # Get the resource
-        resource = client.resources.get_by_id(
+        resource = await run_blocking(
+            client.resources.get_by_id,
             params.resource_id,
             api_version="2021-04-01"  # Generic API version
         )
@@ -271,7 +387,6 @@ async def azure_resources_delete_resource(
     
     try:
         from azure.mgmt.resource import ResourceManagementClient
-        from .auth import get_azure_credential
         
         # Parse resource ID to get subscription
         parsed = _parse_resource_id(params.resource_id)
@@ -284,11 +399,11 @@ async def azure_resources_delete_resource(
                 error="Could not parse subscription ID from resource ID",
             )
         
-        credential = get_azure_credential()
-        client = ResourceManagementClient(credential, subscription_id)
+        client = get_management_client(ResourceManagementClient, subscription_id)
         
         # Start async delete operation
-        poller = client.resources.begin_delete_by_id(
+        poller = await run_blocking(
+            client.resources.begin_delete_by_id,
             params.resource_id,
             api_version="2021-04-01"
         )
@@ -337,8 +452,8 @@ async def azure_resources_list_by_type(
     try:
         from azure.mgmt.resource import ResourceManagementClient
         
-        credential, subscription_id = get_credential_and_subscription(params.subscription_id)
-        client = ResourceManagementClient(credential, subscription_id)
+        subscription_id = get_subscription_id(params.subscription_id)
+        client = get_management_client(ResourceManagementClient, subscription_id)
         
         # Build filter
         filter_str = f"resourceType eq '{params.resource_type}'"
@@ -347,10 +462,10 @@ async def azure_resources_list_by_type(
         
         if params.resource_group:
             # List within specific resource group
-            for resource in client.resources.list_by_resource_group(
+            for resource in await run_blocking(lambda: list(client.resources.list_by_resource_group(
                 params.resource_group,
                 filter=filter_str
-            ):
+            ))):
                 resources.append(ResourceSummary(
                     id=resource.id,
                     name=resource.name,
@@ -360,7 +475,7 @@ async def azure_resources_list_by_type(
                 ))
         else:
             # List across subscription
-            for resource in client.resources.list(filter=filter_str):
+            for resource in await run_blocking(lambda: list(client.resources.list(filter=filter_str))):
                 # Extract resource group from ID
                 parsed = _parse_resource_id(resource.id)
                 resources.append(ResourceSummary(
@@ -403,6 +518,10 @@ async def azure_resources_search(
     """Search Azure resources using Resource Graph.
     
     Uses Azure Resource Graph for efficient cross-subscription queries.
+    Results are paged with $skipToken until top rows are read, and
+    multiple subscriptions are searched in parallel batches. For large
+    result sets use the NDJSON endpoint (api/azure/resources/search/),
+    which streams pages instead of returning them in one response.
     
     Example queries:
     - "Resources | where type == 'microsoft.web/sites'"
@@ -412,7 +531,9 @@ async def azure_resources_search(
     Args:
         params.query: Azure Resource Graph query
         params.subscription_id: Subscription to search
-        params.top: Maximum results to return
+        params.subscription_ids: Subscriptions to search in parallel
+        params.top: Maximum results to return (0 for all)
+        params.use_cache: Reuse recent results of the same query
         
     Returns:
         Search results
@@ -420,41 +541,32 @@ async def azure_resources_search(
     logger.info(f"Searching resources with query: {params.query[:100]}...")
     
     try:
-        from azure.mgmt.resourcegraph import ResourceGraphClient
-        from azure.mgmt.resourcegraph.models import QueryRequest
+        import azure.mgmt.resourcegraph  # noqa: F401
         
-        credential, subscription_id = get_credential_and_subscription(params.subscription_id)
-        client = ResourceGraphClient(credential)
-        
-        # Build query request
-        request = QueryRequest(
-            subscriptions=[subscription_id],
-            query=params.query,
-            options={"$top": params.top}
-        )
-        
-        # Execute query
-        result = client.resources(request)
-        
-        # Convert results to list of dicts
+        subscription_ids = params.subscription_ids or [get_subscription_id(params.subscription_id)]
+        stats = GraphQueryStats()
         resources = []
-        if result.data:
-            for row in result.data:
-                if isinstance(row, dict):
-                    resources.append(row)
-                else:
-                    # Handle non-dict results
-                    resources.append({"data": str(row)})
-        
-        total_records = result.total_records if hasattr(result, 'total_records') else len(resources)
+        async for page in iter_graph_pages(
+            params.query,
+            subscription_ids,
+            limit=params.top or None,
+            use_cache=params.use_cache,
+            stats=stats,
+        ):
+            resources.extend(page)
         
-        logger.info(f"Search returned {len(resources)} results")
+        logger.info(f"Search returned {len(resources)} results in {stats.pages} page(s)")
         
         return AzureResourcesSearchOutput(
             success=True,
             resources=resources,
             count=len(resources),
-            total_records=total_records,
+            total_records=stats.total_records,
+            has_more=stats.has_more,
+            pages=stats.pages,
+            subscriptions=stats.subscriptions,
+            cached=stats.cached,
+            result_truncated=stats.result_truncated,
             query=params.query,
         )
         
@@ -481,3 +593,133 @@ async def azure_resources_search(
             error=wrapped.message,
         )
 
+
+def _snapshot_info(snapshot: Dict[str, Any]) -> InventorySnapshotInfo:
+    return InventorySnapshotInfo(
+        id=snapshot["id"],
+        taken_at=snapshot["taken_at"].isoformat(),
+        subscriptions=snapshot["subscriptions"],
+        resource_count=snapshot["resource_count"],
+        content_hash=snapshot["content_hash"],
+        duration_seconds=round(snapshot["duration_seconds"], 2),
+    )
+
+
+def _inventory_resource(resource: Dict[str, Any]) -> InventoryResource:
+    return InventoryResource(
+        id=resource["resource_id"],
+        name=resource["name"],
+        type=resource["resource_type"],
+        resource_group=resource["resource_group"],
+        subscription_id=resource["subscription_id"],
+        location=resource["location"],
+        tags=resource["tags"] or {},
+        sku=resource["sku"] or {},
+        provisioning_state=resource["provisioning_state"],
+        changes=resource.get("changes", {}),
+    )
+
+
+async def azure_resources_snapshot_inventory(
+    params: AzureResourcesSnapshotInventoryInput
+) -> AzureResourcesSnapshotInventoryOutput:
+    """Store a snapshot of all resources across subscriptions.
+    
+    Normally taken on a schedule by the snapshot_azure_inventory
+    management command; this tool takes one on demand.
+    
+    Args:
+        params.subscription_ids: Subscriptions to include
+        
+    Returns:
+        The stored snapshot
+    """
+    logger.info("Taking Azure inventory snapshot")
+    
+    try:
+        snapshot = await take_snapshot(params.subscription_ids)
+        return AzureResourcesSnapshotInventoryOutput(
+            success=True,
+            snapshot=_snapshot_info(snapshot),
+            unchanged=snapshot["unchanged"],
+            pruned=snapshot["pruned"],
+        )
+        
+    except ValueError as e:
+        return AzureResourcesSnapshotInventoryOutput(success=False, error=str(e))
+    except AzureError as e:
+        logger.error(f"Azure error taking inventory snapshot: {e}")
+        return AzureResourcesSnapshotInventoryOutput(success=False, error=str(e))
+    except Exception as e:
+        logger.error(f"Failed to take inventory snapshot: {e}")
+        wrapped = wrap_azure_error(e)
+        return AzureResourcesSnapshotInventoryOutput(success=False, error=wrapped.message)
+
+
+async def azure_resources_list_inventory_snapshots(
+    params: AzureResourcesListInventorySnapshotsInput
+) -> AzureResourcesListInventorySnapshotsOutput:
+    """List stored inventory snapshots, most recent first.
+    
+    Args:
+        params.limit: Maximum number of snapshots
+        
+    Returns:
+        Snapshots with time, subscriptions, resource count and content hash
+    """
+    try:
+        snapshots = await list_snapshots(max(1, params.limit))
+        return AzureResourcesListInventorySnapshotsOutput(
+            success=True,
+            snapshots=[_snapshot_info(s) for s in snapshots],
+            count=len(snapshots),
+        )
+        
+    except Exception as e:
+        logger.error(f"Failed to list inventory snapshots: {e}")
+        return AzureResourcesListInventorySnapshotsOutput(success=False, error=str(e))
+
+
+async def azure_resources_diff_inventory(
+    params: AzureResourcesDiffInventoryInput
+) -> AzureResourcesDiffInventoryOutput:
+    """Show resources added, removed and modified between two snapshots.
+    
+    Computed locally from stored snapshots; no Azure calls are made.
+    Without snapshot IDs, compares the latest snapshot with the one
+    before it.
+    
+    Args:
+        params.from_snapshot_id: Older snapshot
+        params.to_snapshot_id: Newer snapshot
+        params.resource_type: Optional resource type filter
+        params.max_items: Maximum resources listed per change kind
+        
+    Returns:
+        Added, removed and modified resources with changed fields
+    """
+    logger.info(f"Diffing inventory snapshots {params.from_snapshot_id} -> {params.to_snapshot_id}")
+    
+    try:
+        diff = await diff_snapshots(params.from_snapshot_id, params.to_snapshot_id, params.resource_type)
+        limit = max(0, params.max_items)
+        
+        return AzureResourcesDiffInventoryOutput(
+            success=True,
+            from_snapshot=_snapshot_info(diff["from"]),
+            to_snapshot=_snapshot_info(diff["to"]),
+            subscriptions=diff["subscriptions"],
+            added=[_inventory_resource(r) for r in diff["added"][:limit]],
+            removed=[_inventory_resource(r) for r in diff["removed"][:limit]],
+            modified=[_inventory_resource(r) for r in diff["modified"][:limit]],
+            added_count=len(diff["added"]),
+            removed_count=len(diff["removed"]),
+            modified_count=len(diff["modified"]),
+            truncated=any(len(diff[kind]) > limit for kind in ("added", "removed", "modified")),
+        )
+        
+    except ValueError as e:
+        return AzureResourcesDiffInventoryOutput(success=False, error=str(e))
+    except Exception as e:
+        logger.error(f"Failed to diff inventory snapshots: {e}")
+        return AzureResourcesDiffInventoryOutput(success=False, error=str(e))
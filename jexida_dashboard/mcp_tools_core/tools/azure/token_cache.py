@@ -0,0 +1,322 @@
+"""Persistent Azure access-token cache shared across processes.
+
+The credential objects from azure-identity cache tokens in memory only, so
+the MCP server, the Django app and every restart each acquire their own
+tokens (hundreds of milliseconds to seconds per scope). CachingCredential
+wraps the real credential and keeps tokens in a JSON file under DATA_DIR
+(AZURE_TOKEN_CACHE_PATH), guarded by an flock so processes share one copy:
+- get_token() serves from memory, then from the file, and only then asks
+  the wrapped credential; the file lock is held during that fetch so
+  concurrent processes wait for one fetch instead of each making their own
+- A daemon thread refreshes every known token once less than
+  AZURE_TOKEN_REFRESH_SECONDS of its lifetime remains, so tool calls
+  don't pay acquisition latency when a token runs out. azure-identity
+  keeps returning its own cached token until about 5 minutes before
+  expiry, so when the wrapped credential hands back the same token the
+  refresher asks a new instance (from `factory`) instead, and a refresh
+  only counts once the expiry moves forward
+- Fetch count and latency are kept in get_token_stats()
+
+The file holds bearer tokens and is written with 0600 permissions.
+
+Usage:
+    credential = CachingCredential(
+        DefaultAzureCredential(), TokenFileStore(default_cache_path()), factory=DefaultAzureCredential,
+    )
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: atomic writes only, no cross-process lock
+    fcntl = None
+
+from azure.core.credentials import AccessToken
+
+logger = logging.getLogger(__name__)
+
+
+TOKEN_REFRESH_SECONDS = int(os.environ.get("AZURE_TOKEN_REFRESH_SECONDS", "900"))
+
+# azure-core's bearer policy asks for a new token once fewer than 300
+# seconds remain, so only hand out tokens with more left than that
+MIN_VALID_SECONDS = 330
+
+# How often the background thread looks for tokens to refresh
+REFRESH_CHECK_SECONDS = 60
+
+CACHE_VERSION = 1
+
+# A relative DATA_DIR is anchored at the project root, as in config.Settings,
+# so every process finds the same file whatever its working directory
+PROJECT_ROOT = Path(__file__).resolve().parents[4]
+
+
+def default_cache_path() -> str:
+    """AZURE_TOKEN_CACHE_PATH or <DATA_DIR>/azure_token_cache.json."""
+    if os.environ.get("AZURE_TOKEN_CACHE_PATH"):
+        return os.environ["AZURE_TOKEN_CACHE_PATH"]
+    data_dir = Path(os.environ.get("DATA_DIR", "data")).expanduser()
+    if not data_dir.is_absolute():
+        data_dir = PROJECT_ROOT / data_dir
+    return str(data_dir / "azure_token_cache.json")
+
+
+# =============================================================================
+# Instrumentation
+# =============================================================================
+
+_stats_lock = threading.Lock()
+_stats: Dict[str, float] = {}
+
+
+def _reset_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+        _stats.update({
+            "memory_hits": 0,
+            "file_hits": 0,
+            "fetches": 0,
+            "fetch_errors": 0,
+            "background_refreshes": 0,
+            "fetch_seconds_total": 0.0,
+            "fetch_seconds_max": 0.0,
+            "last_fetch_seconds": 0.0,
+        })
+
+
+_reset_stats()
+
+
+def _count(name: str, amount: float = 1) -> None:
+    with _stats_lock:
+        _stats[name] += amount
+
+
+def _record_fetch(seconds: float) -> None:
+    with _stats_lock:
+        _stats["fetches"] += 1
+        _stats["fetch_seconds_total"] += seconds
+        _stats["fetch_seconds_max"] = max(_stats["fetch_seconds_max"], seconds)
+        _stats["last_fetch_seconds"] = seconds
+
+
+def get_token_stats() -> Dict[str, Any]:
+    """Token cache counters for this process, with average fetch latency."""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["fetch_seconds_avg"] = stats["fetch_seconds_total"] / stats["fetches"] if stats["fetches"] else 0.0
+    for key in ("fetch_seconds_total", "fetch_seconds_max", "last_fetch_seconds", "fetch_seconds_avg"):
+        stats[key] = round(stats[key], 3)
+    return stats
+
+
+# =============================================================================
+# File store
+# =============================================================================
+
+class TokenFileStore:
+    """Tokens by cache key in a JSON file, locked across processes."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.lock_path = self.path.with_suffix(self.path.suffix + ".lock")
+        self._thread_lock = threading.Lock()
+
+    @contextmanager
+    def locked(self) -> Iterator[None]:
+        """Hold the cache lock (threads of this process and other processes)."""
+        with self._thread_lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o600)
+            try:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_EX)
+                yield
+            finally:
+                os.close(fd)
+
+    def read(self) -> Dict[str, Dict[str, Any]]:
+        """All cached tokens; an unreadable or foreign file counts as empty."""
+        try:
+            data = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable token cache {self.path}: {e}")
+            return {}
+        if data.get("version") != CACHE_VERSION:
+            return {}
+        return data.get("tokens", {})
+
+    def write(self, tokens: Dict[str, Dict[str, Any]]) -> None:
+        """Replace the file atomically, dropping expired tokens."""
+        now = time.time()
+        tokens = {k: v for k, v in tokens.items() if v.get("expires_on", 0) > now}
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump({"version": CACHE_VERSION, "tokens": tokens}, f)
+        os.replace(tmp, self.path)
+
+
+# =============================================================================
+# Credential wrapper
+# =============================================================================
+
+class CachingCredential:
+    """TokenCredential that serves tokens from memory, then the shared file.
+
+    Only get_token() is implemented, which azure-core's bearer policy falls
+    back to for credentials without get_token_info().
+    """
+
+    def __init__(
+        self,
+        credential: Any,
+        store: TokenFileStore,
+        identity: str = "",
+        factory: Optional[Callable[[], Any]] = None,
+    ):
+        self.credential = credential
+        self.store = store
+        # Builds a new credential without the wrapped one's in-memory token cache
+        self.factory = factory
+        # Separates tokens of different principals sharing one cache file
+        self.identity = identity or type(credential).__name__
+        self._memory: Dict[str, AccessToken] = {}
+        # Arguments each key was requested with, so the refresher can repeat them
+        self._requests: Dict[str, Tuple[Tuple[str, ...], Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self._refresher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def _key(self, scopes: Tuple[str, ...], kwargs: Dict[str, Any]) -> str:
+        return "|".join([
+            self.identity,
+            " ".join(sorted(scopes)),
+            kwargs.get("tenant_id") or "",
+            "cae" if kwargs.get("enable_cae") else "",
+        ])
+
+    def get_token(self, *scopes: str, **kwargs: Any) -> AccessToken:
+        """Get a token with more than MIN_VALID_SECONDS left."""
+        if kwargs.get("claims"):
+            # Claims challenges must reach the identity provider
+            return self._fetch(scopes, kwargs)
+
+        key = self._key(scopes, kwargs)
+        with self._lock:
+            self._requests[key] = (scopes, dict(kwargs))
+            token = self._memory.get(key)
+        if token is not None and token.expires_on - time.time() > MIN_VALID_SECONDS:
+            _count("memory_hits")
+            return token
+        token = self._load_or_fetch(key, scopes, kwargs, min_valid=MIN_VALID_SECONDS)
+        self._ensure_refresher()
+        return token
+
+    def _load_or_fetch(
+        self,
+        key: str,
+        scopes: Tuple[str, ...],
+        kwargs: Dict[str, Any],
+        min_valid: float,
+        replace: Optional[AccessToken] = None,
+    ) -> AccessToken:
+        """Token from the file, else fetched; `replace` is a token to get a newer one than."""
+        with self.store.locked():
+            tokens = self.store.read()
+            cached = tokens.get(key)
+            if cached and cached["expires_on"] - time.time() > min_valid:
+                token = AccessToken(cached["token"], int(cached["expires_on"]))
+                _count("file_hits")
+            else:
+                token = self._fetch(scopes, kwargs)
+                if replace is not None and token.expires_on <= replace.expires_on and self.factory is not None:
+                    # Answered from the wrapped credential's own cache
+                    token = self._fetch(scopes, kwargs, fresh=True)
+                tokens[key] = {"token": token.token, "expires_on": int(token.expires_on)}
+                try:
+                    self.store.write(tokens)
+                except OSError as e:
+                    logger.warning(f"Could not write token cache {self.store.path}: {e}")
+        with self._lock:
+            self._memory[key] = token
+        return token
+
+    def _fetch(self, scopes: Tuple[str, ...], kwargs: Dict[str, Any], fresh: bool = False) -> AccessToken:
+        started = time.monotonic()
+        credential = self.factory() if fresh else self.credential
+        try:
+            token = credential.get_token(*scopes, **kwargs)
+        except Exception:
+            _count("fetch_errors")
+            raise
+        finally:
+            close = getattr(credential, "close", None) if fresh else None
+            if close is not None:
+                close()
+        elapsed = time.monotonic() - started
+        _record_fetch(elapsed)
+        logger.info(f"Acquired Azure token for {' '.join(scopes)} in {elapsed * 1000:.0f} ms")
+        return AccessToken(token.token, int(token.expires_on))
+
+    # -------------------------------------------------------------------------
+    # Background refresh
+    # -------------------------------------------------------------------------
+
+    def refresh_due(self) -> int:
+        """Refresh tokens with less than TOKEN_REFRESH_SECONDS left.
+
+        Returns:
+            How many tokens were replaced by one that expires later
+        """
+        with self._lock:
+            due = [
+                (key, self._requests[key], token)
+                for key, token in self._memory.items()
+                if key in self._requests and token.expires_on - time.time() < TOKEN_REFRESH_SECONDS
+            ]
+        refreshed = 0
+        for key, (scopes, kwargs), old in due:
+            try:
+                # Another process may already have refreshed it into the file
+                token = self._load_or_fetch(key, scopes, kwargs, min_valid=TOKEN_REFRESH_SECONDS, replace=old)
+                if token.expires_on > old.expires_on:
+                    refreshed += 1
+                    _count("background_refreshes")
+                else:
+                    logger.debug(f"Token for {' '.join(scopes)} not renewed yet; retrying")
+            except Exception as e:
+                logger.warning(f"Background token refresh for {' '.join(scopes)} failed: {e}")
+        return refreshed
+
+    def _ensure_refresher(self) -> None:
+        if self._refresher is not None and self._refresher.is_alive():
+            return
+        with self._lock:
+            if self._refresher is not None and self._refresher.is_alive():
+                return
+            self._stop.clear()
+            self._refresher = threading.Thread(target=self._refresh_loop, name="azure-token-refresh", daemon=True)
+            self._refresher.start()
+
+    def _refresh_loop(self) -> None:
+        while not self._stop.wait(REFRESH_CHECK_SECONDS):
+            self.refresh_due()
+
+    def close(self) -> None:
+        """Stop the refresher and close the wrapped credential."""
+        self._stop.set()
+        close = getattr(self.credential, "close", None)
+        if close is not None:
+            close()
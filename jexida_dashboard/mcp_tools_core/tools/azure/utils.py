@@ -4,13 +4,18 @@ Provides:
 - Command sanitization to prevent shell injection
 - Azure CLI path detection
 - Common validation functions
+- A bounded thread pool for blocking Azure SDK calls
 """
 
+import asyncio
+import functools
 import logging
 import os
 import re
 import shutil
-from typing import List, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Tuple, TypeVar
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +42,9 @@ DANGEROUS_REGEX = re.compile("|".join(DANGEROUS_PATTERNS))
 AZURE_CLI_PATH = os.environ.get("AZURE_CLI_PATH", "az")
 AZURE_COMMAND_MAX_LENGTH = int(os.environ.get("AZURE_COMMAND_MAX_LENGTH", "4096"))
 AZURE_CLI_TIMEOUT = int(os.environ.get("AZURE_CLI_TIMEOUT", "300"))
+AZURE_SDK_MAX_WORKERS = int(os.environ.get("AZURE_SDK_MAX_WORKERS", "16"))
+
+T = TypeVar("T")
 
 
 class CommandSanitizationError(Exception):
@@ -194,3 +202,56 @@ def parse_az_output(stdout: str, stderr: str, exit_code: int) -> Tuple[bool, str
 
     return False, error_message
 
+
+# =============================================================================
+# Blocking SDK calls
+# =============================================================================
+
+# The azure-mgmt-* clients are synchronous: a slow query or LRO poll run
+# directly in a tool would freeze the event loop, including the MCP stdio
+# server and every concurrent tool. Tools run such calls here instead.
+_sdk_executor: Optional[ThreadPoolExecutor] = None
+_sdk_executor_lock = threading.Lock()
+
+
+def get_sdk_executor() -> ThreadPoolExecutor:
+    """Get the shared thread pool for blocking Azure SDK calls.
+
+    The pool is bounded (AZURE_SDK_MAX_WORKERS) and separate from the
+    event loop's default executor, so a burst of slow Azure calls cannot
+    starve other to_thread()/sync_to_async work.
+    """
+    global _sdk_executor
+    with _sdk_executor_lock:
+        if _sdk_executor is None:
+            _sdk_executor = ThreadPoolExecutor(
+                max_workers=AZURE_SDK_MAX_WORKERS,
+                thread_name_prefix="azure-sdk",
+            )
+        return _sdk_executor
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking Azure SDK call in the SDK thread pool.
+
+    Anything lazy (pagers, LRO pollers) must be consumed inside func,
+    e.g. ``await run_blocking(lambda: list(client.resource_groups.list()))``.
+
+    Args:
+        func: Blocking callable
+        *args, **kwargs: Arguments for func
+
+    Returns:
+        The callable's return value (exceptions propagate unchanged)
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_sdk_executor(), functools.partial(func, *args, **kwargs))
+
+
+def shutdown_sdk_executor(wait: bool = True) -> None:
+    """Shut down the SDK thread pool; the next call creates a new one."""
+    global _sdk_executor
+    with _sdk_executor_lock:
+        executor, _sdk_executor = _sdk_executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
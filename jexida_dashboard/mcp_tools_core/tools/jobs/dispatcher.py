@@ -0,0 +1,288 @@
+"""Job queue dispatcher.
+
+submit_job only inserts a `queued` Job. The dispatcher picks queued jobs
+up and runs them over SSH as asyncio subprocesses, so neither the tool
+call nor the event loop waits on the remote command:
+- At most JOB_WORKERS jobs run at once in a process, and at most
+  WorkerNode.max_concurrent_jobs on one node across all processes
+- Jobs are claimed oldest first by a conditional queued -> running
+  update, so several processes (MCP server, dashboard workers) can run
+  dispatchers against the same queue without claiming a job twice
+- Jobs left `running` by a process that died are marked `lost` once they
+  are JOB_LOST_GRACE_SECONDS past their timeout
+
+Tool calls run in short-lived event loops, so the dispatcher runs its own
+loop in a daemon thread. It wakes immediately when a job is submitted in
+this process and polls every JOB_POLL_SECONDS for jobs submitted elsewhere.
+
+Usage:
+    get_job_dispatcher().wake()
+"""
+
+import asyncio
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from asgiref.sync import sync_to_async
+
+from .executor import ExecutionResult, WorkerSSHExecutor
+
+logger = logging.getLogger(__name__)
+
+
+JOB_WORKERS = int(os.environ.get("JOB_WORKERS", "8"))
+JOB_POLL_SECONDS = float(os.environ.get("JOB_POLL_SECONDS", "2"))
+JOB_LOST_GRACE_SECONDS = int(os.environ.get("JOB_LOST_GRACE_SECONDS", "120"))
+
+# How often the dispatcher looks for jobs abandoned by dead processes
+LOST_CHECK_SECONDS = 60
+
+# (node, command, timeout) -> result; node has name, host, user, ssh_port
+JobRunner = Callable[[Any, str, int], Awaitable[ExecutionResult]]
+
+
+async def run_over_ssh(node: Any, command: str, timeout: int) -> ExecutionResult:
+    return await WorkerSSHExecutor(timeout=timeout).run_command_async(node, command)
+
+
+# =============================================================================
+# Persistence
+# =============================================================================
+
+class JobStore:
+    """ORM access to the job queue (synchronous; wrap with sync_to_async)."""
+
+    def claim(self) -> Optional[Any]:
+        """Mark the oldest runnable queued job running and return it.
+
+        A job is runnable when its node is active and runs fewer than
+        max_concurrent_jobs jobs (counted in the database, so jobs of
+        every dispatcher process count).
+
+        The claim is an UPDATE ... WHERE status = 'queued' issued as the
+        first statement of its transaction. On SQLite that takes the
+        database write lock before anything is read, so concurrent claims
+        wait for each other (up to the connection timeout); on databases
+        with row locks the node row is locked as well. The node's running
+        count is then re-checked under that lock and the claim rolled
+        back if it went over the limit.
+
+        Returns:
+            The Job with target_node loaded, or None
+        """
+        from django.db.models import Min
+        from mcp_tools_core.models import Job
+
+        # Nodes with queued work, the one with the oldest waiting job first
+        queued_nodes = (
+            Job.objects.filter(status=Job.STATUS_QUEUED, target_node__is_active=True)
+            .values("target_node_id")
+            .annotate(oldest=Min("created_at"))
+            .order_by("oldest")
+            .values_list("target_node_id", flat=True)
+        )
+        for node_id in list(queued_nodes):
+            job_id = self._claim_on_node(node_id)
+            if job_id is not None:
+                return Job.objects.select_related("target_node").get(id=job_id)
+        return None
+
+    def _claim_on_node(self, node_id: Any) -> Optional[Any]:
+        """Claim the node's oldest queued job if it has a free slot; returns its ID."""
+        from django.db import transaction
+        from django.utils import timezone
+        from mcp_tools_core.models import Job, WorkerNode
+
+        queued = Job.objects.filter(target_node_id=node_id, status=Job.STATUS_QUEUED)
+        while True:
+            job_id = queued.order_by("created_at").values_list("id", flat=True).first()
+            if job_id is None:
+                return None
+            now = timezone.now()
+            with transaction.atomic():
+                claimed = Job.objects.filter(id=job_id, status=Job.STATUS_QUEUED).update(
+                    status=Job.STATUS_RUNNING, started_at=now, updated_at=now,
+                )
+                if not claimed:
+                    # Taken by another dispatcher; try the next one
+                    continue
+                node = WorkerNode.objects.select_for_update().get(id=node_id)
+                running = Job.objects.filter(target_node_id=node_id, status=Job.STATUS_RUNNING).count()
+                if running > node.max_concurrent_jobs:
+                    transaction.set_rollback(True)
+                    return None
+            return job_id
+
+    def finish(self, job_id: Any, result: ExecutionResult) -> None:
+        """Store a job's result; a successful run also marks the node seen."""
+        from django.utils import timezone
+        from mcp_tools_core.models import Job, WorkerNode
+
+        now = timezone.now()
+        job = Job.objects.get(id=job_id)
+        job.status = Job.STATUS_SUCCEEDED if result.success else Job.STATUS_FAILED
+        job.stdout = result.stdout
+        job.stderr = result.stderr
+        job.exit_code = result.exit_code
+        job.duration_ms = result.duration_ms
+        job.finished_at = now
+        job.save()
+        if result.success:
+            WorkerNode.objects.filter(id=job.target_node_id).update(last_seen=now)
+
+    def mark_lost(self, now: datetime, grace_seconds: int, keep: Set[Any]) -> int:
+        """Mark running jobs lost once they are grace_seconds past their timeout.
+
+        Jobs in `keep` (running in this process) are never marked.
+        """
+        from mcp_tools_core.models import Job
+
+        lost = 0
+        candidates = Job.objects.filter(status=Job.STATUS_RUNNING).exclude(id__in=keep)
+        for job_id, started_at, timeout in candidates.values_list("id", "started_at", "timeout"):
+            if started_at is None or now - started_at > timedelta(seconds=timeout + grace_seconds):
+                lost += Job.objects.filter(id=job_id, status=Job.STATUS_RUNNING).update(
+                    status=Job.STATUS_LOST,
+                    stderr="Dispatcher stopped while the job was running; its outcome is unknown",
+                    finished_at=now,
+                )
+        return lost
+
+
+# =============================================================================
+# Dispatcher
+# =============================================================================
+
+class JobDispatcher:
+    """Runs queued jobs in a daemon thread with its own event loop."""
+
+    def __init__(
+        self,
+        store: Optional[JobStore] = None,
+        runner: JobRunner = run_over_ssh,
+        workers: int = JOB_WORKERS,
+    ):
+        self.store = store or JobStore()
+        self.runner = runner
+        self.workers = max(1, workers)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._guard = threading.Lock()
+        # job id -> node name of jobs running in this process
+        self._running: Dict[Any, str] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    # -------------------------------------------------------------------------
+    # Scheduling
+    # -------------------------------------------------------------------------
+
+    async def dispatch_once(self) -> List[Any]:
+        """Start as many queued jobs as limits allow; returns the started job IDs."""
+        started = []
+        while len(self._running) < self.workers:
+            job = await sync_to_async(self.store.claim)()
+            if job is None:
+                break
+            self._running[job.id] = job.target_node.name
+            task = asyncio.ensure_future(self._execute(job))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            started.append(job.id)
+        return started
+
+    async def _execute(self, job: Any) -> None:
+        node = job.target_node
+        try:
+            try:
+                result = await self.runner(node, job.command, job.timeout)
+            except Exception as e:
+                logger.error(f"Job {job.id} on {node.name} raised: {e}")
+                result = ExecutionResult(stdout="", stderr=f"Dispatcher error: {e}", exit_code=1, duration_ms=0)
+            await sync_to_async(self.store.finish)(job.id, result)
+            logger.info(f"Job {job.id} on {node.name} finished with exit code {result.exit_code}")
+        except Exception as e:
+            logger.error(f"Could not store result of job {job.id}: {e}")
+        finally:
+            self._running.pop(job.id, None)
+            if self._wakeup is not None:
+                self._wakeup.set()
+
+    async def drain(self) -> None:
+        """Run until no job is queued or running in this process (tests, --once)."""
+        while True:
+            await self.dispatch_once()
+            if not self._tasks:
+                return
+            await asyncio.wait(set(self._tasks), return_when=asyncio.FIRST_COMPLETED)
+
+    async def run_forever(self) -> None:
+        """Dispatch queued jobs until cancelled."""
+        self._wakeup = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        next_lost_check = 0.0
+        while True:
+            self._wakeup.clear()
+            try:
+                if loop.time() >= next_lost_check:
+                    next_lost_check = loop.time() + LOST_CHECK_SECONDS
+                    lost = await sync_to_async(self.store.mark_lost)(
+                        _now(), JOB_LOST_GRACE_SECONDS, set(self._running),
+                    )
+                    if lost:
+                        logger.warning(f"Marked {lost} abandoned job(s) lost")
+                await self.dispatch_once()
+            except Exception as e:
+                logger.warning(f"Job dispatch failed: {e}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=JOB_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    # -------------------------------------------------------------------------
+    # Thread management
+    # -------------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the dispatcher thread if it is not running."""
+        with self._guard:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            loop = asyncio.new_event_loop()
+            self._loop = loop
+            self._thread = threading.Thread(target=loop.run_forever, name="job-dispatcher", daemon=True)
+            self._thread.start()
+        asyncio.run_coroutine_threadsafe(self.run_forever(), loop)
+
+    def wake(self) -> None:
+        """Look for queued jobs now (starting the dispatcher if needed)."""
+        self.start()
+        loop = self._loop
+
+        def _set():
+            if self._wakeup is not None:
+                self._wakeup.set()
+
+        loop.call_soon_threadsafe(_set)
+
+
+def _now() -> datetime:
+    from django.utils import timezone
+
+    return timezone.now()
+
+
+_dispatcher: Optional[JobDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_job_dispatcher() -> JobDispatcher:
+    """Get the process-wide job dispatcher."""
+    global _dispatcher
+    with _dispatcher_lock:
+        if _dispatcher is None:
+            _dispatcher = JobDispatcher()
+        return _dispatcher
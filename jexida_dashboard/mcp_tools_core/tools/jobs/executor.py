@@ -2,14 +2,17 @@
 
 This module provides the WorkerSSHExecutor class that handles SSH-based
 command execution on remote worker nodes from the MCP server.
+run_command() blocks; run_command_async() runs ssh as an asyncio
+subprocess so the event loop stays free (used by the job dispatcher).
 """
 
+import asyncio
 import base64
 import logging
 import subprocess
 import time
 from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, List
 
 if TYPE_CHECKING:
     from mcp_tools_core.models import WorkerNode
@@ -48,18 +51,8 @@ class WorkerSSHExecutor:
         """
         self.timeout = timeout
 
-    def run_command(self, node: "WorkerNode", command: str) -> ExecutionResult:
-        """Execute a command on a worker node via SSH.
-
-        Args:
-            node: WorkerNode instance with connection details
-            command: Shell command to execute
-
-        Returns:
-            ExecutionResult with stdout, stderr, exit_code, and duration
-        """
-        start_time = time.perf_counter()
-
+    def ssh_args(self, node: "WorkerNode", command: str) -> List[str]:
+        """Build the ssh argument list that runs `command` on `node`."""
         # Build connection string
         connection_string = f"{node.user}@{node.host}"
 
@@ -86,8 +79,22 @@ class WorkerSSHExecutor:
             connection_string,
             wrapped_command,
         ])
+        return ssh_args
+
+    def run_command(self, node: "WorkerNode", command: str) -> ExecutionResult:
+        """Execute a command on a worker node via SSH.
 
-        logger.info(f"Executing on {node.name} ({connection_string}): {command[:100]}...")
+        Args:
+            node: WorkerNode instance with connection details
+            command: Shell command to execute
+
+        Returns:
+            ExecutionResult with stdout, stderr, exit_code, and duration
+        """
+        start_time = time.perf_counter()
+        ssh_args = self.ssh_args(node, command)
+
+        logger.info(f"Executing on {node.name} ({node.user}@{node.host}): {command[:100]}...")
 
         try:
             result = subprocess.run(
@@ -133,6 +140,61 @@ class WorkerSSHExecutor:
                 duration_ms=duration_ms,
             )
 
+    async def run_command_async(self, node: "WorkerNode", command: str) -> ExecutionResult:
+        """Execute a command on a worker node via SSH without blocking the event loop.
+
+        Same arguments, result and error handling as run_command().
+        """
+        start_time = time.perf_counter()
+        ssh_args = self.ssh_args(node, command)
+
+        logger.info(f"Executing on {node.name} ({node.user}@{node.host}): {command[:100]}...")
+
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *ssh_args,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=self.timeout)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.communicate()
+                duration_ms = int((time.perf_counter() - start_time) * 1000)
+                logger.error(f"Command on {node.name} timed out after {self.timeout}s")
+                return ExecutionResult(
+                    stdout="",
+                    stderr=f"Command timed out after {self.timeout} seconds",
+                    exit_code=124,
+                    duration_ms=duration_ms,
+                )
+
+            duration_ms = int((time.perf_counter() - start_time) * 1000)
+
+            logger.info(
+                f"Command on {node.name} completed with exit code {process.returncode} "
+                f"in {duration_ms}ms"
+            )
+
+            return ExecutionResult(
+                stdout=stdout.decode("utf-8", errors="replace"),
+                stderr=stderr.decode("utf-8", errors="replace"),
+                exit_code=process.returncode,
+                duration_ms=duration_ms,
+            )
+
+        except Exception as e:
+            duration_ms = int((time.perf_counter() - start_time) * 1000)
+            logger.error(f"SSH error on {node.name}: {e}")
+            return ExecutionResult(
+                stdout="",
+                stderr=f"SSH error: {str(e)}",
+                exit_code=1,
+                duration_ms=duration_ms,
+            )
+
     def check_connectivity(self, node: "WorkerNode") -> ExecutionResult:
         """Check if a worker node is reachable via SSH.
 
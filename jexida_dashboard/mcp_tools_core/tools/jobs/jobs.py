@@ -1,11 +1,14 @@
 """Job management tools for MCP platform.
 
 Provides tools for managing jobs on worker nodes:
-- submit_job: Submit a command to run on a worker node
+- submit_job: Queue a command to run on a worker node
 - list_jobs: List recent jobs with filtering
 - get_job: Get full details of a specific job
+
+Queued jobs are run by the dispatcher (see dispatcher.py).
 """
 
+import asyncio
 import logging
 import time
 from typing import Optional, List
@@ -13,10 +16,13 @@ from typing import Optional, List
 from asgiref.sync import sync_to_async
 from pydantic import BaseModel, Field
 
-from .executor import WorkerSSHExecutor
+from .dispatcher import get_job_dispatcher
 
 logger = logging.getLogger(__name__)
 
+# How often submit_job checks on a job while waiting for it
+WAIT_POLL_SECONDS = 1.0
+
 
 # =============================================================================
 # Submit Job Tool
@@ -39,6 +45,10 @@ class SubmitJobInput(BaseModel):
         default=300,
         description="Command timeout in seconds (default: 5 minutes)"
     )
+    wait_seconds: int = Field(
+        default=0,
+        description="Wait up to this many seconds for the job to finish (default: 0, return once queued)"
+    )
 
 
 class JobInfo(BaseModel):
@@ -48,46 +58,75 @@ class JobInfo(BaseModel):
     node_name: str = Field(description="Target worker node name")
     command: str = Field(description="Command that was/will be executed")
     description: str = Field(default="", description="Human-readable description of what this job does")
-    status: str = Field(description="Job status: queued, running, succeeded, failed")
+    status: str = Field(description="Job status: queued, running, succeeded, failed, lost")
     stdout: str = Field(default="", description="Standard output")
     stderr: str = Field(default="", description="Standard error")
     exit_code: Optional[int] = Field(default=None, description="Exit code")
     duration_ms: Optional[int] = Field(default=None, description="Duration in milliseconds")
+    timeout: int = Field(default=300, description="Command timeout in seconds")
     created_at: str = Field(description="When the job was created")
+    started_at: Optional[str] = Field(default=None, description="When the job started running")
+    finished_at: Optional[str] = Field(default=None, description="When the job finished")
     updated_at: str = Field(description="When the job was last updated")
 
 
+def _preview(text: str, limit: int) -> str:
+    return text[:limit] + "..." if len(text) > limit else text
+
+
+def job_to_info(job, preview: bool = False) -> JobInfo:
+    """Build JobInfo from a Job (with target_node loaded); preview truncates output."""
+    return JobInfo(
+        id=str(job.id),
+        node_name=job.target_node.name,
+        command=_preview(job.command, 100) if preview else job.command,
+        description=job.description or "",
+        status=job.status,
+        stdout=_preview(job.stdout, 200) if preview else job.stdout,
+        stderr=_preview(job.stderr, 200) if preview else job.stderr,
+        exit_code=job.exit_code,
+        duration_ms=job.duration_ms,
+        timeout=job.timeout,
+        created_at=job.created_at.isoformat(),
+        started_at=job.started_at.isoformat() if job.started_at else None,
+        finished_at=job.finished_at.isoformat() if job.finished_at else None,
+        updated_at=job.updated_at.isoformat(),
+    )
+
+
 class SubmitJobOutput(BaseModel):
     """Output schema for submit_job."""
 
-    success: bool = Field(description="Whether the job completed successfully")
+    success: bool = Field(
+        description="Whether the job was queued (and, if waited for and finished, succeeded)"
+    )
     job: Optional[JobInfo] = Field(default=None, description="Job details")
     error: str = Field(default="", description="Error message if failed to submit")
 
 
 async def submit_job(params: SubmitJobInput) -> SubmitJobOutput:
-    """Submit and execute a job on a worker node.
+    """Queue a job on a worker node.
 
     This tool:
-    1. Creates a job record with status 'queued'
-    2. Resolves the target worker node
-    3. Executes the command via SSH
-    4. Updates the job with results (stdout, stderr, exit_code)
-    5. Sets final status to 'succeeded' or 'failed'
+    1. Resolves the target worker node
+    2. Creates a job record with status 'queued'
+    3. Wakes the dispatcher, which runs the command via SSH when the
+       node has a free slot and records the results
 
-    Jobs are executed synchronously - this call blocks until complete.
+    The call returns once the job is queued; follow it with get_job or
+    list_jobs. With wait_seconds, it waits (without blocking the event
+    loop) until the job finishes or the time is up.
 
     Args:
         params: Job submission parameters
 
     Returns:
-        Job execution results
+        The queued job, or its current state after waiting
     """
     logger.info(f"Submitting job to {params.node_name}: {params.command[:100]}...")
 
     try:
         from mcp_tools_core.models import WorkerNode, Job
-        from django.utils import timezone
 
         # Get the target node
         @sync_to_async
@@ -104,38 +143,12 @@ async def submit_job(params: SubmitJobInput) -> SubmitJobOutput:
                 command=params.command,
                 description=params.description,
                 status=Job.STATUS_QUEUED,
+                timeout=max(1, params.timeout),
             )
 
         @sync_to_async
-        def update_job(job, status, stdout, stderr, exit_code, duration_ms):
-            job.status = status
-            job.stdout = stdout
-            job.stderr = stderr
-            job.exit_code = exit_code
-            job.duration_ms = duration_ms
-            job.save()
-            return job
-
-        @sync_to_async
-        def update_node_last_seen(node):
-            node.last_seen = timezone.now()
-            node.save(update_fields=["last_seen"])
-
-        @sync_to_async
-        def job_to_info(job):
-            return JobInfo(
-                id=str(job.id),
-                node_name=job.target_node.name,
-                command=job.command,
-                description=job.description or "",
-                status=job.status,
-                stdout=job.stdout,
-                stderr=job.stderr,
-                exit_code=job.exit_code,
-                duration_ms=job.duration_ms,
-                created_at=job.created_at.isoformat(),
-                updated_at=job.updated_at.isoformat(),
-            )
+        def reload_job(job_id):
+            return Job.objects.select_related("target_node").get(id=job_id)
 
         node = await get_node()
 
@@ -147,40 +160,25 @@ async def submit_job(params: SubmitJobInput) -> SubmitJobOutput:
 
         # Create job record
         job = await create_job(node)
-        logger.info(f"Created job {job.id} for node {node.name}")
-
-        # Update status to running
-        await update_job(job, Job.STATUS_RUNNING, "", "", None, None)
-
-        # Execute the command
-        executor = WorkerSSHExecutor(timeout=params.timeout)
-        result = executor.run_command(node, params.command)
-
-        # Determine final status
-        if result.success:
-            final_status = Job.STATUS_SUCCEEDED
-            await update_node_last_seen(node)
-        else:
-            final_status = Job.STATUS_FAILED
-
-        # Update job with results
-        job = await update_job(
-            job,
-            final_status,
-            result.stdout,
-            result.stderr,
-            result.exit_code,
-            result.duration_ms,
-        )
+        logger.info(f"Queued job {job.id} for node {node.name}")
 
-        job_info = await job_to_info(job)
+        get_job_dispatcher().wake()
 
-        logger.info(f"Job {job.id} completed with status {final_status}")
+        deadline = time.monotonic() + max(0, params.wait_seconds)
+        while params.wait_seconds > 0 and not job.is_complete and time.monotonic() < deadline:
+            await asyncio.sleep(WAIT_POLL_SECONDS)
+            job = await reload_job(job.id)
+
+        if job.is_complete and job.status != Job.STATUS_SUCCEEDED:
+            return SubmitJobOutput(
+                success=False,
+                job=job_to_info(job),
+                error=job.stderr[:500] or f"Job {job.status}",
+            )
 
         return SubmitJobOutput(
-            success=result.success,
-            job=job_info,
-            error="" if result.success else result.stderr[:500],
+            success=True,
+            job=job_to_info(job),
         )
 
     except Exception as e:
@@ -204,7 +202,7 @@ class ListJobsInput(BaseModel):
     )
     status: Optional[str] = Field(
         default=None,
-        description="Filter by status: queued, running, succeeded, failed"
+        description="Filter by status: queued, running, succeeded, failed, lost"
     )
     limit: int = Field(
         default=20,
@@ -247,27 +245,8 @@ async def list_jobs(params: ListJobsInput) -> ListJobsOutput:
             if params.status:
                 queryset = queryset.filter(status=params.status)
 
-            jobs = []
-            for job in queryset[:params.limit]:
-                # Truncate stdout/stderr for list view
-                stdout_preview = job.stdout[:200] + "..." if len(job.stdout) > 200 else job.stdout
-                stderr_preview = job.stderr[:200] + "..." if len(job.stderr) > 200 else job.stderr
-
-                jobs.append(JobInfo(
-                    id=str(job.id),
-                    node_name=job.target_node.name,
-                    command=job.command[:100] + "..." if len(job.command) > 100 else job.command,
-                    description=job.description or "",
-                    status=job.status,
-                    stdout=stdout_preview,
-                    stderr=stderr_preview,
-                    exit_code=job.exit_code,
-                    duration_ms=job.duration_ms,
-                    created_at=job.created_at.isoformat(),
-                    updated_at=job.updated_at.isoformat(),
-                ))
-
-            return jobs
+            # Truncate command and output for list view
+            return [job_to_info(job, preview=True) for job in queryset[:params.limit]]
 
         jobs = await query_jobs()
 
@@ -335,19 +314,7 @@ async def get_job(params: GetJobInput) -> GetJobOutput:
         def get_job_by_id():
             try:
                 job = Job.objects.select_related("target_node").get(id=job_uuid)
-                return JobInfo(
-                    id=str(job.id),
-                    node_name=job.target_node.name,
-                    command=job.command,
-                    description=job.description or "",
-                    status=job.status,
-                    stdout=job.stdout,
-                    stderr=job.stderr,
-                    exit_code=job.exit_code,
-                    duration_ms=job.duration_ms,
-                    created_at=job.created_at.isoformat(),
-                    updated_at=job.updated_at.isoformat(),
-                )
+                return job_to_info(job)
             except Job.DoesNotExist:
                 return None
 
@@ -43,6 +43,7 @@ class WorkerNodeInfo(BaseModel):
     ssh_port: int = Field(description="SSH port")
     tags: List[str] = Field(default_factory=list, description="Node tags")
     is_active: bool = Field(description="Whether node is active")
+    max_concurrent_jobs: int = Field(default=2, description="Jobs the dispatcher runs on this node at the same time")
     last_seen: Optional[str] = Field(default=None, description="Last contact timestamp")
 
 
@@ -93,6 +94,7 @@ async def list_worker_nodes(params: ListWorkerNodesInput) -> ListWorkerNodesOutp
                     ssh_port=node.ssh_port,
                     tags=node.get_tags_list(),
                     is_active=node.is_active,
+                    max_concurrent_jobs=node.max_concurrent_jobs,
                     last_seen=node.last_seen.isoformat() if node.last_seen else None,
                 ))
 
@@ -159,6 +161,7 @@ async def get_worker_node(params: GetWorkerNodeInput) -> GetWorkerNodeOutput:
                     ssh_port=node.ssh_port,
                     tags=node.get_tags_list(),
                     is_active=node.is_active,
+                    max_concurrent_jobs=node.max_concurrent_jobs,
                     last_seen=node.last_seen.isoformat() if node.last_seen else None,
                 )
             except WorkerNode.DoesNotExist:
@@ -270,6 +273,7 @@ async def check_worker_node(params: CheckWorkerNodeInput) -> CheckWorkerNodeOutp
             ssh_port=node.ssh_port,
             tags=node.get_tags_list(),
             is_active=node.is_active,
+            max_concurrent_jobs=node.max_concurrent_jobs,
             last_seen=node.last_seen.isoformat() if node.last_seen else None,
         )
 
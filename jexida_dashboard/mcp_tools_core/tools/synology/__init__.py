@@ -2,6 +2,9 @@
 
 Contains MCP tools for managing Synology NAS devices:
 - FileStation: File and folder operations
+- Transfers: Streaming, resumable uploads and downloads
+- File index: Local metadata index for instant search
+- Usage: Recursive folder size analytics
 - Download Station: Download task management
 - System: System information and monitoring
 - Users: User account management
@@ -15,12 +18,19 @@ Contains MCP tools for managing Synology NAS devices:
 - Security: Security settings and firewall
 - Tasks: Task Scheduler management
 - Docker: Container management
+- Container stats: Sampled per-container CPU/memory and top consumers
 - Virtualization: Virtual Machine Manager
 - Monitoring: Logs and resource monitoring
+- Log ingestion: Incremental local copy of Log Center entries
+- Utilization: Sampled CPU/memory/disk/network history
+- Multi-NAS: Inventory of NAS units and concurrent fan-out queries
 """
 
 # Import tools to trigger registration
 from . import filestation
+from . import transfers
+from . import file_index
+from . import usage
 from . import download_station
 from . import system
 from . import users
@@ -34,8 +44,12 @@ from . import network
 from . import security
 from . import tasks
 from . import docker
+from . import container_stats
 from . import virtualization
 from . import monitoring
+from . import log_ingest
+from . import utilization
+from . import multi_nas
 
 # Import client for external use
 from .client import (
@@ -52,10 +66,20 @@ from .client import (
     SynologyCamera,
     SynologyBackupTask,
 )
+from .batch import BatchCall, SynologyBatch
+from .polling import PollEvent, PollEventLog, poll_task, wait_task
+from .session_pool import (
+    SynologySession,
+    SynologySessionPool,
+    get_session_pool,
+)
 
 __all__ = [
     # Tool modules
     "filestation",
+    "transfers",
+    "file_index",
+    "usage",
     "download_station",
     "system",
     "users",
@@ -69,8 +93,12 @@ __all__ = [
     "security",
     "tasks",
     "docker",
+    "container_stats",
     "virtualization",
     "monitoring",
+    "log_ingest",
+    "utilization",
+    "multi_nas",
     # Client classes
     "SynologyClient",
     "SynologyAuthError",
@@ -84,5 +112,17 @@ __all__ = [
     "SynologyPackage",
     "SynologyCamera",
     "SynologyBackupTask",
+    # Batched requests
+    "BatchCall",
+    "SynologyBatch",
+    # Background task polling
+    "PollEvent",
+    "PollEventLog",
+    "poll_task",
+    "wait_task",
+    # Session pool
+    "SynologySession",
+    "SynologySessionPool",
+    "get_session_pool",
 ]
 
@@ -17,6 +17,7 @@ from .client import (
     SynologyAPIError,
     SynologyBackupTask,
 )
+from .polling import PollEventLog
 
 logger = get_logger(__name__)
 
@@ -66,6 +67,14 @@ class SynologyRunBackupTaskOutput(BaseModel):
 class SynologyGetBackupStatusInput(BaseModel):
     """Input schema for synology_get_backup_status tool."""
     task_id: int = Field(description="Backup task ID")
+    wait: bool = Field(
+        default=False,
+        description="Wait until the task is no longer running before returning"
+    )
+    timeout_seconds: float = Field(
+        default=3600,
+        description="Maximum time to wait when wait is set (the backup keeps running)"
+    )
 
 
 class BackupStatusOutput(BaseModel):
@@ -84,6 +93,10 @@ class SynologyGetBackupStatusOutput(BaseModel):
         default=None,
         description="Backup status information"
     )
+    progress_events: List[Dict[str, Any]] = Field(
+        default_factory=list,
+        description="Most recent status checks while waiting (elapsed, progress, finished)"
+    )
     error: str = Field(default="", description="Error message if failed")
 
 
@@ -186,7 +199,7 @@ async def synology_run_backup_task(params: SynologyRunBackupTaskInput) -> Synolo
 
 @tool(
     name="synology_get_backup_status",
-    description="Get the current status of a Hyper Backup task on Synology NAS",
+    description="Get the status of a Hyper Backup task on Synology NAS, optionally waiting for a running backup to finish",
     input_schema=SynologyGetBackupStatusInput,
     output_schema=SynologyGetBackupStatusOutput,
     tags=["synology", "backup", "hyperbackup"]
@@ -194,11 +207,19 @@ async def synology_run_backup_task(params: SynologyRunBackupTaskInput) -> Synolo
 async def synology_get_backup_status(params: SynologyGetBackupStatusInput) -> SynologyGetBackupStatusOutput:
     """Get the current status of a backup task."""
     invocation_logger = ToolInvocationLogger(logger)
-    invocation_logger.start("synology_get_backup_status", task_id=params.task_id)
+    invocation_logger.start("synology_get_backup_status", task_id=params.task_id, wait=params.wait)
     
     try:
         async with SynologyClient() as client:
-            status_data = await client.get_backup_status(params.task_id)
+            events = PollEventLog()
+            if params.wait:
+                status_data = await client.wait_for_backup(
+                    params.task_id,
+                    timeout=params.timeout_seconds,
+                    on_progress=events,
+                )
+            else:
+                status_data = await client.get_backup_status(params.task_id)
             
             status = BackupStatusOutput(
                 task_id=status_data.get("task_id", params.task_id),
@@ -213,6 +234,7 @@ async def synology_get_backup_status(params: SynologyGetBackupStatusInput) -> Sy
             return SynologyGetBackupStatusOutput(
                 success=True,
                 status=status,
+                progress_events=events.to_list(),
             )
             
     except SynologyConnectionError as e:
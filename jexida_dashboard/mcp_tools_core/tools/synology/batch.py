@@ -0,0 +1,175 @@
+"""Batched Synology API calls.
+
+DSM 7 can run several API methods in one HTTP round trip through
+SYNO.Entry.Request with a ``compound`` list. SynologyBatch collects calls,
+sends them as one compound request and fans the per-call results and
+errors back out. On NAS units without SYNO.Entry.Request (DSM 6) the calls
+are issued as concurrent individual requests instead.
+
+Usage:
+    async with SynologyClient() as client:
+        batch = client.batch()
+        system = batch.add("SYNO.Core.System", "info")
+        util = batch.add("SYNO.Core.System.Utilization", "get")
+        await batch.execute()
+        model = system.result().get("model")
+"""
+
+import asyncio
+import json
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from logging_config import get_logger
+
+if TYPE_CHECKING:
+    from .client import SynologyClient
+
+logger = get_logger(__name__)
+
+
+COMPOUND_API = "SYNO.Entry.Request"
+
+
+@dataclass
+class BatchCall:
+    """One call in a batch and, after execute(), its outcome."""
+    api: str
+    method: str
+    version: Optional[int] = None
+    params: Dict[str, Any] = field(default_factory=dict)
+    data: Optional[Dict[str, Any]] = None
+    error: Optional[BaseException] = None
+    done: bool = False
+
+    def result(self) -> Dict[str, Any]:
+        """Return the call's data, raising its error if it failed."""
+        if not self.done:
+            raise RuntimeError(f"{self.api}.{self.method} has not been executed")
+        if self.error is not None:
+            raise self.error
+        return self.data or {}
+
+    @property
+    def ok(self) -> bool:
+        return self.done and self.error is None
+
+
+class SynologyBatch:
+    """Collects Synology API calls and executes them together."""
+
+    def __init__(self, client: "SynologyClient", mode: str = "parallel"):
+        """Initialize a batch.
+
+        Args:
+            client: Connected SynologyClient
+            mode: DSM compound mode, "parallel" or "sequential"
+        """
+        self.client = client
+        self.mode = mode
+        self.calls: List[BatchCall] = []
+        self.compound_used = False
+
+    def add(self, api: str, method: str, version: Optional[int] = None, **params) -> BatchCall:
+        """Queue a call; its result is available after execute()."""
+        call = BatchCall(api=api, method=method, version=version, params=params)
+        self.calls.append(call)
+        return call
+
+    async def __aenter__(self) -> "SynologyBatch":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        if exc_type is None:
+            await self.execute()
+
+    def supports_compound(self) -> bool:
+        """Whether the NAS advertises SYNO.Entry.Request (DSM 7+)."""
+        return COMPOUND_API in self.client._api_info
+
+    async def execute(self) -> List[BatchCall]:
+        """Run all pending calls and fill in their results.
+
+        Per-call failures are stored on each BatchCall rather than raised;
+        only a failure of the compound request as a whole falls back to
+        individual requests.
+        """
+        pending = [c for c in self.calls if not c.done]
+        if not pending:
+            return self.calls
+
+        # Only entry.cgi APIs can be part of a compound request
+        compound = []
+        individual = []
+        for call in pending:
+            try:
+                path, _ = self.client._resolve_api(call.api, call.version)
+            except Exception as e:
+                call.error, call.done = e, True
+                continue
+            if path == "entry.cgi" and self.supports_compound():
+                compound.append(call)
+            else:
+                individual.append(call)
+
+        if len(compound) == 1:
+            individual.extend(compound)
+            compound = []
+
+        if compound:
+            try:
+                await self._execute_compound(compound)
+                self.compound_used = True
+            except Exception as e:
+                logger.debug(f"Compound request failed, falling back to individual calls: {e}")
+                individual.extend(compound)
+
+        if individual:
+            await self._execute_individual(individual)
+
+        return self.calls
+
+    async def _execute_compound(self, calls: List[BatchCall]) -> None:
+        from .client import SynologyAPIError
+
+        entries = []
+        for call in calls:
+            _, ver = self.client._resolve_api(call.api, call.version)
+            entries.append({"api": call.api, "method": call.method, "version": ver, **call.params})
+
+        data = await self.client._api_post(
+            COMPOUND_API,
+            "request",
+            version=1,
+            mode=self.mode,
+            stop_when_error="false",
+            compound=json.dumps(entries),
+        )
+
+        results = data.get("result", [])
+        if len(results) != len(calls):
+            raise SynologyAPIError(
+                f"Compound request returned {len(results)} results for {len(calls)} calls"
+            )
+
+        for call, result in zip(calls, results):
+            try:
+                call.data = self.client._check_response(call.api, call.method, result)
+            except SynologyAPIError as e:
+                call.error = e
+            call.done = True
+
+    async def _execute_individual(self, calls: List[BatchCall]) -> None:
+        outcomes = await asyncio.gather(
+            *(
+                self.client._api_request(call.api, call.method, call.version, **call.params)
+                for call in calls
+            ),
+            return_exceptions=True,
+        )
+        for call, outcome in zip(calls, outcomes):
+            if isinstance(outcome, BaseException):
+                call.error = outcome
+            else:
+                call.data = outcome
+            call.done = True
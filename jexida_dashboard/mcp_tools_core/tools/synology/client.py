@@ -6,15 +6,23 @@ Uses session-based authentication with RSA password encryption.
 
 import asyncio
 import base64
+import hashlib
 import json
+import os
+import time
+import uuid
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 
 import httpx
 
 from config import get_settings
 from logging_config import get_logger
 
+from .batch import SynologyBatch
+from .polling import PollEvent, wait_task
+from .session_pool import SynologySession, get_session_pool, load_api_info, save_api_info
+
 logger = get_logger(__name__)
 
 
@@ -46,6 +54,7 @@ SYNOLOGY_ERROR_CODES = {
     105: "The logged in session does not have permission",
     106: "Session timeout",
     107: "Session interrupted by duplicate login",
+    119: "SID not found",
     400: "Invalid parameter",
     401: "Unknown error of file operation",
     402: "System is too busy",
@@ -71,6 +80,39 @@ SYNOLOGY_ERROR_CODES = {
     599: "No such task of the file operation",
 }
 
+# Error codes meaning the SID is no longer valid and a new login is needed
+SESSION_ERROR_CODES = (106, 107, 119)
+
+# Download Station states in which a task will not progress further
+DOWNLOAD_DONE_STATES = ("finished", "seeding", "error")
+
+# Hyper Backup states of a task that is still working
+BACKUP_RUNNING_STATES = ("backup", "preparing", "waiting", "running", "detect")
+
+# Chunk size for streamed FileStation uploads/downloads
+TRANSFER_CHUNK_SIZE = 1024 * 1024
+
+# progress(bytes_done, total_bytes) callback for transfers
+ProgressCallback = Callable[[int, Optional[int]], None]
+
+
+def _error_envelope(body: bytes) -> Optional[Dict[str, Any]]:
+    """Return body as a DSM error envelope, or None if it is file data."""
+    try:
+        data = json.loads(body)
+    except ValueError:
+        return None
+    if isinstance(data, dict) and data.get("success") is False and "error" in data:
+        return data
+    return None
+
+
+def _hash_file(path: str, digest: Any, chunk_size: int = TRANSFER_CHUNK_SIZE) -> None:
+    """Feed an existing file into a hashlib digest in chunks."""
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+
 
 @dataclass
 class SynologySystemInfo:
@@ -262,7 +304,9 @@ class SynologyClient:
     """Async client for Synology DSM API.
     
     Supports DSM 6.x and 7.x API patterns.
-    Uses session-based cookie authentication.
+    Uses session-based cookie authentication. By default the session is
+    borrowed from a process-wide pool keyed by NAS URL and username, so
+    repeated tool calls do not log in and out each time.
     
     Usage:
         async with SynologyClient() as client:
@@ -274,6 +318,8 @@ class SynologyClient:
         "SYNO.API.Info": {"path": "query.cgi", "version": 1},
         "SYNO.API.Auth": {"path": "auth.cgi", "version": 6},
         "SYNO.API.Encryption": {"path": "encryption.cgi", "version": 1},
+        "SYNO.DSM.Info": {"path": "entry.cgi", "version": 2},
+        "SYNO.Entry.Request": {"path": "entry.cgi", "version": 1},
         "SYNO.FileStation.List": {"path": "entry.cgi", "version": 2},
         "SYNO.FileStation.Info": {"path": "entry.cgi", "version": 2},
         "SYNO.FileStation.Search": {"path": "entry.cgi", "version": 2},
@@ -283,6 +329,8 @@ class SynologyClient:
         "SYNO.FileStation.Upload": {"path": "entry.cgi", "version": 2},
         "SYNO.FileStation.Download": {"path": "entry.cgi", "version": 2},
         "SYNO.FileStation.CopyMove": {"path": "entry.cgi", "version": 3},
+        "SYNO.FileStation.MD5": {"path": "entry.cgi", "version": 2},
+        "SYNO.FileStation.DirSize": {"path": "entry.cgi", "version": 2},
         "SYNO.DownloadStation.Task": {"path": "DownloadStation/task.cgi", "version": 1},
         "SYNO.DownloadStation.Info": {"path": "DownloadStation/info.cgi", "version": 1},
         "SYNO.Core.System": {"path": "entry.cgi", "version": 3},
@@ -303,6 +351,8 @@ class SynologyClient:
         verify_ssl: Optional[bool] = None,
         timeout: Optional[int] = None,
         otp_code: Optional[str] = None,
+        pooled: bool = True,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
     ):
         """Initialize Synology client.
         
@@ -313,6 +363,9 @@ class SynologyClient:
             verify_ssl: Verify SSL certs (defaults to config)
             timeout: Request timeout in seconds (defaults to config)
             otp_code: Optional OTP code for 2FA
+            pooled: Borrow the shared session for this NAS/user instead of
+                logging in and out around every use
+            transport: Optional httpx transport (used by tests)
         """
         settings = get_settings()
         
@@ -322,53 +375,105 @@ class SynologyClient:
         self.verify_ssl = verify_ssl if verify_ssl is not None else settings.synology_verify_ssl
         self.timeout = timeout or settings.synology_timeout
         self.otp_code = otp_code
+        self.pooled = pooled
+        self.transport = transport
         
-        self._client: Optional[httpx.AsyncClient] = None
-        self._sid: Optional[str] = None
-        self._api_info: Dict[str, Dict[str, Any]] = {}
-        
+        # Private session until connect() borrows the pooled one
+        self._session = SynologySession(base_url=self.base_url, username=self.username or "")
+        self._borrowed = False
+    
+    # Connection state lives on the (possibly shared) session
+    
+    @property
+    def _client(self) -> Optional[httpx.AsyncClient]:
+        return self._session.current_http()
+    
+    @property
+    def _sid(self) -> Optional[str]:
+        return self._session.sid
+    
+    @_sid.setter
+    def _sid(self, value: Optional[str]) -> None:
+        self._session.sid = value
+    
+    @property
+    def _api_info(self) -> Dict[str, Dict[str, Any]]:
+        return self._session.api_info
+    
+    @_api_info.setter
+    def _api_info(self, value: Dict[str, Dict[str, Any]]) -> None:
+        self._session.api_info = value
+    
     async def __aenter__(self) -> "SynologyClient":
         """Async context manager entry."""
         await self.connect()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
-        """Async context manager exit."""
-        await self.disconnect()
+        """Async context manager exit.
+        
+        Pooled clients hand the session back without logging out.
+        """
+        if self.pooled:
+            self.release()
+        else:
+            await self.disconnect()
+    
+    def _new_http_client(self) -> httpx.AsyncClient:
+        """Create the HTTP client for the current event loop."""
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            verify=self.verify_ssl,
+            timeout=self.timeout,
+            follow_redirects=True,
+            transport=self.transport,
+        )
     
     async def connect(self) -> None:
-        """Establish connection and authenticate."""
+        """Establish connection and authenticate.
+        
+        Pooled clients reuse the shared session if it is already logged in.
+        """
         if not self.base_url:
             raise SynologyConnectionError("Synology NAS URL not configured")
         if not self.username or not self.password:
             raise SynologyAuthError("Synology credentials not configured")
         
-        # Create HTTP client
-        self._client = httpx.AsyncClient(
-            base_url=self.base_url,
-            verify=self.verify_ssl,
-            timeout=self.timeout,
-            follow_redirects=True,
-        )
+        if self.pooled:
+            self._session = get_session_pool().get(self.base_url, self.username)
+        
+        session = self._session
+        resources = session.resources(self._new_http_client)
         
         try:
-            # Get API info
-            await self._get_api_info()
-            
-            # Authenticate
-            await self._authenticate()
-            
-            logger.info(f"Connected to Synology NAS at {self.base_url}")
-            
+            async with resources.auth_lock:
+                if not session.sid:
+                    await self._login()
+                    logger.info(f"Connected to Synology NAS at {self.base_url}")
         except httpx.ConnectError as e:
             await self.disconnect()
             raise SynologyConnectionError(f"Failed to connect to {self.base_url}: {e}")
         except httpx.TimeoutException as e:
             await self.disconnect()
             raise SynologyConnectionError(f"Connection timeout to {self.base_url}: {e}")
+        
+        if not self._borrowed:
+            session.borrowers += 1
+            self._borrowed = True
+        session.last_used = time.monotonic()
+    
+    def release(self) -> None:
+        """Return a pooled session without logging out."""
+        if self._borrowed:
+            self._session.borrowers -= 1
+            self._borrowed = False
+        self._session.last_used = time.monotonic()
     
     async def disconnect(self) -> None:
-        """Close connection and logout."""
+        """Close connection and logout.
+        
+        For pooled clients this ends the shared session for every borrower.
+        """
         if self._sid and self._client:
             try:
                 await self._api_request(
@@ -379,11 +484,39 @@ class SynologyClient:
             except Exception:
                 pass  # Ignore logout errors
         
-        if self._client:
-            await self._client.aclose()
-            self._client = None
-        
+        self.release()
+        await self._session.aclose()
         self._sid = None
+        
+        if self.pooled:
+            get_session_pool().remove(self.base_url, self.username)
+    
+    async def _login(self) -> None:
+        """Authenticate and load the API info map for this DSM version."""
+        await self._authenticate()
+        
+        session = self._session
+        if session.api_info:
+            return
+        
+        session.dsm_version = await self._get_dsm_version()
+        cached = await load_api_info(self.base_url, session.dsm_version)
+        if cached:
+            self._api_info = cached
+            logger.debug(f"Using persisted API info for DSM {session.dsm_version}")
+            return
+        
+        await self._get_api_info()
+        await save_api_info(self.base_url, session.dsm_version, self._api_info)
+    
+    async def _get_dsm_version(self) -> str:
+        """Return the DSM version string, or "" if it cannot be read."""
+        try:
+            data = await self._api_request("SYNO.DSM.Info", "getinfo", retry_auth=False)
+        except SynologyAPIError as e:
+            logger.debug(f"Could not read DSM version: {e}")
+            return ""
+        return str(data.get("version_string") or data.get("version") or "")
     
     async def _get_api_info(self) -> None:
         """Query available APIs from the NAS."""
@@ -435,26 +568,64 @@ class SynologyClient:
         self._sid = data.get("data", {}).get("sid")
         if not self._sid:
             raise SynologyAuthError("No session ID received")
+        self._session.logins += 1
         
         logger.debug(f"Authenticated with session ID: {self._sid[:8]}...")
     
+    async def _reauthenticate(self, stale_sid: Optional[str]) -> None:
+        """Log in again after DSM rejected stale_sid.
+        
+        If another borrower already replaced the SID while we waited for
+        the lock, its new session is used as-is.
+        """
+        resources = self._session.resources(self._new_http_client)
+        async with resources.auth_lock:
+            if self._sid and self._sid != stale_sid:
+                return
+            logger.info(f"Synology session expired, re-authenticating to {self.base_url}")
+            self._sid = None
+            await self._authenticate()
+    
     def _get_error_message(self, code: int) -> str:
         """Get human-readable error message for error code."""
         return SYNOLOGY_ERROR_CODES.get(code, f"Unknown error code {code}")
     
+    def _resolve_api(self, api: str, version: Optional[int]) -> Tuple[str, int]:
+        """Return (cgi path, version) for an API."""
+        api_info = self._api_info.get(api) or self.API_INFO.get(api)
+        if not api_info:
+            raise SynologyAPIError(f"Unknown API: {api}")
+        
+        return api_info.get("path", "entry.cgi"), version or api_info.get("version", 1)
+    
+    def _check_response(self, api: str, method: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Raise SynologyAPIError for a failed DSM response."""
+        if not data.get("success"):
+            error = data.get("error", {})
+            error_code = error.get("code", 0)
+            error_msg = self._get_error_message(error_code)
+            raise SynologyAPIError(f"{api}.{method} failed: {error_msg}", error_code)
+        
+        return data.get("data", {})
+    
     async def _api_request(
         self,
         api: str,
         method: str,
         version: Optional[int] = None,
+        retry_auth: bool = True,
         **params
     ) -> Dict[str, Any]:
         """Make an API request.
         
+        Session errors (106, 107, 119) trigger one re-authentication and
+        retry, so a pooled session that DSM expired heals transparently.
+        
         Args:
             api: API name (e.g., "SYNO.FileStation.List")
             method: Method name (e.g., "list")
             version: API version (uses default if not specified)
+            retry_auth: Re-authenticate and retry once on session errors
             **params: Additional parameters
             
         Returns:
@@ -466,13 +637,7 @@ class SynologyClient:
         if not self._client:
             raise SynologyAPIError("Not connected")
         
-        # Get API path and version
-        api_info = self._api_info.get(api) or self.API_INFO.get(api)
-        if not api_info:
-            raise SynologyAPIError(f"Unknown API: {api}")
-        
-        path = api_info.get("path", "entry.cgi")
-        ver = version or api_info.get("version", 1)
+        path, ver = self._resolve_api(api, version)
         
         # Build request parameters
         request_params = {
@@ -483,8 +648,9 @@ class SynologyClient:
         }
         
         # Add session ID if authenticated
-        if self._sid:
-            request_params["_sid"] = self._sid
+        sid = self._sid
+        if sid:
+            request_params["_sid"] = sid
         
         # Make request
         try:
@@ -498,14 +664,22 @@ class SynologyClient:
         except Exception as e:
             raise SynologyAPIError(f"Request failed for {api}.{method}: {e}")
         
-        # Check for errors
-        if not data.get("success"):
-            error = data.get("error", {})
-            error_code = error.get("code", 0)
-            error_msg = self._get_error_message(error_code)
-            raise SynologyAPIError(f"{api}.{method} failed: {error_msg}", error_code)
+        try:
+            return self._check_response(api, method, data)
+        except SynologyAPIError as e:
+            if not self._should_reauthenticate(api, e, retry_auth):
+                raise
         
-        return data.get("data", {})
+        await self._reauthenticate(sid)
+        return await self._api_request(api, method, version, retry_auth=False, **params)
+    
+    def _should_reauthenticate(self, api: str, error: SynologyAPIError, retry_auth: bool) -> bool:
+        return (
+            retry_auth
+            and api != "SYNO.API.Auth"
+            and bool(self.password)
+            and error.error_code in SESSION_ERROR_CODES
+        )
     
     async def _api_post(
         self,
@@ -513,6 +687,7 @@ class SynologyClient:
         method: str,
         version: Optional[int] = None,
         files: Optional[Dict[str, Any]] = None,
+        retry_auth: bool = True,
         **params
     ) -> Dict[str, Any]:
         """Make a POST API request (for uploads).
@@ -522,6 +697,7 @@ class SynologyClient:
             method: Method name
             version: API version
             files: Files to upload
+            retry_auth: Re-authenticate and retry once on session errors
             **params: Additional parameters
             
         Returns:
@@ -530,12 +706,7 @@ class SynologyClient:
         if not self._client:
             raise SynologyAPIError("Not connected")
         
-        api_info = self._api_info.get(api) or self.API_INFO.get(api)
-        if not api_info:
-            raise SynologyAPIError(f"Unknown API: {api}")
-        
-        path = api_info.get("path", "entry.cgi")
-        ver = version or api_info.get("version", 1)
+        path, ver = self._resolve_api(api, version)
         
         # Build form data
         form_data = {
@@ -545,8 +716,9 @@ class SynologyClient:
             **{k: str(v) for k, v in params.items()},
         }
         
-        if self._sid:
-            form_data["_sid"] = self._sid
+        sid = self._sid
+        if sid:
+            form_data["_sid"] = sid
         
         try:
             response = await self._client.post(
@@ -558,13 +730,26 @@ class SynologyClient:
         except Exception as e:
             raise SynologyAPIError(f"POST request failed for {api}.{method}: {e}")
         
-        if not data.get("success"):
-            error = data.get("error", {})
-            error_code = error.get("code", 0)
-            error_msg = self._get_error_message(error_code)
-            raise SynologyAPIError(f"{api}.{method} failed: {error_msg}", error_code)
+        try:
+            return self._check_response(api, method, data)
+        except SynologyAPIError as e:
+            # Only retry uploads whose payload can be sent again
+            if files or not self._should_reauthenticate(api, e, retry_auth):
+                raise
         
-        return data.get("data", {})
+        await self._reauthenticate(sid)
+        return await self._api_post(api, method, version, files=None, retry_auth=False, **params)
+    
+    def batch(self, mode: str = "parallel") -> SynologyBatch:
+        """Start a batch of API calls sent as one compound request.
+        
+        Args:
+            mode: DSM compound mode, "parallel" or "sequential"
+            
+        Returns:
+            SynologyBatch; add() calls, then execute() (or use async with)
+        """
+        return SynologyBatch(self, mode=mode)
     
     # -------------------------------------------------------------------------
     # System Information
@@ -572,18 +757,16 @@ class SynologyClient:
     
     async def get_system_info(self) -> SynologySystemInfo:
         """Get system information."""
-        # Get system info
-        system_data = await self._api_request(
-            "SYNO.Core.System",
-            "info",
-        )
-        
-        # Get utilization data
-        util_data = await self._api_request(
-            "SYNO.Core.System.Utilization",
-            "get",
-        )
+        batch = self.batch()
+        system_call = batch.add("SYNO.Core.System", "info")
+        util_call = batch.add("SYNO.Core.System.Utilization", "get")
+        await batch.execute()
         
+        return self._parse_system_info(system_call.result(), util_call.result())
+    
+    @staticmethod
+    def _parse_system_info(system_data: Dict[str, Any], util_data: Dict[str, Any]) -> SynologySystemInfo:
+        """Build SynologySystemInfo from system info and utilization data."""
         cpu = util_data.get("cpu", {})
         memory = util_data.get("memory", {})
         
@@ -609,6 +792,37 @@ class SynologyClient:
             temperature=system_data.get("temperature"),
         )
     
+    async def get_system_overview(self) -> Dict[str, Any]:
+        """Get system info, storage volumes and network in one round trip.
+        
+        Returns:
+            Dict with "system" (SynologySystemInfo), "volumes", "network"
+            and "errors" (per-section messages for parts that failed)
+        """
+        batch = self.batch()
+        system_call = batch.add("SYNO.Core.System", "info")
+        util_call = batch.add("SYNO.Core.System.Utilization", "get")
+        storage_call = batch.add("SYNO.Storage.CGI.Storage", "load_info")
+        await batch.execute()
+        
+        errors: Dict[str, str] = {}
+        overview: Dict[str, Any] = {"system": None, "volumes": [], "network": {}, "errors": errors}
+        
+        if system_call.ok and util_call.ok:
+            overview["system"] = self._parse_system_info(system_call.data or {}, util_call.data or {})
+        else:
+            errors["system"] = str(system_call.error or util_call.error)
+        
+        if system_call.ok:
+            overview["network"] = self._parse_network_info(system_call.data or {})
+        
+        if storage_call.ok:
+            overview["volumes"] = self._parse_storage_info(storage_call.data or {})
+        else:
+            errors["storage"] = str(storage_call.error)
+        
+        return overview
+    
     async def get_storage_info(self) -> List[SynologyStorageVolume]:
         """Get storage volume information."""
         data = await self._api_request(
@@ -616,6 +830,11 @@ class SynologyClient:
             "load_info",
         )
         
+        return self._parse_storage_info(data)
+    
+    @staticmethod
+    def _parse_storage_info(data: Dict[str, Any]) -> List[SynologyStorageVolume]:
+        """Build storage volumes from SYNO.Storage.CGI.Storage load_info data."""
         volumes = []
         for vol in data.get("volumes", []):
             total = vol.get("size", {}).get("total", 0)
@@ -639,6 +858,11 @@ class SynologyClient:
             "info",
         )
         
+        return self._parse_network_info(data)
+    
+    @staticmethod
+    def _parse_network_info(data: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract hostname/DNS from SYNO.Core.System info data."""
         return {
             "hostname": data.get("hostname", ""),
             "dns": data.get("dns_name", ""),
@@ -668,6 +892,24 @@ class SynologyClient:
         Returns:
             List of file info objects
         """
+        files, _ = await self.list_files_page(
+            folder_path, offset, limit, sort_by, sort_direction,
+        )
+        return files
+    
+    async def list_files_page(
+        self,
+        folder_path: str = "/",
+        offset: int = 0,
+        limit: int = 1000,
+        sort_by: str = "name",
+        sort_direction: str = "asc",
+    ) -> Tuple[List[SynologyFileInfo], int]:
+        """List one page of a folder.
+        
+        Returns:
+            (files, total) where total is the folder's item count
+        """
         data = await self._api_request(
             "SYNO.FileStation.List",
             "list",
@@ -679,24 +921,92 @@ class SynologyClient:
             additional='["size","time","owner"]',
         )
         
-        files = []
-        for item in data.get("files", []):
-            additional = item.get("additional", {})
-            time_info = additional.get("time", {})
-            owner_info = additional.get("owner", {})
+        files = [self._parse_file_item(item) for item in data.get("files", [])]
+        return files, data.get("total", offset + len(files))
+    
+    async def iter_files(
+        self,
+        folder_path: str = "/",
+        page_size: int = 1000,
+        sort_by: str = "name",
+        sort_direction: str = "asc",
+        offset: int = 0,
+        max_items: Optional[int] = None,
+        prefetch: bool = True,
+    ) -> AsyncIterator[SynologyFileInfo]:
+        """Iterate over a folder, paging automatically.
+        
+        Items are yielded as each page arrives. With prefetch enabled the
+        next page is requested while the current one is being consumed.
+        
+        Args:
+            folder_path: Path to list
+            page_size: Items per FileStation request
+            sort_by: Sort field (name, size, mtime)
+            sort_direction: Sort direction (asc, desc)
+            offset: Starting offset
+            max_items: Stop after this many items (None = all)
+            prefetch: Fetch the next page in the background
             
-            files.append(SynologyFileInfo(
-                name=item.get("name", ""),
-                path=item.get("path", ""),
-                is_dir=item.get("isdir", False),
-                size=additional.get("size", 0),
-                create_time=time_info.get("crtime", 0),
-                modify_time=time_info.get("mtime", 0),
-                access_time=time_info.get("atime", 0),
-                owner=owner_info.get("user", ""),
+        Yields:
+            File info objects
+        """
+        def fetch(page_offset: int) -> "asyncio.Task":
+            size = page_size
+            if max_items is not None:
+                size = min(page_size, max_items - (page_offset - offset))
+            return asyncio.ensure_future(self.list_files_page(
+                folder_path, page_offset, size, sort_by, sort_direction,
             ))
         
-        return files
+        if max_items is not None and max_items <= 0:
+            return
+        
+        yielded = 0
+        next_offset = offset
+        pending: Optional[asyncio.Task] = fetch(next_offset)
+        
+        try:
+            while pending is not None:
+                files, total = await pending
+                pending = None
+                next_offset += len(files)
+                
+                more = (
+                    len(files) > 0
+                    and next_offset < total
+                    and (max_items is None or yielded + len(files) < max_items)
+                )
+                if more and prefetch:
+                    pending = fetch(next_offset)
+                
+                for item in files:
+                    yield item
+                    yielded += 1
+                
+                if more and not prefetch:
+                    pending = fetch(next_offset)
+        finally:
+            if pending is not None and not pending.done():
+                pending.cancel()
+    
+    @staticmethod
+    def _parse_file_item(item: Dict[str, Any]) -> SynologyFileInfo:
+        """Build SynologyFileInfo from a FileStation file entry."""
+        additional = item.get("additional", {})
+        time_info = additional.get("time", {})
+        owner_info = additional.get("owner", {})
+        
+        return SynologyFileInfo(
+            name=item.get("name", ""),
+            path=item.get("path", ""),
+            is_dir=item.get("isdir", False),
+            size=additional.get("size", 0),
+            create_time=time_info.get("crtime", 0),
+            modify_time=time_info.get("mtime", 0),
+            access_time=time_info.get("atime", 0),
+            owner=owner_info.get("user", ""),
+        )
     
     async def get_file_info(self, path: str) -> SynologyFileInfo:
         """Get information about a specific file or folder."""
@@ -727,6 +1037,72 @@ class SynologyClient:
             owner=owner_info.get("user", ""),
         )
     
+    async def list_shares(self) -> List[SynologyFileInfo]:
+        """List the shared folders visible to FileStation (e.g. /photo)."""
+        data = await self._api_request(
+            "SYNO.FileStation.List",
+            "list_share",
+            additional='["size","time","owner"]',
+        )
+        
+        return [self._parse_file_item(item) for item in data.get("shares", [])]
+    
+    async def get_files_info(self, paths: List[str]) -> List[SynologyFileInfo]:
+        """Get information about several files or folders in one request.
+        
+        Paths that do not exist are left out of the result.
+        """
+        if not paths:
+            return []
+        
+        data = await self._api_request(
+            "SYNO.FileStation.List",
+            "getinfo",
+            path=json.dumps(paths),
+            additional='["size","time","owner"]',
+        )
+        
+        return [
+            self._parse_file_item(item)
+            for item in data.get("files", [])
+            if "code" not in item
+        ]
+    
+    async def get_dir_size(
+        self,
+        paths: List[str],
+        timeout: float = 600,
+        on_progress: Optional[Callable[[PollEvent], None]] = None,
+    ) -> Dict[str, int]:
+        """Total size of folders, computed on the NAS (SYNO.FileStation.DirSize task).
+        
+        Args:
+            paths: Folders to measure (totals are combined)
+            timeout: Seconds to wait before the task is stopped
+            on_progress: Called with a PollEvent per status check
+            
+        Returns:
+            Dictionary with total_size, num_file and num_dir
+        """
+        data = await self._api_request(
+            "SYNO.FileStation.DirSize",
+            "start",
+            path=json.dumps(paths),
+        )
+        
+        task_id = data.get("taskid")
+        if not task_id:
+            raise SynologyAPIError("Folder size task failed to start")
+        
+        status = await self._wait_filestation_task(
+            "SYNO.FileStation.DirSize", task_id, "Folder size", timeout, on_progress
+        )
+        return {
+            "total_size": int(status.get("total_size", 0)),
+            "num_file": int(status.get("num_file", 0)),
+            "num_dir": int(status.get("num_dir", 0)),
+        }
+    
     async def create_folder(self, folder_path: str, name: str) -> SynologyFileInfo:
         """Create a new folder.
         
@@ -770,11 +1146,18 @@ class SynologyClient:
             owner="",
         )
     
-    async def delete_files(self, paths: List[str]) -> bool:
+    async def delete_files(
+        self,
+        paths: List[str],
+        timeout: float = 600,
+        on_progress: Optional[Callable[[PollEvent], None]] = None,
+    ) -> bool:
         """Delete files or folders.
         
         Args:
             paths: List of paths to delete
+            timeout: Seconds to wait before the task is stopped
+            on_progress: Called with a PollEvent per status check
             
         Returns:
             True if successful
@@ -793,26 +1176,18 @@ class SynologyClient:
         if not task_id:
             return True  # No task means immediate completion
         
-        # Poll for completion
-        for _ in range(60):  # Max 60 seconds
-            status = await self._api_request(
-                "SYNO.FileStation.Delete",
-                "status",
-                taskid=task_id,
-            )
-            
-            if status.get("finished"):
-                return True
-            
-            await asyncio.sleep(1)
-        
-        raise SynologyAPIError("Delete operation timed out")
+        await self._wait_filestation_task(
+            "SYNO.FileStation.Delete", task_id, "Delete operation", timeout, on_progress
+        )
+        return True
     
     async def move_files(
         self,
         paths: List[str],
         dest_folder: str,
         overwrite: bool = False,
+        timeout: float = 3600,
+        on_progress: Optional[Callable[[PollEvent], None]] = None,
     ) -> bool:
         """Move files to another location.
         
@@ -820,6 +1195,8 @@ class SynologyClient:
             paths: Source paths
             dest_folder: Destination folder
             overwrite: Overwrite existing files
+            timeout: Seconds to wait before the task is stopped
+            on_progress: Called with a PollEvent per status check
             
         Returns:
             True if successful
@@ -839,20 +1216,10 @@ class SynologyClient:
         if not task_id:
             return True
         
-        # Poll for completion
-        for _ in range(120):  # Max 2 minutes
-            status = await self._api_request(
-                "SYNO.FileStation.CopyMove",
-                "status",
-                taskid=task_id,
-            )
-            
-            if status.get("finished"):
-                return True
-            
-            await asyncio.sleep(1)
-        
-        raise SynologyAPIError("Move operation timed out")
+        await self._wait_filestation_task(
+            "SYNO.FileStation.CopyMove", task_id, "Move operation", timeout, on_progress
+        )
+        return True
     
     async def rename_file(self, path: str, new_name: str) -> SynologyFileInfo:
         """Rename a file or folder.
@@ -893,6 +1260,8 @@ class SynologyClient:
         pattern: str,
         extension: Optional[str] = None,
         file_type: Optional[str] = None,  # file, dir, all
+        timeout: float = 120,
+        on_progress: Optional[Callable[[PollEvent], None]] = None,
     ) -> List[SynologyFileInfo]:
         """Search for files.
         
@@ -901,6 +1270,8 @@ class SynologyClient:
             pattern: Search pattern (supports wildcards)
             extension: File extension filter
             file_type: Type filter (file, dir, all)
+            timeout: Seconds to wait before the search is stopped
+            on_progress: Called with a PollEvent per status check
             
         Returns:
             List of matching files
@@ -927,9 +1298,24 @@ class SynologyClient:
         if not task_id:
             raise SynologyAPIError("Search failed to start")
         
-        # Poll for results
-        files = []
-        for _ in range(60):
+        # Poll with a one-item page until finished, then fetch the results
+        await wait_task(
+            lambda: self._api_request(
+                "SYNO.FileStation.Search",
+                "list",
+                taskid=task_id,
+                offset=0,
+                limit=1,
+            ),
+            lambda status: bool(status.get("finished")),
+            stop=lambda: self._api_request("SYNO.FileStation.Search", "stop", taskid=task_id),
+            timeout=timeout,
+            progress=None,
+            label="Search",
+            on_event=on_progress,
+        )
+        
+        try:
             status = await self._api_request(
                 "SYNO.FileStation.Search",
                 "list",
@@ -938,35 +1324,327 @@ class SynologyClient:
                 limit=1000,
                 additional='["size","time","owner"]',
             )
+        finally:
+            # Stop search task
+            await self._api_request(
+                "SYNO.FileStation.Search",
+                "stop",
+                taskid=task_id,
+            )
+        
+        files = []
+        for item in status.get("files", []):
+            additional = item.get("additional", {})
+            time_info = additional.get("time", {})
+            owner_info = additional.get("owner", {})
             
-            if status.get("finished"):
-                for item in status.get("files", []):
-                    additional = item.get("additional", {})
-                    time_info = additional.get("time", {})
-                    owner_info = additional.get("owner", {})
-                    
-                    files.append(SynologyFileInfo(
-                        name=item.get("name", ""),
-                        path=item.get("path", ""),
-                        is_dir=item.get("isdir", False),
-                        size=additional.get("size", 0),
-                        create_time=time_info.get("crtime", 0),
-                        modify_time=time_info.get("mtime", 0),
-                        access_time=time_info.get("atime", 0),
-                        owner=owner_info.get("user", ""),
-                    ))
-                
-                # Stop search task
-                await self._api_request(
-                    "SYNO.FileStation.Search",
-                    "stop",
-                    taskid=task_id,
+            files.append(SynologyFileInfo(
+                name=item.get("name", ""),
+                path=item.get("path", ""),
+                is_dir=item.get("isdir", False),
+                size=additional.get("size", 0),
+                create_time=time_info.get("crtime", 0),
+                modify_time=time_info.get("mtime", 0),
+                access_time=time_info.get("atime", 0),
+                owner=owner_info.get("user", ""),
+            ))
+        
+        return files
+    
+    async def _wait_filestation_task(
+        self,
+        api: str,
+        task_id: str,
+        label: str,
+        timeout: float,
+        on_progress: Optional[Callable[[PollEvent], None]] = None,
+    ) -> Dict[str, Any]:
+        """Poll a FileStation background task (status/stop methods) to completion."""
+        return await wait_task(
+            lambda: self._api_request(api, "status", taskid=task_id),
+            lambda status: bool(status.get("finished")),
+            stop=lambda: self._api_request(api, "stop", taskid=task_id),
+            timeout=timeout,
+            label=label,
+            on_event=on_progress,
+        )
+    
+    # -------------------------------------------------------------------------
+    # FileStation transfers
+    # -------------------------------------------------------------------------
+    
+    async def upload_file(
+        self,
+        local_path: str,
+        dest_folder: str,
+        remote_name: Optional[str] = None,
+        overwrite: bool = False,
+        create_parents: bool = True,
+        chunk_size: int = TRANSFER_CHUNK_SIZE,
+        progress: Optional[ProgressCallback] = None,
+        verify: bool = True,
+    ) -> Dict[str, Any]:
+        """Upload a local file, streaming it from disk in chunks.
+        
+        The multipart body is generated on the fly, so memory use does not
+        grow with the file size. An MD5 is computed while streaming and,
+        with verify enabled, compared against SYNO.FileStation.MD5.
+        
+        Args:
+            local_path: File to upload
+            dest_folder: Destination folder on the NAS
+            remote_name: Name on the NAS (defaults to the local file name)
+            overwrite: Overwrite an existing file
+            create_parents: Create missing parent folders
+            chunk_size: Bytes read per chunk
+            progress: Called as progress(bytes_sent, total_bytes)
+            verify: Compare the NAS-side MD5 after upload
+            
+        Returns:
+            Dict with path, size, md5 and verified
+            
+        Raises:
+            SynologyAPIError: If the upload or verification fails
+        """
+        if not self._client:
+            raise SynologyAPIError("Not connected")
+        if not os.path.isfile(local_path):
+            raise SynologyAPIError(f"Local file not found: {local_path}")
+        
+        name = remote_name or os.path.basename(local_path)
+        size = os.path.getsize(local_path)
+        path, ver = self._resolve_api("SYNO.FileStation.Upload", None)
+        
+        fields = {
+            "path": dest_folder,
+            "create_parents": str(create_parents).lower(),
+            "overwrite": str(overwrite).lower(),
+        }
+        
+        for attempt in range(2):
+            boundary = uuid.uuid4().hex
+            head = b"".join(
+                f'--{boundary}\r\nContent-Disposition: form-data; name="{key}"\r\n\r\n{value}\r\n'.encode()
+                for key, value in fields.items()
+            )
+            head += (
+                f'--{boundary}\r\nContent-Disposition: form-data; name="file"; '
+                f'filename="{name}"\r\nContent-Type: application/octet-stream\r\n\r\n'
+            ).encode()
+            tail = f"\r\n--{boundary}--\r\n".encode()
+            digest = hashlib.md5()
+            
+            async def body() -> AsyncIterator[bytes]:
+                yield head
+                sent = 0
+                with open(local_path, "rb") as f:
+                    while True:
+                        chunk = await asyncio.to_thread(f.read, chunk_size)
+                        if not chunk:
+                            break
+                        digest.update(chunk)
+                        sent += len(chunk)
+                        if progress:
+                            progress(sent, size)
+                        yield chunk
+                yield tail
+            
+            sid = self._sid
+            try:
+                response = await self._client.post(
+                    f"/webapi/{path}",
+                    params={"api": "SYNO.FileStation.Upload", "version": ver, "method": "upload", "_sid": sid},
+                    content=body(),
+                    headers={
+                        "Content-Type": f"multipart/form-data; boundary={boundary}",
+                        "Content-Length": str(len(head) + size + len(tail)),
+                    },
                 )
+                data = response.json()
+            except httpx.TimeoutException:
+                raise SynologyAPIError(f"Upload timeout for {local_path}")
+            except Exception as e:
+                raise SynologyAPIError(f"Upload failed for {local_path}: {e}")
+            
+            try:
+                self._check_response("SYNO.FileStation.Upload", "upload", data)
                 break
+            except SynologyAPIError as e:
+                if attempt or not self._should_reauthenticate("SYNO.FileStation.Upload", e, True):
+                    raise
+            await self._reauthenticate(sid)
+        
+        remote_path = f"{dest_folder.rstrip('/')}/{name}"
+        md5 = digest.hexdigest()
+        verified = None
+        if verify:
+            remote_md5 = await self.get_file_md5(remote_path)
+            verified = remote_md5.lower() == md5
+            if not verified:
+                raise SynologyAPIError(
+                    f"Checksum mismatch after upload of {remote_path}: local {md5}, NAS {remote_md5}"
+                )
+        
+        return {"path": remote_path, "size": size, "md5": md5, "verified": verified}
+    
+    async def download_file(
+        self,
+        remote_path: str,
+        local_path: str,
+        resume: bool = True,
+        chunk_size: int = TRANSFER_CHUNK_SIZE,
+        progress: Optional[ProgressCallback] = None,
+        verify: bool = True,
+    ) -> Dict[str, Any]:
+        """Download a file to disk, streaming the response in chunks.
+        
+        Data is written to ``<local_path>.part`` and renamed once complete
+        and verified; a .part file that fails verification is deleted.
+        With resume enabled an existing .part file is continued with a
+        Range request; if the server ignores the range the download starts
+        over.
+        
+        Args:
+            remote_path: File on the NAS
+            local_path: Destination file
+            resume: Continue an interrupted download
+            chunk_size: Bytes written per chunk
+            progress: Called as progress(bytes_done, total_bytes or None)
+            verify: Compare the local MD5 with SYNO.FileStation.MD5
             
-            await asyncio.sleep(0.5)
+        Returns:
+            Dict with path, size, resumed_from, md5 and verified
+            
+        Raises:
+            SynologyAPIError: If the download or verification fails
+        """
+        if not self._client:
+            raise SynologyAPIError("Not connected")
         
-        return files
+        part_path = f"{local_path}.part"
+        path, ver = self._resolve_api("SYNO.FileStation.Download", None)
+        
+        offset = os.path.getsize(part_path) if resume and os.path.exists(part_path) else 0
+        resumed_from = offset
+        
+        for attempt in range(3):
+            digest = hashlib.md5()
+            if offset:
+                await asyncio.to_thread(_hash_file, part_path, digest, chunk_size)
+            
+            sid = self._sid
+            headers = {"Range": f"bytes={offset}-"} if offset else {}
+            params = {
+                "api": "SYNO.FileStation.Download",
+                "version": ver,
+                "method": "download",
+                "path": remote_path,
+                "mode": "download",
+                "_sid": sid,
+            }
+            
+            try:
+                async with self._client.stream("GET", f"/webapi/{path}", params=params, headers=headers) as response:
+                    content_type = response.headers.get("content-type", "")
+                    
+                    if response.status_code == 416:
+                        # Stale .part (e.g. remote file shrank): start over
+                        offset = resumed_from = 0
+                        continue
+                    
+                    # Errors come back as a small JSON envelope instead of file data
+                    length = response.headers.get("content-length")
+                    if "application/json" in content_type and (length is None or int(length) < 65536):
+                        error = _error_envelope(await response.aread())
+                        if error is not None:
+                            try:
+                                self._check_response("SYNO.FileStation.Download", "download", error)
+                            except SynologyAPIError as e:
+                                if attempt or not self._should_reauthenticate("SYNO.FileStation.Download", e, True):
+                                    raise
+                                await self._reauthenticate(sid)
+                                continue
+                    
+                    if response.status_code >= 400:
+                        raise SynologyAPIError(
+                            f"Download of {remote_path} failed with HTTP {response.status_code}"
+                        )
+                    
+                    if response.status_code != 206:
+                        # Server sent the whole file
+                        if offset:
+                            digest = hashlib.md5()
+                        offset = resumed_from = 0
+                    
+                    total = offset + int(length) if length else None
+                    done = offset
+                    
+                    with open(part_path, "ab" if offset else "wb") as f:
+                        async for chunk in response.aiter_bytes(chunk_size):
+                            await asyncio.to_thread(f.write, chunk)
+                            digest.update(chunk)
+                            done += len(chunk)
+                            if progress:
+                                progress(done, total)
+                    
+                    if total is not None and done != total:
+                        raise SynologyAPIError(
+                            f"Download of {remote_path} ended early: {done} of {total} bytes"
+                        )
+                break
+            except httpx.TimeoutException:
+                raise SynologyAPIError(f"Download timeout for {remote_path} (partial data kept for resume)")
+            except httpx.HTTPError as e:
+                raise SynologyAPIError(f"Download failed for {remote_path}: {e} (partial data kept for resume)")
+        else:
+            raise SynologyAPIError(f"Download of {remote_path} could not be started")
+        
+        md5 = digest.hexdigest()
+        verified = None
+        if verify:
+            remote_md5 = await self.get_file_md5(remote_path)
+            verified = remote_md5.lower() == md5
+            if not verified:
+                # Corrupt data must not replace the destination or be resumed
+                os.remove(part_path)
+                raise SynologyAPIError(
+                    f"Checksum mismatch after download of {remote_path}: local {md5}, NAS {remote_md5}"
+                )
+        
+        os.replace(part_path, local_path)
+        
+        return {
+            "path": local_path,
+            "size": os.path.getsize(local_path),
+            "resumed_from": resumed_from,
+            "md5": md5,
+            "verified": verified,
+        }
+    
+    async def get_file_md5(self, path: str, timeout: float = 600) -> str:
+        """Compute a file's MD5 on the NAS (SYNO.FileStation.MD5 task).
+        
+        Args:
+            path: File on the NAS
+            timeout: Seconds to wait for the task
+            
+        Returns:
+            Hex MD5 digest
+        """
+        data = await self._api_request(
+            "SYNO.FileStation.MD5",
+            "start",
+            file_path=path,
+        )
+        
+        task_id = data.get("taskid")
+        if not task_id:
+            raise SynologyAPIError("MD5 task failed to start")
+        
+        status = await self._wait_filestation_task(
+            "SYNO.FileStation.MD5", task_id, f"MD5 computation for {path}", timeout
+        )
+        return status.get("md5", "")
     
     # -------------------------------------------------------------------------
     # Download Station
@@ -980,27 +1658,74 @@ class SynologyClient:
             additional="detail,transfer",
         )
         
-        tasks = []
-        for task in data.get("tasks", []):
-            additional = task.get("additional", {})
-            detail = additional.get("detail", {})
-            transfer = additional.get("transfer", {})
-            
-            size = task.get("size", 0)
-            downloaded = transfer.get("size_downloaded", 0)
-            
-            tasks.append(SynologyDownloadTask(
-                id=task.get("id", ""),
-                title=task.get("title", ""),
-                status=task.get("status", ""),
-                size=size,
-                size_downloaded=downloaded,
-                speed_download=transfer.get("speed_download", 0),
-                percent_done=round(downloaded / size * 100, 2) if size else 0,
-                destination=detail.get("destination", ""),
-            ))
+        return [self._parse_download_task(task) for task in data.get("tasks", [])]
+    
+    async def get_download(self, task_id: str) -> SynologyDownloadTask:
+        """Get a single download task."""
+        data = await self._api_request(
+            "SYNO.DownloadStation.Task",
+            "getinfo",
+            id=task_id,
+            additional="detail,transfer",
+        )
         
-        return tasks
+        tasks = data.get("tasks", [])
+        if not tasks:
+            raise SynologyAPIError(f"Download task not found: {task_id}")
+        return self._parse_download_task(tasks[0])
+    
+    async def wait_for_download(
+        self,
+        task_id: str,
+        timeout: float = 3600,
+        on_progress: Optional[Callable[[PollEvent], None]] = None,
+    ) -> SynologyDownloadTask:
+        """Wait until a download task finishes or fails.
+        
+        Timing out only stops waiting; the download keeps running.
+        
+        Args:
+            task_id: Download task ID
+            timeout: Seconds to wait
+            on_progress: Called with a PollEvent per status check
+            
+        Returns:
+            The task in its final state
+        """
+        async def fetch() -> Dict[str, Any]:
+            return (await self.get_download(task_id)).to_dict()
+        
+        status = await wait_task(
+            fetch,
+            lambda task: task["status"] in DOWNLOAD_DONE_STATES,
+            timeout=timeout,
+            progress=lambda task: task["percent_done"] / 100,
+            label=f"Download {task_id}",
+            on_event=on_progress,
+            max_interval=5.0,
+        )
+        return SynologyDownloadTask(**status)
+    
+    @staticmethod
+    def _parse_download_task(task: Dict[str, Any]) -> SynologyDownloadTask:
+        """Parse a SYNO.DownloadStation.Task item."""
+        additional = task.get("additional", {})
+        detail = additional.get("detail", {})
+        transfer = additional.get("transfer", {})
+        
+        size = task.get("size", 0)
+        downloaded = transfer.get("size_downloaded", 0)
+        
+        return SynologyDownloadTask(
+            id=task.get("id", ""),
+            title=task.get("title", ""),
+            status=task.get("status", ""),
+            size=size,
+            size_downloaded=downloaded,
+            speed_download=transfer.get("speed_download", 0),
+            percent_done=round(downloaded / size * 100, 2) if size else 0,
+            destination=detail.get("destination", ""),
+        )
     
     async def add_download(
         self,
@@ -1314,6 +2039,34 @@ class SynologyClient:
             "error": data.get("error", None),
         }
     
+    async def wait_for_backup(
+        self,
+        task_id: int,
+        timeout: float = 6 * 3600,
+        on_progress: Optional[Callable[[PollEvent], None]] = None,
+    ) -> Dict[str, Any]:
+        """Wait until a backup task is no longer running.
+        
+        Timing out only stops waiting; the backup keeps running.
+        
+        Args:
+            task_id: Backup task ID
+            timeout: Seconds to wait
+            on_progress: Called with a PollEvent per status check
+            
+        Returns:
+            Final status as returned by get_backup_status()
+        """
+        return await wait_task(
+            lambda: self.get_backup_status(task_id),
+            lambda status: status["state"] not in BACKUP_RUNNING_STATES,
+            timeout=timeout,
+            progress=lambda status: (status["progress"] or 0) / 100,
+            label=f"Backup task {task_id}",
+            on_event=on_progress,
+            max_interval=10.0,
+        )
+    
     # -------------------------------------------------------------------------
     # Shared Folders
     # -------------------------------------------------------------------------
@@ -1753,7 +2506,44 @@ class SynologyClient:
         )
         
         return data.get("container", {})
-    
+
+    async def get_docker_container_stats(self) -> List[Dict[str, Any]]:
+        """Get resource usage of all containers in one batched request.
+
+        Container Manager reports CPU as a percentage; Docker-style
+        cumulative counters (cpu_usage/system_cpu_usage) are passed through
+        when present so callers can compute CPU% from deltas.
+        """
+        batch = self.batch()
+        list_call = batch.add("SYNO.Docker.Container", "list")
+        resource_call = batch.add("SYNO.Docker.Container.Resource", "get")
+        await batch.execute()
+
+        try:
+            containers = list_call.result().get("containers", [])
+            resources = resource_call.result().get("resources", [])
+        except SynologyAPIError as e:
+            if e.error_code == 102:
+                raise SynologyAPIError("Docker/Container Manager is not installed")
+            raise
+
+        states = {c.get("name", ""): c.get("state") or c.get("status", "") for c in containers}
+        stats = []
+        for res in resources:
+            name = res.get("name", "")
+            stats.append({
+                "name": name,
+                "state": states.get(name, ""),
+                "cpu_percent": res.get("cpu"),
+                "cpu_usage": res.get("cpu_usage"),
+                "system_cpu_usage": res.get("system_cpu_usage"),
+                "online_cpus": res.get("online_cpus"),
+                "memory_bytes": res.get("memory", 0),
+                "memory_percent": res.get("memoryPercent", 0),
+            })
+
+        return stats
+
     async def start_docker_container(self, container_id: str) -> bool:
         """Start a Docker container."""
         await self._api_request(
@@ -1969,6 +2759,7 @@ class SynologyClient:
         for log in data.get("logs", []):
             logs.append({
                 "time": log.get("time", 0),
+                "level": log.get("level", ""),
                 "user": log.get("user", ""),
                 "event": log.get("event", ""),
                 "ip": log.get("ip", ""),
@@ -2017,6 +2808,8 @@ class SynologyClient:
             "disk": {
                 "read_access": disk.get("read_access", 0),
                 "write_access": disk.get("write_access", 0),
+                "read_byte": disk.get("read_byte", 0),
+                "write_byte": disk.get("write_byte", 0),
                 "utilization": disk.get("utilization", 0),
             },
         }
@@ -0,0 +1,355 @@
+"""Synology Container Manager resource sampling.
+
+Polls the resource usage of every container in one batched request
+(container list + SYNO.Docker.Container.Resource) per interval and keeps
+a bounded in-memory series per container:
+- CPU% comes straight from Container Manager, or from the delta of
+  Docker-style cumulative counters when those are reported
+- Memory is kept as bytes plus the change since the previous sample, so
+  a container that keeps growing stands out
+- synology_top_containers ranks containers by CPU, memory or memory
+  growth over a window
+
+Tool calls run in short-lived event loops, so the sampler runs in a daemon
+thread with its own loop. It starts on first use and stops by itself after
+IDLE_TIMEOUT seconds without queries.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+from logging_config import get_logger, ToolInvocationLogger
+from tool_registry import tool
+
+from .client import (
+    SynologyClient,
+    SynologyConnectionError,
+    SynologyAuthError,
+    SynologyAPIError,
+)
+
+logger = get_logger(__name__)
+
+
+DEFAULT_INTERVAL = 10
+MAX_POINTS = 360  # one hour at the default interval
+FORGET_AFTER = 3600  # drop containers not seen for this long
+IDLE_TIMEOUT = 1800
+
+RANK_METRICS = ("cpu", "memory", "memory_growth")
+
+
+# -------------------------------------------------------------------------
+# Series
+# -------------------------------------------------------------------------
+
+@dataclass
+class ContainerSample:
+    """One sample for one container."""
+    timestamp: float
+    cpu_percent: Optional[float]
+    memory_bytes: int
+    memory_percent: float
+    memory_delta_bytes: int = 0
+
+
+class ContainerSeries:
+    """Bounded sample history for one container."""
+
+    def __init__(self, name: str, max_points: int = MAX_POINTS):
+        self.name = name
+        self.state = ""
+        self.samples: Deque[ContainerSample] = deque(maxlen=max_points)
+        self.last_seen = 0.0
+        self._counters: Optional[tuple] = None
+
+    def _cpu_percent(self, stats: Dict[str, Any]) -> Optional[float]:
+        if stats.get("cpu_percent") is not None:
+            return float(stats["cpu_percent"])
+
+        cpu_usage, system_usage = stats.get("cpu_usage"), stats.get("system_cpu_usage")
+        if cpu_usage is None or system_usage is None:
+            return None
+        previous, self._counters = self._counters, (cpu_usage, system_usage)
+        if previous is None:
+            return None
+        cpu_delta, system_delta = cpu_usage - previous[0], system_usage - previous[1]
+        if cpu_delta < 0 or system_delta <= 0:
+            return None  # container restarted
+        return cpu_delta / system_delta * (stats.get("online_cpus") or 1) * 100
+
+    def record(self, timestamp: float, stats: Dict[str, Any]) -> ContainerSample:
+        memory = int(stats.get("memory_bytes") or 0)
+        previous = self.samples[-1] if self.samples else None
+        sample = ContainerSample(
+            timestamp=timestamp,
+            cpu_percent=self._cpu_percent(stats),
+            memory_bytes=memory,
+            memory_percent=float(stats.get("memory_percent") or 0),
+            memory_delta_bytes=memory - previous.memory_bytes if previous else 0,
+        )
+        self.samples.append(sample)
+        self.state = stats.get("state", "")
+        self.last_seen = timestamp
+        return sample
+
+    def window(self, start: float) -> List[ContainerSample]:
+        return [s for s in self.samples if s.timestamp >= start]
+
+
+def _average(values: List[float]) -> Optional[float]:
+    return round(sum(values) / len(values), 2) if values else None
+
+
+class ContainerStatsStore:
+    """Per-container series, safe to share between the sampler thread and tools."""
+
+    def __init__(self, max_points: int = MAX_POINTS, forget_after: float = FORGET_AFTER):
+        self.max_points = max_points
+        self.forget_after = forget_after
+        self.series: Dict[str, ContainerSeries] = {}
+        self.last_sample = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, timestamp: float, stats: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            for entry in stats:
+                name = entry.get("name")
+                if not name:
+                    continue
+                series = self.series.get(name)
+                if series is None:
+                    series = self.series[name] = ContainerSeries(name, self.max_points)
+                series.record(timestamp, entry)
+            for name in [n for n, s in self.series.items() if timestamp - s.last_seen > self.forget_after]:
+                del self.series[name]
+            self.last_sample = timestamp
+
+    def top(
+        self,
+        metric: str = "cpu",
+        window_seconds: float = 300,
+        limit: int = 5,
+        now: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """Rank containers over the window.
+
+        Args:
+            metric: 'cpu' (average CPU%), 'memory' (peak bytes) or
+                'memory_growth' (bytes gained over the window)
+            window_seconds: Window ending at now
+            limit: Number of containers to return
+            now: Window end (defaults to the current time)
+
+        Returns:
+            Rows with per-container CPU and memory statistics
+        """
+        if metric not in RANK_METRICS:
+            raise ValueError(f"Unknown metric '{metric}'; use one of: {', '.join(RANK_METRICS)}")
+
+        start = (now if now is not None else time.time()) - window_seconds
+        rows = []
+        with self._lock:
+            for series in self.series.values():
+                samples = series.window(start)
+                if not samples:
+                    continue
+                cpu = [s.cpu_percent for s in samples if s.cpu_percent is not None]
+                memory = [s.memory_bytes for s in samples]
+                rows.append({
+                    "name": series.name,
+                    "state": series.state,
+                    "samples": len(samples),
+                    "cpu_avg": _average(cpu),
+                    "cpu_max": round(max(cpu), 2) if cpu else None,
+                    "memory_bytes": samples[-1].memory_bytes,
+                    "memory_max_bytes": max(memory),
+                    "memory_percent": samples[-1].memory_percent,
+                    "memory_growth_bytes": samples[-1].memory_bytes - samples[0].memory_bytes,
+                })
+
+        key = {
+            "cpu": lambda r: r["cpu_avg"] or 0,
+            "memory": lambda r: r["memory_max_bytes"],
+            "memory_growth": lambda r: r["memory_growth_bytes"],
+        }[metric]
+        rows.sort(key=key, reverse=True)
+        return rows[:limit]
+
+
+async def sample_containers(client: SynologyClient, store: ContainerStatsStore) -> int:
+    """Take one sample of all containers into the store; returns the container count."""
+    stats = await client.get_docker_container_stats()
+    store.record(time.time(), stats)
+    return len(stats)
+
+
+# -------------------------------------------------------------------------
+# Background sampler
+# -------------------------------------------------------------------------
+
+class ContainerStatsSampler:
+    """Daemon thread that samples the default NAS into a store."""
+
+    def __init__(self, store: Optional[ContainerStatsStore] = None, idle_timeout: float = IDLE_TIMEOUT):
+        self.store = store or ContainerStatsStore()
+        self.idle_timeout = idle_timeout
+        self.interval = DEFAULT_INTERVAL
+        self.last_error = ""
+        self._last_used = time.monotonic()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._guard = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def ensure_running(self, interval: float = DEFAULT_INTERVAL) -> None:
+        """Start sampling (or change the interval) and reset the idle timer."""
+        with self._guard:
+            self.interval = interval
+            self._last_used = time.monotonic()
+            if not self.running:
+                self._stop.clear()
+                self._thread = threading.Thread(
+                    target=lambda: asyncio.run(self._run()),
+                    name="synology-container-stats",
+                    daemon=True,
+                )
+                self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    async def _run(self) -> None:
+        logger.info("Synology container stats sampler started")
+        while not self._stop.is_set():
+            if time.monotonic() - self._last_used > self.idle_timeout:
+                logger.info("Synology container stats sampler idle, stopping")
+                break
+            try:
+                # Sessions are pooled, so a client per sample reuses the login
+                async with SynologyClient() as client:
+                    await sample_containers(client, self.store)
+                self.last_error = ""
+            except Exception as e:
+                self.last_error = str(e)
+                logger.warning(f"Container stats sample failed: {e}")
+            await asyncio.get_running_loop().run_in_executor(None, self._stop.wait, self.interval)
+
+
+_sampler: Optional[ContainerStatsSampler] = None
+
+
+def get_container_sampler() -> ContainerStatsSampler:
+    """Get the process-wide container stats sampler."""
+    global _sampler
+    if _sampler is None:
+        _sampler = ContainerStatsSampler()
+    return _sampler
+
+
+# -----------------------------------------------------------------------------
+# Input/Output Schemas
+# -----------------------------------------------------------------------------
+
+class ContainerUsageOutput(BaseModel):
+    """Resource usage of one container over the window."""
+    name: str = Field(description="Container name")
+    state: str = Field(default="", description="Container state")
+    samples: int = Field(description="Samples in the window")
+    cpu_avg: Optional[float] = Field(default=None, description="Average CPU %")
+    cpu_max: Optional[float] = Field(default=None, description="Peak CPU %")
+    memory_bytes: int = Field(description="Latest memory usage in bytes")
+    memory_max_bytes: int = Field(description="Peak memory usage in bytes")
+    memory_percent: float = Field(default=0, description="Latest memory usage in %")
+    memory_growth_bytes: int = Field(description="Memory change over the window in bytes")
+
+
+class SynologyTopContainersInput(BaseModel):
+    """Input schema for synology_top_containers tool."""
+    metric: str = Field(default="cpu", description="Rank by 'cpu', 'memory' or 'memory_growth'")
+    window_minutes: float = Field(default=5, gt=0, description="Window to rank over")
+    limit: int = Field(default=5, ge=1, le=100, description="Number of containers to return")
+    interval_seconds: int = Field(default=DEFAULT_INTERVAL, ge=2, le=300, description="Sampling interval")
+
+
+class SynologyTopContainersOutput(BaseModel):
+    """Output schema for synology_top_containers tool."""
+    success: bool = Field(description="Whether the operation succeeded")
+    metric: str = Field(default="", description="Ranking metric")
+    containers: List[ContainerUsageOutput] = Field(default_factory=list, description="Top consumers")
+    tracked_containers: int = Field(default=0, description="Containers with history")
+    sampler_running: bool = Field(default=False, description="Whether background sampling is active")
+    sample_interval_seconds: float = Field(default=0, description="Background sampling interval")
+    last_sample_age_seconds: Optional[float] = Field(default=None, description="Age of the latest sample")
+    warning: str = Field(default="", description="Sampler problem, if any")
+    error: str = Field(default="", description="Error message if failed")
+
+
+# -----------------------------------------------------------------------------
+# Tool Implementations
+# -----------------------------------------------------------------------------
+
+@tool(
+    name="synology_top_containers",
+    description="Rank Synology Container Manager containers by CPU, memory or memory growth over a recent window (starts background sampling on first use)",
+    input_schema=SynologyTopContainersInput,
+    output_schema=SynologyTopContainersOutput,
+    tags=["synology", "docker", "monitoring"]
+)
+async def synology_top_containers(params: SynologyTopContainersInput) -> SynologyTopContainersOutput:
+    """Top-N containers by resource usage."""
+    invocation_logger = ToolInvocationLogger(logger)
+    invocation_logger.start("synology_top_containers", metric=params.metric, window_minutes=params.window_minutes)
+
+    if params.metric not in RANK_METRICS:
+        return SynologyTopContainersOutput(
+            success=False,
+            metric=params.metric,
+            error=f"Unknown metric '{params.metric}'; use one of: {', '.join(RANK_METRICS)}",
+        )
+
+    sampler = get_container_sampler()
+    store = sampler.store
+
+    try:
+        if not store.series:
+            # First call: sample now so there is something to rank
+            async with SynologyClient() as client:
+                await sample_containers(client, store)
+        sampler.ensure_running(params.interval_seconds)
+
+        rows = store.top(params.metric, params.window_minutes * 60, params.limit)
+        invocation_logger.success(container_count=len(rows))
+
+        return SynologyTopContainersOutput(
+            success=True,
+            metric=params.metric,
+            containers=[ContainerUsageOutput(**row) for row in rows],
+            tracked_containers=len(store.series),
+            sampler_running=sampler.running,
+            sample_interval_seconds=sampler.interval,
+            last_sample_age_seconds=round(time.time() - store.last_sample, 1) if store.last_sample else None,
+            warning=sampler.last_error,
+        )
+
+    except SynologyConnectionError as e:
+        invocation_logger.failure(str(e))
+        return SynologyTopContainersOutput(success=False, metric=params.metric, error=f"Connection error: {e}")
+    except SynologyAuthError as e:
+        invocation_logger.failure(str(e))
+        return SynologyTopContainersOutput(success=False, metric=params.metric, error=f"Authentication error: {e}")
+    except SynologyAPIError as e:
+        invocation_logger.failure(str(e))
+        return SynologyTopContainersOutput(success=False, metric=params.metric, error=f"API error: {e}")
+    except Exception as e:
+        invocation_logger.failure(f"Unexpected error: {e}")
+        return SynologyTopContainersOutput(success=False, metric=params.metric, error=f"Unexpected error: {e}")
@@ -3,7 +3,7 @@
 Provides MCP tools for managing downloads on Synology NAS.
 """
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -17,6 +17,7 @@ from .client import (
     SynologyAPIError,
     SynologyDownloadTask,
 )
+from .polling import PollEventLog
 
 logger = get_logger(__name__)
 
@@ -53,6 +54,30 @@ class SynologyListDownloadsOutput(BaseModel):
     error: str = Field(default="", description="Error message if failed")
 
 
+class SynologyGetDownloadStatusInput(BaseModel):
+    """Input schema for synology_get_download_status tool."""
+    task_id: str = Field(description="Download task ID")
+    wait: bool = Field(
+        default=False,
+        description="Wait until the download is finished, seeding or failed before returning"
+    )
+    timeout_seconds: float = Field(
+        default=3600,
+        description="Maximum time to wait when wait is set (the download keeps running)"
+    )
+
+
+class SynologyGetDownloadStatusOutput(BaseModel):
+    """Output schema for synology_get_download_status tool."""
+    success: bool = Field(description="Whether the operation succeeded")
+    task: Optional[DownloadTaskOutput] = Field(default=None, description="Download task")
+    progress_events: List[Dict[str, Any]] = Field(
+        default_factory=list,
+        description="Most recent status checks while waiting (elapsed, progress, finished)"
+    )
+    error: str = Field(default="", description="Error message if failed")
+
+
 class SynologyAddDownloadInput(BaseModel):
     """Input schema for synology_add_download tool."""
     uri: str = Field(description="URL or magnet link to download")
@@ -168,6 +193,52 @@ async def synology_list_downloads(params: SynologyListDownloadsInput) -> Synolog
         return SynologyListDownloadsOutput(success=False, error=f"Unexpected error: {e}")
 
 
+@tool(
+    name="synology_get_download_status",
+    description="Get a Download Station task's progress, optionally waiting until it finishes",
+    input_schema=SynologyGetDownloadStatusInput,
+    output_schema=SynologyGetDownloadStatusOutput,
+    tags=["synology", "downloadstation", "downloads"]
+)
+async def synology_get_download_status(params: SynologyGetDownloadStatusInput) -> SynologyGetDownloadStatusOutput:
+    """Get (or wait for) a download task's status."""
+    invocation_logger = ToolInvocationLogger(logger)
+    invocation_logger.start("synology_get_download_status", task_id=params.task_id, wait=params.wait)
+    
+    try:
+        async with SynologyClient() as client:
+            events = PollEventLog()
+            if params.wait:
+                task = await client.wait_for_download(
+                    params.task_id,
+                    timeout=params.timeout_seconds,
+                    on_progress=events,
+                )
+            else:
+                task = await client.get_download(params.task_id)
+            
+            invocation_logger.success(status=task.status, percent_done=task.percent_done)
+            
+            return SynologyGetDownloadStatusOutput(
+                success=True,
+                task=_task_to_output(task),
+                progress_events=events.to_list(),
+            )
+            
+    except SynologyConnectionError as e:
+        invocation_logger.failure(str(e))
+        return SynologyGetDownloadStatusOutput(success=False, error=f"Connection error: {e}")
+    except SynologyAuthError as e:
+        invocation_logger.failure(str(e))
+        return SynologyGetDownloadStatusOutput(success=False, error=f"Authentication error: {e}")
+    except SynologyAPIError as e:
+        invocation_logger.failure(str(e))
+        return SynologyGetDownloadStatusOutput(success=False, error=f"API error: {e}")
+    except Exception as e:
+        invocation_logger.failure(f"Unexpected error: {e}")
+        return SynologyGetDownloadStatusOutput(success=False, error=f"Unexpected error: {e}")
+
+
 @tool(
     name="synology_add_download",
     description="Add a new download task to Synology Download Station (URL or magnet link)",
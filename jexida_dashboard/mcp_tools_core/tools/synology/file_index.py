@@ -0,0 +1,679 @@
+"""Local metadata index of the NAS filesystem.
+
+FileStation search runs as a background task on the NAS and is capped at
+the first page of results, so file-finding queries are slow and partial.
+This module keeps a local SQLite copy of the NAS metadata instead:
+- A crawler walks shared folders with bounded concurrency and stores
+  name, path, size, mtime and owner of every entry
+- Re-crawls are incremental: a folder whose mtime is unchanged is not
+  re-listed; only its known subfolders are checked (one getinfo call)
+- Name search uses an FTS5 trigram index (substring matches), with glob,
+  size and age filters answered from indexed columns
+
+Note that a folder's mtime only changes when entries are added, removed or
+renamed, so in-place edits to files are picked up by a full re-crawl.
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from pydantic import BaseModel, Field
+
+from config import get_settings
+from logging_config import get_logger, ToolInvocationLogger
+from tool_registry import tool
+
+from .client import (
+    SynologyClient,
+    SynologyConnectionError,
+    SynologyAuthError,
+    SynologyAPIError,
+    SynologyFileInfo,
+)
+
+logger = get_logger(__name__)
+
+
+# Subfolders checked per getinfo call on unchanged folders
+GETINFO_BATCH_SIZE = 100
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    parent TEXT NOT NULL,
+    name TEXT NOT NULL,
+    ext TEXT NOT NULL DEFAULT '',
+    is_dir INTEGER NOT NULL DEFAULT 0,
+    size INTEGER NOT NULL DEFAULT 0,
+    mtime INTEGER NOT NULL DEFAULT 0,
+    owner TEXT NOT NULL DEFAULT '',
+    indexed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_parent_idx ON files(parent);
+CREATE INDEX IF NOT EXISTS files_size_idx ON files(is_dir, size);
+CREATE INDEX IF NOT EXISTS files_mtime_idx ON files(mtime);
+CREATE INDEX IF NOT EXISTS files_ext_idx ON files(ext);
+
+CREATE TABLE IF NOT EXISTS folders (
+    path TEXT PRIMARY KEY,
+    mtime INTEGER NOT NULL,
+    crawled_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS crawl_runs (
+    id INTEGER PRIMARY KEY,
+    started_at REAL NOT NULL,
+    finished_at REAL,
+    roots TEXT NOT NULL,
+    folders_listed INTEGER NOT NULL DEFAULT 0,
+    folders_skipped INTEGER NOT NULL DEFAULT 0,
+    entries_indexed INTEGER NOT NULL DEFAULT 0,
+    errors INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS files_fts USING fts5(
+    name, content='files', content_rowid='id', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS files_fts_ai AFTER INSERT ON files BEGIN
+    INSERT INTO files_fts(rowid, name) VALUES (new.id, new.name);
+END;
+CREATE TRIGGER IF NOT EXISTS files_fts_ad AFTER DELETE ON files BEGIN
+    INSERT INTO files_fts(files_fts, rowid, name) VALUES ('delete', old.id, old.name);
+END;
+CREATE TRIGGER IF NOT EXISTS files_fts_au AFTER UPDATE OF name ON files BEGIN
+    INSERT INTO files_fts(files_fts, rowid, name) VALUES ('delete', old.id, old.name);
+    INSERT INTO files_fts(rowid, name) VALUES (new.id, new.name);
+END;
+"""
+
+SORT_COLUMNS = {"name": "name", "size": "size", "mtime": "mtime", "path": "path"}
+
+
+def _like_escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _extension(name: str) -> str:
+    return name.rsplit(".", 1)[-1].lower() if "." in name.strip(".") else ""
+
+
+# -------------------------------------------------------------------------
+# Index storage
+# -------------------------------------------------------------------------
+
+class FileIndex:
+    """SQLite-backed metadata index (synchronous; call via asyncio.to_thread)."""
+
+    def __init__(self, path: str):
+        self.path = str(path)
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._write_lock = threading.Lock()
+        self.fts = False
+        self._init_schema()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection; commits on success and always closes."""
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_schema(self) -> None:
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            try:
+                conn.executescript(FTS_SCHEMA)
+                self.fts = True
+            except sqlite3.OperationalError as e:
+                # SQLite without FTS5/trigram: fall back to LIKE scans
+                logger.warning(f"FTS5 trigram index unavailable, using LIKE search: {e}")
+
+    # -- crawl state --------------------------------------------------------
+
+    def folder_mtime(self, path: str) -> Optional[int]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT mtime FROM folders WHERE path = ?", (path,)).fetchone()
+        return row["mtime"] if row else None
+
+    def subfolders(self, path: str) -> List[str]:
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT path FROM files WHERE parent = ? AND is_dir = 1", (path,)
+            ).fetchall()
+        return [row["path"] for row in rows]
+
+    def replace_folder(self, folder: str, mtime: int, items: List[SynologyFileInfo]) -> int:
+        """Replace the direct children of a folder with a fresh listing.
+
+        Entries that disappeared are deleted along with, for folders,
+        everything indexed beneath them.
+
+        Returns:
+            Number of entries written
+        """
+        now = time.time()
+        new_paths = {item.path for item in items}
+
+        with self._write_lock, self._connect() as conn:
+            old = conn.execute(
+                "SELECT path, is_dir FROM files WHERE parent = ?", (folder,)
+            ).fetchall()
+            for row in old:
+                if row["path"] in new_paths:
+                    continue
+                conn.execute("DELETE FROM files WHERE path = ?", (row["path"],))
+                if row["is_dir"]:
+                    self._delete_tree(conn, row["path"])
+
+            conn.executemany(
+                """
+                INSERT INTO files (path, parent, name, ext, is_dir, size, mtime, owner, indexed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(path) DO UPDATE SET
+                    name = excluded.name, ext = excluded.ext, is_dir = excluded.is_dir,
+                    size = excluded.size, mtime = excluded.mtime, owner = excluded.owner,
+                    indexed_at = excluded.indexed_at
+                """,
+                [
+                    (
+                        item.path, folder, item.name,
+                        "" if item.is_dir else _extension(item.name),
+                        int(item.is_dir), int(item.size or 0), int(item.modify_time or 0),
+                        item.owner or "", now,
+                    )
+                    for item in items
+                ],
+            )
+            conn.execute(
+                """
+                INSERT INTO folders (path, mtime, crawled_at) VALUES (?, ?, ?)
+                ON CONFLICT(path) DO UPDATE SET mtime = excluded.mtime, crawled_at = excluded.crawled_at
+                """,
+                (folder, mtime, now),
+            )
+        return len(items)
+
+    def remove_tree(self, path: str) -> None:
+        """Forget a folder and everything beneath it."""
+        with self._write_lock, self._connect() as conn:
+            conn.execute("DELETE FROM files WHERE path = ?", (path,))
+            self._delete_tree(conn, path)
+
+    @staticmethod
+    def _delete_tree(conn: sqlite3.Connection, path: str) -> None:
+        pattern = _like_escape(path.rstrip("/")) + "/%"
+        conn.execute("DELETE FROM files WHERE path LIKE ? ESCAPE '\\'", (pattern,))
+        conn.execute(
+            "DELETE FROM folders WHERE path = ? OR path LIKE ? ESCAPE '\\'", (path, pattern)
+        )
+
+    def start_run(self, roots: List[str]) -> int:
+        with self._write_lock, self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO crawl_runs (started_at, roots) VALUES (?, ?)",
+                (time.time(), ",".join(roots)),
+            )
+            return cursor.lastrowid
+
+    def finish_run(self, run_id: int, stats: Dict[str, int]) -> None:
+        with self._write_lock, self._connect() as conn:
+            conn.execute(
+                """
+                UPDATE crawl_runs SET finished_at = ?, folders_listed = ?, folders_skipped = ?,
+                    entries_indexed = ?, errors = ?
+                WHERE id = ?
+                """,
+                (
+                    time.time(), stats["folders_listed"], stats["folders_skipped"],
+                    stats["entries_indexed"], stats["errors"], run_id,
+                ),
+            )
+
+    def last_crawl(self) -> Optional[float]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT MAX(finished_at) AS finished FROM crawl_runs"
+            ).fetchone()
+        return row["finished"] if row else None
+
+    # -- queries ------------------------------------------------------------
+
+    def search(
+        self,
+        query: Optional[str] = None,
+        glob: Optional[str] = None,
+        path_prefix: Optional[str] = None,
+        extension: Optional[str] = None,
+        file_type: str = "all",
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+        modified_within_days: Optional[float] = None,
+        older_than_days: Optional[float] = None,
+        sort_by: str = "name",
+        descending: bool = False,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """Search the index; all filters are combined with AND."""
+        where = []
+        args: List[Any] = []
+
+        if query:
+            if self.fts and len(query) >= 3:
+                where.append("id IN (SELECT rowid FROM files_fts WHERE files_fts MATCH ?)")
+                args.append('name:"' + query.replace('"', '""') + '"')
+            else:
+                where.append("name LIKE ? ESCAPE '\\'")
+                args.append(f"%{_like_escape(query)}%")
+        if glob:
+            where.append("lower(name) GLOB ?")
+            args.append(glob.lower())
+        if path_prefix and path_prefix.rstrip("/"):
+            prefix = path_prefix.rstrip("/")
+            where.append("path LIKE ? ESCAPE '\\'")
+            args.append(_like_escape(prefix) + "/%")
+        if extension:
+            where.append("ext = ?")
+            args.append(extension.lower().lstrip("."))
+        if file_type == "file":
+            where.append("is_dir = 0")
+        elif file_type == "dir":
+            where.append("is_dir = 1")
+        if min_size is not None:
+            where.append("size >= ?")
+            args.append(min_size)
+        if max_size is not None:
+            where.append("size <= ?")
+            args.append(max_size)
+        now = time.time()
+        if modified_within_days is not None:
+            where.append("mtime >= ?")
+            args.append(int(now - modified_within_days * 86400))
+        if older_than_days is not None:
+            where.append("mtime < ?")
+            args.append(int(now - older_than_days * 86400))
+
+        column = SORT_COLUMNS.get(sort_by, "name")
+        sql = "SELECT path, name, is_dir, size, mtime, owner FROM files"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {column} {'DESC' if descending else 'ASC'} LIMIT ?"
+        args.append(limit)
+
+        with self._connect() as conn:
+            return [dict(row) for row in conn.execute(sql, args).fetchall()]
+
+    def largest_files(
+        self,
+        path_prefix: Optional[str] = None,
+        extension: Optional[str] = None,
+        limit: int = 20,
+    ) -> List[Dict[str, Any]]:
+        """Largest indexed files, optionally below a path or of one extension."""
+        return self.search(
+            path_prefix=path_prefix,
+            extension=extension,
+            file_type="file",
+            sort_by="size",
+            descending=True,
+            limit=limit,
+        )
+
+    def counts(self) -> Dict[str, int]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT COUNT(*) AS entries, COALESCE(SUM(is_dir), 0) AS folders FROM files"
+            ).fetchone()
+        return {"entries": row["entries"], "folders": row["folders"]}
+
+
+_indexes: Dict[str, FileIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def default_index_path() -> str:
+    """Index location from settings (synology_index_path or <data_dir>/synology_index.db)."""
+    settings = get_settings()
+    return settings.synology_index_path or str(Path(settings.data_dir) / "synology_index.db")
+
+
+def get_file_index(path: Optional[str] = None) -> FileIndex:
+    """Return the (cached) FileIndex for a path, defaulting to settings."""
+    path = path or default_index_path()
+    with _indexes_lock:
+        index = _indexes.get(path)
+        if index is None:
+            index = FileIndex(path)
+            _indexes[path] = index
+        return index
+
+
+# -------------------------------------------------------------------------
+# Crawler
+# -------------------------------------------------------------------------
+
+async def crawl_index(
+    client: SynologyClient,
+    index: FileIndex,
+    roots: Optional[List[str]] = None,
+    concurrency: int = 4,
+    full: bool = False,
+) -> Dict[str, Any]:
+    """Walk NAS folders into the index with bounded concurrency.
+
+    Args:
+        client: Connected SynologyClient
+        index: Target index
+        roots: Folders to crawl (defaults to every shared folder)
+        concurrency: Folders listed in parallel
+        full: Re-list every folder even if its mtime is unchanged
+
+    Returns:
+        Crawl statistics
+    """
+    if roots:
+        root_infos = await client.get_files_info(roots)
+    else:
+        root_infos = await client.list_shares()
+        roots = [info.path for info in root_infos]
+
+    stats = {"folders_listed": 0, "folders_skipped": 0, "entries_indexed": 0, "errors": 0}
+    run_id = await asyncio.to_thread(index.start_run, roots)
+    queue: asyncio.Queue = asyncio.Queue()
+
+    for info in root_infos:
+        queue.put_nowait((info.path, info.modify_time))
+
+    async def enqueue_known_subfolders(folder: str) -> bool:
+        """Queue subfolders of an unchanged folder with their current mtimes."""
+        known = await asyncio.to_thread(index.subfolders, folder)
+        for start in range(0, len(known), GETINFO_BATCH_SIZE):
+            chunk = known[start:start + GETINFO_BATCH_SIZE]
+            infos = await client.get_files_info(chunk)
+            if len(infos) != len(chunk):
+                return False  # Something vanished; the folder needs a listing
+            for info in infos:
+                queue.put_nowait((info.path, info.modify_time))
+        return True
+
+    async def process(folder: str, mtime: int) -> None:
+        if not full and await asyncio.to_thread(index.folder_mtime, folder) == mtime:
+            if await enqueue_known_subfolders(folder):
+                stats["folders_skipped"] += 1
+                return
+
+        items = [item async for item in client.iter_files(folder)]
+        stats["entries_indexed"] += await asyncio.to_thread(index.replace_folder, folder, mtime, items)
+        stats["folders_listed"] += 1
+        for item in items:
+            if item.is_dir:
+                queue.put_nowait((item.path, item.modify_time))
+
+    async def worker() -> None:
+        while True:
+            folder, mtime = await queue.get()
+            try:
+                await process(folder, mtime)
+            except Exception as e:
+                stats["errors"] += 1
+                logger.warning(f"Index crawl failed for {folder}: {e}")
+            finally:
+                queue.task_done()
+
+    workers = [asyncio.create_task(worker()) for _ in range(max(1, concurrency))]
+    try:
+        await queue.join()
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    await asyncio.to_thread(index.finish_run, run_id, stats)
+    return {"roots": roots, **stats}
+
+
+# -----------------------------------------------------------------------------
+# Input/Output Schemas
+# -----------------------------------------------------------------------------
+
+class IndexedFileOutput(BaseModel):
+    """A file or folder from the local index."""
+    path: str = Field(description="Full path on the NAS")
+    name: str = Field(description="File/folder name")
+    is_dir: bool = Field(description="Whether this is a directory")
+    size: int = Field(description="Size in bytes")
+    modify_time: int = Field(description="Modification timestamp")
+    owner: str = Field(description="Owner username")
+
+
+class SynologyIndexCrawlInput(BaseModel):
+    """Input schema for synology_index_crawl tool."""
+    roots: List[str] = Field(
+        default_factory=list,
+        description="Folders to crawl (default: all shared folders)"
+    )
+    full: bool = Field(default=False, description="Re-list every folder, ignoring folder mtimes")
+    concurrency: int = Field(default=4, description="Folders listed in parallel")
+
+
+class SynologyIndexCrawlOutput(BaseModel):
+    """Output schema for synology_index_crawl tool."""
+    success: bool = Field(description="Whether the operation succeeded")
+    roots: List[str] = Field(default_factory=list, description="Folders crawled")
+    folders_listed: int = Field(default=0, description="Folders (re)listed from the NAS")
+    folders_skipped: int = Field(default=0, description="Folders unchanged since the last crawl")
+    entries_indexed: int = Field(default=0, description="Entries written to the index")
+    errors: int = Field(default=0, description="Folders that could not be listed")
+    total_entries: int = Field(default=0, description="Entries in the index after the crawl")
+    duration_seconds: float = Field(default=0.0, description="Crawl duration")
+    error: str = Field(default="", description="Error message if failed")
+
+
+class SynologyIndexSearchInput(BaseModel):
+    """Input schema for synology_index_search tool."""
+    query: Optional[str] = Field(default=None, description="Substring of the file name (case-insensitive)")
+    glob: Optional[str] = Field(default=None, description="Glob on the file name (e.g., '*.mkv', 'IMG_20??*')")
+    path_prefix: Optional[str] = Field(default=None, description="Only entries below this folder")
+    extension: Optional[str] = Field(default=None, description="File extension filter (e.g., 'pdf')")
+    file_type: str = Field(default="all", description="Filter by type: file, dir, or all")
+    min_size: Optional[int] = Field(default=None, description="Minimum size in bytes")
+    max_size: Optional[int] = Field(default=None, description="Maximum size in bytes")
+    modified_within_days: Optional[float] = Field(default=None, description="Modified within the last N days")
+    older_than_days: Optional[float] = Field(default=None, description="Not modified for at least N days")
+    sort_by: str = Field(default="name", description="Sort field: name, size, mtime, path")
+    descending: bool = Field(default=False, description="Sort descending")
+    limit: int = Field(default=100, description="Maximum results")
+
+
+class SynologyIndexSearchOutput(BaseModel):
+    """Output schema for synology_index_search tool."""
+    success: bool = Field(description="Whether the operation succeeded")
+    files: List[IndexedFileOutput] = Field(default_factory=list, description="Matching entries")
+    match_count: int = Field(default=0, description="Number of matches returned")
+    query_ms: float = Field(default=0.0, description="Index query time in milliseconds")
+    index_updated_at: Optional[float] = Field(default=None, description="Unix time of the last finished crawl")
+    error: str = Field(default="", description="Error message if failed")
+
+
+class SynologyLargestFilesInput(BaseModel):
+    """Input schema for synology_largest_files tool."""
+    path_prefix: Optional[str] = Field(default=None, description="Only files below this folder")
+    extension: Optional[str] = Field(default=None, description="File extension filter")
+    limit: int = Field(default=20, description="Number of files to return")
+
+
+class SynologyLargestFilesOutput(BaseModel):
+    """Output schema for synology_largest_files tool."""
+    success: bool = Field(description="Whether the operation succeeded")
+    files: List[IndexedFileOutput] = Field(default_factory=list, description="Largest files first")
+    total_bytes: int = Field(default=0, description="Combined size of the returned files")
+    index_updated_at: Optional[float] = Field(default=None, description="Unix time of the last finished crawl")
+    error: str = Field(default="", description="Error message if failed")
+
+
+# -----------------------------------------------------------------------------
+# Helper Functions
+# -----------------------------------------------------------------------------
+
+def _row_to_output(row: Dict[str, Any]) -> IndexedFileOutput:
+    """Convert an index row to IndexedFileOutput."""
+    return IndexedFileOutput(
+        path=row["path"],
+        name=row["name"],
+        is_dir=bool(row["is_dir"]),
+        size=row["size"],
+        modify_time=row["mtime"],
+        owner=row["owner"],
+    )
+
+
+# -----------------------------------------------------------------------------
+# Tool Implementations
+# -----------------------------------------------------------------------------
+
+@tool(
+    name="synology_index_crawl",
+    description="Crawl Synology NAS shared folders into the local metadata index (incremental by folder mtime)",
+    input_schema=SynologyIndexCrawlInput,
+    output_schema=SynologyIndexCrawlOutput,
+    tags=["synology", "filestation", "index"]
+)
+async def synology_index_crawl(params: SynologyIndexCrawlInput) -> SynologyIndexCrawlOutput:
+    """Crawl the NAS into the local index."""
+    invocation_logger = ToolInvocationLogger(logger)
+    invocation_logger.start("synology_index_crawl", roots=params.roots, full=params.full)
+
+    try:
+        index = get_file_index()
+        started = time.monotonic()
+        async with SynologyClient() as client:
+            result = await crawl_index(
+                client, index,
+                roots=params.roots or None,
+                concurrency=params.concurrency,
+                full=params.full,
+            )
+        counts = await asyncio.to_thread(index.counts)
+
+        invocation_logger.success(
+            folders_listed=result["folders_listed"],
+            folders_skipped=result["folders_skipped"],
+        )
+
+        return SynologyIndexCrawlOutput(
+            success=True,
+            roots=result["roots"],
+            folders_listed=result["folders_listed"],
+            folders_skipped=result["folders_skipped"],
+            entries_indexed=result["entries_indexed"],
+            errors=result["errors"],
+            total_entries=counts["entries"],
+            duration_seconds=round(time.monotonic() - started, 3),
+        )
+
+    except SynologyConnectionError as e:
+        invocation_logger.failure(str(e))
+        return SynologyIndexCrawlOutput(success=False, error=f"Connection error: {e}")
+    except SynologyAuthError as e:
+        invocation_logger.failure(str(e))
+        return SynologyIndexCrawlOutput(success=False, error=f"Authentication error: {e}")
+    except SynologyAPIError as e:
+        invocation_logger.failure(str(e))
+        return SynologyIndexCrawlOutput(success=False, error=f"API error: {e}")
+    except Exception as e:
+        invocation_logger.failure(f"Unexpected error: {e}")
+        return SynologyIndexCrawlOutput(success=False, error=f"Unexpected error: {e}")
+
+
+@tool(
+    name="synology_index_search",
+    description="Search the local Synology file index by name substring, glob, size and age (no NAS round trip)",
+    input_schema=SynologyIndexSearchInput,
+    output_schema=SynologyIndexSearchOutput,
+    tags=["synology", "filestation", "index", "search"]
+)
+async def synology_index_search(params: SynologyIndexSearchInput) -> SynologyIndexSearchOutput:
+    """Search the local index."""
+    invocation_logger = ToolInvocationLogger(logger)
+    invocation_logger.start("synology_index_search", query=params.query, glob=params.glob)
+
+    try:
+        index = get_file_index()
+        started = time.perf_counter()
+        rows = await asyncio.to_thread(
+            index.search,
+            query=params.query,
+            glob=params.glob,
+            path_prefix=params.path_prefix,
+            extension=params.extension,
+            file_type=params.file_type,
+            min_size=params.min_size,
+            max_size=params.max_size,
+            modified_within_days=params.modified_within_days,
+            older_than_days=params.older_than_days,
+            sort_by=params.sort_by,
+            descending=params.descending,
+            limit=params.limit,
+        )
+        query_ms = (time.perf_counter() - started) * 1000
+
+        invocation_logger.success(match_count=len(rows))
+
+        return SynologyIndexSearchOutput(
+            success=True,
+            files=[_row_to_output(r) for r in rows],
+            match_count=len(rows),
+            query_ms=round(query_ms, 2),
+            index_updated_at=await asyncio.to_thread(index.last_crawl),
+        )
+
+    except Exception as e:
+        invocation_logger.failure(f"Unexpected error: {e}")
+        return SynologyIndexSearchOutput(success=False, error=f"Unexpected error: {e}")
+
+
+@tool(
+    name="synology_largest_files",
+    description="List the largest files on Synology NAS from the local index",
+    input_schema=SynologyLargestFilesInput,
+    output_schema=SynologyLargestFilesOutput,
+    tags=["synology", "filestation", "index", "storage"]
+)
+async def synology_largest_files(params: SynologyLargestFilesInput) -> SynologyLargestFilesOutput:
+    """List the largest indexed files."""
+    invocation_logger = ToolInvocationLogger(logger)
+    invocation_logger.start("synology_largest_files", path_prefix=params.path_prefix)
+
+    try:
+        index = get_file_index()
+        rows = await asyncio.to_thread(
+            index.largest_files,
+            path_prefix=params.path_prefix,
+            extension=params.extension,
+            limit=params.limit,
+        )
+
+        invocation_logger.success(file_count=len(rows))
+
+        return SynologyLargestFilesOutput(
+            success=True,
+            files=[_row_to_output(r) for r in rows],
+            total_bytes=sum(r["size"] for r in rows),
+            index_updated_at=await asyncio.to_thread(index.last_crawl),
+        )
+
+    except Exception as e:
+        invocation_logger.failure(f"Unexpected error: {e}")
+        return SynologyLargestFilesOutput(success=False, error=f"Unexpected error: {e}")
@@ -3,7 +3,8 @@
 Provides MCP tools for file operations on Synology NAS.
 """
 
-from typing import List, Optional
+import json
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -17,9 +18,14 @@ from .client import (
     SynologyAPIError,
     SynologyFileInfo,
 )
+from .polling import PollEventLog
 
 logger = get_logger(__name__)
 
+# synology_list_files returns stream mode chunks in a single result, so a
+# stream is cut off here; callers continue from offset + file_count
+STREAM_MAX_ITEMS = 20000
+
 
 # -----------------------------------------------------------------------------
 # Input/Output Schemas
@@ -32,9 +38,17 @@ class SynologyListFilesInput(BaseModel):
         description="Folder path to list (e.g., /volume1/shared)"
     )
     offset: int = Field(default=0, description="Starting offset")
-    limit: int = Field(default=100, description="Maximum items to return")
+    limit: int = Field(
+        default=100,
+        description=f"Maximum items to return (stream mode: 0 = up to {STREAM_MAX_ITEMS}, also the upper bound)"
+    )
     sort_by: str = Field(default="name", description="Sort field: name, size, mtime")
     sort_direction: str = Field(default="asc", description="Sort direction: asc, desc")
+    stream: bool = Field(
+        default=False,
+        description="Page through the whole folder and return NDJSON chunks instead of a files list"
+    )
+    chunk_size: int = Field(default=500, description="Items per NDJSON chunk in stream mode")
 
 
 class FileInfoOutput(BaseModel):
@@ -56,6 +70,14 @@ class SynologyListFilesOutput(BaseModel):
         description="List of files and folders"
     )
     file_count: int = Field(default=0, description="Number of items returned")
+    ndjson_chunks: List[str] = Field(
+        default_factory=list,
+        description="Stream mode: chunks of newline-delimited JSON, one file per line"
+    )
+    truncated: bool = Field(
+        default=False,
+        description="Stream mode: the listing stopped at the item cap; continue with offset + file_count"
+    )
     error: str = Field(default="", description="Error message if failed")
 
 
@@ -93,12 +115,20 @@ class SynologyCreateFolderOutput(BaseModel):
 class SynologyDeleteFilesInput(BaseModel):
     """Input schema for synology_delete_files tool."""
     paths: List[str] = Field(description="List of paths to delete")
+    timeout_seconds: float = Field(
+        default=600,
+        description="Stop the delete task on the NAS if it has not finished by then"
+    )
 
 
 class SynologyDeleteFilesOutput(BaseModel):
     """Output schema for synology_delete_files tool."""
     success: bool = Field(description="Whether the operation succeeded")
     deleted_count: int = Field(default=0, description="Number of items deleted")
+    progress_events: List[Dict[str, Any]] = Field(
+        default_factory=list,
+        description="Most recent status checks of the NAS task (elapsed, progress, finished)"
+    )
     error: str = Field(default="", description="Error message if failed")
 
 
@@ -107,12 +137,20 @@ class SynologyMoveFilesInput(BaseModel):
     paths: List[str] = Field(description="Source paths to move")
     dest_folder: str = Field(description="Destination folder path")
     overwrite: bool = Field(default=False, description="Overwrite existing files")
+    timeout_seconds: float = Field(
+        default=3600,
+        description="Stop the move task on the NAS if it has not finished by then"
+    )
 
 
 class SynologyMoveFilesOutput(BaseModel):
     """Output schema for synology_move_files tool."""
     success: bool = Field(description="Whether the operation succeeded")
     moved_count: int = Field(default=0, description="Number of items moved")
+    progress_events: List[Dict[str, Any]] = Field(
+        default_factory=list,
+        description="Most recent status checks of the NAS task (elapsed, progress, finished)"
+    )
     error: str = Field(default="", description="Error message if failed")
 
 
@@ -144,6 +182,10 @@ class SynologySearchFilesInput(BaseModel):
         default="all",
         description="Filter by type: file, dir, or all"
     )
+    timeout_seconds: float = Field(
+        default=120,
+        description="Stop the search task on the NAS if it has not finished by then"
+    )
 
 
 class SynologySearchFilesOutput(BaseModel):
@@ -154,6 +196,10 @@ class SynologySearchFilesOutput(BaseModel):
         description="List of matching files"
     )
     match_count: int = Field(default=0, description="Number of matches found")
+    progress_events: List[Dict[str, Any]] = Field(
+        default_factory=list,
+        description="Most recent status checks of the NAS task (elapsed, progress, finished)"
+    )
     error: str = Field(default="", description="Error message if failed")
 
 
@@ -174,6 +220,33 @@ def _file_info_to_output(info: SynologyFileInfo) -> FileInfoOutput:
     )
 
 
+async def iter_files_ndjson(
+    client: SynologyClient,
+    params: SynologyListFilesInput,
+) -> AsyncIterator[str]:
+    """Yield a folder listing as NDJSON chunks while pages arrive.
+    
+    Each chunk holds up to params.chunk_size lines, one FileInfoOutput
+    object per line, so callers can forward results before the whole
+    folder has been listed.
+    """
+    lines: List[str] = []
+    async for info in client.iter_files(
+        folder_path=params.folder_path,
+        sort_by=params.sort_by,
+        sort_direction=params.sort_direction,
+        offset=params.offset,
+        max_items=params.limit or None,
+    ):
+        lines.append(json.dumps(_file_info_to_output(info).model_dump()))
+        if len(lines) >= max(params.chunk_size, 1):
+            yield "\n".join(lines) + "\n"
+            lines = []
+    
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
 # -----------------------------------------------------------------------------
 # Tool Implementations
 # -----------------------------------------------------------------------------
@@ -192,6 +265,22 @@ async def synology_list_files(params: SynologyListFilesInput) -> SynologyListFil
     
     try:
         async with SynologyClient() as client:
+            if params.stream:
+                cap = min(params.limit or STREAM_MAX_ITEMS, STREAM_MAX_ITEMS)
+                capped = params.model_copy(update={"limit": cap})
+                chunks = [chunk async for chunk in iter_files_ndjson(client, capped)]
+                file_count = sum(chunk.count("\n") for chunk in chunks)
+                truncated = file_count >= cap and params.limit != cap
+                
+                invocation_logger.success(file_count=file_count, chunk_count=len(chunks), truncated=truncated)
+                
+                return SynologyListFilesOutput(
+                    success=True,
+                    file_count=file_count,
+                    ndjson_chunks=chunks,
+                    truncated=truncated,
+                )
+            
             files = await client.list_files(
                 folder_path=params.folder_path,
                 offset=params.offset,
@@ -312,13 +401,19 @@ async def synology_delete_files(params: SynologyDeleteFilesInput) -> SynologyDel
     
     try:
         async with SynologyClient() as client:
-            await client.delete_files(params.paths)
+            events = PollEventLog()
+            await client.delete_files(
+                params.paths,
+                timeout=params.timeout_seconds,
+                on_progress=events,
+            )
             
-            invocation_logger.success(deleted_count=len(params.paths))
+            invocation_logger.success(deleted_count=len(params.paths), status_checks=events.checks)
             
             return SynologyDeleteFilesOutput(
                 success=True,
                 deleted_count=len(params.paths),
+                progress_events=events.to_list(),
             )
             
     except SynologyConnectionError as e:
@@ -349,17 +444,21 @@ async def synology_move_files(params: SynologyMoveFilesInput) -> SynologyMoveFil
     
     try:
         async with SynologyClient() as client:
+            events = PollEventLog()
             await client.move_files(
                 params.paths,
                 params.dest_folder,
                 overwrite=params.overwrite,
+                timeout=params.timeout_seconds,
+                on_progress=events,
             )
             
-            invocation_logger.success(moved_count=len(params.paths))
+            invocation_logger.success(moved_count=len(params.paths), status_checks=events.checks)
             
             return SynologyMoveFilesOutput(
                 success=True,
                 moved_count=len(params.paths),
+                progress_events=events.to_list(),
             )
             
     except SynologyConnectionError as e:
@@ -427,21 +526,25 @@ async def synology_search_files(params: SynologySearchFilesInput) -> SynologySea
     
     try:
         async with SynologyClient() as client:
+            events = PollEventLog()
             files = await client.search_files(
                 folder_path=params.folder_path,
                 pattern=params.pattern,
                 extension=params.extension,
                 file_type=params.file_type if params.file_type != "all" else None,
+                timeout=params.timeout_seconds,
+                on_progress=events,
             )
             
             file_list = [_file_info_to_output(f) for f in files]
             
-            invocation_logger.success(match_count=len(file_list))
+            invocation_logger.success(match_count=len(file_list), status_checks=events.checks)
             
             return SynologySearchFilesOutput(
                 success=True,
                 files=file_list,
                 match_count=len(file_list),
+                progress_events=events.to_list(),
             )
             
     except SynologyConnectionError as e:
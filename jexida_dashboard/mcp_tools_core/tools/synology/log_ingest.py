@@ -0,0 +1,523 @@
+"""Incremental Synology Log Center ingestion.
+
+synology_list_logs re-reads the newest entries on every call, so security
+reviews and correlation with UniFi/SSH events re-download the same logs.
+This module keeps a local copy instead:
+- A cursor per NAS and log type (Fact 'synology.logs.cursor.<host>.<type>')
+  remembers the newest ingested time plus the fingerprints logged at that
+  second
+- Ingestion pages from the newest entry and stops at the cursor, so only
+  newer entries are fetched and stored in the SynologyLogEntry table
+- When a run hits max_entries, the entries it could not take are kept as a
+  backfill gap in the cursor and fetched by later runs
+- synology_query_logs filters by level, user, IP, event text and time
+  range entirely from the local table
+
+Entries identical in every field within the same second share a
+fingerprint and are stored once. Log Center times without an offset are
+in the NAS's local time; they are read in SYNOLOGY_TIMEZONE (an IANA
+name, default UTC), which should match the NAS's regional settings.
+"""
+
+import hashlib
+from datetime import datetime, timedelta, timezone as dt_timezone, tzinfo
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from asgiref.sync import sync_to_async
+from pydantic import BaseModel, Field
+
+from config import get_settings
+from logging_config import get_logger, ToolInvocationLogger
+from tool_registry import tool
+
+from .client import (
+    SynologyClient,
+    SynologyConnectionError,
+    SynologyAuthError,
+    SynologyAPIError,
+)
+
+logger = get_logger(__name__)
+
+
+CURSOR_FACT_PREFIX = "synology.logs.cursor"
+DEFAULT_LOG_TYPES = ("connection", "transfer")
+LOG_TIME_FORMATS = ("%Y/%m/%d %H:%M:%S", "%Y-%m-%d %H:%M:%S")
+
+
+# -------------------------------------------------------------------------
+# Entry normalization and cursor logic
+# -------------------------------------------------------------------------
+
+def nas_host(base_url: str) -> str:
+    """Host (and port) identifying a NAS in the log table."""
+    return urlparse(base_url).netloc or base_url
+
+
+def log_timezone() -> tzinfo:
+    """Time zone of the NAS clock from settings (synology_timezone, default UTC)."""
+    name = get_settings().synology_timezone
+    if not name:
+        return dt_timezone.utc
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        logger.warning(f"Unknown SYNOLOGY_TIMEZONE {name!r}, reading log times as UTC")
+        return dt_timezone.utc
+
+
+def parse_log_time(value: Any, tz: Optional[tzinfo] = None) -> Optional[datetime]:
+    """Parse a Log Center time (epoch seconds or 'YYYY/MM/DD HH:MM:SS').
+
+    Date strings are NAS local time and are read in tz (default UTC);
+    the result is always an aware UTC datetime.
+    """
+    if isinstance(value, (int, float)) and value > 0:
+        return datetime.fromtimestamp(value, tz=dt_timezone.utc)
+    if isinstance(value, str) and value.strip():
+        text = value.strip()
+        if text.isdigit():
+            return datetime.fromtimestamp(int(text), tz=dt_timezone.utc)
+        for fmt in LOG_TIME_FORMATS:
+            try:
+                local = datetime.strptime(text, fmt).replace(tzinfo=tz or dt_timezone.utc)
+            except ValueError:
+                continue
+            return local.astimezone(dt_timezone.utc)
+    return None
+
+
+def normalize_entry(log_type: str, raw: Dict[str, Any], tz: Optional[tzinfo] = None) -> Optional[Dict[str, Any]]:
+    """Turn a list_logs() entry into SynologyLogEntry fields (None if undated)."""
+    logged_at = parse_log_time(raw.get("time"), tz)
+    if logged_at is None:
+        return None
+
+    row = {
+        "log_type": log_type,
+        "logged_at": logged_at,
+        "level": str(raw.get("level") or "")[:16],
+        "user": str(raw.get("user") or "")[:128],
+        "ip": str(raw.get("ip") or "")[:45],
+        "event": str(raw.get("event") or "")[:255],
+        "description": str(raw.get("desc") or ""),
+    }
+    digest = hashlib.sha1("\x1f".join([
+        log_type, logged_at.isoformat(), row["level"], row["user"], row["ip"], row["event"], row["description"],
+    ]).encode("utf-8"))
+    row["fingerprint"] = digest.hexdigest()
+    return row
+
+
+def select_new_entries(
+    rows: List[Dict[str, Any]],
+    cursor: Optional[Dict[str, Any]],
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """Keep entries newer than the cursor from a newest-first page.
+
+    Args:
+        rows: Normalized entries, newest first
+        cursor: {"last_time": epoch, "fingerprints": [...]} or None
+
+    Returns:
+        (new rows, whether the cursor was reached so paging can stop)
+    """
+    if not cursor or cursor.get("last_time") is None:
+        return rows, False
+
+    last_time = float(cursor["last_time"])
+    seen = set(cursor.get("fingerprints") or [])
+    new = []
+    for row in rows:
+        ts = row["logged_at"].timestamp()
+        if ts < last_time:
+            return new, True
+        if ts == last_time and row["fingerprint"] in seen:
+            continue
+        new.append(row)
+    return new, False
+
+
+def select_gap_entries(
+    rows: List[Dict[str, Any]],
+    gap: Dict[str, Any],
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """Keep entries of a newest-first page that fall inside a backfill gap.
+
+    A gap lies below the oldest entries stored so far ("before_time" and
+    the fingerprints stored at that second) and above an older cursor
+    ("until", None when it reaches back to the start of the log).
+
+    Returns:
+        (gap rows, whether the bottom of the gap was reached)
+    """
+    before_time = float(gap["before_time"])
+    stored = set(gap.get("before_fingerprints") or [])
+    below = [
+        row for row in rows
+        if row["logged_at"].timestamp() < before_time
+        or (row["logged_at"].timestamp() == before_time and row["fingerprint"] not in stored)
+    ]
+    return select_new_entries(below, gap.get("until"))
+
+
+def gap_below(
+    kept: List[Dict[str, Any]],
+    until: Optional[Dict[str, Any]],
+    gap: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Gap left between the oldest of the kept rows and until.
+
+    When an existing gap is narrowed, fingerprints it already stored at
+    the same second are carried over.
+    """
+    oldest = min(row["logged_at"].timestamp() for row in kept)
+    at_oldest = {row["fingerprint"] for row in kept if row["logged_at"].timestamp() == oldest}
+    if gap and float(gap["before_time"]) == oldest:
+        at_oldest |= set(gap.get("before_fingerprints") or [])
+    return {"before_time": oldest, "before_fingerprints": sorted(at_oldest), "until": until}
+
+
+def advance_cursor(cursor: Optional[Dict[str, Any]], new_rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Cursor after ingesting new_rows (newest time and its fingerprints)."""
+    cursor = dict(cursor or {})
+    if not new_rows:
+        return cursor
+
+    newest = max(row["logged_at"].timestamp() for row in new_rows)
+    at_newest = {row["fingerprint"] for row in new_rows if row["logged_at"].timestamp() == newest}
+    if cursor.get("last_time") == newest:
+        at_newest |= set(cursor.get("fingerprints") or [])
+    cursor["last_time"] = newest
+    cursor["fingerprints"] = sorted(at_newest)
+    return cursor
+
+
+# -------------------------------------------------------------------------
+# Storage
+# -------------------------------------------------------------------------
+
+def cursor_fact_key(nas: str, log_type: str) -> str:
+    return f"{CURSOR_FACT_PREFIX}.{nas}.{log_type}"
+
+
+@sync_to_async
+def _load_cursor(nas: str, log_type: str) -> Optional[Dict[str, Any]]:
+    from mcp_tools_core.models import Fact
+
+    fact = Fact.objects.filter(key=cursor_fact_key(nas, log_type)).first()
+    return fact.value if fact else None
+
+
+@sync_to_async
+def _store_entries(nas: str, log_type: str, rows: List[Dict[str, Any]], cursor: Dict[str, Any]) -> int:
+    """Insert new entries and save the cursor in one transaction."""
+    from django.db import transaction
+    from mcp_tools_core.models import Fact, SynologyLogEntry
+
+    with transaction.atomic():
+        before = SynologyLogEntry.objects.filter(nas=nas, log_type=log_type).count()
+        SynologyLogEntry.objects.bulk_create(
+            [SynologyLogEntry(nas=nas, **row) for row in rows],
+            batch_size=500,
+            ignore_conflicts=True,
+        )
+        stored = SynologyLogEntry.objects.filter(nas=nas, log_type=log_type).count() - before
+        Fact.objects.update_or_create(
+            key=cursor_fact_key(nas, log_type),
+            defaults={"value": cursor, "source": "synology_log_ingest"},
+        )
+    return stored
+
+
+async def _collect(
+    client: SynologyClient,
+    log_type: str,
+    page_size: int,
+    limit: int,
+    select: Callable[[List[Dict[str, Any]]], Tuple[List[Dict[str, Any]], bool]],
+    tz: Optional[tzinfo],
+) -> Tuple[List[Dict[str, Any]], int, bool]:
+    """Page newest-first through a log type, keeping the rows select() picks.
+
+    Returns:
+        (up to limit rows, pages fetched, whether select() reached its end)
+    """
+    picked: List[Dict[str, Any]] = []
+    pages = 0
+    offset = 0
+
+    while True:
+        raw = await client.list_logs(log_type=log_type, offset=offset, limit=page_size)
+        pages += 1
+        rows = [row for row in (normalize_entry(log_type, entry, tz) for entry in raw) if row]
+        fresh, reached = select(rows)
+        picked.extend(fresh)
+        done = reached or len(raw) < page_size
+        if done or len(picked) > limit:
+            break
+        offset += len(raw)
+
+    return picked[:limit], pages, done and len(picked) <= limit
+
+
+async def ingest_logs(
+    client: SynologyClient,
+    log_type: str,
+    page_size: int = 500,
+    max_entries: int = 20000,
+    tz: Optional[tzinfo] = None,
+) -> Dict[str, Any]:
+    """Fetch entries newer than the cursor for one log type and store them.
+
+    New entries are taken newest first. If there are more than
+    max_entries, the older rest is recorded as a gap in the cursor, and
+    later runs fill gaps with what is left of their max_entries.
+
+    Args:
+        client: Connected SynologyClient
+        log_type: Log Center log type
+        page_size: Entries per list request
+        max_entries: Upper bound on entries fetched per run
+        tz: Time zone of Log Center date strings (default UTC)
+
+    Returns:
+        Ingestion statistics for the log type
+    """
+    nas = nas_host(client.base_url)
+    cursor = await _load_cursor(nas, log_type)
+    gaps = list((cursor or {}).get("gaps") or [])
+
+    new_rows, pages, complete = await _collect(
+        client, log_type, page_size, max_entries, lambda rows: select_new_entries(rows, cursor), tz,
+    )
+    if not complete and new_rows:
+        until = {"last_time": cursor["last_time"], "fingerprints": cursor.get("fingerprints") or []} \
+            if cursor and cursor.get("last_time") is not None else None
+        gaps.insert(0, gap_below(new_rows, until))
+
+    gap_rows: List[Dict[str, Any]] = []
+    remaining = []
+    for gap in gaps:
+        budget = max_entries - len(new_rows) - len(gap_rows)
+        if budget <= 0:
+            remaining.append(gap)
+            continue
+        filled, gap_pages, complete = await _collect(
+            client, log_type, page_size, budget, lambda rows, gap=gap: select_gap_entries(rows, gap), tz,
+        )
+        pages += gap_pages
+        gap_rows.extend(filled)
+        if not complete:
+            remaining.append(gap_below(filled, gap.get("until"), gap) if filled else gap)
+
+    new_cursor = advance_cursor(cursor, new_rows)
+    new_cursor.pop("gaps", None)
+    if remaining:
+        new_cursor["gaps"] = remaining
+
+    rows = new_rows + gap_rows
+    stored = 0
+    if rows or new_cursor != (cursor or {}):
+        stored = await _store_entries(nas, log_type, rows, new_cursor)
+    return {
+        "log_type": log_type,
+        "pages": pages,
+        "fetched_new": len(new_rows),
+        "backfilled": len(gap_rows),
+        "stored": stored,
+        "truncated": bool(remaining),
+    }
+
+
+# -----------------------------------------------------------------------------
+# Input/Output Schemas
+# -----------------------------------------------------------------------------
+
+class SynologyIngestLogsInput(BaseModel):
+    """Input schema for synology_ingest_logs tool."""
+    log_types: List[str] = Field(
+        default_factory=lambda: list(DEFAULT_LOG_TYPES),
+        description="Log Center log types to ingest (e.g., connection, transfer)"
+    )
+    max_entries: int = Field(
+        default=20000,
+        ge=1,
+        description="Maximum entries fetched per log type per run (the rest is fetched by later runs)"
+    )
+
+
+class LogIngestStats(BaseModel):
+    """Ingestion result for one log type."""
+    log_type: str = Field(description="Log type")
+    pages: int = Field(description="List requests made")
+    fetched_new: int = Field(description="Entries newer than the cursor")
+    backfilled: int = Field(default=0, description="Older entries fetched for gaps left by earlier runs")
+    stored: int = Field(description="Entries inserted into the local table")
+    truncated: bool = Field(description="Whether entries are still missing because of max_entries; run again")
+    error: str = Field(default="", description="Error for this log type, if any")
+
+
+class SynologyIngestLogsOutput(BaseModel):
+    """Output schema for synology_ingest_logs tool."""
+    success: bool = Field(description="Whether the operation succeeded")
+    results: List[LogIngestStats] = Field(default_factory=list, description="Per log type results")
+    total_stored: int = Field(default=0, description="Entries inserted across log types")
+    truncated: bool = Field(default=False, description="Whether any log type still has entries to fetch")
+    error: str = Field(default="", description="Error message if failed")
+
+
+class SynologyQueryLogsInput(BaseModel):
+    """Input schema for synology_query_logs tool."""
+    log_type: Optional[str] = Field(default=None, description="Filter by log type")
+    level: Optional[str] = Field(default=None, description="Filter by level (e.g., warn, err)")
+    user: Optional[str] = Field(default=None, description="Filter by user (exact match)")
+    ip: Optional[str] = Field(default=None, description="Filter by IP address (exact match, or prefix ending in '.')")
+    text: Optional[str] = Field(default=None, description="Case-insensitive substring of event or message")
+    hours: Optional[int] = Field(default=24, ge=1, description="Only entries from the last N hours (ignored if since is set)")
+    since: Optional[datetime] = Field(default=None, description="Start of the time range (ISO 8601)")
+    until: Optional[datetime] = Field(default=None, description="End of the time range (ISO 8601)")
+    nas: Optional[str] = Field(default=None, description="Filter by NAS host")
+    limit: int = Field(default=200, ge=1, le=5000, description="Maximum entries to return")
+
+
+class StoredLogEntry(BaseModel):
+    """Locally stored log entry."""
+    nas: str = Field(description="NAS host")
+    log_type: str = Field(description="Log type")
+    logged_at: datetime = Field(description="When the event was logged")
+    level: str = Field(description="Severity")
+    user: str = Field(description="User")
+    ip: str = Field(description="IP address")
+    event: str = Field(description="Event type")
+    description: str = Field(description="Log message")
+
+
+class SynologyQueryLogsOutput(BaseModel):
+    """Output schema for synology_query_logs tool."""
+    success: bool = Field(description="Whether the operation succeeded")
+    entries: List[StoredLogEntry] = Field(default_factory=list, description="Matching entries, newest first")
+    count: int = Field(default=0, description="Number of entries returned")
+    total_matches: int = Field(default=0, description="Number of matching entries before the limit")
+    error: str = Field(default="", description="Error message if failed")
+
+
+# -----------------------------------------------------------------------------
+# Tool Implementations
+# -----------------------------------------------------------------------------
+
+@tool(
+    name="synology_ingest_logs",
+    description="Fetch only new Synology Log Center entries (per log type cursor) into the local log table",
+    input_schema=SynologyIngestLogsInput,
+    output_schema=SynologyIngestLogsOutput,
+    tags=["synology", "logs", "monitoring"]
+)
+async def synology_ingest_logs(params: SynologyIngestLogsInput) -> SynologyIngestLogsOutput:
+    """Ingest new log entries."""
+    invocation_logger = ToolInvocationLogger(logger)
+    invocation_logger.start("synology_ingest_logs", log_types=params.log_types)
+
+    try:
+        results = []
+        tz = log_timezone()
+        async with SynologyClient() as client:
+            for log_type in params.log_types:
+                try:
+                    stats = await ingest_logs(client, log_type, max_entries=params.max_entries, tz=tz)
+                    results.append(LogIngestStats(**stats))
+                except SynologyAPIError as e:
+                    # One unsupported log type should not block the others
+                    results.append(LogIngestStats(
+                        log_type=log_type, pages=0, fetched_new=0, stored=0, truncated=False, error=str(e),
+                    ))
+
+        total = sum(r.stored for r in results)
+        truncated = any(r.truncated for r in results)
+        invocation_logger.success(total_stored=total, truncated=truncated)
+
+        return SynologyIngestLogsOutput(
+            success=not all(r.error for r in results),
+            results=results,
+            total_stored=total,
+            truncated=truncated,
+            error="; ".join(f"{r.log_type}: {r.error}" for r in results if r.error),
+        )
+
+    except SynologyConnectionError as e:
+        invocation_logger.failure(str(e))
+        return SynologyIngestLogsOutput(success=False, error=f"Connection error: {e}")
+    except SynologyAuthError as e:
+        invocation_logger.failure(str(e))
+        return SynologyIngestLogsOutput(success=False, error=f"Authentication error: {e}")
+    except Exception as e:
+        invocation_logger.failure(f"Unexpected error: {e}")
+        return SynologyIngestLogsOutput(success=False, error=f"Unexpected error: {e}")
+
+
+@tool(
+    name="synology_query_logs",
+    description="Query ingested Synology logs locally by level, user, IP, text and time range (no NAS access)",
+    input_schema=SynologyQueryLogsInput,
+    output_schema=SynologyQueryLogsOutput,
+    tags=["synology", "logs", "monitoring", "security"]
+)
+async def synology_query_logs(params: SynologyQueryLogsInput) -> SynologyQueryLogsOutput:
+    """Query the local log table."""
+    invocation_logger = ToolInvocationLogger(logger)
+    invocation_logger.start("synology_query_logs", user=params.user, ip=params.ip, level=params.level)
+
+    try:
+        @sync_to_async
+        def run_query():
+            from django.db.models import Q
+            from mcp_tools_core.models import SynologyLogEntry
+
+            queryset = SynologyLogEntry.objects.all()
+            if params.nas:
+                queryset = queryset.filter(nas=params.nas)
+            if params.log_type:
+                queryset = queryset.filter(log_type=params.log_type)
+            if params.level:
+                queryset = queryset.filter(level__iexact=params.level)
+            if params.user:
+                queryset = queryset.filter(user=params.user)
+            if params.ip:
+                if params.ip.endswith("."):
+                    queryset = queryset.filter(ip__startswith=params.ip)
+                else:
+                    queryset = queryset.filter(ip=params.ip)
+            if params.text:
+                queryset = queryset.filter(Q(event__icontains=params.text) | Q(description__icontains=params.text))
+
+            since = params.since
+            if since is None and params.hours:
+                since = datetime.now(dt_timezone.utc) - timedelta(hours=params.hours)
+            if since is not None:
+                queryset = queryset.filter(logged_at__gte=since)
+            if params.until is not None:
+                queryset = queryset.filter(logged_at__lte=params.until)
+
+            total = queryset.count()
+            rows = list(queryset.order_by("-logged_at")[:params.limit].values(
+                "nas", "log_type", "logged_at", "level", "user", "ip", "event", "description",
+            ))
+            return rows, total
+
+        rows, total = await run_query()
+        entries = [StoredLogEntry(**row) for row in rows]
+
+        invocation_logger.success(count=len(entries), total_matches=total)
+
+        return SynologyQueryLogsOutput(
+            success=True,
+            entries=entries,
+            count=len(entries),
+            total_matches=total,
+        )
+
+    except Exception as e:
+        invocation_logger.failure(f"Unexpected error: {e}")
+        return SynologyQueryLogsOutput(success=False, error=f"Unexpected error: {e}")
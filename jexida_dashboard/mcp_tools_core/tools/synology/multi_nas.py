@@ -0,0 +1,363 @@
+"""Synology multi-NAS inventory and fan-out.
+
+SynologyClient talks to one NAS. This module adds:
+- An inventory of named NAS targets read from the secrets store
+  (service type 'synology'). Keys prefixed with '<name>.' define a named
+  target ('backup.url', 'backup.username', 'backup.password', optional
+  'backup.verify_ssl'); unprefixed 'url'/'username'/'password' (or the
+  SYNOLOGY_* settings) define the 'default' target
+- fan_out(), which runs the same client operation on every target
+  concurrently with a per-target timeout and returns one result per
+  target, so a refresh takes as long as the slowest NAS, not the sum
+
+Usage:
+    targets = await get_inventory()
+    results = await fan_out(targets, lambda c: c.get_system_info(), timeout=20)
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from asgiref.sync import sync_to_async
+from pydantic import BaseModel, Field
+
+from config import get_settings
+from logging_config import get_logger, ToolInvocationLogger
+from tool_registry import tool
+
+from .client import SynologyClient
+
+logger = get_logger(__name__)
+
+
+DEFAULT_TARGET = "default"
+TARGET_KEYS = ("url", "username", "password", "verify_ssl")
+
+# Read-only client methods without arguments that can be fanned out
+FANOUT_METHODS = (
+    "get_system_info",
+    "get_system_overview",
+    "get_storage_info",
+    "get_network_info",
+    "get_resource_usage",
+    "get_security_settings",
+    "list_shares",
+    "list_shared_folders",
+    "list_backup_tasks",
+    "list_downloads",
+    "list_packages",
+    "list_users",
+    "list_scheduled_tasks",
+    "list_docker_containers",
+    "list_virtual_machines",
+)
+
+
+# -------------------------------------------------------------------------
+# Inventory
+# -------------------------------------------------------------------------
+
+@dataclass
+class NasTarget:
+    """One NAS in the inventory."""
+    name: str
+    url: str
+    username: str
+    password: str = field(repr=False)
+    verify_ssl: Optional[bool] = None
+
+    def client(self, **kwargs: Any) -> SynologyClient:
+        """Build a (pooled) client for this NAS."""
+        return SynologyClient(
+            base_url=self.url,
+            username=self.username,
+            password=self.password,
+            verify_ssl=self.verify_ssl,
+            **kwargs,
+        )
+
+
+def _parse_bool(value: Optional[str]) -> Optional[bool]:
+    if value is None or value == "":
+        return None
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def build_inventory(values: Dict[str, str]) -> List[NasTarget]:
+    """Group secret key/values into targets.
+
+    Args:
+        values: Secret key -> value for service type 'synology'
+
+    Returns:
+        Targets with a URL, sorted by name ('default' first)
+    """
+    grouped: Dict[str, Dict[str, str]] = {}
+    for key, value in values.items():
+        name, _, field_name = key.rpartition(".")
+        if field_name in TARGET_KEYS:
+            grouped.setdefault(name or DEFAULT_TARGET, {})[field_name] = value
+
+    targets = [
+        NasTarget(
+            name=name,
+            url=fields["url"].rstrip("/"),
+            username=fields.get("username", ""),
+            password=fields.get("password", ""),
+            verify_ssl=_parse_bool(fields.get("verify_ssl")),
+        )
+        for name, fields in grouped.items()
+        if fields.get("url")
+    ]
+    return sorted(targets, key=lambda t: (t.name != DEFAULT_TARGET, t.name))
+
+
+@sync_to_async
+def _load_secret_values() -> Dict[str, str]:
+    from secrets_app.models import Secret
+
+    return {s.key: s.get_value() for s in Secret.objects.filter(service_type="synology")}
+
+
+async def get_inventory() -> List[NasTarget]:
+    """All configured NAS targets (secrets store, then SYNOLOGY_* settings)."""
+    try:
+        values = await _load_secret_values()
+    except Exception as e:
+        logger.debug(f"Could not load Synology targets from secrets store: {e}")
+        values = {}
+
+    targets = build_inventory(values)
+    settings = get_settings()
+    if settings.synology_url and not any(t.name == DEFAULT_TARGET for t in targets):
+        targets.insert(0, NasTarget(
+            name=DEFAULT_TARGET,
+            url=settings.synology_url.rstrip("/"),
+            username=settings.synology_username or "",
+            password=settings.synology_password or "",
+        ))
+    return targets
+
+
+def select_targets(targets: List[NasTarget], names: Optional[List[str]]) -> List[NasTarget]:
+    """Targets matching names (all when names is empty); unknown names raise ValueError."""
+    if not names:
+        return targets
+    by_name = {t.name: t for t in targets}
+    unknown = [n for n in names if n not in by_name]
+    if unknown:
+        raise ValueError(f"Unknown NAS target(s): {', '.join(unknown)}; known: {', '.join(by_name) or 'none'}")
+    return [by_name[n] for n in names]
+
+
+# -------------------------------------------------------------------------
+# Fan-out executor
+# -------------------------------------------------------------------------
+
+@dataclass
+class FanOutResult:
+    """Outcome of one operation on one NAS."""
+    target: str
+    success: bool
+    data: Any = None
+    error: str = ""
+    duration_seconds: float = 0.0
+
+
+async def _run_on_target(
+    target: NasTarget,
+    operation: Callable[[SynologyClient], Awaitable[Any]],
+    timeout: float,
+) -> FanOutResult:
+    started = time.monotonic()
+
+    async def run() -> Any:
+        async with target.client() as client:
+            return await operation(client)
+
+    try:
+        # The timeout covers login as well as the call itself
+        data = await asyncio.wait_for(run(), timeout)
+        return FanOutResult(target.name, True, data, duration_seconds=round(time.monotonic() - started, 3))
+    except asyncio.TimeoutError:
+        error = f"Timed out after {timeout:g}s"
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    logger.warning(f"Synology fan-out to {target.name} failed: {error}")
+    return FanOutResult(target.name, False, error=error, duration_seconds=round(time.monotonic() - started, 3))
+
+
+async def fan_out(
+    targets: List[NasTarget],
+    operation: Callable[[SynologyClient], Awaitable[Any]],
+    timeout: float = 30,
+) -> List[FanOutResult]:
+    """Run an operation on every target concurrently.
+
+    Args:
+        targets: NAS targets
+        operation: Coroutine function taking a connected SynologyClient
+        timeout: Per-target timeout in seconds (including login)
+
+    Returns:
+        One FanOutResult per target, in target order; failures never
+        raise, they are reported per target
+    """
+    return list(await asyncio.gather(*(_run_on_target(t, operation, timeout) for t in targets)))
+
+
+def to_jsonable(value: Any) -> Any:
+    """Convert client return values (dataclasses with to_dict, lists, dicts) to JSON types."""
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    if isinstance(value, dict):
+        return {k: to_jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_jsonable(v) for v in value]
+    return value
+
+
+# -----------------------------------------------------------------------------
+# Input/Output Schemas
+# -----------------------------------------------------------------------------
+
+class NasTargetOutput(BaseModel):
+    """NAS target (without credentials)."""
+    name: str = Field(description="Target name")
+    url: str = Field(description="NAS URL")
+    username: str = Field(description="Login user")
+
+
+class SynologyListNasTargetsInput(BaseModel):
+    """Input schema for synology_list_nas_targets tool."""
+    pass  # No parameters needed
+
+
+class SynologyListNasTargetsOutput(BaseModel):
+    """Output schema for synology_list_nas_targets tool."""
+    success: bool = Field(description="Whether the operation succeeded")
+    targets: List[NasTargetOutput] = Field(default_factory=list, description="Configured NAS targets")
+    error: str = Field(default="", description="Error message if failed")
+
+
+class SynologyMultiNasInput(BaseModel):
+    """Input schema for synology_multi_nas tool."""
+    method: str = Field(
+        description=f"Client method to run on every NAS: {', '.join(FANOUT_METHODS)}"
+    )
+    targets: List[str] = Field(default_factory=list, description="Target names (all targets when empty)")
+    timeout_seconds: float = Field(default=30, gt=0, description="Per-NAS timeout, including login")
+
+
+class NasResultOutput(BaseModel):
+    """Result from one NAS."""
+    target: str = Field(description="Target name")
+    success: bool = Field(description="Whether the call succeeded on this NAS")
+    data: Any = Field(default=None, description="Method result")
+    error: str = Field(default="", description="Error for this NAS, if any")
+    duration_seconds: float = Field(default=0.0, description="Time taken for this NAS")
+
+
+class SynologyMultiNasOutput(BaseModel):
+    """Output schema for synology_multi_nas tool."""
+    success: bool = Field(description="Whether at least one NAS answered")
+    method: str = Field(default="", description="Method that was run")
+    results: List[NasResultOutput] = Field(default_factory=list, description="One entry per NAS")
+    succeeded: int = Field(default=0, description="Targets that answered")
+    failed: int = Field(default=0, description="Targets that failed or timed out")
+    duration_seconds: float = Field(default=0.0, description="Wall time (about the slowest NAS)")
+    error: str = Field(default="", description="Error message if failed")
+
+
+# -----------------------------------------------------------------------------
+# Tool Implementations
+# -----------------------------------------------------------------------------
+
+@tool(
+    name="synology_list_nas_targets",
+    description="List the Synology NAS units configured in the secrets store (multi-NAS inventory)",
+    input_schema=SynologyListNasTargetsInput,
+    output_schema=SynologyListNasTargetsOutput,
+    tags=["synology", "inventory"]
+)
+async def synology_list_nas_targets(params: SynologyListNasTargetsInput) -> SynologyListNasTargetsOutput:
+    """List configured NAS targets."""
+    invocation_logger = ToolInvocationLogger(logger)
+    invocation_logger.start("synology_list_nas_targets")
+
+    try:
+        targets = await get_inventory()
+        invocation_logger.success(target_count=len(targets))
+        return SynologyListNasTargetsOutput(
+            success=True,
+            targets=[NasTargetOutput(name=t.name, url=t.url, username=t.username) for t in targets],
+        )
+    except Exception as e:
+        invocation_logger.failure(f"Unexpected error: {e}")
+        return SynologyListNasTargetsOutput(success=False, error=f"Unexpected error: {e}")
+
+
+@tool(
+    name="synology_multi_nas",
+    description="Run a read-only Synology query (system info, storage, backups, Docker containers, ...) on all NAS units concurrently with per-NAS timeouts",
+    input_schema=SynologyMultiNasInput,
+    output_schema=SynologyMultiNasOutput,
+    tags=["synology", "inventory", "monitoring"]
+)
+async def synology_multi_nas(params: SynologyMultiNasInput) -> SynologyMultiNasOutput:
+    """Fan a client method out to several NAS units."""
+    invocation_logger = ToolInvocationLogger(logger)
+    invocation_logger.start("synology_multi_nas", method=params.method, targets=params.targets)
+
+    if params.method not in FANOUT_METHODS:
+        return SynologyMultiNasOutput(
+            success=False,
+            method=params.method,
+            error=f"Unsupported method '{params.method}'; use one of: {', '.join(FANOUT_METHODS)}",
+        )
+
+    try:
+        targets = select_targets(await get_inventory(), params.targets)
+        if not targets:
+            return SynologyMultiNasOutput(success=False, method=params.method, error="No Synology NAS targets configured")
+
+        started = time.monotonic()
+        results = await fan_out(
+            targets,
+            lambda client: getattr(client, params.method)(),
+            timeout=params.timeout_seconds,
+        )
+        duration = time.monotonic() - started
+
+        outputs = [
+            NasResultOutput(
+                target=r.target,
+                success=r.success,
+                data=to_jsonable(r.data),
+                error=r.error,
+                duration_seconds=r.duration_seconds,
+            )
+            for r in results
+        ]
+        succeeded = sum(1 for r in results if r.success)
+
+        invocation_logger.success(succeeded=succeeded, failed=len(results) - succeeded)
+
+        return SynologyMultiNasOutput(
+            success=succeeded > 0,
+            method=params.method,
+            results=outputs,
+            succeeded=succeeded,
+            failed=len(results) - succeeded,
+            duration_seconds=round(duration, 3),
+            error="" if succeeded else "All targets failed",
+        )
+
+    except ValueError as e:
+        invocation_logger.failure(str(e))
+        return SynologyMultiNasOutput(success=False, method=params.method, error=str(e))
+    except Exception as e:
+        invocation_logger.failure(f"Unexpected error: {e}")
+        return SynologyMultiNasOutput(success=False, method=params.method, error=f"Unexpected error: {e}")
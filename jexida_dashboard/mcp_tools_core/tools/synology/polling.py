@@ -0,0 +1,217 @@
+"""Adaptive polling of Synology background tasks.
+
+Several DSM operations (FileStation delete/copy-move/search/MD5, Download
+Station transfers, Hyper Backup runs) start a server-side task and have to
+be polled until they finish. poll_task() is the one shared loop for all of
+them:
+
+- the first status check follows the start call after ~50ms and the
+  interval doubles from there (capped), so short tasks return almost
+  immediately and long ones do not hammer the NAS;
+- when the task reports progress, the next check is pulled forward to the
+  estimated completion time;
+- an overall deadline replaces per-call iteration caps;
+- on timeout or cancellation the task's stop method is called so nothing
+  keeps running server-side.
+
+Each status check is yielded as a PollEvent that tools can stream or log.
+
+Usage:
+    async for event in poll_task(fetch_status, is_finished, stop=stop_task):
+        logger.info(f"{event.progress:.0%} after {event.elapsed:.1f}s")
+    result = event.status
+
+    status = await wait_task(fetch_status, is_finished, timeout=600)
+"""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+INITIAL_INTERVAL = 0.05
+MAX_INTERVAL = 2.0
+BACKOFF_FACTOR = 2.0
+DEFAULT_TIMEOUT = 300.0
+
+StatusFetcher = Callable[[], Awaitable[Dict[str, Any]]]
+StopCallback = Callable[[], Awaitable[Any]]
+
+
+@dataclass
+class PollEvent:
+    """One status check of a polled task."""
+    label: str
+    attempt: int
+    elapsed: float
+    status: Dict[str, Any] = field(default_factory=dict)
+    progress: Optional[float] = None
+    finished: bool = False
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "label": self.label,
+            "attempt": self.attempt,
+            "elapsed": round(self.elapsed, 3),
+            "progress": self.progress,
+            "finished": self.finished,
+        }
+
+
+class PollEventLog:
+    """on_event sink keeping the most recent events for a tool's output."""
+
+    def __init__(self, limit: int = 100):
+        self.events: deque = deque(maxlen=limit)
+        self.checks = 0
+
+    def __call__(self, event: PollEvent) -> None:
+        self.checks += 1
+        self.events.append(event)
+        logger.debug(f"{event.label}: check {event.attempt}, progress={event.progress}")
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Events as dictionaries, oldest first."""
+        return [event.to_dict() for event in self.events]
+
+
+def filestation_progress(status: Dict[str, Any]) -> Optional[float]:
+    """Progress fraction (0-1) reported by FileStation task status calls."""
+    value = status.get("progress")
+    if value is None:
+        return None
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return None
+    # Delete/CopyMove report 0-1, some DSM builds report a percentage
+    return value / 100 if value > 1 else value
+
+
+def _next_interval(
+    interval: float,
+    elapsed: float,
+    progress: Optional[float],
+    initial_interval: float,
+    max_interval: float,
+) -> float:
+    """Sleep before the next check: backoff, pulled in by the progress ETA."""
+    if progress and 0 < progress < 1:
+        eta = elapsed * (1 - progress) / progress
+        return max(initial_interval, min(interval, eta, max_interval))
+    return min(interval, max_interval)
+
+
+async def _stop_quietly(stop: Optional[StopCallback], label: str) -> None:
+    """Call a task's stop method, logging instead of raising."""
+    if stop is None:
+        return
+    try:
+        await stop()
+    except Exception as e:
+        logger.warning(f"Failed to stop {label}: {e}")
+
+
+async def poll_task(
+    fetch_status: StatusFetcher,
+    is_finished: Callable[[Dict[str, Any]], bool],
+    stop: Optional[StopCallback] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    progress: Callable[[Dict[str, Any]], Optional[float]] = filestation_progress,
+    label: str = "task",
+    initial_interval: float = INITIAL_INTERVAL,
+    max_interval: float = MAX_INTERVAL,
+    backoff: float = BACKOFF_FACTOR,
+) -> AsyncIterator[PollEvent]:
+    """Poll a background task until it finishes, yielding every check.
+
+    Args:
+        fetch_status: Coroutine function returning the task's status dict
+        is_finished: Whether a status dict means the task is done
+        stop: Coroutine function stopping the task; called on timeout and
+            when the caller cancels or abandons the iteration early
+        timeout: Overall deadline in seconds
+        progress: Extracts a 0-1 progress fraction from a status dict
+        label: Name used in events, logs and the timeout error
+        initial_interval: First sleep in seconds
+        max_interval: Upper bound for the sleep between checks
+        backoff: Multiplier applied to the interval after each check
+
+    Yields:
+        PollEvent per status check; the last one has finished=True
+
+    Raises:
+        SynologyAPIError: If the deadline passes before the task finishes
+    """
+    from .client import SynologyAPIError
+
+    started = time.monotonic()
+    deadline = started + timeout
+    interval = initial_interval
+    attempt = 0
+    finished = False
+
+    try:
+        await asyncio.sleep(min(initial_interval, timeout))
+        while True:
+            attempt += 1
+            status = await fetch_status()
+            elapsed = time.monotonic() - started
+            finished = bool(is_finished(status))
+            fraction = progress(status) if progress else None
+
+            yield PollEvent(
+                label=label,
+                attempt=attempt,
+                elapsed=elapsed,
+                status=status,
+                progress=1.0 if finished else fraction,
+                finished=finished,
+            )
+            if finished:
+                return
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            delay = _next_interval(interval, elapsed, fraction, initial_interval, max_interval)
+            await asyncio.sleep(min(delay, remaining))
+            interval *= backoff
+    finally:
+        if not finished:
+            await _stop_quietly(stop, label)
+
+    suffix = " (stopped on the NAS)" if stop else ""
+    raise SynologyAPIError(f"{label} timed out after {timeout:g}s{suffix}")
+
+
+async def wait_task(
+    fetch_status: StatusFetcher,
+    is_finished: Callable[[Dict[str, Any]], bool],
+    on_event: Optional[Callable[[PollEvent], None]] = None,
+    **kwargs: Any,
+) -> Dict[str, Any]:
+    """Poll a task to completion and return its final status.
+
+    Args:
+        fetch_status: Coroutine function returning the task's status dict
+        is_finished: Whether a status dict means the task is done
+        on_event: Called with every PollEvent
+        **kwargs: Passed through to poll_task()
+
+    Returns:
+        The status dict of the final check
+    """
+    status: Dict[str, Any] = {}
+    async for event in poll_task(fetch_status, is_finished, **kwargs):
+        if on_event:
+            on_event(event)
+        status = event.status
+    return status
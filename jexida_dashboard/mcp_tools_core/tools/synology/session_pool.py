@@ -0,0 +1,208 @@
+"""Shared Synology DSM session pool.
+
+Logging in to DSM is slow (hundreds of milliseconds, more with 2FA) and
+every login/logout pair lands in the NAS connection log. The pool keeps one
+authenticated session per (NAS URL, username) alive across tool calls:
+- The SID and API info map are shared by every SynologyClient borrowing
+  the session
+- One httpx.AsyncClient is kept per event loop, since Django views run each
+  tool call in a fresh loop and httpx clients cannot cross loops
+- The API info map is persisted per NAS and DSM version in the Fact store,
+  so a new process only repeats the SYNO.API.Info query-all after an upgrade
+"""
+
+import asyncio
+import threading
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+from asgiref.sync import sync_to_async
+
+from logging_config import get_logger
+
+logger = get_logger(__name__)
+
+
+# Fact key prefix for persisted API info maps: synology.api_info.<host>.<dsm version>
+API_INFO_FACT_PREFIX = "synology.api_info"
+
+
+@dataclass
+class _LoopResources:
+    """HTTP client and auth lock bound to one event loop."""
+    loop_ref: "weakref.ReferenceType[asyncio.AbstractEventLoop]"
+    http: httpx.AsyncClient
+    auth_lock: asyncio.Lock
+
+
+@dataclass
+class SynologySession:
+    """An authenticated DSM session shared by SynologyClient instances."""
+    base_url: str
+    username: str
+    sid: Optional[str] = None
+    api_info: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    dsm_version: str = ""
+    logins: int = 0
+    borrowers: int = 0
+    last_used: float = 0.0
+    _resources: Dict[int, _LoopResources] = field(default_factory=dict, repr=False)
+    _guard: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def resources(self, factory: Callable[[], httpx.AsyncClient]) -> _LoopResources:
+        """Return the HTTP client and auth lock for the running event loop.
+
+        Entries belonging to closed or collected loops are dropped; their
+        clients cannot be closed from another loop and are left to the GC.
+        """
+        loop = asyncio.get_running_loop()
+        with self._guard:
+            for key, res in list(self._resources.items()):
+                owner = res.loop_ref()
+                if owner is None or owner.is_closed():
+                    del self._resources[key]
+
+            res = self._resources.get(id(loop))
+            if res is None or res.loop_ref() is not loop:
+                res = _LoopResources(
+                    loop_ref=weakref.ref(loop),
+                    http=factory(),
+                    auth_lock=asyncio.Lock(),
+                )
+                self._resources[id(loop)] = res
+            return res
+
+    def current_http(self) -> Optional[httpx.AsyncClient]:
+        """Return the HTTP client for the running loop, if one was created."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+        res = self._resources.get(id(loop))
+        if res is None or res.loop_ref() is not loop:
+            return None
+        return res.http
+
+    async def aclose(self) -> None:
+        """Close the HTTP client of the running loop and forget the others."""
+        http = self.current_http()
+        with self._guard:
+            self._resources.clear()
+        if http is not None:
+            await http.aclose()
+
+
+class SynologySessionPool:
+    """Process-wide pool of SynologySession objects keyed by (URL, user)."""
+
+    def __init__(self):
+        self._sessions: Dict[Tuple[str, str], SynologySession] = {}
+        self._lock = threading.Lock()
+
+    def get(self, base_url: str, username: str) -> SynologySession:
+        """Return the session for a NAS/user pair, creating an empty one."""
+        key = (base_url.rstrip("/"), username)
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = SynologySession(base_url=key[0], username=username)
+                self._sessions[key] = session
+            return session
+
+    def remove(self, base_url: str, username: str) -> Optional[SynologySession]:
+        """Drop a session from the pool (e.g. after an explicit logout)."""
+        with self._lock:
+            return self._sessions.pop((base_url.rstrip("/"), username), None)
+
+    def sessions(self) -> List[SynologySession]:
+        """Return all pooled sessions."""
+        with self._lock:
+            return list(self._sessions.values())
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Summarize pooled sessions (never includes the SID)."""
+        return [
+            {
+                "base_url": s.base_url,
+                "username": s.username,
+                "authenticated": bool(s.sid),
+                "dsm_version": s.dsm_version,
+                "logins": s.logins,
+                "borrowers": s.borrowers,
+                "idle_seconds": round(time.monotonic() - s.last_used, 1) if s.last_used else None,
+            }
+            for s in self.sessions()
+        ]
+
+    async def close_all(self) -> None:
+        """Close the HTTP clients of every session and empty the pool.
+
+        Sessions are not logged out; DSM expires them on its own.
+        """
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            await session.aclose()
+
+
+_pool = SynologySessionPool()
+
+
+def get_session_pool() -> SynologySessionPool:
+    """Return the process-wide Synology session pool."""
+    return _pool
+
+
+# -------------------------------------------------------------------------
+# API info persistence
+# -------------------------------------------------------------------------
+
+def api_info_fact_key(base_url: str, dsm_version: str) -> str:
+    """Build the Fact key for an API info map of one NAS and DSM version."""
+    host = urlparse(base_url).netloc or base_url
+    return f"{API_INFO_FACT_PREFIX}.{host}.{dsm_version}"
+
+
+@sync_to_async
+def _load_fact(key: str) -> Optional[Dict[str, Any]]:
+    from mcp_tools_core.models import Fact
+
+    fact = Fact.objects.filter(key=key).first()
+    return fact.value if fact else None
+
+
+@sync_to_async
+def _save_fact(key: str, value: Dict[str, Any]) -> None:
+    from mcp_tools_core.models import Fact
+
+    Fact.objects.update_or_create(
+        key=key,
+        defaults={"value": value, "source": "synology_client"},
+    )
+
+
+async def load_api_info(base_url: str, dsm_version: str) -> Optional[Dict[str, Dict[str, Any]]]:
+    """Load a persisted API info map, or None if unknown or unavailable."""
+    if not dsm_version:
+        return None
+    try:
+        return await _load_fact(api_info_fact_key(base_url, dsm_version))
+    except Exception as e:
+        # Outside Django (or before migrations) the map is simply re-queried
+        logger.debug(f"Could not load persisted Synology API info: {e}")
+        return None
+
+
+async def save_api_info(base_url: str, dsm_version: str, api_info: Dict[str, Dict[str, Any]]) -> None:
+    """Persist an API info map for a NAS and DSM version (best effort)."""
+    if not dsm_version or not api_info:
+        return
+    try:
+        await _save_fact(api_info_fact_key(base_url, dsm_version), api_info)
+    except Exception as e:
+        logger.debug(f"Could not persist Synology API info: {e}")
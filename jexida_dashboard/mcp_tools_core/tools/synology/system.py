@@ -93,6 +93,31 @@ class SynologyGetNetworkInfoOutput(BaseModel):
     error: str = Field(default="", description="Error message if failed")
 
 
+class SynologyGetSystemOverviewInput(BaseModel):
+    """Input schema for synology_get_system_overview tool."""
+    pass  # No parameters needed
+
+
+class SynologyGetSystemOverviewOutput(BaseModel):
+    """Output schema for synology_get_system_overview tool."""
+    success: bool = Field(description="Whether the operation succeeded")
+    info: Optional[SystemInfoOutput] = Field(
+        default=None,
+        description="System information"
+    )
+    volumes: List[StorageVolumeOutput] = Field(
+        default_factory=list,
+        description="List of storage volumes"
+    )
+    hostname: str = Field(default="", description="NAS hostname")
+    dns_name: str = Field(default="", description="DNS name")
+    partial_errors: Dict[str, str] = Field(
+        default_factory=dict,
+        description="Sections that could not be fetched, with their errors"
+    )
+    error: str = Field(default="", description="Error message if failed")
+
+
 # -----------------------------------------------------------------------------
 # Helper Functions
 # -----------------------------------------------------------------------------
@@ -242,3 +267,51 @@ async def synology_get_network_info(params: SynologyGetNetworkInfoInput) -> Syno
         invocation_logger.failure(f"Unexpected error: {e}")
         return SynologyGetNetworkInfoOutput(success=False, error=f"Unexpected error: {e}")
 
+
+@tool(
+    name="synology_get_system_overview",
+    description="Get system info, utilization, storage volumes and network info from Synology NAS in a single batched request",
+    input_schema=SynologyGetSystemOverviewInput,
+    output_schema=SynologyGetSystemOverviewOutput,
+    tags=["synology", "system", "monitoring", "storage"]
+)
+async def synology_get_system_overview(params: SynologyGetSystemOverviewInput) -> SynologyGetSystemOverviewOutput:
+    """Get a combined system, storage and network overview."""
+    invocation_logger = ToolInvocationLogger(logger)
+    invocation_logger.start("synology_get_system_overview")
+    
+    try:
+        async with SynologyClient() as client:
+            overview = await client.get_system_overview()
+            
+            info = overview["system"]
+            volumes = [_volume_to_output(v) for v in overview["volumes"]]
+            network = overview["network"]
+            errors = overview["errors"]
+            
+            if info is None and not volumes:
+                raise SynologyAPIError("; ".join(errors.values()) or "No data returned")
+            
+            invocation_logger.success(volume_count=len(volumes), partial_errors=len(errors))
+            
+            return SynologyGetSystemOverviewOutput(
+                success=True,
+                info=_system_info_to_output(info) if info else None,
+                volumes=volumes,
+                hostname=network.get("hostname", ""),
+                dns_name=network.get("dns", ""),
+                partial_errors=errors,
+            )
+            
+    except SynologyConnectionError as e:
+        invocation_logger.failure(str(e))
+        return SynologyGetSystemOverviewOutput(success=False, error=f"Connection error: {e}")
+    except SynologyAuthError as e:
+        invocation_logger.failure(str(e))
+        return SynologyGetSystemOverviewOutput(success=False, error=f"Authentication error: {e}")
+    except SynologyAPIError as e:
+        invocation_logger.failure(str(e))
+        return SynologyGetSystemOverviewOutput(success=False, error=f"API error: {e}")
+    except Exception as e:
+        invocation_logger.failure(f"Unexpected error: {e}")
+        return SynologyGetSystemOverviewOutput(success=False, error=f"Unexpected error: {e}")
@@ -0,0 +1,240 @@
+"""Synology FileStation transfer tools.
+
+Provides MCP tools for moving large files (e.g. multi-GB backups) between
+the host running the tool and the NAS. Transfers stream from/to disk in
+chunks, downloads resume from a .part file, and both directions can be
+verified against the NAS-side MD5.
+
+Local paths are relative to the transfer directory (synology_transfer_dir,
+default <data_dir>/transfers); paths that leave it are rejected.
+"""
+
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from pydantic import BaseModel, Field
+
+from config import get_settings
+from logging_config import get_logger, ToolInvocationLogger
+from tool_registry import tool
+
+from .client import (
+    SynologyClient,
+    SynologyConnectionError,
+    SynologyAuthError,
+    SynologyAPIError,
+)
+
+logger = get_logger(__name__)
+
+
+# -----------------------------------------------------------------------------
+# Input/Output Schemas
+# -----------------------------------------------------------------------------
+
+class SynologyUploadFileInput(BaseModel):
+    """Input schema for synology_upload_file tool."""
+    local_path: str = Field(description="File to upload, relative to the transfer directory on the host running the tool")
+    dest_folder: str = Field(description="Destination folder on the NAS (e.g., /backups/db)")
+    remote_name: Optional[str] = Field(
+        default=None,
+        description="File name on the NAS (defaults to the local file name)"
+    )
+    overwrite: bool = Field(default=False, description="Overwrite an existing file")
+    create_parents: bool = Field(default=True, description="Create missing parent folders")
+    verify: bool = Field(default=True, description="Verify the upload with the NAS-side MD5")
+
+
+class SynologyUploadFileOutput(BaseModel):
+    """Output schema for synology_upload_file tool."""
+    success: bool = Field(description="Whether the operation succeeded")
+    path: str = Field(default="", description="Path of the uploaded file on the NAS")
+    size: int = Field(default=0, description="Bytes uploaded")
+    md5: str = Field(default="", description="MD5 of the uploaded data")
+    verified: Optional[bool] = Field(default=None, description="Whether the NAS-side MD5 matched")
+    duration_seconds: float = Field(default=0.0, description="Transfer duration")
+    mb_per_second: float = Field(default=0.0, description="Average throughput in MB/s")
+    error: str = Field(default="", description="Error message if failed")
+
+
+class SynologyDownloadFileInput(BaseModel):
+    """Input schema for synology_download_file tool."""
+    path: str = Field(description="File on the NAS to download")
+    local_path: str = Field(description="Destination file, relative to the transfer directory on the host running the tool")
+    resume: bool = Field(default=True, description="Resume from an existing <local_path>.part file")
+    verify: bool = Field(default=True, description="Verify the download with the NAS-side MD5")
+
+
+class SynologyDownloadFileOutput(BaseModel):
+    """Output schema for synology_download_file tool."""
+    success: bool = Field(description="Whether the operation succeeded")
+    local_path: str = Field(default="", description="Where the file was written")
+    size: int = Field(default=0, description="Size of the downloaded file in bytes")
+    resumed_from: int = Field(default=0, description="Byte offset the download resumed from")
+    md5: str = Field(default="", description="MD5 of the downloaded file")
+    verified: Optional[bool] = Field(default=None, description="Whether the NAS-side MD5 matched")
+    duration_seconds: float = Field(default=0.0, description="Transfer duration")
+    mb_per_second: float = Field(default=0.0, description="Average throughput in MB/s")
+    error: str = Field(default="", description="Error message if failed")
+
+
+# -----------------------------------------------------------------------------
+# Helper Functions
+# -----------------------------------------------------------------------------
+
+def transfer_root() -> Path:
+    """Transfer directory from settings (synology_transfer_dir or <data_dir>/transfers)."""
+    settings = get_settings()
+    return Path(settings.synology_transfer_dir or Path(settings.data_dir) / "transfers").resolve()
+
+
+def resolve_transfer_path(local_path: str) -> Path:
+    """Resolve a tool-supplied local path inside the transfer directory.
+
+    Raises:
+        ValueError: If the path is absolute or resolves outside the directory
+    """
+    if not local_path or Path(local_path).is_absolute():
+        raise ValueError(f"Local path must be relative to the transfer directory: {local_path!r}")
+    root = transfer_root()
+    resolved = (root / local_path).resolve()
+    if resolved == root or root not in resolved.parents:
+        raise ValueError(f"Local path escapes the transfer directory: {local_path!r}")
+    return resolved
+
+
+def _progress_logger(label: str, step_percent: int = 10) -> Callable[[int, Optional[int]], None]:
+    """Build a progress callback that logs every step_percent."""
+    state = {"next": step_percent}
+
+    def report(done: int, total: Optional[int]) -> None:
+        if not total:
+            return
+        percent = done * 100 // total
+        if percent >= state["next"]:
+            logger.info(f"{label}: {percent}% ({done}/{total} bytes)")
+            state["next"] = (percent // step_percent + 1) * step_percent
+
+    return report
+
+
+def _throughput(size: int, seconds: float) -> float:
+    """Average MB/s for a transfer."""
+    return round(size / (1024 * 1024) / seconds, 2) if seconds > 0 else 0.0
+
+
+# -----------------------------------------------------------------------------
+# Tool Implementations
+# -----------------------------------------------------------------------------
+
+@tool(
+    name="synology_upload_file",
+    description="Upload a local file (e.g. a multi-GB backup) to Synology NAS, streamed in chunks with MD5 verification",
+    input_schema=SynologyUploadFileInput,
+    output_schema=SynologyUploadFileOutput,
+    tags=["synology", "filestation", "files", "transfer"]
+)
+async def synology_upload_file(params: SynologyUploadFileInput) -> SynologyUploadFileOutput:
+    """Upload a file to the NAS."""
+    invocation_logger = ToolInvocationLogger(logger)
+    invocation_logger.start("synology_upload_file", local_path=params.local_path, dest=params.dest_folder)
+
+    try:
+        local_path = resolve_transfer_path(params.local_path)
+        async with SynologyClient() as client:
+            started = time.monotonic()
+            result = await client.upload_file(
+                local_path=str(local_path),
+                dest_folder=params.dest_folder,
+                remote_name=params.remote_name,
+                overwrite=params.overwrite,
+                create_parents=params.create_parents,
+                progress=_progress_logger(f"Upload {params.local_path}"),
+                verify=params.verify,
+            )
+            duration = time.monotonic() - started
+
+            invocation_logger.success(size=result["size"], verified=result["verified"])
+
+            return SynologyUploadFileOutput(
+                success=True,
+                path=result["path"],
+                size=result["size"],
+                md5=result["md5"],
+                verified=result["verified"],
+                duration_seconds=round(duration, 3),
+                mb_per_second=_throughput(result["size"], duration),
+            )
+
+    except ValueError as e:
+        invocation_logger.failure(str(e))
+        return SynologyUploadFileOutput(success=False, error=str(e))
+    except SynologyConnectionError as e:
+        invocation_logger.failure(str(e))
+        return SynologyUploadFileOutput(success=False, error=f"Connection error: {e}")
+    except SynologyAuthError as e:
+        invocation_logger.failure(str(e))
+        return SynologyUploadFileOutput(success=False, error=f"Authentication error: {e}")
+    except SynologyAPIError as e:
+        invocation_logger.failure(str(e))
+        return SynologyUploadFileOutput(success=False, error=f"API error: {e}")
+    except Exception as e:
+        invocation_logger.failure(f"Unexpected error: {e}")
+        return SynologyUploadFileOutput(success=False, error=f"Unexpected error: {e}")
+
+
+@tool(
+    name="synology_download_file",
+    description="Download a file from Synology NAS to local disk, streamed in chunks, resumable, with MD5 verification",
+    input_schema=SynologyDownloadFileInput,
+    output_schema=SynologyDownloadFileOutput,
+    tags=["synology", "filestation", "files", "transfer"]
+)
+async def synology_download_file(params: SynologyDownloadFileInput) -> SynologyDownloadFileOutput:
+    """Download a file from the NAS."""
+    invocation_logger = ToolInvocationLogger(logger)
+    invocation_logger.start("synology_download_file", path=params.path, local_path=params.local_path)
+
+    try:
+        local_path = resolve_transfer_path(params.local_path)
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        async with SynologyClient() as client:
+            started = time.monotonic()
+            result = await client.download_file(
+                remote_path=params.path,
+                local_path=str(local_path),
+                resume=params.resume,
+                progress=_progress_logger(f"Download {params.path}"),
+                verify=params.verify,
+            )
+            duration = time.monotonic() - started
+
+            invocation_logger.success(size=result["size"], resumed_from=result["resumed_from"])
+
+            return SynologyDownloadFileOutput(
+                success=True,
+                local_path=result["path"],
+                size=result["size"],
+                resumed_from=result["resumed_from"],
+                md5=result["md5"],
+                verified=result["verified"],
+                duration_seconds=round(duration, 3),
+                mb_per_second=_throughput(result["size"] - result["resumed_from"], duration),
+            )
+
+    except ValueError as e:
+        invocation_logger.failure(str(e))
+        return SynologyDownloadFileOutput(success=False, error=str(e))
+    except SynologyConnectionError as e:
+        invocation_logger.failure(str(e))
+        return SynologyDownloadFileOutput(success=False, error=f"Connection error: {e}")
+    except SynologyAuthError as e:
+        invocation_logger.failure(str(e))
+        return SynologyDownloadFileOutput(success=False, error=f"Authentication error: {e}")
+    except SynologyAPIError as e:
+        invocation_logger.failure(str(e))
+        return SynologyDownloadFileOutput(success=False, error=f"API error: {e}")
+    except Exception as e:
+        invocation_logger.failure(f"Unexpected error: {e}")
+        return SynologyDownloadFileOutput(success=False, error=f"Unexpected error: {e}")
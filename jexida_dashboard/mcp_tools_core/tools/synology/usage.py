@@ -0,0 +1,432 @@
+"""Synology folder usage analytics.
+
+Answers "what is eating /volume1?" without paging through list_files:
+- A walker lists folders with bounded concurrency and folds every page
+  into per-folder byte/file/extension totals as it arrives, so only one
+  small record per folder is kept, never the file entries themselves
+- Folders below scan_depth, or beyond the max_folders listing budget, are
+  measured with a SYNO.FileStation.DirSize task on the NAS instead
+- Per-folder results are cached by folder mtime; an unchanged folder is
+  not re-listed on the next call (its subfolders are still checked)
+- Totals roll up per subtree and are returned as a top-N tree plus a
+  per-extension breakdown
+
+Like the file index, the cache relies on folder mtimes, which change when
+entries are added, removed or renamed but not when a file grows in place.
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from logging_config import get_logger, ToolInvocationLogger
+from tool_registry import tool
+
+from .client import (
+    SynologyClient,
+    SynologyConnectionError,
+    SynologyAuthError,
+    SynologyAPIError,
+)
+from .file_index import GETINFO_BATCH_SIZE, _extension
+
+logger = get_logger(__name__)
+
+
+CACHE_MAX_FOLDERS = 50_000
+UNSCANNED_EXTENSION = "(unscanned)"
+
+
+# -------------------------------------------------------------------------
+# Per-folder cache
+# -------------------------------------------------------------------------
+
+@dataclass
+class FolderStats:
+    """Direct (non-recursive) contents of one listed folder."""
+    mtime: int
+    bytes: int
+    files: int
+    extensions: Dict[str, Tuple[int, int]]  # ext -> (bytes, files)
+    subfolders: List[str]
+
+
+class FolderStatsCache:
+    """LRU cache of FolderStats keyed by NAS and folder path."""
+
+    def __init__(self, max_folders: int = CACHE_MAX_FOLDERS):
+        self.max_folders = max_folders
+        self._entries: "OrderedDict[Tuple[str, str], FolderStats]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, nas: str, path: str, mtime: int) -> Optional[FolderStats]:
+        """Cached stats if the folder's mtime is unchanged."""
+        with self._lock:
+            stats = self._entries.get((nas, path))
+            if stats is None or stats.mtime != mtime:
+                return None
+            self._entries.move_to_end((nas, path))
+            return stats
+
+    def put(self, nas: str, path: str, stats: FolderStats) -> None:
+        with self._lock:
+            self._entries[(nas, path)] = stats
+            self._entries.move_to_end((nas, path))
+            while len(self._entries) > self.max_folders:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_usage_cache = FolderStatsCache()
+
+
+def get_usage_cache() -> FolderStatsCache:
+    """Get the process-wide folder usage cache."""
+    return _usage_cache
+
+
+# -------------------------------------------------------------------------
+# Walker
+# -------------------------------------------------------------------------
+
+@dataclass
+class UsageNode:
+    """One folder in a usage walk."""
+    path: str
+    depth: int
+    source: str = "listed"  # listed, cached, dirsize, error
+    own_bytes: int = 0
+    own_files: int = 0
+    nested_folders: int = 0  # Reported by DirSize for unlisted subtrees
+    children: List[str] = field(default_factory=list)
+    total_bytes: int = 0
+    total_files: int = 0
+    total_folders: int = 0
+
+
+async def walk_usage(
+    client: SynologyClient,
+    root: str,
+    scan_depth: int = 12,
+    max_folders: int = 5000,
+    concurrency: int = 8,
+    cache: Optional[FolderStatsCache] = None,
+) -> Dict[str, Any]:
+    """Measure a folder tree with bounded concurrency.
+
+    Args:
+        client: Connected SynologyClient
+        root: Folder to measure
+        scan_depth: Folders this many levels below root are measured with
+            a DirSize task instead of being listed
+        max_folders: Listing budget; once spent, remaining folders are
+            measured with DirSize tasks
+        concurrency: Folders processed in parallel
+        cache: Per-folder cache (None disables caching)
+
+    Returns:
+        Dictionary with nodes (path -> UsageNode, totals rolled up),
+        extensions (ext -> [bytes, files]) and walk statistics
+    """
+    root = root.rstrip("/") or "/"
+    root_info = await client.get_files_info([root])
+    if not root_info or not root_info[0].is_dir:
+        raise SynologyAPIError(f"Folder not found: {root}")
+
+    nodes: Dict[str, UsageNode] = {}
+    extensions: Dict[str, List[int]] = {}
+    stats = {"folders_listed": 0, "folders_cached": 0, "dirsize_tasks": 0, "errors": 0}
+    listings_started = 0
+    queue: asyncio.Queue = asyncio.Queue()
+    queue.put_nowait((root, root_info[0].modify_time, 0))
+
+    def add_extension(ext: str, size: int, count: int) -> None:
+        totals = extensions.setdefault(ext, [0, 0])
+        totals[0] += size
+        totals[1] += count
+
+    def enqueue(node: UsageNode, subfolders: List[Tuple[str, int]]) -> None:
+        for path, mtime in subfolders:
+            node.children.append(path)
+            queue.put_nowait((path, mtime, node.depth + 1))
+
+    async def current_subfolders(paths: List[str]) -> Optional[List[Tuple[str, int]]]:
+        """Current mtimes of known subfolders, or None if one vanished."""
+        found = []
+        for start in range(0, len(paths), GETINFO_BATCH_SIZE):
+            chunk = paths[start:start + GETINFO_BATCH_SIZE]
+            infos = await client.get_files_info(chunk)
+            if len(infos) != len(chunk):
+                return None
+            found.extend((info.path, info.modify_time) for info in infos)
+        return found
+
+    async def measure(node: UsageNode) -> None:
+        result = await client.get_dir_size([node.path])
+        node.source = "dirsize"
+        node.own_bytes = result["total_size"]
+        node.own_files = result["num_file"]
+        node.nested_folders = result["num_dir"]
+        add_extension(UNSCANNED_EXTENSION, node.own_bytes, node.own_files)
+        stats["dirsize_tasks"] += 1
+
+    async def process(path: str, mtime: int, depth: int) -> None:
+        nonlocal listings_started
+        node = nodes[path] = UsageNode(path=path, depth=depth)
+
+        if depth >= scan_depth or listings_started >= max_folders:
+            await measure(node)
+            return
+
+        cached = cache.get(client.base_url, path, mtime) if cache and mtime else None
+        if cached:
+            subfolders = await current_subfolders(cached.subfolders)
+            if subfolders is not None:
+                node.source = "cached"
+                node.own_bytes, node.own_files = cached.bytes, cached.files
+                for ext, (size, count) in cached.extensions.items():
+                    add_extension(ext, size, count)
+                enqueue(node, subfolders)
+                stats["folders_cached"] += 1
+                return
+
+        listings_started += 1
+        own_extensions: Dict[str, List[int]] = {}
+        subfolders = []
+        async for item in client.iter_files(path):
+            if item.is_dir:
+                subfolders.append((item.path, item.modify_time))
+                continue
+            node.own_bytes += item.size or 0
+            node.own_files += 1
+            totals = own_extensions.setdefault(_extension(item.name), [0, 0])
+            totals[0] += item.size or 0
+            totals[1] += 1
+
+        for ext, (size, count) in own_extensions.items():
+            add_extension(ext, size, count)
+        if cache is not None and mtime:
+            cache.put(client.base_url, path, FolderStats(
+                mtime=mtime,
+                bytes=node.own_bytes,
+                files=node.own_files,
+                extensions={ext: (size, count) for ext, (size, count) in own_extensions.items()},
+                subfolders=[p for p, _ in subfolders],
+            ))
+        enqueue(node, subfolders)
+        stats["folders_listed"] += 1
+
+    async def worker() -> None:
+        while True:
+            path, mtime, depth = await queue.get()
+            try:
+                await process(path, mtime, depth)
+            except Exception as e:
+                stats["errors"] += 1
+                nodes[path].source = "error"
+                logger.warning(f"Folder usage walk failed for {path}: {e}")
+            finally:
+                queue.task_done()
+
+    workers = [asyncio.create_task(worker()) for _ in range(max(1, concurrency))]
+    try:
+        await queue.join()
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    _roll_up(nodes)
+    return {"root": root, "nodes": nodes, "extensions": extensions, **stats}
+
+
+def _roll_up(nodes: Dict[str, UsageNode]) -> None:
+    """Fill subtree totals, deepest folders first."""
+    for node in sorted(nodes.values(), key=lambda n: n.depth, reverse=True):
+        node.total_bytes += node.own_bytes
+        node.total_files += node.own_files
+        node.total_folders += node.nested_folders + len(node.children)
+        parent = nodes.get(node.path.rsplit("/", 1)[0] or "/")
+        if parent is not None and parent is not node:
+            parent.total_bytes += node.total_bytes
+            parent.total_files += node.total_files
+            parent.total_folders += node.total_folders
+
+
+def build_usage_tree(
+    nodes: Dict[str, UsageNode],
+    path: str,
+    depth: int,
+    top_n: int,
+) -> Dict[str, Any]:
+    """Top-N subtree of a rolled-up walk as nested dictionaries."""
+    node = nodes[path]
+    children = sorted(
+        (nodes[c] for c in node.children if c in nodes),
+        key=lambda n: n.total_bytes,
+        reverse=True,
+    )
+    shown = children[:top_n] if depth > 0 else []
+    return {
+        "path": node.path,
+        "name": node.path.rsplit("/", 1)[-1] or "/",
+        "bytes": node.total_bytes,
+        "files": node.total_files,
+        "folders": node.total_folders,
+        "own_bytes": node.own_bytes,
+        "source": node.source,
+        "other_bytes": sum(c.total_bytes for c in children[len(shown):]),
+        "children": [build_usage_tree(nodes, c.path, depth - 1, top_n) for c in shown],
+    }
+
+
+# -----------------------------------------------------------------------------
+# Input/Output Schemas
+# -----------------------------------------------------------------------------
+
+class FolderUsageNode(BaseModel):
+    """Usage of one folder subtree."""
+    path: str = Field(description="Folder path")
+    name: str = Field(description="Folder name")
+    bytes: int = Field(description="Total bytes in the subtree")
+    files: int = Field(description="Total files in the subtree")
+    folders: int = Field(description="Total folders in the subtree")
+    own_bytes: int = Field(description="Bytes in files directly in this folder")
+    source: str = Field(description="How it was measured: listed, cached, dirsize or error")
+    other_bytes: int = Field(description="Bytes in subfolders not shown in children")
+    children: List["FolderUsageNode"] = Field(
+        default_factory=list,
+        description="Largest subfolders, largest first"
+    )
+
+
+class ExtensionUsage(BaseModel):
+    """Usage by file extension."""
+    extension: str = Field(description="Lower-case extension ('' for none, '(unscanned)' for DirSize totals)")
+    bytes: int = Field(description="Total bytes")
+    files: int = Field(description="Number of files")
+    percent: float = Field(description="Share of total bytes")
+
+
+class SynologyFolderUsageInput(BaseModel):
+    """Input schema for synology_folder_usage tool."""
+    path: str = Field(description="Folder to analyse (e.g., /volume1/media or /media)")
+    top_n: int = Field(default=10, ge=1, le=100, description="Subfolders and extensions to return per level")
+    tree_depth: int = Field(default=2, ge=0, le=10, description="Levels of the returned tree")
+    scan_depth: int = Field(
+        default=12,
+        ge=1,
+        description="Below this depth subtrees are measured with a NAS-side DirSize task"
+    )
+    max_folders: int = Field(
+        default=5000,
+        ge=1,
+        description="Folders to list before switching to DirSize tasks for the rest"
+    )
+    concurrency: int = Field(default=8, ge=1, le=32, description="Folders processed in parallel")
+    use_cache: bool = Field(default=True, description="Reuse results of folders whose mtime is unchanged")
+
+
+class SynologyFolderUsageOutput(BaseModel):
+    """Output schema for synology_folder_usage tool."""
+    success: bool = Field(description="Whether the operation succeeded")
+    total_bytes: int = Field(default=0, description="Total bytes under the folder")
+    total_files: int = Field(default=0, description="Total files under the folder")
+    total_folders: int = Field(default=0, description="Total folders under the folder")
+    tree: Optional[FolderUsageNode] = Field(default=None, description="Top-N usage tree")
+    extensions: List[ExtensionUsage] = Field(
+        default_factory=list,
+        description="Largest extensions by bytes"
+    )
+    folders_listed: int = Field(default=0, description="Folders listed from the NAS")
+    folders_cached: int = Field(default=0, description="Folders answered from the cache")
+    dirsize_tasks: int = Field(default=0, description="Subtrees measured with DirSize tasks")
+    errors: int = Field(default=0, description="Folders that could not be measured")
+    duration_seconds: float = Field(default=0.0, description="Walk duration")
+    error: str = Field(default="", description="Error message if failed")
+
+
+# -----------------------------------------------------------------------------
+# Tool Implementations
+# -----------------------------------------------------------------------------
+
+@tool(
+    name="synology_folder_usage",
+    description="Recursive folder size analysis on Synology NAS: largest subfolders as a top-N tree and usage by file extension",
+    input_schema=SynologyFolderUsageInput,
+    output_schema=SynologyFolderUsageOutput,
+    tags=["synology", "filestation", "files", "storage"]
+)
+async def synology_folder_usage(params: SynologyFolderUsageInput) -> SynologyFolderUsageOutput:
+    """Measure a folder tree."""
+    invocation_logger = ToolInvocationLogger(logger)
+    invocation_logger.start("synology_folder_usage", path=params.path)
+
+    try:
+        async with SynologyClient() as client:
+            started = time.monotonic()
+            result = await walk_usage(
+                client,
+                params.path,
+                scan_depth=params.scan_depth,
+                max_folders=params.max_folders,
+                concurrency=params.concurrency,
+                cache=get_usage_cache() if params.use_cache else None,
+            )
+            duration = time.monotonic() - started
+
+        tree = build_usage_tree(result["nodes"], result["root"], params.tree_depth, params.top_n)
+        total = tree["bytes"]
+        extensions = sorted(result["extensions"].items(), key=lambda kv: kv[1][0], reverse=True)
+
+        invocation_logger.success(
+            total_bytes=total,
+            folders_listed=result["folders_listed"],
+            folders_cached=result["folders_cached"],
+        )
+
+        return SynologyFolderUsageOutput(
+            success=True,
+            total_bytes=total,
+            total_files=tree["files"],
+            total_folders=tree["folders"],
+            tree=FolderUsageNode(**tree),
+            extensions=[
+                ExtensionUsage(
+                    extension=ext,
+                    bytes=size,
+                    files=count,
+                    percent=round(size * 100 / total, 2) if total else 0.0,
+                )
+                for ext, (size, count) in extensions[:params.top_n]
+            ],
+            folders_listed=result["folders_listed"],
+            folders_cached=result["folders_cached"],
+            dirsize_tasks=result["dirsize_tasks"],
+            errors=result["errors"],
+            duration_seconds=round(duration, 3),
+        )
+
+    except SynologyConnectionError as e:
+        invocation_logger.failure(str(e))
+        return SynologyFolderUsageOutput(success=False, error=f"Connection error: {e}")
+    except SynologyAuthError as e:
+        invocation_logger.failure(str(e))
+        return SynologyFolderUsageOutput(success=False, error=f"Authentication error: {e}")
+    except SynologyAPIError as e:
+        invocation_logger.failure(str(e))
+        return SynologyFolderUsageOutput(success=False, error=f"API error: {e}")
+    except Exception as e:
+        invocation_logger.failure(f"Unexpected error: {e}")
+        return SynologyFolderUsageOutput(success=False, error=f"Unexpected error: {e}")
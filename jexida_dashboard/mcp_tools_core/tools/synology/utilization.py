@@ -0,0 +1,468 @@
+"""Synology resource utilization history.
+
+A background sampler (manage.py sample_synology_utilization) polls
+SYNO.Core.System.Utilization and records every metric (CPU load, memory,
+disk I/O, per-interface network rates) into fixed-size ring buffers:
+- raw: every sample (default 720, i.e. 2 hours at 10s)
+- minute: per-minute averages (default 2880, i.e. 48 hours)
+- hour: per-hour averages (default 2160, i.e. 90 days)
+
+Each ring is a pair of preallocated arrays, so memory use is fixed no
+matter how long the sampler runs. The sampler persists the buffers to a
+state file under DATA_DIR periodically; the query tools read that file
+and answer ranges, averages and percentiles without contacting the NAS.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from array import array
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel, Field
+
+from config import get_settings
+from logging_config import get_logger, ToolInvocationLogger
+from tool_registry import tool
+
+from .client import SynologyClient
+
+logger = get_logger(__name__)
+
+
+STATE_VERSION = 1
+TIERS = ("raw", "minute", "hour")
+TIER_SECONDS = {"raw": 0, "minute": 60, "hour": 3600}
+DEFAULT_CAPACITY = {"raw": 720, "minute": 2880, "hour": 2160}
+PERCENTILES = (50, 90, 95, 99)
+
+
+# -------------------------------------------------------------------------
+# Ring buffers
+# -------------------------------------------------------------------------
+
+class RingBuffer:
+    """Fixed-capacity (timestamp, value) series backed by two arrays."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._ts = array("d", [0.0]) * capacity
+        self._values = array("d", [0.0]) * capacity
+        self._head = 0  # Next write position
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, ts: float, value: float) -> None:
+        self._ts[self._head] = ts
+        self._values[self._head] = value
+        self._head = (self._head + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def __iter__(self) -> Iterator[Tuple[float, float]]:
+        """Points oldest first."""
+        start = (self._head - self._size) % self.capacity
+        for i in range(self._size):
+            j = (start + i) % self.capacity
+            yield self._ts[j], self._values[j]
+
+    def oldest(self) -> Optional[float]:
+        if not self._size:
+            return None
+        return self._ts[(self._head - self._size) % self.capacity]
+
+    def latest(self) -> Optional[Tuple[float, float]]:
+        if not self._size:
+            return None
+        j = (self._head - 1) % self.capacity
+        return self._ts[j], self._values[j]
+
+    def between(self, start: float, end: float) -> List[Tuple[float, float]]:
+        return [(ts, v) for ts, v in self if start <= ts <= end]
+
+
+class MetricSeries:
+    """Raw samples of one metric plus minute and hour averages."""
+
+    def __init__(self, capacity: Optional[Dict[str, int]] = None):
+        capacity = {**DEFAULT_CAPACITY, **(capacity or {})}
+        self.tiers = {tier: RingBuffer(capacity[tier]) for tier in TIERS}
+        # Open bucket per downsampled tier: [bucket_start, sum, count]
+        self.pending: Dict[str, List[float]] = {"minute": [0.0, 0.0, 0], "hour": [0.0, 0.0, 0]}
+
+    def record(self, ts: float, value: float) -> None:
+        self.tiers["raw"].append(ts, value)
+        self._accumulate("minute", ts, value)
+
+    def _accumulate(self, tier: str, ts: float, value: float) -> None:
+        bucket = ts - ts % TIER_SECONDS[tier]
+        pending = self.pending[tier]
+        if pending[2] and bucket != pending[0]:
+            average = pending[1] / pending[2]
+            self.tiers[tier].append(pending[0], average)
+            if tier == "minute":
+                self._accumulate("hour", pending[0], average)
+            pending[:] = [bucket, 0.0, 0]
+        if not pending[2]:
+            pending[0] = bucket
+        pending[1] += value
+        pending[2] += 1
+
+    def points(self, tier: str, start: float, end: float) -> List[Tuple[float, float]]:
+        """Points of a tier in [start, end], including its open bucket."""
+        points = self.tiers[tier].between(start, end)
+        pending = self.pending.get(tier)
+        if pending and pending[2] and start <= pending[0] <= end:
+            points.append((pending[0], pending[1] / pending[2]))
+        return points
+
+    def best_tier(self, start: float) -> str:
+        """Finest tier whose history reaches back to start."""
+        for tier in TIERS[:-1]:
+            oldest = self.tiers[tier].oldest()
+            if oldest is not None and oldest <= start:
+                return tier
+        # Fall back to the coarsest tier that has any data
+        for tier in reversed(TIERS):
+            if len(self.tiers[tier]) or (tier != "raw" and self.pending[tier][2]):
+                return tier
+        return "raw"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "tiers": {tier: [list(p) for p in ring] for tier, ring in self.tiers.items()},
+            "pending": self.pending,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], capacity: Optional[Dict[str, int]] = None) -> "MetricSeries":
+        series = cls(capacity)
+        for tier, points in data.get("tiers", {}).items():
+            if tier in series.tiers:
+                for ts, value in points:
+                    series.tiers[tier].append(ts, value)
+        for tier, pending in data.get("pending", {}).items():
+            if tier in series.pending:
+                series.pending[tier] = list(pending)
+        return series
+
+
+def summarize(values: List[float]) -> Dict[str, Optional[float]]:
+    """Min, max, average and percentiles of a list of values."""
+    if not values:
+        return {"count": 0, "min": None, "max": None, "avg": None,
+                **{f"p{p}": None for p in PERCENTILES}}
+
+    ordered = sorted(values)
+
+    def percentile(p: float) -> float:
+        # Linear interpolation between closest ranks
+        rank = (len(ordered) - 1) * p / 100
+        low, high = math.floor(rank), math.ceil(rank)
+        return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+    return {
+        "count": len(ordered),
+        "min": round(ordered[0], 3),
+        "max": round(ordered[-1], 3),
+        "avg": round(sum(ordered) / len(ordered), 3),
+        **{f"p{p}": round(percentile(p), 3) for p in PERCENTILES},
+    }
+
+
+# -------------------------------------------------------------------------
+# History store
+# -------------------------------------------------------------------------
+
+class UtilizationHistory:
+    """Ring-buffered history of every sampled metric, persisted to a file."""
+
+    def __init__(self, path: str, capacity: Optional[Dict[str, int]] = None):
+        self.path = path
+        self.capacity = capacity
+        self.series: Dict[str, MetricSeries] = {}
+        self.last_sample: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def record(self, ts: float, metrics: Dict[str, float]) -> None:
+        with self._lock:
+            for name, value in metrics.items():
+                series = self.series.get(name)
+                if series is None:
+                    series = self.series[name] = MetricSeries(self.capacity)
+                series.record(ts, float(value))
+            self.last_sample = ts
+
+    def match(self, patterns: List[str]) -> List[str]:
+        """Metric names matching any of the glob patterns."""
+        return sorted(n for n in self.series if any(fnmatch(n, p) for p in patterns))
+
+    def query(
+        self,
+        name: str,
+        start: float,
+        end: float,
+        resolution: str = "auto",
+    ) -> Tuple[str, List[Tuple[float, float]]]:
+        """Points of one metric in a time range at a resolution."""
+        series = self.series[name]
+        tier = series.best_tier(start) if resolution == "auto" else resolution
+        return tier, series.points(tier, start, end)
+
+    def save(self) -> None:
+        """Write the state file atomically."""
+        with self._lock:
+            state = {
+                "version": STATE_VERSION,
+                "saved_at": time.time(),
+                "last_sample": self.last_sample,
+                "metrics": {name: s.to_dict() for name, s in self.series.items()},
+            }
+        path = Path(self.path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(state, separators=(",", ":")))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str, capacity: Optional[Dict[str, int]] = None) -> "UtilizationHistory":
+        """Load a state file; a missing or unreadable file gives an empty history."""
+        history = cls(path, capacity)
+        try:
+            state = json.loads(Path(path).read_text())
+        except FileNotFoundError:
+            return history
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable utilization state {path}: {e}")
+            return history
+
+        if state.get("version") != STATE_VERSION:
+            logger.warning(f"Ignoring utilization state {path} with version {state.get('version')}")
+            return history
+        history.last_sample = state.get("last_sample")
+        for name, data in state.get("metrics", {}).items():
+            history.series[name] = MetricSeries.from_dict(data, capacity)
+        return history
+
+
+def default_state_path() -> str:
+    """State file from settings (synology_utilization_path or <data_dir>/synology_utilization.json)."""
+    settings = get_settings()
+    return settings.synology_utilization_path or str(Path(settings.data_dir) / "synology_utilization.json")
+
+
+# -------------------------------------------------------------------------
+# Sampler
+# -------------------------------------------------------------------------
+
+def flatten_usage(usage: Dict[str, Any]) -> Dict[str, float]:
+    """Turn get_resource_usage() output into flat metric names."""
+    cpu = usage.get("cpu", {})
+    memory = usage.get("memory", {})
+    disk = usage.get("disk", {})
+    metrics = {
+        "cpu.user_load": cpu.get("user_load", 0),
+        "cpu.system_load": cpu.get("system_load", 0),
+        "cpu.total_load": cpu.get("total_load", 0),
+        "memory.real_usage": memory.get("real_usage", 0),
+        "disk.utilization": disk.get("utilization", 0),
+        "disk.read_access": disk.get("read_access", 0),
+        "disk.write_access": disk.get("write_access", 0),
+        "disk.read_byte": disk.get("read_byte", 0),
+        "disk.write_byte": disk.get("write_byte", 0),
+    }
+    total_swap = memory.get("total_swap", 0)
+    if total_swap:
+        metrics["memory.swap_usage"] = round((total_swap - memory.get("avail_swap", 0)) * 100 / total_swap, 2)
+    for iface in usage.get("network", []):
+        device = iface.get("device")
+        if device:
+            metrics[f"network.{device}.rx"] = iface.get("rx", 0)
+            metrics[f"network.{device}.tx"] = iface.get("tx", 0)
+    return metrics
+
+
+async def sample_utilization(client: SynologyClient, history: UtilizationHistory) -> Dict[str, float]:
+    """Take one sample from the NAS into the history."""
+    metrics = flatten_usage(await client.get_resource_usage())
+    history.record(time.time(), metrics)
+    return metrics
+
+
+# -----------------------------------------------------------------------------
+# Input/Output Schemas
+# -----------------------------------------------------------------------------
+
+class UtilizationMetricInfo(BaseModel):
+    """One sampled metric."""
+    name: str = Field(description="Metric name (e.g., cpu.total_load, network.eth0.rx)")
+    latest_value: Optional[float] = Field(default=None, description="Most recent raw sample")
+    latest_time: Optional[float] = Field(default=None, description="Unix time of the most recent sample")
+    raw_points: int = Field(description="Raw samples held")
+    minute_points: int = Field(description="Minute averages held")
+    hour_points: int = Field(description="Hour averages held")
+    oldest_time: Optional[float] = Field(default=None, description="Unix time of the oldest retained point")
+
+
+class SynologyListUtilizationMetricsInput(BaseModel):
+    """Input schema for synology_list_utilization_metrics tool."""
+    pattern: str = Field(default="*", description="Glob filter on metric names (e.g., network.*)")
+
+
+class SynologyListUtilizationMetricsOutput(BaseModel):
+    """Output schema for synology_list_utilization_metrics tool."""
+    success: bool = Field(description="Whether the operation succeeded")
+    metrics: List[UtilizationMetricInfo] = Field(default_factory=list, description="Sampled metrics")
+    last_sample: Optional[float] = Field(default=None, description="Unix time of the last sample")
+    error: str = Field(default="", description="Error message if failed")
+
+
+class UtilizationSeries(BaseModel):
+    """History of one metric over the requested range."""
+    name: str = Field(description="Metric name")
+    resolution: str = Field(description="Tier used: raw, minute or hour")
+    stats: Dict[str, Optional[float]] = Field(description="count, min, max, avg, p50, p90, p95, p99")
+    points: List[List[float]] = Field(
+        default_factory=list,
+        description="[unix_time, value] pairs, oldest first (empty unless include_points)"
+    )
+
+
+class SynologyGetUtilizationHistoryInput(BaseModel):
+    """Input schema for synology_get_utilization_history tool."""
+    metrics: List[str] = Field(
+        default_factory=lambda: ["cpu.total_load", "memory.real_usage", "disk.utilization"],
+        description="Metric names or glob patterns (e.g., network.*.rx)"
+    )
+    minutes: int = Field(default=60, ge=1, description="Length of the range ending at end_time")
+    end_time: Optional[float] = Field(default=None, description="Unix end time (defaults to now)")
+    resolution: str = Field(default="auto", description="auto, raw, minute or hour")
+    include_points: bool = Field(default=True, description="Return the data points, not only statistics")
+    max_points: int = Field(default=500, ge=1, description="Maximum points returned per metric (evenly thinned)")
+
+
+class SynologyGetUtilizationHistoryOutput(BaseModel):
+    """Output schema for synology_get_utilization_history tool."""
+    success: bool = Field(description="Whether the operation succeeded")
+    start_time: float = Field(default=0.0, description="Unix start of the range")
+    end_time: float = Field(default=0.0, description="Unix end of the range")
+    series: List[UtilizationSeries] = Field(default_factory=list, description="One entry per metric")
+    last_sample: Optional[float] = Field(default=None, description="Unix time of the last sample")
+    error: str = Field(default="", description="Error message if failed")
+
+
+# -----------------------------------------------------------------------------
+# Tool Implementations
+# -----------------------------------------------------------------------------
+
+@tool(
+    name="synology_list_utilization_metrics",
+    description="List Synology utilization metrics recorded by the background sampler, with their latest values",
+    input_schema=SynologyListUtilizationMetricsInput,
+    output_schema=SynologyListUtilizationMetricsOutput,
+    tags=["synology", "monitoring", "utilization"]
+)
+async def synology_list_utilization_metrics(
+    params: SynologyListUtilizationMetricsInput,
+) -> SynologyListUtilizationMetricsOutput:
+    """List sampled metrics (no NAS access)."""
+    invocation_logger = ToolInvocationLogger(logger)
+    invocation_logger.start("synology_list_utilization_metrics", pattern=params.pattern)
+
+    try:
+        history = UtilizationHistory.load(default_state_path())
+        metrics = []
+        for name in history.match([params.pattern]):
+            series = history.series[name]
+            latest = series.tiers["raw"].latest()
+            oldest = [t for t in (r.oldest() for r in series.tiers.values()) if t is not None]
+            metrics.append(UtilizationMetricInfo(
+                name=name,
+                latest_value=latest[1] if latest else None,
+                latest_time=latest[0] if latest else None,
+                raw_points=len(series.tiers["raw"]),
+                minute_points=len(series.tiers["minute"]),
+                hour_points=len(series.tiers["hour"]),
+                oldest_time=min(oldest) if oldest else None,
+            ))
+
+        invocation_logger.success(metric_count=len(metrics))
+
+        return SynologyListUtilizationMetricsOutput(
+            success=True,
+            metrics=metrics,
+            last_sample=history.last_sample,
+        )
+
+    except Exception as e:
+        invocation_logger.failure(f"Unexpected error: {e}")
+        return SynologyListUtilizationMetricsOutput(success=False, error=f"Unexpected error: {e}")
+
+
+@tool(
+    name="synology_get_utilization_history",
+    description="Synology CPU, memory, disk and network utilization over a time range with averages and percentiles, from the local sampler history",
+    input_schema=SynologyGetUtilizationHistoryInput,
+    output_schema=SynologyGetUtilizationHistoryOutput,
+    tags=["synology", "monitoring", "utilization"]
+)
+async def synology_get_utilization_history(
+    params: SynologyGetUtilizationHistoryInput,
+) -> SynologyGetUtilizationHistoryOutput:
+    """Query utilization history (no NAS access)."""
+    invocation_logger = ToolInvocationLogger(logger)
+    invocation_logger.start("synology_get_utilization_history", metrics=params.metrics, minutes=params.minutes)
+
+    if params.resolution not in ("auto", *TIERS):
+        return SynologyGetUtilizationHistoryOutput(
+            success=False,
+            error=f"Invalid resolution '{params.resolution}'; use auto, raw, minute or hour",
+        )
+
+    try:
+        history = UtilizationHistory.load(default_state_path())
+        end = params.end_time or time.time()
+        start = end - params.minutes * 60
+        names = history.match(params.metrics)
+        if not names:
+            return SynologyGetUtilizationHistoryOutput(
+                success=False,
+                start_time=start,
+                end_time=end,
+                last_sample=history.last_sample,
+                error="No sampled metrics match; is sample_synology_utilization running?",
+            )
+
+        series = []
+        for name in names:
+            tier, points = history.query(name, start, end, params.resolution)
+            if params.include_points and len(points) > params.max_points:
+                step = len(points) / params.max_points
+                shown = [points[int(i * step)] for i in range(params.max_points)]
+            else:
+                shown = points if params.include_points else []
+            series.append(UtilizationSeries(
+                name=name,
+                resolution=tier,
+                stats=summarize([v for _, v in points]),
+                points=[[ts, round(v, 3)] for ts, v in shown],
+            ))
+
+        invocation_logger.success(series_count=len(series))
+
+        return SynologyGetUtilizationHistoryOutput(
+            success=True,
+            start_time=start,
+            end_time=end,
+            series=series,
+            last_sample=history.last_sample,
+        )
+
+    except Exception as e:
+        invocation_logger.failure(f"Unexpected error: {e}")
+        return SynologyGetUtilizationHistoryOutput(success=False, error=f"Unexpected error: {e}")
@@ -2,8 +2,9 @@
 
 Contains MCP tools for managing and hardening UniFi networks:
 - Controller tools: get_config, backup, restore
-- Device discovery: list_devices, network_scan, topology
+- Device discovery: list_devices, network_scan, scan_history, topology, topology_graph
 - Security: comprehensive audit, hardening, monitoring
+- Statistics: per-port/per-radio timeseries (port_stats)
 - Management: VLAN, WiFi, Firewall create/update
 - SSH tools: device diagnostics and adoption
 - Config management: export, diff, drift_monitor
@@ -26,11 +27,14 @@ from . import clients
 from . import security
 from . import changes
 from . import network_scan
+from . import scan_history
 from . import audit
 from . import hardening
 from . import controller
 from . import topology
+from . import topology_graph
 from . import monitoring
+from . import port_stats
 from . import vlan_mgmt
 from . import wifi_mgmt
 from . import firewall_mgmt
@@ -61,11 +65,14 @@ __all__ = [
     "security",
     "changes",
     "network_scan",
+    "scan_history",
     "audit",
     "hardening",
     "controller",
     "topology",
+    "topology_graph",
     "monitoring",
+    "port_stats",
     "vlan_mgmt",
     "wifi_mgmt",
     "firewall_mgmt",
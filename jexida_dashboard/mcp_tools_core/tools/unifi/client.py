@@ -308,6 +308,8 @@ class UniFiClient:
                 "uptime_seconds": client.get("uptime", 0),
                 "last_seen": client.get("last_seen", 0),
                 "ap_mac": client.get("ap_mac", ""),
+                "sw_mac": client.get("sw_mac", ""),
+                "sw_port": client.get("sw_port", 0),
             })
         
         return clients
@@ -773,6 +775,18 @@ class UniFiClient:
             return devices[0]
         return {}
     
+    async def get_device_stats(self) -> List[Dict[str, Any]]:
+        """Get raw stat/device records including port and radio counters.
+        
+        Unlike get_all_device_details(), this keeps the controller's
+        counters (rx/tx bytes, errors, vap_table, radio_table_stats) intact
+        for statistics collection.
+        
+        Returns:
+            Raw device records from stat/device
+        """
+        return await self._get("stat/device")
+    
     async def get_all_device_details(self) -> List[Dict[str, Any]]:
         """Get detailed information for all devices including port states.
         
@@ -849,14 +863,27 @@ class UniFiClient:
         
         return detailed_devices
     
-    async def get_lldp_table(self) -> List[Dict[str, Any]]:
+    async def get_lldp_table(
+        self,
+        devices: Optional[List[Dict[str, Any]]] = None,
+    ) -> List[Dict[str, Any]]:
         """Get LLDP neighbor information.
         
+        Args:
+            devices: Output of get_all_device_details() if the caller already
+                has it; avoids fetching stat/device a second time
+        
         Returns:
             List of LLDP neighbor entries
         """
         # LLDP info is embedded in device details
-        devices = await self.get_all_device_details()
+        if devices is None:
+            devices = await self.get_all_device_details()
+        return self.extract_lldp_entries(devices)
+    
+    @staticmethod
+    def extract_lldp_entries(devices: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Extract LLDP neighbor entries from get_all_device_details() output."""
         lldp_entries = []
         
         for device in devices:
@@ -866,6 +893,7 @@ class UniFiClient:
                     if entry.get("via", "") == "lldp":
                         lldp_entries.append({
                             "local_device": device.get("name", device.get("mac")),
+                            "local_mac": device.get("mac", ""),
                             "local_port": port.get("port_idx"),
                             "remote_mac": entry.get("mac", ""),
                             "remote_name": entry.get("name", ""),
@@ -1,7 +1,9 @@
 """Network scanning tool using nmap.
 
 Provides the network_scan_local tool for discovering devices and open ports
-on local network subnets.
+on local network subnets. Results are persisted per subnet (see
+scan_history) so later scans can be compared and, optionally, restricted
+to hosts that are new or changed.
 """
 
 import asyncio
@@ -16,6 +18,13 @@ from config import get_settings
 from logging_config import get_logger, ToolInvocationLogger
 from tool_registry import tool
 
+from .scan_history import (
+    hosts_in_subnet,
+    load_latest_snapshot,
+    save_scan,
+    select_hosts_to_rescan,
+)
+
 logger = get_logger(__name__)
 
 
@@ -104,6 +113,14 @@ class NetworkScanInput(BaseModel):
         default="top-100",
         description="Port specification: 'top-100', 'top-1000', 'common', or port range like '1-1024' or '22,80,443'"
     )
+    persist: bool = Field(
+        default=True,
+        description="Store results in the scan history for change detection"
+    )
+    only_changed: bool = Field(
+        default=False,
+        description="Run a fast host discovery first and only port-scan hosts that are new or changed since the last scan; stable hosts reuse their previous port results"
+    )
     
     @field_validator("subnets")
     @classmethod
@@ -159,6 +176,9 @@ class NetworkScanOutput(BaseModel):
     hosts_total: int = Field(default=0, description="Total hosts scanned")
     scan_duration_seconds: float = Field(default=0, description="Scan duration")
     command_executed: str = Field(default="", description="Nmap command that was run")
+    scan_ids: List[int] = Field(default_factory=list, description="Persisted scan IDs (one per subnet)")
+    hosts_port_scanned: int = Field(default=0, description="Hosts that were actually port-scanned")
+    hosts_carried_forward: int = Field(default=0, description="Stable hosts whose ports were reused from the previous scan")
     error: str = Field(default="", description="Error message if failed")
 
 
@@ -273,6 +293,116 @@ def parse_nmap_xml(xml_output: str) -> NetworkScanOutput:
     )
 
 
+def build_port_args(ports: Optional[str]) -> List[str]:
+    """Translate a validated port specification into nmap arguments."""
+    if ports:
+        ports_lower = ports.lower()
+        if ports_lower in PORT_PRESETS:
+            return PORT_PRESETS[ports_lower].split()
+        return ["-p", ports]
+    return ["--top-ports", "100"]
+
+
+async def run_nmap(cmd: List[str], timeout: int) -> str:
+    """Run an nmap command and return its XML stdout.
+    
+    Args:
+        cmd: Full nmap argument list (must include -oX -)
+        timeout: Timeout in seconds
+        
+    Returns:
+        Raw XML output
+        
+    Raises:
+        NmapError: If nmap times out or exits non-zero
+        FileNotFoundError: If the nmap binary is missing
+    """
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    
+    try:
+        stdout, stderr = await asyncio.wait_for(
+            process.communicate(),
+            timeout=timeout,
+        )
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.communicate()
+        raise NmapError(f"Scan timed out after {timeout} seconds")
+    
+    if process.returncode != 0:
+        stderr_str = stderr.decode("utf-8", errors="replace")
+        raise NmapError(f"nmap failed: {stderr_str}")
+    
+    return stdout.decode("utf-8", errors="replace")
+
+
+async def _plan_incremental_scan(
+    params: NetworkScanInput,
+    settings,
+) -> tuple:
+    """Discover live hosts and split them into rescan targets and stable hosts.
+    
+    Returns:
+        (targets, carried_hosts, discovery_command) where targets are IPs
+        that need a port scan and carried_hosts are HostInfo objects
+        rebuilt from the previous scan of their subnet.
+    """
+    cmd = [settings.nmap_path, "-oX", "-", "-sn", "-n", *params.subnets]
+    discovery = parse_nmap_xml(await run_nmap(cmd, settings.nmap_timeout))
+    
+    targets: List[str] = []
+    carried: List[HostInfo] = []
+    
+    for subnet in params.subnets:
+        previous = await load_latest_snapshot(subnet)
+        live = hosts_in_subnet(discovery.hosts, subnet)
+        rescan = set(select_hosts_to_rescan(previous, [(h.ip, h.mac) for h in live]))
+        
+        for host in live:
+            if host.ip in rescan or host.ip in targets:
+                if host.ip not in targets:
+                    targets.append(host.ip)
+                continue
+            before = previous[host.ip]
+            carried.append(HostInfo(
+                ip=host.ip,
+                mac=host.mac or before["mac"],
+                hostname=host.hostname or before["hostname"],
+                vendor=host.vendor or before["vendor"],
+                state="up",
+                ports=[
+                    PortInfo(
+                        port=port,
+                        protocol=protocol,
+                        state="open",
+                        service=info["service"],
+                        version=info["version"],
+                    )
+                    for (port, protocol), info in sorted(before["ports"].items())
+                ],
+            ))
+    
+    return targets, carried, " ".join(cmd)
+
+
+async def _persist_results(params: NetworkScanInput, result: NetworkScanOutput, carried_ips: List[str]) -> None:
+    """Store scan results per subnet and record the new scan IDs on the result."""
+    for subnet in params.subnets:
+        subnet_hosts = hosts_in_subnet(result.hosts, subnet)
+        scan_id = await save_scan(
+            subnet,
+            params.ports or "",
+            subnet_hosts,
+            incremental=params.only_changed,
+            carried_forward=[ip for ip in carried_ips if any(h.ip == ip for h in subnet_hosts)],
+        )
+        result.scan_ids.append(scan_id)
+
+
 @tool(
     name="network_scan_local",
     description="Run a local network scan using nmap to discover devices and open ports",
@@ -283,6 +413,10 @@ def parse_nmap_xml(xml_output: str) -> NetworkScanOutput:
 async def network_scan_local(params: NetworkScanInput) -> NetworkScanOutput:
     """Run a network scan using nmap.
     
+    With only_changed=True a ping sweep runs first and only hosts that are
+    new or whose MAC changed since the last persisted scan are port-scanned.
+    Stable hosts keep the ports recorded by the previous scan.
+    
     Args:
         params: Scan parameters including subnets and port specification
         
@@ -295,76 +429,53 @@ async def network_scan_local(params: NetworkScanInput) -> NetworkScanOutput:
         "network_scan_local",
         subnet_count=len(params.subnets),
         ports=params.ports,
+        only_changed=params.only_changed,
     )
     
+    command_str = ""
+    
     try:
-        # Build nmap command
-        cmd = [settings.nmap_path]
+        targets = list(params.subnets)
+        carried: List[HostInfo] = []
         
-        # Output as XML to stdout
-        cmd.extend(["-oX", "-"])
+        if params.only_changed:
+            targets, carried, command_str = await _plan_incremental_scan(params, settings)
+            logger.info(
+                f"Incremental scan: {len(targets)} hosts to scan, {len(carried)} stable hosts reused"
+            )
         
-        # Add port specification
-        if params.ports:
-            ports_lower = params.ports.lower()
-            if ports_lower in PORT_PRESETS:
-                cmd.extend(PORT_PRESETS[ports_lower].split())
-            else:
-                cmd.extend(["-p", params.ports])
+        if targets:
+            # Build nmap command: XML to stdout, ports, and reasonable scan options
+            cmd = [settings.nmap_path, "-oX", "-"]
+            cmd.extend(build_port_args(params.ports))
+            cmd.extend([
+                "-sV",           # Version detection
+                "--version-light",  # Light version detection (faster)
+                "-T4",           # Aggressive timing
+                "-n",            # No DNS resolution (faster)
+                "--open",        # Only show open ports
+            ])
+            cmd.extend(targets)
+            
+            command_str = " ".join(cmd)
+            logger.info(f"Running nmap scan: {command_str}")
+            
+            result = parse_nmap_xml(await run_nmap(cmd, settings.nmap_timeout))
         else:
-            cmd.extend(["--top-ports", "100"])
-        
-        # Add reasonable scan options
-        cmd.extend([
-            "-sV",           # Version detection
-            "--version-light",  # Light version detection (faster)
-            "-T4",           # Aggressive timing
-            "-n",            # No DNS resolution (faster)
-            "--open",        # Only show open ports
-        ])
+            result = NetworkScanOutput(success=True)
         
-        # Add subnets
-        cmd.extend(params.subnets)
-        
-        command_str = " ".join(cmd)
-        logger.info(f"Running nmap scan: {command_str}")
-        
-        # Execute nmap
-        process = await asyncio.create_subprocess_exec(
-            *cmd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-        
-        try:
-            stdout, stderr = await asyncio.wait_for(
-                process.communicate(),
-                timeout=settings.nmap_timeout,
-            )
-        except asyncio.TimeoutError:
-            process.kill()
-            await process.communicate()
-            invocation_logger.failure("Scan timed out")
-            return NetworkScanOutput(
-                success=False,
-                error=f"Scan timed out after {settings.nmap_timeout} seconds",
-                command_executed=command_str,
-            )
-        
-        stdout_str = stdout.decode("utf-8", errors="replace")
-        stderr_str = stderr.decode("utf-8", errors="replace")
+        result.command_executed = command_str
+        result.hosts_port_scanned = len(result.hosts)
         
-        if process.returncode != 0:
-            invocation_logger.failure(f"nmap exited with code {process.returncode}")
-            return NetworkScanOutput(
-                success=False,
-                error=f"nmap failed: {stderr_str}",
-                command_executed=command_str,
-            )
+        if carried:
+            scanned_ips = {h.ip for h in result.hosts}
+            carried = [h for h in carried if h.ip not in scanned_ips]
+            result.hosts.extend(carried)
+            result.hosts_carried_forward = len(carried)
+            result.hosts_up = len(result.hosts)
         
-        # Parse XML output
-        result = parse_nmap_xml(stdout_str)
-        result.command_executed = command_str
+        if params.persist:
+            await _persist_results(params, result, [h.ip for h in carried])
         
         invocation_logger.success(
             hosts_up=result.hosts_up,
@@ -385,6 +496,7 @@ async def network_scan_local(params: NetworkScanInput) -> NetworkScanOutput:
         return NetworkScanOutput(
             success=False,
             error=str(e),
+            command_executed=command_str,
         )
     except Exception as e:
         invocation_logger.failure(f"Unexpected error: {e}")
@@ -392,4 +504,3 @@ async def network_scan_local(params: NetworkScanInput) -> NetworkScanOutput:
             success=False,
             error=f"Unexpected error: {e}",
         )
-
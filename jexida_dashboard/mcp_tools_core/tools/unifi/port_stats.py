@@ -0,0 +1,455 @@
+"""UniFi per-port and per-radio statistics collector.
+
+Samples stat/device on an interval and stores compact rows per switch
+port and AP radio in the UniFiPortStat table:
+- Raw samples with counters and rates computed from counter deltas
+- Hourly rollups (average rates, peak PoE, average clients)
+
+Query tools answer range and top-N questions from the local table
+without contacting the controller:
+- unifi_port_stats_collect: Take one sample (and roll up finished hours)
+- unifi_port_stats_query: Time series for one port/radio
+- unifi_port_stats_top: Top-N ports/radios over a window
+"""
+
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import Any, Dict, List, Literal, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from pydantic import BaseModel, Field
+
+from .client import UniFiClient, UniFiConnectionError, UniFiAuthError, UniFiAPIError
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+SeriesKey = Tuple[str, str, int]  # (device_mac, kind, port_idx)
+
+# Last raw counters per series, so rates don't need a DB read every sample
+_last_samples: Dict[SeriesKey, Dict[str, Any]] = {}
+
+
+# -------------------------------------------------------------------------
+# Sample extraction and rate computation
+# -------------------------------------------------------------------------
+
+def extract_samples(raw_devices: List[Dict[str, Any]], ts: datetime) -> List[Dict[str, Any]]:
+    """Turn raw stat/device records into one sample row per port and radio.
+
+    Args:
+        raw_devices: Output of UniFiClient.get_device_stats()
+        ts: Sample timestamp
+
+    Returns:
+        Row dicts matching UniFiPortStat fields (without rates)
+    """
+    rows = []
+    for dev in raw_devices:
+        mac = (dev.get("mac") or "").lower()
+        if not mac:
+            continue
+
+        for port in dev.get("port_table", []) or []:
+            rows.append({
+                "device_mac": mac,
+                "kind": "port",
+                "port_idx": int(port.get("port_idx", 0)),
+                "name": (port.get("name") or "")[:100],
+                "ts": ts,
+                "rx_bytes": int(port.get("rx_bytes", 0) or 0),
+                "tx_bytes": int(port.get("tx_bytes", 0) or 0),
+                "rx_errors": int(port.get("rx_errors", 0) or 0),
+                "tx_errors": int(port.get("tx_errors", 0) or 0),
+                "poe_power": float(port.get("poe_power", 0) or 0),
+                "num_sta": len(port.get("mac_table", []) or []),
+            })
+
+        # Radio byte/error counters live on the VAPs; client counts on radio_table_stats
+        vap_totals: Dict[str, Dict[str, int]] = {}
+        for vap in dev.get("vap_table", []) or []:
+            band = vap.get("radio", "")
+            totals = vap_totals.setdefault(band, {"rx_bytes": 0, "tx_bytes": 0, "rx_errors": 0, "tx_errors": 0})
+            totals["rx_bytes"] += int(vap.get("rx_bytes", 0) or 0)
+            totals["tx_bytes"] += int(vap.get("tx_bytes", 0) or 0)
+            totals["rx_errors"] += int(vap.get("rx_errors", 0) or 0)
+            totals["tx_errors"] += int(vap.get("tx_errors", 0) or 0)
+
+        for idx, radio in enumerate(dev.get("radio_table_stats", []) or []):
+            band = radio.get("radio", "")
+            totals = vap_totals.get(band, {})
+            rows.append({
+                "device_mac": mac,
+                "kind": "radio",
+                "port_idx": idx,
+                "name": band[:100],
+                "ts": ts,
+                "rx_bytes": totals.get("rx_bytes", 0),
+                "tx_bytes": totals.get("tx_bytes", 0),
+                "rx_errors": totals.get("rx_errors", 0),
+                "tx_errors": totals.get("tx_errors", 0),
+                "poe_power": 0.0,
+                "num_sta": int(radio.get("num_sta", 0) or 0),
+            })
+
+    return rows
+
+
+def compute_rates(row: Dict[str, Any], previous: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Fill rx_rate/tx_rate/error_rate from the delta to the previous sample.
+
+    Rates are left as None for the first sample of a series and whenever a
+    counter went backwards (device reboot or counter wrap).
+    """
+    row = dict(row, rx_rate=None, tx_rate=None, error_rate=None)
+    if not previous:
+        return row
+
+    elapsed = (row["ts"] - previous["ts"]).total_seconds()
+    if elapsed <= 0:
+        return row
+
+    deltas = {
+        field: row[field] - previous[field]
+        for field in ("rx_bytes", "tx_bytes", "rx_errors", "tx_errors")
+    }
+    if any(delta < 0 for delta in deltas.values()):
+        return row
+
+    row["rx_rate"] = deltas["rx_bytes"] / elapsed
+    row["tx_rate"] = deltas["tx_bytes"] / elapsed
+    row["error_rate"] = (deltas["rx_errors"] + deltas["tx_errors"]) / elapsed
+    return row
+
+
+def rollup_rows(rows: List[Dict[str, Any]], bucket_start: datetime) -> Dict[str, Any]:
+    """Aggregate the raw rows of one series within one hour into a rollup row."""
+    def avg(field: str) -> Optional[float]:
+        values = [r[field] for r in rows if r[field] is not None]
+        return sum(values) / len(values) if values else None
+
+    last = max(rows, key=lambda r: r["ts"])
+    return {
+        "device_mac": last["device_mac"],
+        "kind": last["kind"],
+        "port_idx": last["port_idx"],
+        "name": last["name"],
+        "resolution": "hour",
+        "ts": bucket_start,
+        "rx_bytes": last["rx_bytes"],
+        "tx_bytes": last["tx_bytes"],
+        "rx_errors": last["rx_errors"],
+        "tx_errors": last["tx_errors"],
+        "poe_power": max(r["poe_power"] for r in rows),
+        "num_sta": round(sum(r["num_sta"] for r in rows) / len(rows)),
+        "rx_rate": avg("rx_rate"),
+        "tx_rate": avg("tx_rate"),
+        "error_rate": avg("error_rate"),
+    }
+
+
+def _hour_floor(ts: datetime) -> datetime:
+    return ts.replace(minute=0, second=0, microsecond=0)
+
+
+# -------------------------------------------------------------------------
+# Persistence
+# -------------------------------------------------------------------------
+
+SAMPLE_FIELDS = [
+    "device_mac", "kind", "port_idx", "name", "ts",
+    "rx_bytes", "tx_bytes", "rx_errors", "tx_errors",
+    "poe_power", "num_sta", "rx_rate", "tx_rate", "error_rate",
+]
+
+
+@sync_to_async
+def _store_samples(rows: List[Dict[str, Any]]) -> int:
+    from mcp_tools_core.models import UniFiPortStat
+
+    # Cold start: seed previous counters from the latest stored raw rows
+    missing = {(r["device_mac"], r["kind"], r["port_idx"]) for r in rows} - set(_last_samples)
+    if missing:
+        macs = {key[0] for key in missing}
+        since = rows[0]["ts"] - timedelta(hours=1) if rows else None
+        queryset = UniFiPortStat.objects.filter(
+            resolution=UniFiPortStat.RESOLUTION_RAW,
+            device_mac__in=macs,
+            ts__gte=since,
+        ).order_by("ts").values(*SAMPLE_FIELDS)
+        for prev in queryset:
+            key = (prev["device_mac"], prev["kind"], prev["port_idx"])
+            if key in missing:
+                _last_samples[key] = prev
+
+    objects = []
+    for row in rows:
+        key = (row["device_mac"], row["kind"], row["port_idx"])
+        row = compute_rates(row, _last_samples.get(key))
+        _last_samples[key] = row
+        objects.append(UniFiPortStat(resolution=UniFiPortStat.RESOLUTION_RAW, **row))
+
+    UniFiPortStat.objects.bulk_create(objects)
+    return len(objects)
+
+
+@sync_to_async
+def rollup_and_prune(now: datetime, raw_retention_hours: int = 48) -> Dict[str, int]:
+    """Roll finished hours of raw samples into hourly rows and prune old raw rows.
+
+    Args:
+        now: Current time; only hours ending before this are rolled up
+        raw_retention_hours: Raw samples older than this are deleted
+
+    Returns:
+        Counts of rollup rows created and raw rows deleted
+    """
+    from mcp_tools_core.models import UniFiPortStat
+
+    current_hour = _hour_floor(now)
+    last_rollup = (
+        UniFiPortStat.objects.filter(resolution=UniFiPortStat.RESOLUTION_HOUR)
+        .order_by("-ts").values_list("ts", flat=True).first()
+    )
+    start = last_rollup + timedelta(hours=1) if last_rollup else None
+
+    raw = UniFiPortStat.objects.filter(resolution=UniFiPortStat.RESOLUTION_RAW, ts__lt=current_hour)
+    if start is not None:
+        raw = raw.filter(ts__gte=start)
+
+    buckets: Dict[Tuple[SeriesKey, datetime], List[Dict[str, Any]]] = {}
+    for row in raw.values(*SAMPLE_FIELDS).iterator():
+        key = (row["device_mac"], row["kind"], row["port_idx"])
+        buckets.setdefault((key, _hour_floor(row["ts"])), []).append(row)
+
+    rollups = [
+        UniFiPortStat(**rollup_rows(rows, bucket))
+        for (_key, bucket), rows in buckets.items()
+    ]
+    UniFiPortStat.objects.bulk_create(rollups)
+
+    deleted, _ = UniFiPortStat.objects.filter(
+        resolution=UniFiPortStat.RESOLUTION_RAW,
+        ts__lt=now - timedelta(hours=raw_retention_hours),
+    ).delete()
+
+    return {"rollups_created": len(rollups), "raw_pruned": deleted}
+
+
+async def collect_port_stats(site: Optional[str] = None, raw_retention_hours: int = 48) -> Dict[str, Any]:
+    """Take one statistics sample from the controller and store it.
+
+    Args:
+        site: UniFi site ID (defaults to configured site)
+        raw_retention_hours: How long raw samples are kept before pruning
+
+    Returns:
+        Summary with sample, rollup and prune counts
+    """
+    async with UniFiClient(site=site) as client:
+        raw_devices = await client.get_device_stats()
+
+    now = datetime.now(dt_timezone.utc)
+    rows = extract_samples(raw_devices, now)
+    stored = await _store_samples(rows) if rows else 0
+    maintenance = await rollup_and_prune(now, raw_retention_hours)
+
+    logger.info(f"UniFi stats sample: {stored} rows from {len(raw_devices)} devices")
+    return {"samples_stored": stored, "devices": len(raw_devices), **maintenance}
+
+
+# -------------------------------------------------------------------------
+# unifi_port_stats_collect tool
+# -------------------------------------------------------------------------
+
+class UniFiPortStatsCollectInput(BaseModel):
+    """Input schema for unifi_port_stats_collect tool."""
+
+    site_id: Optional[str] = Field(
+        default=None,
+        description="UniFi site ID (defaults to configured site)"
+    )
+    raw_retention_hours: int = Field(
+        default=48,
+        description="Hours of raw samples to keep; older ones survive only as hourly rollups"
+    )
+
+
+class UniFiPortStatsCollectOutput(BaseModel):
+    """Output schema for unifi_port_stats_collect tool."""
+
+    success: bool = Field(description="Whether the sample was taken")
+    samples_stored: int = Field(default=0, description="Port/radio rows stored")
+    devices: int = Field(default=0, description="Devices sampled")
+    rollups_created: int = Field(default=0, description="Hourly rollup rows created")
+    raw_pruned: int = Field(default=0, description="Old raw rows deleted")
+    error: str = Field(default="", description="Error message if failed")
+
+
+async def unifi_port_stats_collect(params: UniFiPortStatsCollectInput) -> UniFiPortStatsCollectOutput:
+    """Take one per-port/per-radio statistics sample.
+
+    Normally driven by `manage.py collect_unifi_stats`; exposed as a tool
+    so samples can also be triggered on demand or from n8n.
+    """
+    logger.info("unifi_port_stats_collect called")
+
+    try:
+        summary = await collect_port_stats(params.site_id, params.raw_retention_hours)
+        return UniFiPortStatsCollectOutput(success=True, **summary)
+    except UniFiConnectionError as e:
+        logger.error(f"Connection error: {e}")
+        return UniFiPortStatsCollectOutput(success=False, error=f"Connection error: {e}")
+    except UniFiAuthError as e:
+        logger.error(f"Auth error: {e}")
+        return UniFiPortStatsCollectOutput(success=False, error=f"Authentication error: {e}")
+    except UniFiAPIError as e:
+        logger.error(f"API error: {e}")
+        return UniFiPortStatsCollectOutput(success=False, error=f"API error: {e}")
+    except Exception as e:
+        logger.error(f"Unexpected error: {e}")
+        return UniFiPortStatsCollectOutput(success=False, error=f"Unexpected error: {e}")
+
+
+# -------------------------------------------------------------------------
+# unifi_port_stats_query tool
+# -------------------------------------------------------------------------
+
+class UniFiPortStatsQueryInput(BaseModel):
+    """Input schema for unifi_port_stats_query tool."""
+
+    device_mac: str = Field(description="MAC address of the switch or AP")
+    port_idx: int = Field(description="Port index (switch) or radio index (AP)")
+    kind: Literal["port", "radio"] = Field(default="port", description="Port or radio series")
+    hours: int = Field(default=24, description="How many hours back to return")
+    resolution: Literal["auto", "raw", "hour"] = Field(
+        default="auto",
+        description="Sample tier; 'auto' uses raw for <= 24h and hourly rollups beyond"
+    )
+
+
+class UniFiPortStatsQueryOutput(BaseModel):
+    """Output schema for unifi_port_stats_query tool."""
+
+    success: bool = Field(description="Whether the query succeeded")
+    resolution: str = Field(default="", description="Tier the points came from")
+    points: List[Dict[str, Any]] = Field(default_factory=list, description="Samples oldest first")
+    count: int = Field(default=0, description="Number of points")
+    error: str = Field(default="", description="Error message if failed")
+
+
+async def unifi_port_stats_query(params: UniFiPortStatsQueryInput) -> UniFiPortStatsQueryOutput:
+    """Return the stored time series for one switch port or AP radio.
+
+    Answers from the local stats table only; the controller is not contacted.
+    """
+    logger.info(f"unifi_port_stats_query called: {params.device_mac} {params.kind} {params.port_idx}")
+
+    resolution = params.resolution
+    if resolution == "auto":
+        resolution = "raw" if params.hours <= 24 else "hour"
+
+    try:
+        from mcp_tools_core.models import UniFiPortStat
+
+        @sync_to_async
+        def load():
+            since = datetime.now(dt_timezone.utc) - timedelta(hours=params.hours)
+            rows = UniFiPortStat.objects.filter(
+                device_mac=params.device_mac.lower(),
+                kind=params.kind,
+                port_idx=params.port_idx,
+                resolution=resolution,
+                ts__gte=since,
+            ).order_by("ts").values(
+                "ts", "rx_rate", "tx_rate", "error_rate", "poe_power", "num_sta",
+                "rx_bytes", "tx_bytes", "rx_errors", "tx_errors",
+            )
+            return [dict(r, ts=r["ts"].isoformat()) for r in rows]
+
+        points = await load()
+        return UniFiPortStatsQueryOutput(
+            success=True,
+            resolution=resolution,
+            points=points,
+            count=len(points),
+        )
+    except Exception as e:
+        logger.error(f"Failed to query port stats: {e}")
+        return UniFiPortStatsQueryOutput(success=False, error=str(e))
+
+
+# -------------------------------------------------------------------------
+# unifi_port_stats_top tool
+# -------------------------------------------------------------------------
+
+TOP_METRICS = {
+    "throughput": None,  # rx_rate + tx_rate
+    "rx_rate": "rx_rate",
+    "tx_rate": "tx_rate",
+    "errors": "error_rate",
+    "poe_power": "poe_power",
+    "clients": "num_sta",
+}
+
+
+class UniFiPortStatsTopInput(BaseModel):
+    """Input schema for unifi_port_stats_top tool."""
+
+    metric: Literal["throughput", "rx_rate", "tx_rate", "errors", "poe_power", "clients"] = Field(
+        default="throughput",
+        description="Metric to rank by (averaged over the window)"
+    )
+    kind: Optional[Literal["port", "radio"]] = Field(
+        default=None,
+        description="Restrict to ports or radios (default both)"
+    )
+    hours: int = Field(default=1, description="Window size in hours")
+    limit: int = Field(default=10, description="Number of entries to return")
+
+
+class UniFiPortStatsTopOutput(BaseModel):
+    """Output schema for unifi_port_stats_top tool."""
+
+    success: bool = Field(description="Whether the query succeeded")
+    metric: str = Field(default="", description="Metric ranked by")
+    top: List[Dict[str, Any]] = Field(default_factory=list, description="Top ports/radios, highest first")
+    error: str = Field(default="", description="Error message if failed")
+
+
+async def unifi_port_stats_top(params: UniFiPortStatsTopInput) -> UniFiPortStatsTopOutput:
+    """Rank ports/radios by a metric averaged over a recent window.
+
+    Uses raw samples for windows up to 24 hours and hourly rollups beyond.
+    """
+    logger.info(f"unifi_port_stats_top called: metric={params.metric}, hours={params.hours}")
+
+    try:
+        from django.db.models import Avg, F, Max
+        from mcp_tools_core.models import UniFiPortStat
+
+        @sync_to_async
+        def load():
+            resolution = UniFiPortStat.RESOLUTION_RAW if params.hours <= 24 else UniFiPortStat.RESOLUTION_HOUR
+            since = datetime.now(dt_timezone.utc) - timedelta(hours=params.hours)
+            queryset = UniFiPortStat.objects.filter(resolution=resolution, ts__gte=since)
+            if params.kind:
+                queryset = queryset.filter(kind=params.kind)
+
+            field = TOP_METRICS[params.metric]
+            value = Avg(F("rx_rate") + F("tx_rate")) if field is None else (
+                Max(field) if field == "poe_power" else Avg(field)
+            )
+            rows = (
+                queryset.values("device_mac", "kind", "port_idx")
+                .annotate(value=value, name=Max("name"))
+                .exclude(value=None)
+                .order_by("-value")[:params.limit]
+            )
+            return list(rows)
+
+        top = await load()
+        return UniFiPortStatsTopOutput(success=True, metric=params.metric, top=top)
+    except Exception as e:
+        logger.error(f"Failed to rank port stats: {e}")
+        return UniFiPortStatsTopOutput(success=False, error=str(e))
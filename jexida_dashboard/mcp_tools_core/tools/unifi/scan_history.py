@@ -0,0 +1,370 @@
+"""Network scan history and change detection.
+
+Persists network_scan_local results in the NetworkScan / NetworkScanResult
+tables and provides the network_scan_changes tool, which reports what
+changed in a subnet since its previous scan:
+- New and disappeared hosts
+- Hosts whose MAC address changed
+- Newly opened and closed ports
+- Changed service banners
+"""
+
+import ipaddress
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+
+# A snapshot maps ip -> {"mac", "hostname", "vendor", "ports": {(port, protocol): {...}}}
+Snapshot = Dict[str, Dict[str, Any]]
+
+
+# -------------------------------------------------------------------------
+# Snapshot helpers
+# -------------------------------------------------------------------------
+
+def hosts_in_subnet(hosts: List[Any], subnet: str) -> List[Any]:
+    """Return the hosts (HostInfo-like objects) whose IP falls inside subnet."""
+    network = ipaddress.ip_network(subnet, strict=False)
+    selected = []
+    for host in hosts:
+        try:
+            if ipaddress.ip_address(host.ip) in network:
+                selected.append(host)
+        except ValueError:
+            continue
+    return selected
+
+
+def snapshot_from_hosts(hosts: List[Any]) -> Snapshot:
+    """Build a snapshot from HostInfo-like objects (as parsed from nmap)."""
+    snapshot: Snapshot = {}
+    for host in hosts:
+        snapshot[host.ip] = {
+            "mac": host.mac,
+            "hostname": host.hostname,
+            "vendor": host.vendor,
+            "ports": {
+                (p.port, p.protocol): {"service": p.service, "version": p.version}
+                for p in host.ports
+            },
+        }
+    return snapshot
+
+
+def diff_snapshots(previous: Snapshot, current: Snapshot) -> Dict[str, List[Dict[str, Any]]]:
+    """Compute host and port level changes between two snapshots.
+
+    Args:
+        previous: Snapshot of the earlier scan
+        current: Snapshot of the later scan
+
+    Returns:
+        Dict with new_hosts, disappeared_hosts, mac_changes, new_ports,
+        closed_ports and changed_services lists
+    """
+    changes: Dict[str, List[Dict[str, Any]]] = {
+        "new_hosts": [],
+        "disappeared_hosts": [],
+        "mac_changes": [],
+        "new_ports": [],
+        "closed_ports": [],
+        "changed_services": [],
+    }
+
+    for ip in sorted(set(current) - set(previous), key=_ip_sort_key):
+        host = current[ip]
+        changes["new_hosts"].append({
+            "ip": ip,
+            "mac": host["mac"],
+            "hostname": host["hostname"],
+            "vendor": host["vendor"],
+            "ports": [f"{port}/{proto}" for port, proto in sorted(host["ports"])],
+        })
+
+    for ip in sorted(set(previous) - set(current), key=_ip_sort_key):
+        host = previous[ip]
+        changes["disappeared_hosts"].append({
+            "ip": ip,
+            "mac": host["mac"],
+            "hostname": host["hostname"],
+        })
+
+    for ip in sorted(set(previous) & set(current), key=_ip_sort_key):
+        before = previous[ip]
+        after = current[ip]
+
+        if before["mac"] and after["mac"] and before["mac"].lower() != after["mac"].lower():
+            changes["mac_changes"].append({
+                "ip": ip,
+                "old_mac": before["mac"],
+                "new_mac": after["mac"],
+            })
+
+        for key in sorted(set(after["ports"]) - set(before["ports"])):
+            changes["new_ports"].append({
+                "ip": ip,
+                "port": key[0],
+                "protocol": key[1],
+                **after["ports"][key],
+            })
+
+        for key in sorted(set(before["ports"]) - set(after["ports"])):
+            changes["closed_ports"].append({
+                "ip": ip,
+                "port": key[0],
+                "protocol": key[1],
+                **before["ports"][key],
+            })
+
+        for key in sorted(set(before["ports"]) & set(after["ports"])):
+            old = before["ports"][key]
+            new = after["ports"][key]
+            if old["service"] != new["service"] or old["version"] != new["version"]:
+                changes["changed_services"].append({
+                    "ip": ip,
+                    "port": key[0],
+                    "protocol": key[1],
+                    "old_service": old["service"],
+                    "old_version": old["version"],
+                    "new_service": new["service"],
+                    "new_version": new["version"],
+                })
+
+    return changes
+
+
+def select_hosts_to_rescan(previous: Snapshot, discovered: List[Tuple[str, str]]) -> List[str]:
+    """Pick the hosts from a discovery sweep that need a full port scan.
+
+    A host needs rescanning when it was not present in the previous scan,
+    or when its MAC address changed (a different device took the IP).
+
+    Args:
+        previous: Snapshot of the previous scan of the subnet
+        discovered: (ip, mac) pairs found up by the discovery sweep
+
+    Returns:
+        IPs that should be port-scanned
+    """
+    targets = []
+    for ip, mac in discovered:
+        before = previous.get(ip)
+        if before is None:
+            targets.append(ip)
+        elif mac and before["mac"] and mac.lower() != before["mac"].lower():
+            targets.append(ip)
+    return targets
+
+
+def _ip_sort_key(ip: str) -> Tuple[int, Any]:
+    try:
+        return (0, ipaddress.ip_address(ip))
+    except ValueError:
+        return (1, ip)
+
+
+# -------------------------------------------------------------------------
+# Persistence
+# -------------------------------------------------------------------------
+
+def _snapshot_from_scan(scan) -> Snapshot:
+    """Load a snapshot from a NetworkScan row (sync, ORM)."""
+    snapshot: Snapshot = {}
+    for row in scan.results.all():
+        host = snapshot.setdefault(row.ip, {
+            "mac": row.mac,
+            "hostname": row.hostname,
+            "vendor": row.vendor,
+            "ports": {},
+        })
+        if row.port:
+            host["ports"][(row.port, row.protocol)] = {
+                "service": row.service,
+                "version": row.version,
+            }
+    return snapshot
+
+
+@sync_to_async
+def load_latest_snapshot(subnet: str) -> Snapshot:
+    """Return the snapshot of the most recent scan of a subnet (empty if none)."""
+    from mcp_tools_core.models import NetworkScan
+
+    scan = NetworkScan.objects.filter(subnet=subnet).order_by("-scanned_at", "-id").first()
+    if scan is None:
+        return {}
+    return _snapshot_from_scan(scan)
+
+
+@sync_to_async
+def save_scan(
+    subnet: str,
+    ports: str,
+    hosts: List[Any],
+    incremental: bool = False,
+    carried_forward: Optional[List[str]] = None,
+) -> int:
+    """Persist the hosts of one subnet as a new NetworkScan.
+
+    Args:
+        subnet: Scanned subnet
+        ports: Port specification used
+        hosts: HostInfo-like objects found in the subnet
+        incremental: Whether only changed hosts were port-scanned
+        carried_forward: IPs whose ports were copied from the previous scan
+
+    Returns:
+        The new NetworkScan id
+    """
+    from django.db import transaction
+    from django.utils import timezone
+    from mcp_tools_core.models import NetworkScan, NetworkScanResult
+
+    carried = set(carried_forward or [])
+    now = timezone.now()
+
+    with transaction.atomic():
+        scan = NetworkScan.objects.create(
+            subnet=subnet,
+            ports=ports or "",
+            incremental=incremental,
+            hosts_up=len(hosts),
+        )
+        rows = []
+        for host in hosts:
+            base = {
+                "scan": scan,
+                "ip": host.ip,
+                "mac": host.mac or "",
+                "hostname": (host.hostname or "")[:255],
+                "vendor": (host.vendor or "")[:255],
+                "carried_forward": host.ip in carried,
+                "seen_at": now,
+            }
+            if not host.ports:
+                rows.append(NetworkScanResult(**base))
+            for port in host.ports:
+                rows.append(NetworkScanResult(
+                    port=port.port,
+                    protocol=port.protocol,
+                    service=(port.service or "")[:100],
+                    version=(port.version or "")[:255],
+                    **base,
+                ))
+        NetworkScanResult.objects.bulk_create(rows)
+
+    return scan.id
+
+
+# -------------------------------------------------------------------------
+# network_scan_changes tool
+# -------------------------------------------------------------------------
+
+class NetworkScanChangesInput(BaseModel):
+    """Input schema for network_scan_changes tool."""
+
+    subnet: str = Field(
+        description="Subnet in CIDR notation, exactly as passed to network_scan_local"
+    )
+    base_scan_id: Optional[int] = Field(
+        default=None,
+        description="Scan to compare from (defaults to the scan before target_scan_id)"
+    )
+    target_scan_id: Optional[int] = Field(
+        default=None,
+        description="Scan to compare to (defaults to the latest scan of the subnet)"
+    )
+
+
+class NetworkScanChangesOutput(BaseModel):
+    """Output schema for network_scan_changes tool."""
+
+    success: bool = Field(description="Whether the comparison succeeded")
+    subnet: str = Field(default="", description="Subnet compared")
+    base_scan_id: Optional[int] = Field(default=None, description="Earlier scan ID")
+    base_scanned_at: str = Field(default="", description="When the earlier scan ran")
+    target_scan_id: Optional[int] = Field(default=None, description="Later scan ID")
+    target_scanned_at: str = Field(default="", description="When the later scan ran")
+    has_changes: bool = Field(default=False, description="True if anything changed")
+    new_hosts: List[Dict[str, Any]] = Field(default_factory=list, description="Hosts not seen in the earlier scan")
+    disappeared_hosts: List[Dict[str, Any]] = Field(default_factory=list, description="Hosts no longer up")
+    mac_changes: List[Dict[str, Any]] = Field(default_factory=list, description="IPs now answered by a different MAC")
+    new_ports: List[Dict[str, Any]] = Field(default_factory=list, description="Newly opened ports on known hosts")
+    closed_ports: List[Dict[str, Any]] = Field(default_factory=list, description="Ports no longer open on known hosts")
+    changed_services: List[Dict[str, Any]] = Field(default_factory=list, description="Ports whose service banner changed")
+    error: str = Field(default="", description="Error message if failed")
+
+
+async def network_scan_changes(params: NetworkScanChangesInput) -> NetworkScanChangesOutput:
+    """Report what changed in a subnet between two persisted scans.
+
+    By default compares the latest scan of the subnet with the one before
+    it. Runs entirely against the local scan history; no scan is started.
+
+    Args:
+        params: Subnet and optional scan IDs
+
+    Returns:
+        New/disappeared hosts, MAC changes, port and service changes
+    """
+    logger.info(f"network_scan_changes called: subnet={params.subnet}")
+
+    try:
+        from mcp_tools_core.models import NetworkScan
+
+        @sync_to_async
+        def load_pair():
+            scans = NetworkScan.objects.filter(subnet=params.subnet).order_by("-scanned_at", "-id")
+            if params.target_scan_id is not None:
+                target = scans.filter(id=params.target_scan_id).first()
+            else:
+                target = scans.first()
+            if target is None:
+                return None, None, {}, {}
+
+            if params.base_scan_id is not None:
+                base = scans.filter(id=params.base_scan_id).first()
+            else:
+                base = scans.filter(scanned_at__lte=target.scanned_at).exclude(id=target.id).first()
+
+            base_snapshot = _snapshot_from_scan(base) if base else {}
+            return base, target, base_snapshot, _snapshot_from_scan(target)
+
+        base, target, base_snapshot, target_snapshot = await load_pair()
+
+        if target is None:
+            return NetworkScanChangesOutput(
+                success=False,
+                subnet=params.subnet,
+                error=f"No persisted scans found for subnet {params.subnet}",
+            )
+        if base is None:
+            return NetworkScanChangesOutput(
+                success=False,
+                subnet=params.subnet,
+                target_scan_id=target.id,
+                target_scanned_at=target.scanned_at.isoformat(),
+                error="Only one scan of this subnet exists; nothing to compare against",
+            )
+
+        changes = diff_snapshots(base_snapshot, target_snapshot)
+
+        return NetworkScanChangesOutput(
+            success=True,
+            subnet=params.subnet,
+            base_scan_id=base.id,
+            base_scanned_at=base.scanned_at.isoformat(),
+            target_scan_id=target.id,
+            target_scanned_at=target.scanned_at.isoformat(),
+            has_changes=any(changes.values()),
+            **changes,
+        )
+
+    except Exception as e:
+        logger.error(f"Failed to compute scan changes: {e}")
+        return NetworkScanChangesOutput(success=False, subnet=params.subnet, error=str(e))
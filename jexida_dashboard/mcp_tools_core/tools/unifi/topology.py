@@ -10,6 +10,7 @@ from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
 
 from .client import UniFiClient, UniFiConnectionError, UniFiAuthError, UniFiAPIError
+from .topology_graph import cache_devices
 
 import logging
 logger = logging.getLogger(__name__)
@@ -76,6 +77,7 @@ class UniFiNetworkTopologyOutput(BaseModel):
     topology: Optional[NetworkTopology] = None
     device_count: int = Field(default=0, description="Number of devices")
     connection_count: int = Field(default=0, description="Number of connections")
+    graph_version: int = Field(default=0, description="Version of the cached topology graph after this refresh")
     error: str = Field(default="", description="Error message if failed")
 
 
@@ -104,6 +106,9 @@ async def unifi_network_topology(
             # Get detailed device information
             devices_data = await client.get_all_device_details()
             
+            # Keep the cached graph used by unifi_topology_query in sync
+            graph = cache_devices(client.site, devices_data)
+            
             # Build device topology objects
             devices = []
             device_macs = {}  # MAC -> device index mapping
@@ -201,6 +206,7 @@ async def unifi_network_topology(
                 topology=topology,
                 device_count=len(devices),
                 connection_count=len(connections),
+                graph_version=graph.version,
             )
             
     except UniFiConnectionError as e:
@@ -0,0 +1,579 @@
+"""Cached, incrementally updated UniFi topology graph.
+
+Maintains one TopologyGraph per site built from device uplinks and LLDP
+neighbours. The graph is computed once from a single stat/device fetch,
+cached with a version number, and refreshed incrementally: only devices
+whose uplink or LLDP neighbours changed have their edges rebuilt.
+
+Provides the unifi_topology_query tool for:
+- path: Device-to-device path through the uplink tree
+- blast_radius: Everything downstream of a switch/device
+- clients_behind_port: Clients learned on a given switch port
+- export: The whole graph as JSON or Graphviz DOT
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Dict, List, Literal, Optional, Set, Tuple
+
+from pydantic import BaseModel, Field
+
+from .client import UniFiClient, UniFiConnectionError, UniFiAuthError, UniFiAPIError
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+def _norm_mac(mac: Optional[str]) -> str:
+    return (mac or "").lower()
+
+
+class TopologyGraph:
+    """Adjacency-list graph of UniFi devices and their clients.
+
+    Nodes are device MACs. Edges are undirected and carry the port on each
+    side when known. The uplink tree (child -> parent) is kept separately
+    so downstream queries don't have to guess direction from LLDP.
+
+    Each device's own uplink/LLDP links are stored per source device, and
+    adjacency is resolved from them pair by pair (uplink preferred over
+    LLDP), so rebuilding one device's links never loses the other side's.
+    """
+
+    def __init__(self, site: str = "default"):
+        self.site = site
+        self.version = 0
+        self.built_at = 0.0
+        self.refreshed_at = 0.0
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self.adjacency: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self.parent: Dict[str, str] = {}
+        self.children: Dict[str, Set[str]] = {}
+        self.port_clients: Dict[Tuple[str, int], Set[str]] = {}
+        self.clients: Dict[str, Dict[str, Any]] = {}
+        # Per-device fingerprint of the data edges are derived from
+        self._edge_sources: Dict[str, Tuple[Any, ...]] = {}
+        # source mac -> neighbor -> link reported by that source
+        self._links: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+    # ------------------------------------------------------------------
+    # Building / incremental updates
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_devices(
+        cls,
+        devices: List[Dict[str, Any]],
+        clients: Optional[List[Dict[str, Any]]] = None,
+        site: str = "default",
+    ) -> "TopologyGraph":
+        """Build a graph from get_all_device_details() (and get_clients()) output."""
+        graph = cls(site=site)
+        graph.sync_devices(devices)
+        if clients is not None:
+            graph.sync_clients(clients)
+        graph.built_at = graph.refreshed_at
+        return graph
+
+    def sync_devices(self, devices: List[Dict[str, Any]]) -> bool:
+        """Apply a fresh device listing, rebuilding only what changed.
+
+        Args:
+            devices: Output of UniFiClient.get_all_device_details()
+
+        Returns:
+            True if the graph changed (and its version was bumped)
+        """
+        changed = False
+        seen = set()
+        added = []
+
+        for device in devices:
+            mac = _norm_mac(device.get("mac"))
+            if not mac:
+                continue
+            seen.add(mac)
+            node = {
+                "mac": mac,
+                "name": device.get("name", mac),
+                "model": device.get("model", ""),
+                "type": device.get("type", "other"),
+                "ip": device.get("ip", ""),
+            }
+            if self.nodes.get(mac) != node:
+                if mac not in self.nodes:
+                    added.append(mac)
+                self.nodes[mac] = node
+                self.adjacency.setdefault(mac, {})
+                changed = True
+
+        for mac in list(self.nodes):
+            if mac not in seen:
+                self._remove_device(mac)
+                changed = True
+
+        # Links other devices reported while this one was gone apply again
+        for mac in added:
+            self._restore_links_to(mac)
+
+        # Edges need every endpoint to exist first, so do them in a second pass
+        for device in devices:
+            mac = _norm_mac(device.get("mac"))
+            if mac and self._update_device_edges(mac, device):
+                changed = True
+
+        self.refreshed_at = time.time()
+        if changed:
+            self.version += 1
+        return changed
+
+    def update_device(self, device: Dict[str, Any]) -> bool:
+        """Incrementally apply a single device's new details (e.g. uplink change)."""
+        mac = _norm_mac(device.get("mac"))
+        if not mac:
+            return False
+        changed = mac not in self.nodes
+        if changed:
+            self.nodes[mac] = {
+                "mac": mac,
+                "name": device.get("name", mac),
+                "model": device.get("model", ""),
+                "type": device.get("type", "other"),
+                "ip": device.get("ip", ""),
+            }
+            self.adjacency.setdefault(mac, {})
+            self._restore_links_to(mac)
+        if self._update_device_edges(mac, device):
+            changed = True
+        if changed:
+            self.version += 1
+        return changed
+
+    def sync_clients(self, clients: List[Dict[str, Any]]) -> bool:
+        """Apply a fresh client listing (port attachment of wired clients, AP of wireless)."""
+        port_clients: Dict[Tuple[str, int], Set[str]] = {}
+        client_map: Dict[str, Dict[str, Any]] = {}
+
+        for client in clients:
+            mac = _norm_mac(client.get("mac"))
+            if not mac:
+                continue
+            attach_mac = _norm_mac(client.get("sw_mac") if client.get("is_wired") else client.get("ap_mac"))
+            port = int(client.get("sw_port") or 0) if client.get("is_wired") else 0
+            client_map[mac] = {
+                "mac": mac,
+                "name": client.get("name", mac),
+                "ip": client.get("ip", ""),
+                "is_wired": bool(client.get("is_wired")),
+                "attached_to": attach_mac,
+                "port": port,
+            }
+            if attach_mac:
+                port_clients.setdefault((attach_mac, port), set()).add(mac)
+
+        if client_map == self.clients:
+            return False
+        self.clients = client_map
+        self.port_clients = port_clients
+        self.version += 1
+        return True
+
+    def _update_device_edges(self, mac: str, device: Dict[str, Any]) -> bool:
+        uplink = device.get("uplink") or {}
+        uplink_mac = _norm_mac(uplink.get("uplink_mac"))
+        uplink_port = uplink.get("uplink_remote_port", 0)
+        lldp = tuple(sorted(
+            (port.get("port_idx", 0), _norm_mac(entry.get("mac")))
+            for port in device.get("ports", [])
+            for entry in port.get("mac_table", [])
+            if entry.get("via", "") == "lldp"
+        ))
+        source = (uplink_mac, uplink_port, lldp)
+        if self._edge_sources.get(mac) == source:
+            return False
+
+        self._drop_edges_from(mac)
+        self._edge_sources[mac] = source
+
+        if uplink_mac and uplink_mac != mac:
+            self.parent[mac] = uplink_mac
+            self.children.setdefault(uplink_mac, set()).add(mac)
+            self._add_edge(mac, uplink_mac, {
+                "type": "uplink",
+                "source": mac,
+                "remote_port": uplink_port,
+                "speed": uplink.get("speed", 0),
+            })
+
+        for port_idx, remote in lldp:
+            if remote and remote != mac:
+                self._add_edge(mac, remote, {
+                    "type": "lldp",
+                    "source": mac,
+                    "local_port": port_idx,
+                })
+
+        return True
+
+    def _add_edge(self, a: str, b: str, attrs: Dict[str, Any]) -> None:
+        """Record a link reported by device a and re-resolve the pair."""
+        links = self._links.setdefault(a, {})
+        existing = links.get(b)
+        # A device's uplink to b wins over its own LLDP entry for b
+        if existing and existing["type"] == "uplink" and attrs["type"] != "uplink":
+            return
+        links[b] = attrs
+        self._resolve_pair(a, b)
+
+    def _resolve_pair(self, a: str, b: str) -> None:
+        """Set the a-b adjacency from what either side reported, preferring uplinks."""
+        reported = [link for link in (self._links.get(a, {}).get(b), self._links.get(b, {}).get(a)) if link]
+        if not reported:
+            self.adjacency.get(a, {}).pop(b, None)
+            self.adjacency.get(b, {}).pop(a, None)
+            return
+        attrs = next((link for link in reported if link["type"] == "uplink"), reported[0])
+        self.adjacency.setdefault(a, {})[b] = attrs
+        self.adjacency.setdefault(b, {})[a] = attrs
+
+    def _restore_links_to(self, mac: str) -> None:
+        for source, links in self._links.items():
+            if mac in links:
+                self._resolve_pair(source, mac)
+
+    def _drop_edges_from(self, mac: str) -> None:
+        """Remove the links contributed by mac's own uplink/LLDP data."""
+        old_parent = self.parent.pop(mac, None)
+        if old_parent:
+            self.children.get(old_parent, set()).discard(mac)
+        for neighbor in self._links.pop(mac, {}):
+            self._resolve_pair(mac, neighbor)
+
+    def _remove_device(self, mac: str) -> None:
+        self._drop_edges_from(mac)
+        # Links other devices report to mac stay recorded until they change
+        for neighbor in list(self.adjacency.get(mac, {})):
+            self.adjacency.get(neighbor, {}).pop(mac, None)
+        for child in self.children.pop(mac, set()):
+            if self.parent.get(child) == mac:
+                self.parent.pop(child)
+        self.adjacency.pop(mac, None)
+        self.nodes.pop(mac, None)
+        self._edge_sources.pop(mac, None)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def resolve(self, ref: str) -> Optional[str]:
+        """Resolve a MAC, name or IP to a device MAC."""
+        ref_norm = _norm_mac(ref)
+        if ref_norm in self.nodes:
+            return ref_norm
+        for mac, node in self.nodes.items():
+            if ref == node["name"] or ref == node["ip"]:
+                return mac
+        return None
+
+    def path(self, src: str, dst: str) -> List[str]:
+        """Shortest path between two devices (BFS over adjacency). Empty if unreachable."""
+        if src not in self.nodes or dst not in self.nodes:
+            return []
+        previous: Dict[str, Optional[str]] = {src: None}
+        queue = deque([src])
+        while queue:
+            current = queue.popleft()
+            if current == dst:
+                break
+            for neighbor in self.adjacency.get(current, {}):
+                if neighbor not in previous:
+                    previous[neighbor] = current
+                    queue.append(neighbor)
+        if dst not in previous:
+            return []
+        hops = []
+        node: Optional[str] = dst
+        while node is not None:
+            hops.append(node)
+            node = previous[node]
+        return list(reversed(hops))
+
+    def downstream(self, mac: str) -> List[str]:
+        """All devices below mac in the uplink tree."""
+        result = []
+        queue = deque(self.children.get(mac, ()))
+        seen = {mac}
+        while queue:
+            child = queue.popleft()
+            if child in seen:
+                continue
+            seen.add(child)
+            result.append(child)
+            queue.extend(self.children.get(child, ()))
+        return result
+
+    def clients_of(self, macs: List[str]) -> List[str]:
+        """Clients attached (on any port/radio) to any of the given devices."""
+        wanted = set(macs)
+        return sorted(
+            client for (dev, _port), clients in self.port_clients.items()
+            if dev in wanted for client in clients
+        )
+
+    def blast_radius(self, mac: str) -> Dict[str, Any]:
+        """Devices and clients that lose connectivity if mac goes down."""
+        devices = self.downstream(mac)
+        return {
+            "device": mac,
+            "devices": devices,
+            "clients": self.clients_of([mac] + devices),
+        }
+
+    def clients_behind_port(self, mac: str, port_idx: int) -> List[str]:
+        """Clients on a switch port, including those behind downstream devices on it."""
+        result = set(self.port_clients.get((mac, port_idx), set()))
+        for child in self.children.get(mac, set()):
+            edge = self.adjacency.get(child, {}).get(mac, {})
+            if edge.get("type") == "uplink" and edge.get("remote_port") == port_idx:
+                below = [child] + self.downstream(child)
+                result.update(self.clients_of(below))
+        return sorted(result)
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def edges(self) -> List[Dict[str, Any]]:
+        """Unique undirected edges."""
+        seen = set()
+        result = []
+        for a, neighbors in self.adjacency.items():
+            for b, attrs in neighbors.items():
+                key = tuple(sorted((a, b)))
+                if key in seen:
+                    continue
+                seen.add(key)
+                result.append({"from": a, "to": b, **attrs})
+        return result
+
+    def to_json(self) -> Dict[str, Any]:
+        """Serializable representation of the graph."""
+        return {
+            "site": self.site,
+            "version": self.version,
+            "built_at": self.built_at,
+            "refreshed_at": self.refreshed_at,
+            "nodes": list(self.nodes.values()),
+            "edges": self.edges(),
+            "clients": list(self.clients.values()),
+        }
+
+    def to_dot(self) -> str:
+        """Graphviz DOT representation (devices only)."""
+        lines = [f'graph "unifi_{self.site}" {{']
+        for mac, node in sorted(self.nodes.items()):
+            label = f'{node["name"]}\\n{node["type"]}'
+            lines.append(f'  "{mac}" [label="{label}"];')
+        for edge in self.edges():
+            port = edge.get("remote_port") or edge.get("local_port")
+            attrs = [f'label="{edge["type"]}{f" p{port}" if port else ""}"']
+            if edge["type"] == "lldp":
+                attrs.append("style=dashed")
+            lines.append(f'  "{edge["from"]}" -- "{edge["to"]}" [{", ".join(attrs)}];')
+        lines.append("}")
+        return "\n".join(lines)
+
+
+# -------------------------------------------------------------------------
+# Per-site cache
+# -------------------------------------------------------------------------
+
+_graphs: Dict[str, TopologyGraph] = {}
+_locks: Dict[str, asyncio.Lock] = {}
+
+
+def cache_devices(site: str, devices: List[Dict[str, Any]]) -> TopologyGraph:
+    """Feed an already-fetched device listing into the cached graph for a site."""
+    graph = _graphs.get(site)
+    if graph is None:
+        graph = _graphs[site] = TopologyGraph.from_devices(devices, site=site)
+    else:
+        graph.sync_devices(devices)
+    return graph
+
+
+async def get_topology_graph(
+    site: Optional[str] = None,
+    max_age_seconds: int = 300,
+    include_clients: bool = True,
+) -> TopologyGraph:
+    """Return the cached topology graph for a site, refreshing it when stale.
+
+    Refreshes fetch stat/device (and stat/sta) once and apply the result
+    incrementally; the version only changes if something actually moved.
+    """
+    async with UniFiClient(site=site) as client:
+        key = client.site
+        lock = _locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            graph = _graphs.get(key)
+            if graph is not None and time.time() - graph.refreshed_at < max_age_seconds:
+                return graph
+
+            devices = await client.get_all_device_details()
+            clients = await client.get_clients() if include_clients else None
+
+            if graph is None:
+                graph = _graphs[key] = TopologyGraph.from_devices(devices, clients, site=key)
+                logger.info(f"Topology graph built for site {key}: {len(graph.nodes)} devices")
+            else:
+                old_version = graph.version
+                graph.sync_devices(devices)
+                if clients is not None:
+                    graph.sync_clients(clients)
+                logger.info(f"Topology graph refreshed for site {key}: v{old_version} -> v{graph.version}")
+            return graph
+
+
+def clear_topology_cache() -> None:
+    """Drop all cached graphs."""
+    _graphs.clear()
+
+
+# -------------------------------------------------------------------------
+# unifi_topology_query tool
+# -------------------------------------------------------------------------
+
+class UniFiTopologyQueryInput(BaseModel):
+    """Input schema for unifi_topology_query tool."""
+
+    query: Literal["path", "blast_radius", "clients_behind_port", "export"] = Field(
+        description="Query type: path, blast_radius, clients_behind_port, or export"
+    )
+    device: Optional[str] = Field(
+        default=None,
+        description="Device MAC, name or IP (source for path; target for blast_radius/clients_behind_port)"
+    )
+    target: Optional[str] = Field(
+        default=None,
+        description="Destination device MAC, name or IP (path query)"
+    )
+    port_idx: Optional[int] = Field(
+        default=None,
+        description="Switch port index (clients_behind_port query)"
+    )
+    format: Literal["json", "dot"] = Field(
+        default="json",
+        description="Export format (export query)"
+    )
+    max_age_seconds: int = Field(
+        default=300,
+        description="Reuse the cached graph if it was refreshed within this many seconds"
+    )
+    site_id: Optional[str] = Field(
+        default=None,
+        description="UniFi site ID (defaults to configured site)"
+    )
+
+
+class UniFiTopologyQueryOutput(BaseModel):
+    """Output schema for unifi_topology_query tool."""
+
+    success: bool = Field(description="Whether the query succeeded")
+    graph_version: int = Field(default=0, description="Version of the cached graph used")
+    path: List[Dict[str, Any]] = Field(default_factory=list, description="Devices along the path")
+    devices: List[Dict[str, Any]] = Field(default_factory=list, description="Affected devices")
+    clients: List[Dict[str, Any]] = Field(default_factory=list, description="Affected clients")
+    graph: Optional[Dict[str, Any]] = Field(default=None, description="Graph export (json format)")
+    dot: str = Field(default="", description="Graph export (dot format)")
+    error: str = Field(default="", description="Error message if failed")
+
+
+async def unifi_topology_query(params: UniFiTopologyQueryInput) -> UniFiTopologyQueryOutput:
+    """Query the cached UniFi topology graph.
+
+    The graph is built from uplink and LLDP data once and refreshed
+    incrementally, so repeated queries don't re-walk the controller.
+
+    Args:
+        params: Query type and arguments
+
+    Returns:
+        Path, affected devices/clients, or the exported graph
+    """
+    logger.info(f"unifi_topology_query called: query={params.query}")
+
+    try:
+        graph = await get_topology_graph(site=params.site_id, max_age_seconds=params.max_age_seconds)
+
+        def describe(macs: List[str]) -> List[Dict[str, Any]]:
+            return [graph.nodes[m] for m in macs if m in graph.nodes]
+
+        def describe_clients(macs: List[str]) -> List[Dict[str, Any]]:
+            return [graph.clients.get(m, {"mac": m}) for m in macs]
+
+        if params.query == "export":
+            if params.format == "dot":
+                return UniFiTopologyQueryOutput(success=True, graph_version=graph.version, dot=graph.to_dot())
+            return UniFiTopologyQueryOutput(success=True, graph_version=graph.version, graph=graph.to_json())
+
+        device = graph.resolve(params.device or "")
+        if device is None:
+            return UniFiTopologyQueryOutput(
+                success=False,
+                graph_version=graph.version,
+                error=f"Device not found in topology: {params.device}",
+            )
+
+        if params.query == "path":
+            target = graph.resolve(params.target or "")
+            if target is None:
+                return UniFiTopologyQueryOutput(
+                    success=False,
+                    graph_version=graph.version,
+                    error=f"Target device not found in topology: {params.target}",
+                )
+            hops = graph.path(device, target)
+            if not hops:
+                return UniFiTopologyQueryOutput(
+                    success=False,
+                    graph_version=graph.version,
+                    error="No path between the devices",
+                )
+            return UniFiTopologyQueryOutput(success=True, graph_version=graph.version, path=describe(hops))
+
+        if params.query == "blast_radius":
+            radius = graph.blast_radius(device)
+            return UniFiTopologyQueryOutput(
+                success=True,
+                graph_version=graph.version,
+                devices=describe(radius["devices"]),
+                clients=describe_clients(radius["clients"]),
+            )
+
+        if params.port_idx is None:
+            return UniFiTopologyQueryOutput(
+                success=False,
+                graph_version=graph.version,
+                error="port_idx is required for clients_behind_port",
+            )
+        clients = graph.clients_behind_port(device, params.port_idx)
+        return UniFiTopologyQueryOutput(
+            success=True,
+            graph_version=graph.version,
+            clients=describe_clients(clients),
+        )
+
+    except UniFiConnectionError as e:
+        logger.error(f"Connection error: {e}")
+        return UniFiTopologyQueryOutput(success=False, error=f"Connection error: {e}")
+    except UniFiAuthError as e:
+        logger.error(f"Auth error: {e}")
+        return UniFiTopologyQueryOutput(success=False, error=f"Authentication error: {e}")
+    except UniFiAPIError as e:
+        logger.error(f"API error: {e}")
+        return UniFiTopologyQueryOutput(success=False, error=f"API error: {e}")
+    except Exception as e:
+        logger.error(f"Unexpected error: {e}")
+        return UniFiTopologyQueryOutput(success=False, error=f"Unexpected error: {e}")
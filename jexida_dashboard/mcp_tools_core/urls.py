@@ -29,5 +29,15 @@ urlpatterns = [
     path("api/request/", views.api_tool_request, name="api_request"),
     path("api/facts/", views.api_fact_list, name="api_facts"),
     path("api/facts/<str:key>/", views.api_fact_detail, name="api_fact_detail"),
+    path(
+        "api/azure/deployments/<str:handle>/events/",
+        views.api_azure_deployment_events,
+        name="api_azure_deployment_events",
+    ),
+    path(
+        "api/azure/resources/search/",
+        views.api_azure_resources_search,
+        name="api_azure_resources_search",
+    ),
 ]
 
@@ -6,8 +6,9 @@ Provides both web UI views (HTMX-enabled) and REST API endpoints.
 import asyncio
 import json
 import logging
+import time
 
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, StreamingHttpResponse
 from django.shortcuts import render, get_object_or_404, redirect
 from django.utils import timezone
 from django.views.decorators.csrf import csrf_exempt
@@ -322,6 +323,18 @@ def api_root(request):
                 "url": f"{base_url}facts/",
                 "description": "List all facts in the knowledge store",
             },
+            "azure_deployment_events": {
+                "method": "GET",
+                "url": f"{base_url}azure/deployments/{{handle}}/events/",
+                "description": "Server-sent events with per-resource progress of a deployment started by an Azure deploy tool",
+                "content_type": "text/event-stream",
+            },
+            "azure_resources_search": {
+                "method": "GET",
+                "url": f"{base_url}azure/resources/search/?query={{kql}}",
+                "description": "Stream Resource Graph results as NDJSON, one resource per line, then a _meta line. Optional: subscription (repeatable), top, cache=0",
+                "content_type": "application/x-ndjson",
+            },
         },
         "usage": {
             "step_1": "GET /tools/api/tools/ to discover available tools",
@@ -521,3 +534,114 @@ def api_fact_detail(request, key):
     
     return JsonResponse({"error": "Method not allowed"}, status=405)
 
+
+
+# Seconds between database polls and between keep-alive comments
+DEPLOYMENT_EVENTS_POLL_INTERVAL = 1.0
+DEPLOYMENT_EVENTS_KEEPALIVE = 15.0
+# Longest a single stream holds a worker; clients reconnect with Last-Event-ID
+DEPLOYMENT_EVENTS_MAX_SECONDS = 300.0
+
+
+@require_GET
+def api_azure_deployment_events(request, handle):
+    """API: Stream deployment progress as server-sent events.
+    
+    Emits an 'operation' event for every per-resource operation change
+    recorded by the deployment tracker, a 'deployment' event whenever the
+    deployment state changes, and a final 'done' event once the deployment
+    reaches a terminal state. Resume with ?after=<sequence> (or the
+    Last-Event-ID header).
+    
+    A stream ends with a 'timeout' event after DEPLOYMENT_EVENTS_MAX_SECONDS
+    so it cannot hold a worker indefinitely; EventSource clients reconnect
+    and continue from the last event ID.
+    """
+    from .tools.azure.deployment_tracker import DeploymentStore, get_deployment_tracker
+    
+    store = DeploymentStore()
+    deployment = store.get(handle)
+    if deployment is None:
+        return JsonResponse({"error": f"Deployment '{handle}' not found"}, status=404)
+    if not deployment["finished"]:
+        # Make sure this process follows it, or the stream would never end
+        get_deployment_tracker().track(handle)
+    
+    try:
+        after = int(request.GET.get("after") or request.headers.get("Last-Event-ID") or 0)
+    except ValueError:
+        return JsonResponse({"error": "after must be an integer"}, status=400)
+    
+    def event(name, data, event_id=None):
+        lines = [f"event: {name}"]
+        if event_id is not None:
+            lines.append(f"id: {event_id}")
+        lines.append(f"data: {json.dumps(data)}")
+        return "\n".join(lines) + "\n\n"
+    
+    def stream():
+        cursor = after
+        state = None
+        last_sent = time.monotonic()
+        deadline = last_sent + DEPLOYMENT_EVENTS_MAX_SECONDS
+        while True:
+            deployment, operations = store.events(handle, cursor)
+            if deployment is None:
+                return
+            for op in operations:
+                cursor = op["sequence"]
+                yield event("operation", op, cursor)
+                last_sent = time.monotonic()
+            if deployment["provisioning_state"] != state or deployment["sequence"] > cursor:
+                state = deployment["provisioning_state"]
+                cursor = max(cursor, deployment["sequence"])
+                yield event("deployment", deployment, cursor)
+                last_sent = time.monotonic()
+            if deployment["finished"]:
+                yield event("done", {"handle": handle, "provisioning_state": state})
+                return
+            if time.monotonic() >= deadline:
+                yield event("timeout", {"handle": handle, "provisioning_state": state, "after": cursor})
+                return
+            if time.monotonic() - last_sent >= DEPLOYMENT_EVENTS_KEEPALIVE:
+                yield ": keep-alive\n\n"
+                last_sent = time.monotonic()
+            time.sleep(DEPLOYMENT_EVENTS_POLL_INTERVAL)
+    
+    response = StreamingHttpResponse(stream(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+@require_GET
+def api_azure_resources_search(request):
+    """API: Stream Resource Graph results as NDJSON.
+    
+    Query parameters: query (required), subscription (repeatable; default
+    subscription if omitted), top (0 or omitted for all), cache (0 to
+    bypass the query cache). Pages are fetched as the response is read,
+    one JSON object per line, followed by a {"_meta": ...} line with
+    paging stats or an {"_error": ...} line if a request fails.
+    """
+    from .tools.azure.auth import get_subscription_id
+    from .tools.azure.resource_graph import stream_ndjson
+    
+    query = request.GET.get("query", "").strip()
+    if not query:
+        return JsonResponse({"error": "query is required"}, status=400)
+    try:
+        top = int(request.GET.get("top") or 0)
+    except ValueError:
+        return JsonResponse({"error": "top must be an integer"}, status=400)
+    try:
+        subscriptions = request.GET.getlist("subscription") or [get_subscription_id()]
+    except Exception as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    
+    response = StreamingHttpResponse(
+        stream_ndjson(query, subscriptions, limit=top or None, use_cache=request.GET.get("cache") != "0"),
+        content_type="application/x-ndjson",
+    )
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -5,9 +5,10 @@ Also supports loading secrets from database with fallback to environment variabl
 Secrets are never logged or exposed in responses.
 """
 
+from pathlib import Path
 from typing import Optional
 from pydantic_settings import BaseSettings
-from pydantic import Field
+from pydantic import Field, field_validator
 
 # Try to import database config (may fail if DB not initialized)
 try:
@@ -17,6 +18,9 @@ except ImportError:
     DB_CONFIG_AVAILABLE = False
     load_config_from_db = None
 
+# Relative data paths are anchored here rather than at the working directory
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
 
 class Settings(BaseSettings):
     """MCP Server configuration settings.
@@ -96,6 +100,34 @@ class Settings(BaseSettings):
         default=30,
         description="Timeout for Synology API requests in seconds"
     )
+    synology_index_path: Optional[str] = Field(
+        default=None,
+        description="SQLite file for the local NAS metadata index (defaults to <data_dir>/synology_index.db)"
+    )
+    synology_utilization_path: Optional[str] = Field(
+        default=None,
+        description="State file of the utilization sampler (defaults to <data_dir>/synology_utilization.json)"
+    )
+    synology_timezone: Optional[str] = Field(
+        default=None,
+        description="IANA time zone of the NAS clock, used for Log Center times without an offset (default UTC)"
+    )
+    synology_transfer_dir: Optional[str] = Field(
+        default=None,
+        description="Local directory uploads are read from and downloads written to (defaults to <data_dir>/transfers)"
+    )
+    
+    # Local data directory for caches and indexes
+    data_dir: str = Field(
+        default="data",
+        description="Directory for local caches, indexes and sampler state (relative to the project root)"
+    )
+    
+    @field_validator("data_dir")
+    @classmethod
+    def _resolve_data_dir(cls, value: str) -> str:
+        path = Path(value).expanduser()
+        return str(path if path.is_absolute() else PROJECT_ROOT / path)
     
     # Database settings
     database_url: Optional[str] = Field(
@@ -156,7 +156,7 @@ PHASE_1_TOOLS = [
     },
     {
         "name": "azure_resources_search",
-        "description": "Search Azure resources using Resource Graph queries (Kusto-like syntax).",
+        "description": "Search Azure resources using Resource Graph queries (Kusto-like syntax). Pages past 1000 results and searches several subscriptions in parallel.",
         "handler_path": "mcp_tools_core.tools.azure.resources.azure_resources_search",
         "tags": "azure,resources,search,resourcegraph",
         "input_schema": {
@@ -164,16 +164,60 @@ PHASE_1_TOOLS = [
             "properties": {
                 "query": {"type": "string", "description": "Azure Resource Graph query"},
                 "subscription_id": {"type": "string", "description": "Subscription ID"},
-                "top": {"type": "integer", "default": 100, "description": "Max results"}
+                "subscription_ids": {"type": "array", "items": {"type": "string"}, "description": "Subscriptions to search in parallel"},
+                "top": {"type": "integer", "default": 100, "description": "Max results (0 for all)"},
+                "use_cache": {"type": "boolean", "default": True, "description": "Reuse recent results of the same query"}
             },
             "required": ["query"]
         }
     },
+    {
+        "name": "azure_resources_snapshot_inventory",
+        "description": "Store a snapshot of all resources (id, type, location, tags, SKU, provisioning state) across subscriptions using Resource Graph. Normally taken on a schedule by the snapshot_azure_inventory command.",
+        "handler_path": "mcp_tools_core.tools.azure.resources.azure_resources_snapshot_inventory",
+        "tags": "azure,resources,inventory,resourcegraph",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "subscription_ids": {"type": "array", "items": {"type": "string"}, "description": "Subscriptions to include (default: configured)"}
+            },
+            "required": []
+        }
+    },
+    {
+        "name": "azure_resources_list_inventory_snapshots",
+        "description": "List stored Azure inventory snapshots, most recent first.",
+        "handler_path": "mcp_tools_core.tools.azure.resources.azure_resources_list_inventory_snapshots",
+        "tags": "azure,resources,inventory",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "limit": {"type": "integer", "default": 20, "description": "Max snapshots"}
+            },
+            "required": []
+        }
+    },
+    {
+        "name": "azure_resources_diff_inventory",
+        "description": "Show resources added, removed and modified between two inventory snapshots (default: previous vs latest). Computed locally without Azure calls.",
+        "handler_path": "mcp_tools_core.tools.azure.resources.azure_resources_diff_inventory",
+        "tags": "azure,resources,inventory,diff,changes",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "from_snapshot_id": {"type": "integer", "description": "Older snapshot (default: the one before to_snapshot_id)"},
+                "to_snapshot_id": {"type": "integer", "description": "Newer snapshot (default: latest)"},
+                "resource_type": {"type": "string", "description": "Only compare this resource type"},
+                "max_items": {"type": "integer", "default": 200, "description": "Max resources listed per change kind"}
+            },
+            "required": []
+        }
+    },
     
     # Deployments Tools
     {
         "name": "azure_deployments_deploy_to_resource_group",
-        "description": "Deploy an ARM template to a resource group.",
+        "description": "Deploy an ARM template to a resource group. Returns a tracking handle right away unless wait_for_completion is set.",
         "handler_path": "mcp_tools_core.tools.azure.deployments.azure_deployments_deploy_to_resource_group",
         "tags": "azure,deployments,arm,bicep",
         "input_schema": {
@@ -184,14 +228,16 @@ PHASE_1_TOOLS = [
                 "template": {"type": "object", "description": "ARM template as JSON"},
                 "parameters": {"type": "object", "description": "Template parameters"},
                 "mode": {"type": "string", "default": "Incremental", "description": "Incremental or Complete"},
-                "subscription_id": {"type": "string", "description": "Subscription ID"}
+                "subscription_id": {"type": "string", "description": "Subscription ID"},
+                "wait_for_completion": {"type": "boolean", "default": False, "description": "Wait for the deployment to finish"},
+                "timeout_seconds": {"type": "integer", "default": 3600, "description": "Max seconds to wait"}
             },
             "required": ["resource_group", "deployment_name", "template"]
         }
     },
     {
         "name": "azure_deployments_deploy_to_subscription",
-        "description": "Deploy an ARM template at subscription scope.",
+        "description": "Deploy an ARM template at subscription scope. Returns a tracking handle right away unless wait_for_completion is set.",
         "handler_path": "mcp_tools_core.tools.azure.deployments.azure_deployments_deploy_to_subscription",
         "tags": "azure,deployments,arm,bicep,subscription",
         "input_schema": {
@@ -202,7 +248,9 @@ PHASE_1_TOOLS = [
                 "template": {"type": "object", "description": "ARM template as JSON"},
                 "parameters": {"type": "object", "description": "Template parameters"},
                 "mode": {"type": "string", "default": "Incremental", "description": "Incremental or Complete"},
-                "subscription_id": {"type": "string", "description": "Subscription ID"}
+                "subscription_id": {"type": "string", "description": "Subscription ID"},
+                "wait_for_completion": {"type": "boolean", "default": False, "description": "Wait for the deployment to finish"},
+                "timeout_seconds": {"type": "integer", "default": 3600, "description": "Max seconds to wait"}
             },
             "required": ["deployment_name", "location", "template"]
         }
@@ -239,6 +287,21 @@ PHASE_1_TOOLS = [
             "required": []
         }
     },
+    {
+        "name": "azure_deployments_watch",
+        "description": "Stream the progress of a deployment started by a deploy tool: long-polls for per-resource operation changes after a sequence cursor.",
+        "handler_path": "mcp_tools_core.tools.azure.deployments.azure_deployments_watch",
+        "tags": "azure,deployments,status,progress",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "handle": {"type": "string", "description": "Deployment handle"},
+                "after_sequence": {"type": "integer", "default": 0, "description": "Cursor from the previous call"},
+                "wait_seconds": {"type": "integer", "default": 20, "description": "Max seconds to wait for new progress"}
+            },
+            "required": ["handle"]
+        }
+    },
     
     # App Platform Tools
     {
@@ -441,6 +504,27 @@ PHASE_1_TOOLS = [
             "required": ["resource_id", "metric_names"]
         }
     },
+    {
+        "name": "azure_monitoring_get_metrics_batch",
+        "description": "Get the same metrics for many resources concurrently, aligned to one time grid and downsampled to a point budget.",
+        "handler_path": "mcp_tools_core.tools.azure.monitoring.azure_monitoring_get_metrics_batch",
+        "tags": "azure,monitoring,metrics,batch",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "resource_ids": {"type": "array", "items": {"type": "string"}, "description": "Full Azure resource IDs"},
+                "resource_group": {"type": "string", "description": "Resource group (with resource_type, instead of resource_ids)"},
+                "resource_type": {"type": "string", "description": "Resource type (e.g., Microsoft.Web/sites)"},
+                "subscription_id": {"type": "string", "description": "Subscription of resource_group"},
+                "metric_names": {"type": "array", "items": {"type": "string"}, "description": "Metric names"},
+                "timespan": {"type": "string", "default": "PT1H", "description": "ISO 8601 duration ending now"},
+                "interval": {"type": "string", "default": "PT5M", "description": "Metric granularity"},
+                "aggregation": {"type": "string", "default": "Average", "description": "Average, Total, Count, Maximum, or Minimum"},
+                "max_points": {"type": "integer", "default": 500, "description": "Point budget across all series"}
+            },
+            "required": ["metric_names"]
+        }
+    },
     {
         "name": "azure_monitoring_query_logs",
         "description": "Query logs from Log Analytics using Kusto Query Language.",
@@ -504,6 +588,25 @@ PHASE_1_TOOLS = [
             "required": ["scope", "time_period"]
         }
     },
+    {
+        "name": "azure_cost_query",
+        "description": "Query daily Azure costs from the local cost store, grouped by resource group or service and rolled up by day, week or month. Only missing and recent days are fetched from Cost Management.",
+        "handler_path": "mcp_tools_core.tools.azure.cost.azure_cost_query",
+        "tags": "azure,cost,billing,analysis",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "subscription_id": {"type": "string", "description": "Subscription ID"},
+                "from_date": {"type": "string", "description": "First day (YYYY-MM-DD, default 30 days ago)"},
+                "to_date": {"type": "string", "description": "Last day (YYYY-MM-DD, default today)"},
+                "resource_group": {"type": "string", "description": "Optional resource group filter"},
+                "group_by": {"type": "string", "default": "resource_group", "description": "resource_group, service, or none"},
+                "rollup": {"type": "string", "default": "none", "description": "none, day, week, or month"},
+                "top_n": {"type": "integer", "default": 0, "description": "Keep the top N groups (0 = all)"}
+            },
+            "required": []
+        }
+    },
     
     # Flow Tools (High-level Orchestration)
     {
@@ -520,14 +623,15 @@ PHASE_1_TOOLS = [
                 "tags": {"type": "object", "description": "Additional tags to apply"},
                 "sku": {"type": "object", "description": "App Service plan SKU (name, tier, capacity)"},
                 "is_linux": {"type": "boolean", "default": True, "description": "Linux or Windows plan"},
-                "runtime_stack": {"type": "string", "default": "PYTHON|3.11", "description": "Runtime stack"}
+                "runtime_stack": {"type": "string", "default": "PYTHON|3.11", "description": "Runtime stack"},
+                "resume_run_id": {"type": "string", "description": "Run ID of a failed run to resume (same parameters)"}
             },
             "required": ["base_name", "location"]
         }
     },
     {
         "name": "azure_flow_add_data_services",
-        "description": "Add data services to an existing environment: Storage Account + Blob Container + SQL Server + Database.",
+        "description": "Add data services to an existing environment: Storage Account + Blob Container + SQL Server + Database. The storage and SQL chains run concurrently; failed runs can be resumed.",
         "handler_path": "mcp_tools_core.tools.azure.flows.azure_flow_add_data_services",
         "tags": "azure,flow,orchestration,storage,sql",
         "input_schema": {
@@ -541,7 +645,8 @@ PHASE_1_TOOLS = [
                 "sql_admin_login": {"type": "string", "default": "sqladmin", "description": "SQL admin login"},
                 "sql_admin_password_secret_ref": {"type": "string", "description": "Secret ref for SQL password"},
                 "tags": {"type": "object", "description": "Tags to apply"},
-                "environment": {"type": "string", "default": "dev", "description": "Environment name"}
+                "environment": {"type": "string", "default": "dev", "description": "Environment name"},
+                "resume_run_id": {"type": "string", "description": "Run ID of a failed run to resume (same parameters)"}
             },
             "required": ["resource_group", "base_name", "location"]
         }
@@ -564,6 +669,23 @@ PHASE_1_TOOLS = [
             "required": ["resource_group", "deployment_name", "template_source"]
         }
     },
+    # CLI
+    {
+        "name": "azure_cli_run",
+        "description": "Execute an Azure CLI command safely with subscription context. Runs on warm CLI workers; read-only (list/show/get) results are cached briefly.",
+        "handler_path": "mcp_tools_core.tools.azure.cli.azure_cli_run",
+        "tags": "azure,cli",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "subscription_id": {"type": "string", "description": "Azure subscription ID (GUID)"},
+                "command": {"type": "string", "description": "Azure CLI command after 'az'"},
+                "dry_run": {"type": "boolean", "default": False},
+                "use_cache": {"type": "boolean", "default": True, "description": "Reuse a recent result of the same read-only command"}
+            },
+            "required": ["subscription_id", "command"]
+        }
+    },
 ]
 
 # =============================================================================
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Register the network scan history tools in the MCP database.
+
+Updates network_scan_local with its persistence/incremental options and
+adds network_scan_changes. Run this on the MCP server after deploying
+network_scan.py and scan_history.py and running migrations.
+"""
+
+import os
+import sys
+import django
+
+# Add the jexida_dashboard to the path
+sys.path.insert(0, '/opt/jexida-mcp/jexida_dashboard')
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'jexida_dashboard.settings')
+
+django.setup()
+
+from mcp_tools_core.models import Tool
+
+TOOLS = [
+    {
+        "name": "network_scan_local",
+        "description": "Run a local network scan using nmap to discover devices and open ports. Results are stored per subnet; set only_changed=true to port-scan only new or changed hosts.",
+        "handler_path": "mcp_tools_core.tools.unifi.network_scan.network_scan_local",
+        "tags": "network,security,scan",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "subnets": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "List of subnets to scan in CIDR notation (e.g., ['192.168.1.0/24'])"
+                },
+                "ports": {
+                    "type": "string",
+                    "default": "top-100",
+                    "description": "Port specification: 'top-100', 'top-1000', 'common', or port range"
+                },
+                "persist": {
+                    "type": "boolean",
+                    "default": True,
+                    "description": "Store results in the scan history for change detection"
+                },
+                "only_changed": {
+                    "type": "boolean",
+                    "default": False,
+                    "description": "Only port-scan hosts that are new or changed since the last scan"
+                }
+            },
+            "required": ["subnets"]
+        }
+    },
+    {
+        "name": "network_scan_changes",
+        "description": "Show what changed in a subnet since its previous scan: new and disappeared hosts, MAC changes, newly opened or closed ports, and changed service banners.",
+        "handler_path": "mcp_tools_core.tools.unifi.scan_history.network_scan_changes",
+        "tags": "network,security,scan,history",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "subnet": {
+                    "type": "string",
+                    "description": "Subnet in CIDR notation, as passed to network_scan_local"
+                },
+                "base_scan_id": {
+                    "type": "integer",
+                    "description": "Scan to compare from (defaults to the previous scan)"
+                },
+                "target_scan_id": {
+                    "type": "integer",
+                    "description": "Scan to compare to (defaults to the latest scan)"
+                }
+            },
+            "required": ["subnet"]
+        }
+    },
+]
+
+
+def main():
+    print("Registering network scan history tools...")
+    print("=" * 60)
+
+    for tool_data in TOOLS:
+        tool, created = Tool.objects.update_or_create(
+            name=tool_data["name"],
+            defaults={
+                "description": tool_data["description"],
+                "handler_path": tool_data["handler_path"],
+                "tags": tool_data["tags"],
+                "input_schema": tool_data["input_schema"],
+                "is_active": True,
+            }
+        )
+        action = "Created" if created else "Updated"
+        print(f"  {action}: {tool.name}")
+
+    print()
+    print(f"Registered {len(TOOLS)} tools successfully!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,550 @@
+#!/usr/bin/env python3
+"""Register the Synology NAS tools added after the initial seed migration.
+
+The original Synology tools are created by migration 0002_seed_tools.
+Run this on the MCP server after deploying the Synology tool modules.
+
+Usage:
+    python scripts/register_synology_tools.py
+"""
+
+import os
+import sys
+import django
+
+# Add the jexida_dashboard to the path
+sys.path.insert(0, '/opt/jexida-mcp/jexida_dashboard')
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'jexida_dashboard.settings')
+
+django.setup()
+
+from mcp_tools_core.models import Tool
+
+TOOLS = [
+    {
+        "name": "synology_get_system_overview",
+        "description": "Get system info, utilization, storage volumes and network info from Synology NAS in a single batched request.",
+        "handler_path": "mcp_tools_core.tools.synology.system.synology_get_system_overview",
+        "tags": "synology,nas,system,monitoring,storage",
+        "input_schema": {
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    },
+    {
+        "name": "synology_upload_file",
+        "description": "Upload a local file (e.g. a multi-GB backup) to Synology NAS, streamed in chunks with MD5 verification.",
+        "handler_path": "mcp_tools_core.tools.synology.transfers.synology_upload_file",
+        "tags": "synology,nas,filestation,files,transfer",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "local_path": {
+                    "type": "string",
+                    "description": "File to upload, relative to the transfer directory on the host running the tool"
+                },
+                "dest_folder": {
+                    "type": "string",
+                    "description": "Destination folder on the NAS (e.g., /backups/db)"
+                },
+                "remote_name": {
+                    "type": "string",
+                    "description": "File name on the NAS (defaults to the local file name)"
+                },
+                "overwrite": {
+                    "type": "boolean",
+                    "description": "Overwrite an existing file",
+                    "default": False
+                },
+                "create_parents": {
+                    "type": "boolean",
+                    "description": "Create missing parent folders",
+                    "default": True
+                },
+                "verify": {
+                    "type": "boolean",
+                    "description": "Verify the upload with the NAS-side MD5",
+                    "default": True
+                }
+            },
+            "required": ["local_path", "dest_folder"]
+        }
+    },
+    {
+        "name": "synology_download_file",
+        "description": "Download a file from Synology NAS to local disk, streamed in chunks, resumable, with MD5 verification.",
+        "handler_path": "mcp_tools_core.tools.synology.transfers.synology_download_file",
+        "tags": "synology,nas,filestation,files,transfer",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "path": {
+                    "type": "string",
+                    "description": "File on the NAS to download"
+                },
+                "local_path": {
+                    "type": "string",
+                    "description": "Destination file, relative to the transfer directory on the host running the tool"
+                },
+                "resume": {
+                    "type": "boolean",
+                    "description": "Resume from an existing <local_path>.part file",
+                    "default": True
+                },
+                "verify": {
+                    "type": "boolean",
+                    "description": "Verify the download with the NAS-side MD5",
+                    "default": True
+                }
+            },
+            "required": ["path", "local_path"]
+        }
+    },
+    {
+        "name": "synology_index_crawl",
+        "description": "Crawl Synology NAS shared folders into the local metadata index (incremental by folder mtime).",
+        "handler_path": "mcp_tools_core.tools.synology.file_index.synology_index_crawl",
+        "tags": "synology,nas,filestation,index",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "roots": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Folders to crawl (default: all shared folders)"
+                },
+                "full": {
+                    "type": "boolean",
+                    "description": "Re-list every folder, ignoring folder mtimes",
+                    "default": False
+                },
+                "concurrency": {
+                    "type": "integer",
+                    "description": "Folders listed in parallel",
+                    "default": 4
+                }
+            },
+            "required": []
+        }
+    },
+    {
+        "name": "synology_index_search",
+        "description": "Search the local Synology file index by name substring, glob, size and age (no NAS round trip).",
+        "handler_path": "mcp_tools_core.tools.synology.file_index.synology_index_search",
+        "tags": "synology,nas,filestation,index,search",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Substring of the file name (case-insensitive)"
+                },
+                "glob": {
+                    "type": "string",
+                    "description": "Glob on the file name (e.g., '*.mkv', 'IMG_20??*')"
+                },
+                "path_prefix": {
+                    "type": "string",
+                    "description": "Only entries below this folder"
+                },
+                "extension": {
+                    "type": "string",
+                    "description": "File extension filter (e.g., 'pdf')"
+                },
+                "file_type": {
+                    "type": "string",
+                    "description": "Filter by type: file, dir, or all",
+                    "default": "all"
+                },
+                "min_size": {
+                    "type": "integer",
+                    "description": "Minimum size in bytes"
+                },
+                "max_size": {
+                    "type": "integer",
+                    "description": "Maximum size in bytes"
+                },
+                "modified_within_days": {
+                    "type": "number",
+                    "description": "Modified within the last N days"
+                },
+                "older_than_days": {
+                    "type": "number",
+                    "description": "Not modified for at least N days"
+                },
+                "sort_by": {
+                    "type": "string",
+                    "description": "Sort field: name, size, mtime, path",
+                    "default": "name"
+                },
+                "descending": {
+                    "type": "boolean",
+                    "description": "Sort descending",
+                    "default": False
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum results",
+                    "default": 100
+                }
+            },
+            "required": []
+        }
+    },
+    {
+        "name": "synology_largest_files",
+        "description": "List the largest files on Synology NAS from the local index.",
+        "handler_path": "mcp_tools_core.tools.synology.file_index.synology_largest_files",
+        "tags": "synology,nas,filestation,index,storage",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "path_prefix": {
+                    "type": "string",
+                    "description": "Only files below this folder"
+                },
+                "extension": {
+                    "type": "string",
+                    "description": "File extension filter"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Number of files to return",
+                    "default": 20
+                }
+            },
+            "required": []
+        }
+    },
+    {
+        "name": "synology_get_download_status",
+        "description": "Get a Download Station task's progress, optionally waiting until it finishes.",
+        "handler_path": "mcp_tools_core.tools.synology.download_station.synology_get_download_status",
+        "tags": "synology,nas,downloadstation,downloads",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "task_id": {
+                    "type": "string",
+                    "description": "Download task ID"
+                },
+                "wait": {
+                    "type": "boolean",
+                    "description": "Wait until the download is finished, seeding or failed before returning",
+                    "default": False
+                },
+                "timeout_seconds": {
+                    "type": "number",
+                    "description": "Maximum time to wait when wait is set (the download keeps running)",
+                    "default": 3600
+                }
+            },
+            "required": ["task_id"]
+        }
+    },
+    {
+        "name": "synology_get_backup_status",
+        "description": "Get the status of a Hyper Backup task on Synology NAS, optionally waiting for a running backup to finish.",
+        "handler_path": "mcp_tools_core.tools.synology.backup.synology_get_backup_status",
+        "tags": "synology,nas,backup,hyperbackup",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "task_id": {
+                    "type": "integer",
+                    "description": "Backup task ID"
+                },
+                "wait": {
+                    "type": "boolean",
+                    "description": "Wait until the task is no longer running before returning",
+                    "default": False
+                },
+                "timeout_seconds": {
+                    "type": "number",
+                    "description": "Maximum time to wait when wait is set (the backup keeps running)",
+                    "default": 3600
+                }
+            },
+            "required": ["task_id"]
+        }
+    },
+    {
+        "name": "synology_folder_usage",
+        "description": "Recursive folder size analysis on Synology NAS: largest subfolders as a top-N tree and usage by file extension.",
+        "handler_path": "mcp_tools_core.tools.synology.usage.synology_folder_usage",
+        "tags": "synology,nas,filestation,files,storage",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "path": {
+                    "type": "string",
+                    "description": "Folder to analyse (e.g., /volume1/media or /media)"
+                },
+                "top_n": {
+                    "type": "integer",
+                    "description": "Subfolders and extensions to return per level",
+                    "default": 10
+                },
+                "tree_depth": {
+                    "type": "integer",
+                    "description": "Levels of the returned tree",
+                    "default": 2
+                },
+                "scan_depth": {
+                    "type": "integer",
+                    "description": "Below this depth subtrees are measured with a NAS-side DirSize task",
+                    "default": 12
+                },
+                "max_folders": {
+                    "type": "integer",
+                    "description": "Folders to list before switching to DirSize tasks for the rest",
+                    "default": 5000
+                },
+                "concurrency": {
+                    "type": "integer",
+                    "description": "Folders processed in parallel",
+                    "default": 8
+                },
+                "use_cache": {
+                    "type": "boolean",
+                    "description": "Reuse results of folders whose mtime is unchanged",
+                    "default": True
+                }
+            },
+            "required": ["path"]
+        }
+    },
+    {
+        "name": "synology_list_utilization_metrics",
+        "description": "List Synology utilization metrics recorded by the background sampler, with their latest values.",
+        "handler_path": "mcp_tools_core.tools.synology.utilization.synology_list_utilization_metrics",
+        "tags": "synology,nas,monitoring,utilization",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "pattern": {
+                    "type": "string",
+                    "description": "Glob filter on metric names (e.g., network.*)",
+                    "default": "*"
+                }
+            },
+            "required": []
+        }
+    },
+    {
+        "name": "synology_get_utilization_history",
+        "description": "Synology CPU, memory, disk and network utilization over a time range with averages and percentiles, from the local sampler history.",
+        "handler_path": "mcp_tools_core.tools.synology.utilization.synology_get_utilization_history",
+        "tags": "synology,nas,monitoring,utilization",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "metrics": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Metric names or glob patterns (e.g., network.*.rx)"
+                },
+                "minutes": {
+                    "type": "integer",
+                    "description": "Length of the range ending at end_time",
+                    "default": 60
+                },
+                "end_time": {
+                    "type": "number",
+                    "description": "Unix end time (defaults to now)"
+                },
+                "resolution": {
+                    "type": "string",
+                    "description": "auto, raw, minute or hour",
+                    "default": "auto"
+                },
+                "include_points": {
+                    "type": "boolean",
+                    "description": "Return the data points, not only statistics",
+                    "default": True
+                },
+                "max_points": {
+                    "type": "integer",
+                    "description": "Maximum points returned per metric (evenly thinned)",
+                    "default": 500
+                }
+            },
+            "required": []
+        }
+    },
+    {
+        "name": "synology_ingest_logs",
+        "description": "Fetch only new Synology Log Center entries (per log type cursor) into the local log table.",
+        "handler_path": "mcp_tools_core.tools.synology.log_ingest.synology_ingest_logs",
+        "tags": "synology,nas,logs,monitoring",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "log_types": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Log Center log types to ingest (e.g., connection, transfer)"
+                },
+                "max_entries": {
+                    "type": "integer",
+                    "description": "Maximum entries fetched per log type per run (the rest is fetched by later runs)",
+                    "default": 20000
+                }
+            },
+            "required": []
+        }
+    },
+    {
+        "name": "synology_query_logs",
+        "description": "Query ingested Synology logs locally by level, user, IP, text and time range (no NAS access).",
+        "handler_path": "mcp_tools_core.tools.synology.log_ingest.synology_query_logs",
+        "tags": "synology,nas,logs,monitoring,security",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "log_type": {
+                    "type": "string",
+                    "description": "Filter by log type"
+                },
+                "level": {
+                    "type": "string",
+                    "description": "Filter by level (e.g., warn, err)"
+                },
+                "user": {
+                    "type": "string",
+                    "description": "Filter by user (exact match)"
+                },
+                "ip": {
+                    "type": "string",
+                    "description": "Filter by IP address (exact match, or prefix ending in '.')"
+                },
+                "text": {
+                    "type": "string",
+                    "description": "Case-insensitive substring of event or message"
+                },
+                "hours": {
+                    "type": "integer",
+                    "description": "Only entries from the last N hours (ignored if since is set)",
+                    "default": 24
+                },
+                "since": {
+                    "type": "string",
+                    "description": "Start of the time range (ISO 8601)"
+                },
+                "until": {
+                    "type": "string",
+                    "description": "End of the time range (ISO 8601)"
+                },
+                "nas": {
+                    "type": "string",
+                    "description": "Filter by NAS host"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum entries to return",
+                    "default": 200
+                }
+            },
+            "required": []
+        }
+    },
+    {
+        "name": "synology_list_nas_targets",
+        "description": "List the Synology NAS units configured in the secrets store (multi-NAS inventory).",
+        "handler_path": "mcp_tools_core.tools.synology.multi_nas.synology_list_nas_targets",
+        "tags": "synology,nas,inventory",
+        "input_schema": {
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    },
+    {
+        "name": "synology_multi_nas",
+        "description": "Run a read-only Synology query (system info, storage, backups, Docker containers, ...) on all NAS units concurrently with per-NAS timeouts.",
+        "handler_path": "mcp_tools_core.tools.synology.multi_nas.synology_multi_nas",
+        "tags": "synology,nas,inventory,monitoring",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "method": {
+                    "type": "string",
+                    "description": "Client method to run on every NAS: get_system_info, get_system_overview, get_storage_info, get_network_info, get_resource_usage, get_security_settings, list_shares, list_shared_folders, list_backup_tasks, list_downloads, list_packages, list_users, list_scheduled_tasks, list_docker_containers, list_virtual_machines"
+                },
+                "targets": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Target names (all targets when empty)"
+                },
+                "timeout_seconds": {
+                    "type": "number",
+                    "description": "Per-NAS timeout, including login",
+                    "default": 30
+                }
+            },
+            "required": ["method"]
+        }
+    },
+    {
+        "name": "synology_top_containers",
+        "description": "Rank Synology Container Manager containers by CPU, memory or memory growth over a recent window (starts background sampling on first use).",
+        "handler_path": "mcp_tools_core.tools.synology.container_stats.synology_top_containers",
+        "tags": "synology,nas,docker,monitoring",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "metric": {
+                    "type": "string",
+                    "description": "Rank by 'cpu', 'memory' or 'memory_growth'",
+                    "default": "cpu"
+                },
+                "window_minutes": {
+                    "type": "number",
+                    "description": "Window to rank over",
+                    "default": 5
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Number of containers to return",
+                    "default": 5
+                },
+                "interval_seconds": {
+                    "type": "integer",
+                    "description": "Sampling interval",
+                    "default": 10
+                }
+            },
+            "required": []
+        }
+    },
+]
+
+
+def main():
+    print("Registering Synology tools...")
+    print("=" * 60)
+
+    for tool_data in TOOLS:
+        tool, created = Tool.objects.update_or_create(
+            name=tool_data["name"],
+            defaults={
+                "description": tool_data["description"],
+                "handler_path": tool_data["handler_path"],
+                "tags": tool_data["tags"],
+                "input_schema": tool_data["input_schema"],
+                "is_active": True,
+            }
+        )
+        action = "Created" if created else "Updated"
+        print(f"  {action}: {tool.name}")
+
+    print()
+    print(f"Registered {len(TOOLS)} tools successfully!")
+    print()
+    print("Don't forget to restart the jexida-mcp service:")
+    print("  sudo systemctl restart jexida-mcp.service")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""Register the UniFi port/radio statistics tools in the MCP database.
+
+Run this on the MCP server after deploying port_stats.py and running
+migrations. Start the collector with:
+    python manage.py collect_unifi_stats --interval 60
+"""
+
+import os
+import sys
+import django
+
+# Add the jexida_dashboard to the path
+sys.path.insert(0, '/opt/jexida-mcp/jexida_dashboard')
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'jexida_dashboard.settings')
+
+django.setup()
+
+from mcp_tools_core.models import Tool
+
+TOOLS = [
+    {
+        "name": "unifi_port_stats_collect",
+        "description": "Take one per-port/per-radio statistics sample from the UniFi controller (traffic counters and rates, errors, PoE draw, clients) and roll finished hours into hourly rows.",
+        "handler_path": "mcp_tools_core.tools.unifi.port_stats.unifi_port_stats_collect",
+        "tags": "unifi,network,stats,timeseries",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "site_id": {
+                    "type": "string",
+                    "description": "UniFi site ID (defaults to configured site)"
+                },
+                "raw_retention_hours": {
+                    "type": "integer",
+                    "default": 48,
+                    "description": "Hours of raw samples to keep"
+                }
+            },
+            "required": []
+        }
+    },
+    {
+        "name": "unifi_port_stats_query",
+        "description": "Return the stored traffic/error/PoE/client time series for one switch port or AP radio. Reads the local stats table only.",
+        "handler_path": "mcp_tools_core.tools.unifi.port_stats.unifi_port_stats_query",
+        "tags": "unifi,network,stats,timeseries",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "device_mac": {
+                    "type": "string",
+                    "description": "MAC address of the switch or AP"
+                },
+                "port_idx": {
+                    "type": "integer",
+                    "description": "Port index (switch) or radio index (AP)"
+                },
+                "kind": {
+                    "type": "string",
+                    "enum": [
+                        "port",
+                        "radio"
+                    ],
+                    "default": "port",
+                    "description": "Port or radio series"
+                },
+                "hours": {
+                    "type": "integer",
+                    "default": 24,
+                    "description": "How many hours back to return"
+                },
+                "resolution": {
+                    "type": "string",
+                    "enum": [
+                        "auto",
+                        "raw",
+                        "hour"
+                    ],
+                    "default": "auto",
+                    "description": "Sample tier"
+                }
+            },
+            "required": [
+                "device_mac",
+                "port_idx"
+            ]
+        }
+    },
+    {
+        "name": "unifi_port_stats_top",
+        "description": "Rank UniFi switch ports/AP radios by throughput, errors, PoE draw or clients over a recent window. Reads the local stats table only.",
+        "handler_path": "mcp_tools_core.tools.unifi.port_stats.unifi_port_stats_top",
+        "tags": "unifi,network,stats,timeseries",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "metric": {
+                    "type": "string",
+                    "enum": [
+                        "throughput",
+                        "rx_rate",
+                        "tx_rate",
+                        "errors",
+                        "poe_power",
+                        "clients"
+                    ],
+                    "default": "throughput",
+                    "description": "Metric to rank by"
+                },
+                "kind": {
+                    "type": "string",
+                    "enum": [
+                        "port",
+                        "radio"
+                    ],
+                    "description": "Restrict to ports or radios"
+                },
+                "hours": {
+                    "type": "integer",
+                    "default": 1,
+                    "description": "Window size in hours"
+                },
+                "limit": {
+                    "type": "integer",
+                    "default": 10,
+                    "description": "Number of entries to return"
+                }
+            },
+            "required": []
+        }
+    },
+]
+
+
+def main():
+    print("Registering UniFi statistics tools...")
+    print("=" * 60)
+
+    for tool_data in TOOLS:
+        tool, created = Tool.objects.update_or_create(
+            name=tool_data["name"],
+            defaults={
+                "description": tool_data["description"],
+                "handler_path": tool_data["handler_path"],
+                "tags": tool_data["tags"],
+                "input_schema": tool_data["input_schema"],
+                "is_active": True,
+            }
+        )
+        action = "Created" if created else "Updated"
+        print(f"  {action}: {tool.name}")
+
+    print()
+    print(f"Registered {len(TOOLS)} tools successfully!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Register the cached UniFi topology graph tools in the MCP database.
+
+Run this on the MCP server after deploying topology_graph.py.
+"""
+
+import os
+import sys
+import django
+
+# Add the jexida_dashboard to the path
+sys.path.insert(0, '/opt/jexida-mcp/jexida_dashboard')
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'jexida_dashboard.settings')
+
+django.setup()
+
+from mcp_tools_core.models import Tool
+
+TOOLS = [
+    {
+        "name": "unifi_topology_query",
+        "description": "Query the cached UniFi topology graph (built from uplinks and LLDP, refreshed incrementally): path between two devices, blast radius of a switch, clients behind a switch port, or export the graph as JSON/DOT.",
+        "handler_path": "mcp_tools_core.tools.unifi.topology_graph.unifi_topology_query",
+        "tags": "unifi,network,topology,graph",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "enum": [
+                        "path",
+                        "blast_radius",
+                        "clients_behind_port",
+                        "export"
+                    ],
+                    "description": "Query type"
+                },
+                "device": {
+                    "type": "string",
+                    "description": "Device MAC, name or IP"
+                },
+                "target": {
+                    "type": "string",
+                    "description": "Destination device for path queries"
+                },
+                "port_idx": {
+                    "type": "integer",
+                    "description": "Switch port index for clients_behind_port"
+                },
+                "format": {
+                    "type": "string",
+                    "enum": [
+                        "json",
+                        "dot"
+                    ],
+                    "default": "json",
+                    "description": "Export format"
+                },
+                "max_age_seconds": {
+                    "type": "integer",
+                    "default": 300,
+                    "description": "Reuse the cached graph if refreshed within this many seconds"
+                },
+                "site_id": {
+                    "type": "string",
+                    "description": "UniFi site ID (defaults to configured site)"
+                }
+            },
+            "required": [
+                "query"
+            ]
+        }
+    },
+]
+
+
+def main():
+    print("Registering UniFi topology graph tools...")
+    print("=" * 60)
+
+    for tool_data in TOOLS:
+        tool, created = Tool.objects.update_or_create(
+            name=tool_data["name"],
+            defaults={
+                "description": tool_data["description"],
+                "handler_path": tool_data["handler_path"],
+                "tags": tool_data["tags"],
+                "input_schema": tool_data["input_schema"],
+                "is_active": True,
+            }
+        )
+        action = "Created" if created else "Updated"
+        print(f"  {action}: {tool.name}")
+
+    print()
+    print(f"Registered {len(TOOLS)} tools successfully!")
+
+
+if __name__ == "__main__":
+    main()
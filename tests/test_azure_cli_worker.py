@@ -0,0 +1,184 @@
+"""Tests for warm Azure CLI execution and read-only result caching.
+
+Tests command classification, cache expiry and invalidation, worker reuse
+and failure handling against a fake worker script, and azure_cli_run's
+cache and fallback behaviour.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+WORKSPACE_ROOT = Path(__file__).parent.parent
+sys.path.append(str(WORKSPACE_ROOT / "mcp_server_files"))
+
+SUBSCRIPTION = "12345678-1234-1234-1234-123456789012"
+
+# Speaks the az_worker.py protocol; echoes args and its pid, sleeps on "sleep"
+FAKE_WORKER = '''
+import json, os, sys, time
+print(json.dumps({"ready": True}), flush=True)
+for line in sys.stdin:
+    args = json.loads(line)["args"]
+    if args[0] == "sleep":
+        time.sleep(float(args[1]))
+    out = json.dumps({"args": args, "pid": os.getpid()})
+    print(json.dumps({"stdout": out, "stderr": "", "exit_code": 0}), flush=True)
+'''
+
+
+class TestCliWorker(unittest.TestCase):
+    """Test cli_worker classification, cache, and worker pool."""
+
+    def setUp(self):
+        try:
+            from jexida_dashboard.mcp_tools_core.tools.azure import cli_worker
+        except ImportError as e:
+            self.skipTest(f"Azure tool dependencies not installed: {e}")
+        self.cw = cli_worker
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.script = os.path.join(tmp.name, "fake_worker.py")
+        Path(self.script).write_text(FAKE_WORKER)
+
+    def pool(self, **kwargs):
+        pool = self.cw.AzWorkerPool(size=1, python=sys.executable, script=self.script, **kwargs)
+        self.addCleanup(pool.close)
+        return pool
+
+    def test_read_only_commands(self):
+        """The verb is the last word before the first option."""
+        self.assertEqual(self.cw.command_verb("vm list -g rg --output json"), "list")
+        self.assertTrue(self.cw.is_read_only("webapp config appsettings list --name x"))
+        self.assertTrue(self.cw.is_read_only("group show --name rg"))
+        self.assertFalse(self.cw.is_read_only("group create --name rg --location eastus"))
+        self.assertFalse(self.cw.is_read_only("--version"))
+
+    def test_cache_expiry_and_invalidation(self):
+        """Entries expire after the TTL and are dropped per subscription."""
+        cache = self.cw.CliResultCache(ttl=0.1)
+        result = self.cw.CliResult("[]", "", 0, 1.5)
+        other = SUBSCRIPTION.replace("1", "2")
+
+        cache.put("group  list", SUBSCRIPTION.upper(), result)
+        cache.put("group list", other, result)
+        self.assertIs(cache.get("group list", SUBSCRIPTION), result)
+
+        cache.invalidate(SUBSCRIPTION)
+        self.assertIsNone(cache.get("group list", SUBSCRIPTION))
+        self.assertIs(cache.get("group list", other), result)
+
+        time.sleep(0.15)
+        self.assertIsNone(cache.get("group list", other))
+
+    def test_worker_is_reused(self):
+        """Consecutive commands run in the same warm process."""
+        pool = self.pool()
+
+        first = pool.run(["group", "list"], timeout=10)
+        second = pool.run(["vm", "show"], timeout=10)
+
+        self.assertEqual(first.exit_code, 0)
+        self.assertIn('"group", "list"', first.stdout)
+        self.assertEqual(first.stdout.split('"pid": ')[1], second.stdout.split('"pid": ')[1])
+        self.assertGreater(pool.startup_seconds, 0)
+
+    def test_unavailable_interpreter_falls_back(self):
+        """A worker that cannot start makes run() return None for a while."""
+        pool = self.cw.AzWorkerPool(size=1, python="/nonexistent/python", script=self.script)
+
+        self.assertIsNone(pool.run(["group", "list"], timeout=10))
+        self.assertFalse(pool.available())
+
+    def test_timeout_kills_worker(self):
+        """A command that outlives its timeout is reported, not retried."""
+        pool = self.pool()
+
+        result = pool.run(["sleep", "5"], timeout=0.5)
+
+        self.assertEqual(result.exit_code, -1)
+        self.assertIn("timed out", result.stderr)
+        self.assertEqual(pool.run(["group", "list"], timeout=10).exit_code, 0)
+
+
+class TestAzureCliRunCache(unittest.TestCase):
+    """Test azure_cli_run with a warm pool and the result cache."""
+
+    def setUp(self):
+        try:
+            from jexida_dashboard.mcp_tools_core.tools.azure import cli, cli_worker
+        except ImportError as e:
+            self.skipTest(f"Azure tool dependencies not installed: {e}")
+        self.cli = cli
+        self.cw = cli_worker
+
+    def run_command(self, command, pool, cache):
+        params = self.cli.AzureCliInput(subscription_id=SUBSCRIPTION, command=command)
+        with patch.object(self.cli, "get_cli_pool", return_value=pool), \
+                patch.object(self.cli, "get_cli_cache", return_value=cache), \
+                patch.object(self.cli, "AZURE_CLI_WARM", True), \
+                patch.object(self.cli, "build_az_command", lambda c, s: ["az", "--subscription", s, *c.split()]):
+            return asyncio.run(self.cli.azure_cli_run(params))
+
+    def test_read_only_results_are_cached(self):
+        """A repeated list is served from cache until a write invalidates it."""
+        calls = []
+        cw = self.cw
+
+        class FakePool:
+            startup_seconds = 1.2
+
+            def available(self):
+                return True
+
+            def run(self, args, timeout):
+                calls.append(args)
+                return cw.CliResult(f"out-{len(calls)}", "", 0, 0.3)
+
+        pool, cache = FakePool(), self.cw.CliResultCache(ttl=60)
+
+        first = self.run_command("group list", pool, cache)
+        second = self.run_command("group list", pool, cache)
+        self.run_command("group create --name rg --location eastus", pool, cache)
+        third = self.run_command("group list", pool, cache)
+
+        self.assertTrue(first.warm)
+        self.assertEqual(first.time_saved_ms, 1200)
+        self.assertEqual(first.duration_ms, 300)
+        self.assertTrue(second.cached)
+        self.assertEqual(second.stdout, "out-1")
+        self.assertEqual(second.time_saved_ms, 300)
+        self.assertFalse(third.cached)
+        self.assertEqual(third.stdout, "out-3")
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(calls[0], ["--subscription", SUBSCRIPTION, "group", "list"])
+
+    def test_unavailable_pool_spawns_az(self):
+        """Without a worker the command runs as a cold subprocess."""
+        class NoPool:
+            startup_seconds = 0.0
+
+            def available(self):
+                return True
+
+            def run(self, args, timeout):
+                return None
+
+        async def cold(cmd_args):
+            return self.cw.CliResult("cold", "", 0, 2.0)
+
+        with patch.object(self.cli, "_run_cold", cold):
+            result = self.run_command("group list", NoPool(), self.cw.CliResultCache(ttl=60))
+
+        self.assertEqual(result.stdout, "cold")
+        self.assertFalse(result.warm)
+        self.assertEqual(result.time_saved_ms, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
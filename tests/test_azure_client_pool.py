@@ -0,0 +1,97 @@
+"""Tests for pooled Azure management clients."""
+
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+WORKSPACE_ROOT = Path(__file__).parent.parent
+sys.path.append(str(WORKSPACE_ROOT / "mcp_server_files"))
+
+
+class FakeClient:
+    """Records construction arguments and close() calls."""
+
+    instances = []
+
+    def __init__(self, credential, subscription_id=None, **kwargs):
+        self.credential = credential
+        self.subscription_id = subscription_id
+        self.transport = kwargs.get("transport")
+        self.closed = False
+        FakeClient.instances.append(self)
+
+    def close(self):
+        self.closed = True
+
+
+class FakeTenantClient(FakeClient):
+    """Client that only takes a credential (e.g. ResourceGraphClient)."""
+
+
+class TestManagementClientPool(unittest.TestCase):
+    """Test get_management_client caching, sharing and shutdown."""
+
+    def setUp(self):
+        try:
+            from jexida_dashboard.mcp_tools_core.tools.azure import auth
+            import requests  # noqa: F401
+            from azure.core.pipeline.transport import RequestsTransport  # noqa: F401
+        except ImportError as e:
+            self.skipTest(f"Azure SDK not installed: {e}")
+        self.auth = auth
+        auth.clear_credential_cache()
+        FakeClient.instances = []
+        self.credential = object()
+        p = patch.object(auth, "get_azure_credential", side_effect=lambda: self.credential)
+        p.start()
+        self.addCleanup(p.stop)
+        self.addCleanup(auth.close_management_clients)
+
+    def test_one_client_per_type_and_subscription(self):
+        """Repeated calls reuse clients; all clients share one transport."""
+        a1 = self.auth.get_management_client(FakeClient, "sub-a")
+        a2 = self.auth.get_management_client(FakeClient, "sub-a")
+        b = self.auth.get_management_client(FakeClient, "sub-b")
+        tenant = self.auth.get_management_client(FakeTenantClient)
+
+        self.assertIs(a1, a2)
+        self.assertIsNot(a1, b)
+        self.assertEqual(len(FakeClient.instances), 3)
+        self.assertEqual((b.credential, b.subscription_id), (self.credential, "sub-b"))
+        self.assertIsNone(tenant.subscription_id)
+        self.assertIsNotNone(a1.transport)
+        self.assertIs(a1.transport, tenant.transport)
+
+    def test_clear_credential_cache_closes_and_rebuilds(self):
+        """Clients holding the old credential are closed and replaced."""
+        old = self.auth.get_management_client(FakeClient, "sub-a")
+        old_session = self.auth._shared_session
+
+        self.auth.clear_credential_cache()
+        self.credential = object()
+        new = self.auth.get_management_client(FakeClient, "sub-a")
+
+        self.assertTrue(old.closed)
+        self.assertIsNot(new, old)
+        self.assertIs(new.credential, self.credential)
+        self.assertIsNot(self.auth._shared_session, old_session)
+
+    def test_close_management_clients(self):
+        """Shutdown closes every client and the shared session."""
+        clients = [
+            self.auth.get_management_client(FakeClient, "sub-a"),
+            self.auth.get_management_client(FakeTenantClient),
+        ]
+        session = self.auth._shared_session
+
+        with patch.object(session, "close") as close_session:
+            self.auth.close_management_clients()
+
+        self.assertTrue(all(c.closed for c in clients))
+        close_session.assert_called_once()
+        self.assertEqual(self.auth._client_cache, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,189 @@
+"""Tests for the local Azure cost store.
+
+Tests fetch planning (backfill, new days, stale recent days, chunking),
+parsing of daily Cost Management results, and top-N group folding.
+"""
+
+import asyncio
+import sys
+import unittest
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+WORKSPACE_ROOT = Path(__file__).parent.parent
+sys.path.append(str(WORKSPACE_ROOT / "mcp_server_files"))
+
+TODAY = date(2024, 12, 20)
+NOW = datetime(2024, 12, 20, 12, 0, tzinfo=timezone.utc)
+
+
+class TestCostStore(unittest.TestCase):
+    """Test cost_store pure helpers."""
+
+    def setUp(self):
+        try:
+            from jexida_dashboard.mcp_tools_core.tools.azure import cost_store
+        except ImportError as e:
+            self.skipTest(f"Azure tool dependencies not installed: {e}")
+        self.cs = cost_store
+
+    def coverage(self, first, last, refreshed_hours_ago):
+        return self.cs.Coverage(first, last, NOW - timedelta(hours=refreshed_hours_ago))
+
+    def test_empty_store_fetches_window_in_chunks(self):
+        """Without coverage the whole window is fetched, never past today."""
+        ranges = self.cs.plan_fetch(date(2024, 11, 21), date(2024, 12, 31), None, TODAY, NOW)
+
+        self.assertEqual(ranges[0][0], date(2024, 11, 21))
+        self.assertEqual(ranges[-1][1], TODAY)
+        for (start, end), (next_start, _) in zip(ranges, ranges[1:]):
+            self.assertEqual(next_start, end + timedelta(days=1))
+        self.assertTrue(all((end - start).days < self.cs.FETCH_CHUNK_DAYS for start, end in ranges))
+
+    def test_covered_and_fresh_fetches_nothing(self):
+        """A covered window with recently refreshed data is answered locally."""
+        coverage = self.coverage(date(2024, 11, 1), TODAY, refreshed_hours_ago=1)
+
+        self.assertEqual(self.cs.plan_fetch(date(2024, 11, 20), TODAY, coverage, TODAY, NOW), [])
+
+    def test_only_missing_and_stale_recent_days(self):
+        """Older missing days and the stale revision window are fetched; the middle is not."""
+        coverage = self.coverage(date(2024, 11, 15), date(2024, 12, 18), refreshed_hours_ago=24)
+
+        ranges = self.cs.plan_fetch(date(2024, 11, 10), TODAY, coverage, TODAY, NOW)
+
+        revision_start = TODAY - timedelta(days=self.cs.COST_REVISION_DAYS)
+        self.assertEqual(ranges, [(date(2024, 11, 10), date(2024, 11, 14)), (revision_start, TODAY)])
+
+    def test_backfill_is_fetched_newest_first(self):
+        """Each backfill chunk borders the covered range when it is stored."""
+        coverage = self.coverage(date(2024, 11, 15), date(2024, 12, 18), refreshed_hours_ago=1)
+
+        ranges = self.cs.plan_fetch(date(2024, 10, 1), date(2024, 12, 18), coverage, TODAY, NOW)
+
+        self.assertEqual(ranges[0][1], date(2024, 11, 14))
+        self.assertEqual(ranges[-1][0], date(2024, 10, 1))
+        for (start, _), (_, next_end) in zip(ranges, ranges[1:]):
+            self.assertEqual(next_end, start - timedelta(days=1))
+
+    def test_extend_coverage_only_when_adjacent(self):
+        """A chunk that does not touch the covered range leaves it unchanged."""
+        first, last = date(2024, 11, 15), date(2024, 12, 18)
+
+        self.assertEqual(
+            self.cs.extend_coverage(first, last, date(2024, 11, 1), date(2024, 11, 14)),
+            (date(2024, 11, 1), last),
+        )
+        self.assertEqual(self.cs.extend_coverage(first, last, date(2024, 10, 1), date(2024, 10, 14)), (first, last))
+
+    def test_old_window_does_not_refresh_recent_days(self):
+        """A window entirely in the past ignores recent-day staleness."""
+        coverage = self.coverage(date(2024, 11, 1), TODAY, refreshed_hours_ago=48)
+
+        self.assertEqual(self.cs.plan_fetch(date(2024, 11, 1), date(2024, 11, 30), coverage, TODAY, NOW), [])
+
+    def test_parse_cost_rows(self):
+        """Rows are mapped by column name; resource group case variants merge."""
+        columns = ["totalCost", "UsageDate", "ResourceGroup", "ServiceName", "Currency"]
+        rows = [
+            [1.5, 20241201, "RG-App", "Storage", "EUR"],
+            [2.0, 20241201, "rg-app", "Storage", "EUR"],
+            [4.0, "2024-12-02T00:00:00", "", "Bandwidth", "EUR"],
+        ]
+
+        parsed = self.cs.parse_cost_rows(columns, rows)
+
+        self.assertEqual(len(parsed), 2)
+        first = next(r for r in parsed if r["resource_group"] == "rg-app")
+        self.assertEqual(first["cost"], 3.5)
+        self.assertEqual(first["day"], date(2024, 12, 1))
+        self.assertEqual(first["currency"], "EUR")
+        with self.assertRaises(ValueError):
+            self.cs.parse_cost_rows(["ResourceGroup"], [])
+
+    def test_limit_groups(self):
+        """Groups beyond top_n are folded into 'Other' per period."""
+        rows = [
+            {"period": "2024-12-01", "name": "a", "cost": 10.0},
+            {"period": "2024-12-01", "name": "b", "cost": 5.0},
+            {"period": "2024-12-01", "name": "c", "cost": 1.0},
+            {"period": "2024-12-02", "name": "c", "cost": 2.0},
+        ]
+
+        limited = self.cs.limit_groups(rows, 1)
+
+        self.assertEqual(
+            [(r["period"], r["name"], r["cost"]) for r in limited],
+            [("2024-12-01", "a", 10.0), ("2024-12-01", "Other", 6.0), ("2024-12-02", "Other", 2.0)],
+        )
+        self.assertEqual(self.cs.limit_groups(rows, 0), rows)
+
+    def test_ensure_costs_fetches_once_and_falls_back_to_stored(self):
+        """A second call is served locally; a failed refresh serves stored data."""
+        cs = self.cs
+
+        class MemoryCostStore:
+            def __init__(self):
+                self.cov = None
+                self.rows = {}
+
+            def coverage(self, subscription_id):
+                return self.cov
+
+            def replace(self, subscription_id, start, end, rows, refreshed):
+                self.rows[(start, end)] = rows
+                first, last = cs.extend_coverage(self.cov.first_day, self.cov.last_day, start, end) if self.cov else (start, end)
+                refreshed_at = datetime.now(timezone.utc) if refreshed or not self.cov else self.cov.refreshed_at
+                self.cov = cs.Coverage(first, last, refreshed_at)
+
+        calls = []
+
+        def fetch(subscription_id, start, end):
+            calls.append((start, end))
+            return [{"day": start, "resource_group": "rg", "service_name": "svc", "cost": 1.0, "currency": "USD"}]
+
+        def broken_fetch(subscription_id, start, end):
+            raise RuntimeError("throttled")
+
+        store = MemoryCostStore()
+        today = cs.utc_today()
+        from_day = today - timedelta(days=29)
+
+        first = asyncio.run(cs.ensure_costs("sub", from_day, today, store=store, fetch=fetch))
+        second = asyncio.run(cs.ensure_costs("sub", from_day, today, store=store, fetch=fetch))
+
+        self.assertEqual(first["fetched_ranges"], len(calls))
+        self.assertGreater(len(calls), 1)
+        self.assertEqual(second["fetched_ranges"], 0)
+
+        store.cov = cs.Coverage(store.cov.first_day, store.cov.last_day, store.cov.refreshed_at - timedelta(days=2))
+        fallback = asyncio.run(cs.ensure_costs("sub", from_day, today, store=store, fetch=broken_fetch))
+        self.assertTrue(fallback["stale"])
+        with self.assertRaises(RuntimeError):
+            asyncio.run(cs.ensure_costs("sub", from_day - timedelta(days=30), today, store=store, fetch=broken_fetch))
+
+        # A throttled chunk in the middle of a backfill leaves no hole in the coverage
+        covered_from = store.cov.first_day
+        attempts = []
+
+        def throttled_second_chunk(subscription_id, start, end):
+            attempts.append((start, end))
+            if len(attempts) == 2:
+                raise RuntimeError("429 Too Many Requests")
+            return fetch(subscription_id, start, end)
+
+        backfill_from = covered_from - timedelta(days=45)
+        with self.assertRaises(RuntimeError):
+            asyncio.run(cs.ensure_costs("sub", backfill_from, today, store=store, fetch=throttled_second_chunk))
+        self.assertEqual(store.cov.first_day, attempts[0][0])
+        self.assertEqual(attempts[0][1], covered_from - timedelta(days=1))
+
+        calls.clear()
+        asyncio.run(cs.ensure_costs("sub", backfill_from, today, store=store, fetch=fetch))
+        self.assertEqual(calls[0][1], attempts[0][0] - timedelta(days=1))
+        self.assertIn(backfill_from, [start for start, _ in calls])
+        self.assertEqual(store.cov.first_day, backfill_from)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+"""Tests for background ARM deployment tracking.
+
+Tests flattening of SDK deployment objects, change detection, backoff,
+and the tracker's poll loop against an in-memory store.
+"""
+
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+WORKSPACE_ROOT = Path(__file__).parent.parent
+sys.path.append(str(WORKSPACE_ROOT / "mcp_server_files"))
+
+
+def make_operation(op_id, state, name="web", code="", message=None):
+    return SimpleNamespace(
+        operation_id=op_id,
+        properties=SimpleNamespace(
+            provisioning_state=state,
+            status_code=code,
+            status_message=message,
+            target_resource=SimpleNamespace(resource_type="Microsoft.Web/sites", resource_name=name),
+        ),
+    )
+
+
+def make_deployment(state, outputs=None, error=None):
+    return SimpleNamespace(properties=SimpleNamespace(
+        provisioning_state=state,
+        correlation_id="corr-1",
+        outputs=outputs,
+        error=error,
+    ))
+
+
+class MemoryStore:
+    """In-memory stand-in for DeploymentStore."""
+
+    def __init__(self, deployment):
+        self.deployment = deployment
+        self.operations = {}
+
+    def get(self, handle):
+        return dict(self.deployment) if handle == self.deployment["handle"] else None
+
+    def known_operations(self, handle):
+        return {k: (v["provisioning_state"], v["status_code"], v["status_message"]) for k, v in self.operations.items()}
+
+    def record(self, handle, state, operations):
+        for op in operations:
+            self.deployment["sequence"] += 1
+            self.operations[op["operation_id"]] = dict(op, sequence=self.deployment["sequence"])
+        changed = bool(operations)
+        for field, value in state.items():
+            if value and value != self.deployment.get(field):
+                self.deployment[field] = value
+                changed = True
+        if changed and not operations:
+            self.deployment["sequence"] += 1
+        return self.deployment["sequence"]
+
+    def set_error(self, handle, error):
+        self.deployment["error"] = error
+
+    def mark_timed_out(self, handle, error):
+        self.record(handle, {"provisioning_state": "TimedOut", "error": error}, [])
+
+
+class TestDeploymentTracker(unittest.TestCase):
+    """Test deployment_tracker helpers and poll loop."""
+
+    def setUp(self):
+        try:
+            from jexida_dashboard.mcp_tools_core.tools.azure import deployment_tracker
+        except ImportError as e:
+            self.skipTest(f"Azure tool dependencies not installed: {e}")
+        self.dt = deployment_tracker
+
+    def test_flatten_operation_and_deployment(self):
+        """SDK objects become plain dicts; outputs are unwrapped to values."""
+        op = self.dt.operation_state(make_operation("op1", "Failed", code="Conflict", message={"error": "x"}))
+        self.assertEqual(op["resource_name"], "web")
+        self.assertEqual(op["status_code"], "Conflict")
+        self.assertIn("error", op["status_message"])
+
+        state = self.dt.deployment_state(make_deployment(
+            "Succeeded", outputs={"url": {"type": "String", "value": "https://app"}},
+        ))
+        self.assertEqual(state["outputs"], {"url": "https://app"})
+        self.assertEqual(state["error"], "")
+
+    def test_changed_operations(self):
+        """Only new operations and state changes are reported."""
+        known = {"op1": ("Running", "", ""), "op2": ("Succeeded", "OK", "")}
+        fetched = [
+            self.dt.operation_state(make_operation("op1", "Succeeded", code="OK")),
+            self.dt.operation_state(make_operation("op2", "Succeeded", code="OK")),
+            self.dt.operation_state(make_operation("op3", "Running", name="db")),
+        ]
+
+        changed = self.dt.changed_operations(known, fetched)
+
+        self.assertEqual([c["operation_id"] for c in changed], ["op1", "op3"])
+
+    def test_backoff(self):
+        """Intervals grow to the maximum while idle and reset on change."""
+        interval = self.dt.INITIAL_INTERVAL
+        for _ in range(20):
+            interval = self.dt.next_interval(interval, False)
+        self.assertEqual(interval, self.dt.MAX_INTERVAL)
+        self.assertEqual(self.dt.next_interval(interval, True), self.dt.INITIAL_INTERVAL)
+
+    def test_follow_until_terminal(self):
+        """The tracker records operation changes and stops when the deployment finishes."""
+        polls = [
+            (make_deployment("Running"), [make_operation("op1", "Running")]),
+            (make_deployment("Running"), [make_operation("op1", "Running")]),
+            (make_deployment("Succeeded", outputs={"url": {"value": "https://app"}}),
+             [make_operation("op1", "Succeeded", code="OK")]),
+        ]
+        store = MemoryStore({
+            "handle": "h1", "deployment_name": "app", "provisioning_state": "Accepted",
+            "correlation_id": "", "outputs": {}, "error": "", "sequence": 0, "finished": False,
+        })
+        tracker = self.dt.DeploymentTracker(store=store, fetch=lambda deployment: polls.pop(0))
+
+        with patch.object(self.dt, "INITIAL_INTERVAL", 0), patch.object(self.dt, "MAX_INTERVAL", 0):
+            asyncio.run(tracker.follow("h1", timeout=5))
+
+        self.assertEqual(polls, [])
+        self.assertEqual(store.deployment["provisioning_state"], "Succeeded")
+        self.assertEqual(store.deployment["outputs"], {"url": "https://app"})
+        self.assertEqual(store.operations["op1"]["provisioning_state"], "Succeeded")
+        # One sequence number per operation change; deployment changes in the same poll ride along
+        self.assertEqual(store.operations["op1"]["sequence"], 2)
+        self.assertEqual(store.deployment["sequence"], 2)
+
+    def test_follow_timeout_is_terminal(self):
+        """A deployment the tracker gives up on is not resumed again."""
+        store = MemoryStore({
+            "handle": "h1", "deployment_name": "app", "provisioning_state": "Accepted",
+            "correlation_id": "", "outputs": {}, "error": "", "sequence": 0, "finished": False,
+        })
+        tracker = self.dt.DeploymentTracker(store=store, fetch=lambda deployment: (make_deployment("Running"), []))
+
+        with patch.object(self.dt, "INITIAL_INTERVAL", 0), patch.object(self.dt, "MAX_INTERVAL", 0):
+            asyncio.run(tracker.follow("h1", timeout=0.05))
+
+        self.assertEqual(store.deployment["provisioning_state"], self.dt.TIMED_OUT_STATE)
+        self.assertIn(store.deployment["provisioning_state"], self.dt.TERMINAL_STATES)
+        self.assertIn("Stopped tracking", store.deployment["error"])
+
+
+if __name__ == "__main__":
+    unittest.main()
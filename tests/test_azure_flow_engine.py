@@ -0,0 +1,170 @@
+"""Tests for the Azure flow DAG engine.
+
+Tests dependency ordering, concurrency of independent branches, the
+concurrency limit, downstream-only skipping on failure, and resume.
+"""
+
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+WORKSPACE_ROOT = Path(__file__).parent.parent
+sys.path.append(str(WORKSPACE_ROOT / "mcp_server_files"))
+
+
+class TestFlowEngine(unittest.TestCase):
+    """Test flows.run_flow and helpers."""
+
+    def setUp(self):
+        try:
+            from jexida_dashboard.mcp_tools_core.tools.azure import flows
+        except ImportError as e:
+            self.skipTest(f"Azure tool dependencies not installed: {e}")
+        self.flows = flows
+        self.events = []
+        self.running = 0
+        self.peak = 0
+
+    def step(self, name, depends_on=(), delay=0.05, fail=False, required=True):
+        async def run(results):
+            self.events.append(("start", name, sorted(results)))
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+            await asyncio.sleep(delay)
+            self.running -= 1
+            self.events.append(("end", name))
+            if fail:
+                return SimpleNamespace(success=False, error=f"{name} broke")
+            return {"name": name}
+
+        return self.flows.FlowStep(name, run, tuple(depends_on), description=f"create {name}", required=required)
+
+    def data_services(self, **overrides):
+        return [
+            self.step("storage"),
+            self.step("container", ["storage"], **overrides.get("container", {})),
+            self.step("sql_server"),
+            self.step("sql_database", ["sql_server"], **overrides.get("sql_database", {})),
+            self.step("firewall", ["sql_server"], required=False),
+        ]
+
+    def test_independent_chains_run_concurrently(self):
+        """Storage and SQL chains overlap; dependents see upstream results."""
+        results = asyncio.run(self.flows.run_flow(self.data_services(), max_concurrency=4))
+
+        self.assertTrue(all(r.status == "succeeded" for r in results.values()))
+        self.assertEqual(list(results), ["storage", "container", "sql_server", "sql_database", "firewall"])
+        self.assertGreaterEqual(self.peak, 2)
+        starts = {e[1]: e[2] for e in self.events if e[0] == "start"}
+        self.assertIn("storage", starts["container"])
+        self.assertIn("sql_server", starts["sql_database"])
+        self.assertEqual(results["container"].result, {"name": "container"})
+
+    def test_concurrency_limit(self):
+        """No more than max_concurrency steps run at once."""
+        steps = [self.step(f"s{i}") for i in range(6)]
+
+        asyncio.run(self.flows.run_flow(steps, max_concurrency=2))
+
+        self.assertEqual(self.peak, 2)
+
+    def test_failure_skips_downstream_only(self):
+        """A failed step skips its dependents; the other chain completes."""
+        steps = [
+            self.step("storage", fail=True),
+            self.step("container", ["storage"]),
+            self.step("cdn", ["container"]),
+            self.step("sql_server"),
+            self.step("sql_database", ["sql_server"]),
+        ]
+
+        results = asyncio.run(self.flows.run_flow(steps))
+
+        self.assertEqual(results["storage"].status, "failed")
+        self.assertEqual(results["storage"].error, "storage broke")
+        self.assertEqual(results["container"].status, "skipped")
+        self.assertEqual(results["cdn"].status, "skipped")
+        self.assertEqual(results["sql_database"].status, "succeeded")
+        self.assertEqual(self.flows.flow_error(steps, results), "Failed to create storage: storage broke")
+
+    def test_optional_step_failure_is_not_a_flow_error(self):
+        """A failed non-required step does not fail the flow."""
+        steps = [self.step("sql_server"), self.step("firewall", ["sql_server"], fail=True, required=False)]
+
+        results = asyncio.run(self.flows.run_flow(steps))
+
+        self.assertEqual(results["firewall"].status, "failed")
+        self.assertEqual(self.flows.flow_error(steps, results), "")
+
+    def test_resume_skips_completed_steps(self):
+        """Completed steps are not re-run and their results reach dependents."""
+        steps = self.data_services()
+        completed = {"storage": {"name": "storage"}, "sql_server": {"name": "sql_server"}}
+
+        results = asyncio.run(self.flows.run_flow(steps, completed=completed))
+
+        started = [e[1] for e in self.events if e[0] == "start"]
+        self.assertNotIn("storage", started)
+        self.assertNotIn("sql_server", started)
+        self.assertEqual(results["storage"].status, "resumed")
+        self.assertEqual(results["container"].status, "succeeded")
+
+    def test_run_checkpointed_flow_records_steps(self):
+        """Each decided step is checkpointed and the run is finished with its error."""
+        flows = self.flows
+
+        class MemoryRunStore:
+            def __init__(self):
+                self.runs = {}
+
+            def create(self, flow, params):
+                self.runs["r1"] = {"run_id": "r1", "flow": flow, "params": params, "status": "running", "steps": {}}
+                return "r1"
+
+            def load(self, run_id):
+                return self.runs.get(run_id)
+
+            def save_step(self, run_id, result):
+                self.runs[run_id]["steps"][result.name] = result.to_dict()
+
+            def finish(self, run_id, error):
+                self.runs[run_id]["status"] = "failed" if error else "succeeded"
+
+        store = MemoryRunStore()
+        first = [self.step("storage"), self.step("container", ["storage"], fail=True)]
+        params = {"base_name": "app", "tags": {"env": "dev"}}
+        run_id, results, error = asyncio.run(flows.run_checkpointed_flow("flow", first, params, store=store))
+        self.assertEqual(store.runs["r1"]["status"], "failed")
+        self.assertIn("container broke", error)
+
+        self.events = []
+        retry = [self.step("storage"), self.step("container", ["storage"])]
+        with self.assertRaises(ValueError) as changed:
+            asyncio.run(flows.run_checkpointed_flow(
+                "flow", retry, dict(params, base_name="other"), resume_run_id="r1", store=store,
+            ))
+        self.assertIn("base_name", str(changed.exception))
+        self.assertEqual(self.events, [])
+
+        run_id, results, error = asyncio.run(
+            flows.run_checkpointed_flow("flow", retry, params, resume_run_id="r1", store=store)
+        )
+        self.assertEqual([e[1] for e in self.events if e[0] == "start"], ["container"])
+        self.assertEqual(error, "")
+        self.assertEqual(store.runs["r1"]["status"], "succeeded")
+
+        with self.assertRaises(ValueError):
+            asyncio.run(flows.run_checkpointed_flow("other_flow", retry, params, resume_run_id="r1", store=store))
+
+    def test_validate_flow(self):
+        """Unknown dependencies and cycles are rejected."""
+        with self.assertRaises(ValueError):
+            self.flows.validate_flow([self.step("a", ["missing"])])
+        with self.assertRaises(ValueError):
+            self.flows.validate_flow([self.step("a", ["b"]), self.step("b", ["a"])])
+
+
+if __name__ == "__main__":
+    unittest.main()
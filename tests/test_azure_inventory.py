@@ -0,0 +1,204 @@
+"""Tests for Azure inventory snapshots and diffs.
+
+Tests row normalization and hashing, snapshot storage from paged Resource
+Graph results, and diffs between snapshots (including the unchanged fast
+path and subscriptions missing from one side).
+"""
+
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+
+WORKSPACE_ROOT = Path(__file__).parent.parent
+sys.path.append(str(WORKSPACE_ROOT / "mcp_server_files"))
+
+SUB_A = "aaaaaaaa-0000-0000-0000-000000000000"
+SUB_B = "bbbbbbbb-0000-0000-0000-000000000000"
+
+
+def graph_row(sub, name, rtype="Microsoft.Web/sites", location="EastUS", tags=None, sku=None, state="Succeeded"):
+    return {
+        "id": f"/subscriptions/{sub}/resourceGroups/RG-App/providers/{rtype}/{name}",
+        "name": name,
+        "type": rtype,
+        "location": location,
+        "resourceGroup": "RG-App",
+        "subscriptionId": sub,
+        "tags": tags or {},
+        "sku": sku,
+        "provisioningState": state,
+    }
+
+
+class MemoryInventoryStore:
+    """In-memory stand-in for InventoryStore."""
+
+    def __init__(self):
+        self.snapshots_by_id = {}
+        self.rows = {}
+        self.hash_reads = 0
+
+    def save(self, taken_at, subscriptions, resources, content_hash, duration_seconds):
+        snapshot_id = len(self.snapshots_by_id) + 1
+        info = {
+            "id": snapshot_id,
+            "taken_at": taken_at,
+            "subscriptions": list(subscriptions),
+            "resource_count": len(resources),
+            "content_hash": content_hash,
+            "duration_seconds": duration_seconds,
+        }
+        self.snapshots_by_id[snapshot_id] = info
+        self.rows[snapshot_id] = {r["resource_id"]: dict(r) for r in resources}
+        return dict(info)
+
+    def snapshots(self, limit=20):
+        ordered = sorted(self.snapshots_by_id.values(), key=lambda s: (s["taken_at"], s["id"]), reverse=True)
+        return [dict(s) for s in ordered[:limit]]
+
+    def get(self, snapshot_id):
+        info = self.snapshots_by_id.get(snapshot_id)
+        return dict(info) if info else None
+
+    def previous(self, snapshot):
+        older = [s for s in self.snapshots() if (s["taken_at"], s["id"]) < (snapshot["taken_at"], snapshot["id"])]
+        return older[0] if older else None
+
+    def hashes(self, snapshot_id, subscriptions=None, resource_type=None):
+        self.hash_reads += 1
+        return {
+            rid: r["content_hash"]
+            for rid, r in self.rows[snapshot_id].items()
+            if (subscriptions is None or r["subscription_id"] in subscriptions)
+            and (not resource_type or r["resource_type"] == resource_type.lower())
+        }
+
+    def resources(self, snapshot_id, resource_ids):
+        return {rid: self.rows[snapshot_id][rid] for rid in resource_ids}
+
+    def prune(self, before):
+        return 0
+
+
+class TestInventory(unittest.TestCase):
+    """Test inventory snapshotting and diffing."""
+
+    def setUp(self):
+        try:
+            from jexida_dashboard.mcp_tools_core.tools.azure import inventory
+        except ImportError as e:
+            self.skipTest(f"Azure tool dependencies not installed: {e}")
+        self.inv = inventory
+        self.store = MemoryInventoryStore()
+
+    def snapshot(self, rows_by_sub, truncated=False):
+        """Take a snapshot from fake Resource Graph pages of two rows each."""
+        def fetch(subscriptions, query, top, skip_token):
+            rows = [row for sub in subscriptions for row in rows_by_sub.get(sub, [])]
+            start = int(skip_token or 0)
+            page = rows[start:start + 2]
+            more = start + 2 < len(rows)
+            return page, str(start + 2) if more else None, len(rows), truncated
+
+        return asyncio.run(self.inv.take_snapshot(list(rows_by_sub), store=self.store, fetch=fetch))
+
+    def diff(self, **kwargs):
+        return asyncio.run(self.inv.diff_snapshots(store=self.store, **kwargs))
+
+    def test_normalize_and_hash(self):
+        """IDs and types are lowercased; the hash ignores key order and case of IDs."""
+        row = graph_row(SUB_A, "app1", tags={"env": "prod", "team": "web"}, sku={"name": "S1"})
+        resource = self.inv.normalize_resource(row)
+
+        self.assertEqual(resource["resource_type"], "microsoft.web/sites")
+        self.assertEqual(resource["resource_group"], "rg-app")
+        self.assertEqual(resource["location"], "eastus")
+        self.assertTrue(resource["resource_id"].islower())
+
+        reordered = dict(row, tags={"team": "web", "env": "prod"}, id=row["id"].upper())
+        self.assertEqual(
+            self.inv.resource_hash(resource),
+            self.inv.resource_hash(self.inv.normalize_resource(reordered)),
+        )
+        self.assertNotEqual(
+            self.inv.resource_hash(resource),
+            self.inv.resource_hash(self.inv.normalize_resource(dict(row, sku={"name": "P1v3"}))),
+        )
+
+    def test_snapshot_pages_all_resources(self):
+        """Every page is stored; an identical second snapshot is reported unchanged."""
+        rows = {SUB_A: [graph_row(SUB_A, f"app{i}") for i in range(5)]}
+
+        first = self.snapshot(rows)
+        second = self.snapshot(rows)
+
+        self.assertEqual(first["resource_count"], 5)
+        self.assertFalse(first["unchanged"])
+        self.assertTrue(second["unchanged"])
+        self.assertEqual(first["content_hash"], second["content_hash"])
+
+    def test_truncated_result_is_not_stored(self):
+        """A truncated inventory would look like mass deletion, so it is refused."""
+        with self.assertRaises(ValueError):
+            self.snapshot({SUB_A: [graph_row(SUB_A, "app1")]}, truncated=True)
+        self.assertEqual(self.store.snapshots(), [])
+
+    def test_diff_added_removed_modified(self):
+        """Changes are classified and modified fields carry before and after."""
+        self.snapshot({SUB_A: [
+            graph_row(SUB_A, "keep"),
+            graph_row(SUB_A, "gone"),
+            graph_row(SUB_A, "retag", tags={"env": "dev"}),
+        ]})
+        self.snapshot({SUB_A: [
+            graph_row(SUB_A, "keep"),
+            graph_row(SUB_A, "retag", tags={"env": "prod"}),
+            graph_row(SUB_A, "db", rtype="Microsoft.Sql/servers"),
+        ]})
+
+        diff = self.diff()
+
+        self.assertEqual((diff["from"]["id"], diff["to"]["id"]), (1, 2))
+        self.assertEqual([r["name"] for r in diff["added"]], ["db"])
+        self.assertEqual([r["name"] for r in diff["removed"]], ["gone"])
+        self.assertEqual([r["name"] for r in diff["modified"]], ["retag"])
+        self.assertEqual(diff["modified"][0]["changes"], {"tags": {"before": {"env": "dev"}, "after": {"env": "prod"}}})
+
+        sites_only = self.diff(resource_type="Microsoft.Web/sites")
+        self.assertEqual(sites_only["added"], [])
+
+    def test_unchanged_diff_reads_no_rows(self):
+        """Equal snapshot hashes short-circuit the diff."""
+        rows = {SUB_A: [graph_row(SUB_A, "app1")]}
+        self.snapshot(rows)
+        self.snapshot(rows)
+
+        diff = self.diff()
+
+        self.assertEqual((diff["added"], diff["removed"], diff["modified"]), ([], [], []))
+        self.assertEqual(self.store.hash_reads, 0)
+
+    def test_new_subscription_is_not_reported_as_added(self):
+        """Only subscriptions present in both snapshots are compared."""
+        self.snapshot({SUB_A: [graph_row(SUB_A, "app1")]})
+        self.snapshot({SUB_A: [graph_row(SUB_A, "app1")], SUB_B: [graph_row(SUB_B, "other")]})
+
+        diff = self.diff()
+
+        self.assertEqual(diff["subscriptions"], [SUB_A])
+        self.assertEqual(diff["added"], [])
+
+    def test_missing_snapshots(self):
+        """Diffing needs two snapshots; unknown IDs are reported."""
+        with self.assertRaises(ValueError):
+            self.diff()
+        self.snapshot({SUB_A: [graph_row(SUB_A, "app1")]})
+        with self.assertRaises(ValueError):
+            self.diff()
+        with self.assertRaises(ValueError):
+            self.diff(from_snapshot_id=42, to_snapshot_id=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+"""Tests for batched Azure metric queries.
+
+Tests duration handling, grid alignment, budget-driven downsampling, and
+the batch tool's concurrency limit and per-resource error reporting.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import types
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+WORKSPACE_ROOT = Path(__file__).parent.parent
+sys.path.append(str(WORKSPACE_ROOT / "mcp_server_files"))
+
+
+class TestMetricsBatch(unittest.TestCase):
+    """Test monitoring batch-metric helpers and tool."""
+
+    def setUp(self):
+        try:
+            from jexida_dashboard.mcp_tools_core.tools.azure import monitoring
+        except ImportError as e:
+            self.skipTest(f"Azure tool dependencies not installed: {e}")
+        self.m = monitoring
+
+    def test_durations(self):
+        """ISO 8601 durations round-trip; months and junk are rejected."""
+        self.assertEqual(self.m.parse_duration("PT5M"), timedelta(minutes=5))
+        self.assertEqual(self.m.parse_duration("P1DT12H"), timedelta(days=1, hours=12))
+        self.assertEqual(self.m.format_duration(timedelta(minutes=90)), "PT1H30M")
+        self.assertEqual(self.m.format_duration(timedelta(days=1)), "P1D")
+        for bad in ("P1M", "5m", "PT", "PT0M"):
+            with self.assertRaises(ValueError):
+                self.m.parse_duration(bad)
+
+    def test_window_and_alignment(self):
+        """The window ends on an interval boundary; points land in their slots."""
+        now = datetime(2024, 1, 1, 12, 7, 30, tzinfo=timezone.utc)
+        start, count = self.m.metric_window(timedelta(hours=1), timedelta(minutes=5), now)
+
+        self.assertEqual(start, datetime(2024, 1, 1, 11, 5, tzinfo=timezone.utc))
+        self.assertEqual(count, 12)
+
+        points = [(start, 1.0), (start + timedelta(minutes=10), 3.0), (start + timedelta(hours=2), 9.0)]
+        values = self.m.align_points(points, start, timedelta(minutes=5), count)
+        self.assertEqual(values[:3], [1.0, None, 3.0])
+        self.assertEqual(len(values), 12)
+
+    def test_downsample(self):
+        """Buckets combine by aggregation and the factor fits the budget."""
+        values = [1.0, 3.0, None, None, 5.0, 7.0]
+
+        self.assertEqual(self.m.downsample(values, 2, "Average"), [2.0, None, 6.0])
+        self.assertEqual(self.m.downsample(values, 3, "Total"), [4.0, 12.0])
+        self.assertEqual(self.m.downsample(values, 3, "Maximum"), [3.0, 7.0])
+        self.assertEqual(self.m.downsample_factor(288, 4, 100), 12)
+        self.assertEqual(self.m.downsample_factor(12, 2, 500), 1)
+        self.assertEqual(self.m.downsample_factor(12, 1000, 10), 12)
+
+    def test_batch_tool(self):
+        """Resources are fetched concurrently up to the limit and share one grid."""
+        m = self.m
+        lock = threading.Lock()
+        state = {"running": 0, "peak": 0}
+
+        def fake_fetch(resource_id, metric_names, timespan, interval, aggregation):
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.05)
+            with lock:
+                state["running"] -= 1
+            if resource_id.endswith("broken"):
+                raise RuntimeError("metric not supported")
+            start = datetime.fromisoformat(timespan.split("/")[0])
+            points = [(start + timedelta(minutes=5 * i), float(i)) for i in range(12)]
+            return [(name, "Percent", {}, points) for name in metric_names]
+
+        ids = [f"/subscriptions/s/resourceGroups/rg/providers/Microsoft.Web/sites/app{i}" for i in range(5)]
+        params = m.AzureMonitoringGetMetricsBatchInput(
+            resource_ids=ids + ["/subscriptions/s/resourceGroups/rg/providers/Microsoft.Web/sites/broken"],
+            metric_names=["CpuPercentage"],
+            timespan="PT1H",
+            interval="PT5M",
+            max_points=30,
+        )
+
+        with patch.object(m, "_fetch_metric_points", fake_fetch), patch.object(m, "METRICS_MAX_CONCURRENCY", 2):
+            result = asyncio.run(m.azure_monitoring_get_metrics_batch(params))
+
+        self.assertTrue(result.success)
+        self.assertEqual(state["peak"], 2)
+        self.assertEqual(len(result.series), 5)
+        self.assertEqual(result.interval, "PT10M")
+        self.assertEqual(len(result.timestamps), 6)
+        self.assertTrue(all(len(s.values) == 6 for s in result.series))
+        self.assertEqual(result.series[0].values[0], 0.5)
+        self.assertEqual(result.series[0].resource_name, "app0")
+        self.assertEqual([e.error for e in result.errors], ["metric not supported"])
+
+    def test_dimension_timeseries_stay_separate(self):
+        """Each timeseries of a split metric becomes its own series."""
+        m = self.m
+        ns = types.SimpleNamespace
+        start = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+        def timeseries(instance, values):
+            return ns(
+                metadatavalues=[ns(name=ns(value="Instance"), value=instance)],
+                data=[ns(time_stamp=start + timedelta(minutes=5 * i), average=v) for i, v in enumerate(values)],
+            )
+
+        response = ns(value=[
+            ns(name=ns(value="CpuPercentage"), unit=ns(value="Percent"), timeseries=[
+                timeseries("a", [10.0, 20.0]),
+                timeseries("b", [90.0, 80.0]),
+            ]),
+            ns(name=ns(value="Requests"), unit=ns(value="Count"), timeseries=[]),
+        ])
+        client = ns(metrics=ns(list=lambda **kwargs: response))
+        fake_sdk = types.ModuleType("azure.mgmt.monitor")
+        fake_sdk.MonitorManagementClient = object
+
+        with patch.dict(sys.modules, {"azure.mgmt.monitor": fake_sdk}), \
+                patch.object(m, "get_management_client", return_value=client):
+            metrics = m._fetch_metric_points(
+                "/subscriptions/s/resourceGroups/rg/providers/Microsoft.Web/sites/app",
+                ["CpuPercentage", "Requests"], "", "PT5M", "Average",
+            )
+
+        self.assertEqual([(name, dims) for name, _, dims, _ in metrics], [
+            ("CpuPercentage", {"Instance": "a"}),
+            ("CpuPercentage", {"Instance": "b"}),
+            ("Requests", {}),
+        ])
+        self.assertEqual([v for _, v in metrics[0][3]], [10.0, 20.0])
+        self.assertEqual([v for _, v in metrics[1][3]], [90.0, 80.0])
+        self.assertEqual(metrics[2][3], [])
+
+    def test_batch_tool_requires_resources(self):
+        """Without resource IDs or a group and type, the call fails cleanly."""
+        params = self.m.AzureMonitoringGetMetricsBatchInput(metric_names=["CpuPercentage"])
+
+        result = asyncio.run(self.m.azure_monitoring_get_metrics_batch(params))
+
+        self.assertFalse(result.success)
+        self.assertIn("resource_ids", result.error)
+
+
+if __name__ == "__main__":
+    unittest.main()
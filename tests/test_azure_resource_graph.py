@@ -0,0 +1,139 @@
+"""Tests for paged Resource Graph queries.
+
+Tests skip-token paging, the row limit, fan-out across subscription
+batches, error propagation, the query cache, and NDJSON streaming.
+"""
+
+import asyncio
+import json
+import sys
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+WORKSPACE_ROOT = Path(__file__).parent.parent
+sys.path.append(str(WORKSPACE_ROOT / "mcp_server_files"))
+
+
+class FakeGraph:
+    """Serves `rows_per_sub` rows per subscription; skip tokens are row offsets."""
+
+    def __init__(self, rows_per_sub, fail_on=None):
+        self.rows_per_sub = rows_per_sub
+        self.fail_on = fail_on
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, subscriptions, query, top, skip_token):
+        with self.lock:
+            self.calls.append((tuple(subscriptions), top, skip_token))
+        if self.fail_on and self.fail_on in subscriptions:
+            raise RuntimeError("throttled")
+        rows = [{"id": f"/subscriptions/{s}/r{i}"} for s in subscriptions for i in range(self.rows_per_sub)]
+        start = int(skip_token or 0)
+        end = start + top
+        next_token = str(end) if end < len(rows) else None
+        return rows[start:end], next_token, len(rows), False
+
+
+class TestResourceGraph(unittest.TestCase):
+    """Test resource_graph paging, fan-out, and caching."""
+
+    def setUp(self):
+        try:
+            from jexida_dashboard.mcp_tools_core.tools.azure import resource_graph
+        except ImportError as e:
+            self.skipTest(f"Azure tool dependencies not installed: {e}")
+        self.rg = resource_graph
+        self.rg.clear_graph_cache()
+        self.addCleanup(self.rg.clear_graph_cache)
+
+    def collect(self, subscriptions, fetch, limit=None, use_cache=False):
+        stats = self.rg.GraphQueryStats()
+
+        async def run():
+            return [row async for row in self.rg.iter_graph_rows(
+                "Resources | project id", subscriptions, limit, use_cache, stats, fetch,
+            )]
+
+        return asyncio.run(run()), stats
+
+    def test_follows_skip_tokens(self):
+        """All rows are read across pages of at most GRAPH_PAGE_SIZE."""
+        fetch = FakeGraph(2500)
+
+        rows, stats = self.collect(["sub-a"], fetch)
+
+        self.assertEqual(len(rows), 2500)
+        self.assertEqual(len({r["id"] for r in rows}), 2500)
+        self.assertEqual(stats.pages, 3)
+        self.assertEqual(stats.total_records, 2500)
+        self.assertFalse(stats.has_more)
+        self.assertEqual([c[2] for c in fetch.calls], [None, "1000", "2000"])
+
+    def test_limit_stops_paging(self):
+        """Paging stops at the limit and reports that more rows exist."""
+        fetch = FakeGraph(2500)
+
+        rows, stats = self.collect(["sub-a"], fetch, limit=1200)
+
+        self.assertEqual(len(rows), 1200)
+        self.assertTrue(stats.has_more)
+        self.assertEqual([c[1] for c in fetch.calls], [1000, 200])
+
+    def test_fans_out_across_subscription_batches(self):
+        """Subscriptions are split into batches whose results are merged."""
+        fetch = FakeGraph(3)
+        subscriptions = [f"sub-{i}" for i in range(5)]
+
+        with patch.object(self.rg, "GRAPH_SUBSCRIPTION_BATCH", 2):
+            rows, stats = self.collect(subscriptions, fetch)
+
+        self.assertEqual(len(rows), 15)
+        self.assertEqual(stats.subscriptions, 5)
+        self.assertEqual(stats.total_records, 15)
+        self.assertEqual(sorted(len(c[0]) for c in fetch.calls), [1, 2, 2])
+
+    def test_batch_error_propagates(self):
+        """A failed batch fails the whole query."""
+        fetch = FakeGraph(3, fail_on="sub-3")
+
+        with patch.object(self.rg, "GRAPH_SUBSCRIPTION_BATCH", 2):
+            with self.assertRaises(RuntimeError):
+                self.collect([f"sub-{i}" for i in range(5)], fetch)
+
+    def test_cache_keyed_by_normalized_query(self):
+        """Queries differing only in layout and comments share a cache entry."""
+        fetch = FakeGraph(3)
+        stats = self.rg.GraphQueryStats()
+
+        async def run(query):
+            return [row async for row in self.rg.iter_graph_rows(query, ["sub-a"], stats=stats, fetch=fetch)]
+
+        first = asyncio.run(run("Resources\n| where name == 'a  b'  // apps\n| project id"))
+        second = asyncio.run(run("Resources | where name == 'a  b' | project id"))
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(fetch.calls), 1)
+        self.assertTrue(stats.cached)
+        self.assertNotEqual(
+            self.rg.normalize_kql("where name == 'a  b'"),
+            self.rg.normalize_kql("where name == 'a b'"),
+        )
+
+    def test_stream_ndjson(self):
+        """Rows stream as NDJSON lines followed by a stats line."""
+        lines = list(self.rg.stream_ndjson("Resources", ["sub-a"], limit=5, use_cache=False, fetch=FakeGraph(10)))
+        records = [json.loads(line) for line in "".join(lines).splitlines()]
+
+        self.assertEqual(len(records), 6)
+        self.assertEqual(records[-1]["_meta"]["rows"], 5)
+        self.assertTrue(records[-1]["_meta"]["has_more"])
+
+        failed = list(self.rg.stream_ndjson("Resources", ["sub-a"], fetch=FakeGraph(1, fail_on="sub-a")))
+        self.assertIn("_error", json.loads(failed[-1]))
+
+
+if __name__ == "__main__":
+    unittest.main()
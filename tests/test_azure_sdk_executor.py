@@ -0,0 +1,123 @@
+"""Tests that blocking Azure SDK calls run off the event loop.
+
+A slow fake ResourceManagementClient blocks its thread the way a slow
+Azure API call does; a fast tool running alongside must not be delayed.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import types
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+WORKSPACE_ROOT = Path(__file__).parent.parent
+sys.path.append(str(WORKSPACE_ROOT / "mcp_server_files"))
+
+# Upper bound on any blocking wait, so a regression fails instead of hanging
+WAIT_SECONDS = 5
+
+# Set to let SlowResourceGroups.list() return
+release = threading.Event()
+
+
+class SlowResourceGroups:
+    def list(self):
+        release.wait(WAIT_SECONDS)  # blocking HTTP call in the real SDK
+        return iter([types.SimpleNamespace(name="rg1", location="eastus", tags={}, properties=None)])
+
+
+class SlowResourceManagementClient:
+    def __init__(self, credential, subscription_id, **kwargs):
+        self.resource_groups = SlowResourceGroups()
+
+
+class TestAzureSdkExecutor(unittest.TestCase):
+    """Test run_blocking and the tools that use it."""
+
+    def setUp(self):
+        try:
+            from jexida_dashboard.mcp_tools_core.tools.azure import auth, core, utils
+        except ImportError as e:
+            self.skipTest(f"Azure tool dependencies not installed: {e}")
+        self.core = core
+        self.utils = utils
+
+        fake_sdk = types.ModuleType("azure.mgmt.resource")
+        fake_sdk.ResourceManagementClient = SlowResourceManagementClient
+        patches = [
+            patch.dict(sys.modules, {"azure.mgmt.resource": fake_sdk}),
+            patch.object(core, "get_subscription_id", return_value="sub-1"),
+            patch.object(auth, "get_azure_credential", return_value=object()),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.addCleanup(auth.close_management_clients)
+        release.set()
+        self.addCleanup(release.set)
+
+    def test_slow_sdk_call_does_not_delay_fast_tool(self):
+        """A fast tool finishes while the slow SDK call is still blocking."""
+        release.clear()
+
+        async def run():
+            slow = asyncio.create_task(self.core.azure_core_list_resource_groups(
+                self.core.AzureCoreListResourceGroupsInput()
+            ))
+            await asyncio.sleep(0)  # let the slow tool reach its SDK call
+            await self.core.azure_core_get_connection_info(
+                self.core.AzureCoreGetConnectionInfoInput()
+            )
+            slow_pending = not slow.done()
+            release.set()
+            return slow_pending, await slow
+
+        slow_pending, slow_result = asyncio.run(run())
+
+        self.assertTrue(slow_pending)
+        self.assertTrue(slow_result.success, slow_result.error)
+
+    def test_slow_tool_still_returns_results(self):
+        """Pagers are consumed in the pool and results come back intact."""
+        result = asyncio.run(self.core.azure_core_list_resource_groups(
+            self.core.AzureCoreListResourceGroupsInput()
+        ))
+
+        self.assertTrue(result.success, result.error)
+        self.assertEqual([rg.name for rg in result.resource_groups], ["rg1"])
+
+    def test_pool_is_bounded_and_concurrent(self):
+        """Calls beyond the pool size queue instead of spawning threads."""
+        self.utils.shutdown_sdk_executor()
+        self.addCleanup(self.utils.shutdown_sdk_executor)
+
+        lock = threading.Lock()
+        # Two calls must be in flight together before either may finish
+        pair = threading.Barrier(2, timeout=WAIT_SECONDS)
+        active = [0]
+        peak = [0]
+
+        def call():
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            pair.wait()
+            time.sleep(0.01)
+            with lock:
+                active[0] -= 1
+
+        async def run():
+            with patch.object(self.utils, "AZURE_SDK_MAX_WORKERS", 2):
+                await asyncio.gather(*(self.utils.run_blocking(call) for _ in range(4)))
+
+        asyncio.run(run())
+
+        self.assertEqual(peak[0], 2)
+        self.assertEqual(self.utils.get_sdk_executor()._max_workers, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
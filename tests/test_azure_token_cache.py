@@ -0,0 +1,171 @@
+"""Tests for the persistent Azure token cache.
+
+Tests memory and file hits, sharing between credential instances (as
+separate processes would), expiry handling, background refresh, and
+fetch instrumentation.
+"""
+
+import os
+import stat
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+WORKSPACE_ROOT = Path(__file__).parent.parent
+sys.path.append(str(WORKSPACE_ROOT / "mcp_server_files"))
+
+SCOPE = "https://management.azure.com/.default"
+
+
+# azure-identity (MSAL) returns its cached token until this close to expiry
+MSAL_REFRESH_OFFSET = 300
+
+
+class FakeAuthority:
+    """The identity provider: issues numbered tokens valid for `lifetime` seconds."""
+
+    def __init__(self, lifetime=3600):
+        self.lifetime = lifetime
+        self.issued = 0
+
+    def issue(self):
+        self.issued += 1
+        return SimpleNamespace(token=f"token-{self.issued}", expires_on=int(time.time()) + self.lifetime)
+
+
+class FakeCredential:
+    """Caches its token in memory the way azure-identity credentials do."""
+
+    def __init__(self, lifetime=3600, authority=None):
+        self.authority = authority or FakeAuthority(lifetime)
+        self.token = None
+        self.calls = 0
+
+    def get_token(self, *scopes, **kwargs):
+        self.calls += 1
+        if kwargs.get("claims") or self.token is None or self.token.expires_on - time.time() < MSAL_REFRESH_OFFSET:
+            self.token = self.authority.issue()
+        return self.token
+
+
+class TestTokenCache(unittest.TestCase):
+    """Test token_cache.CachingCredential and TokenFileStore."""
+
+    def setUp(self):
+        try:
+            from jexida_dashboard.mcp_tools_core.tools.azure import token_cache
+        except ImportError as e:
+            self.skipTest(f"Azure tool dependencies not installed: {e}")
+        self.tc = token_cache
+        self.tc._reset_stats()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "cache", "tokens.json")
+
+    def credential(self, inner, factory=None):
+        cred = self.tc.CachingCredential(inner, self.tc.TokenFileStore(self.path), "sp:tenant:client", factory)
+        self.addCleanup(cred.close)
+        return cred
+
+    def test_memory_then_file_sharing(self):
+        """A second instance (another process) reuses the persisted token."""
+        first_inner, second_inner = FakeCredential(), FakeCredential()
+        first = self.credential(first_inner)
+
+        self.assertEqual(first.get_token(SCOPE).token, "token-1")
+        self.assertEqual(first.get_token(SCOPE).token, "token-1")
+        second = self.credential(second_inner)
+        self.assertEqual(second.get_token(SCOPE).token, "token-1")
+
+        self.assertEqual(first_inner.calls, 1)
+        self.assertEqual(second_inner.calls, 0)
+        stats = self.tc.get_token_stats()
+        self.assertEqual((stats["fetches"], stats["memory_hits"], stats["file_hits"]), (1, 1, 1))
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o600)
+
+    def test_nearly_expired_tokens_are_refetched(self):
+        """Tokens the SDK would immediately refresh are not handed out."""
+        inner = FakeCredential(lifetime=self.tc.MIN_VALID_SECONDS - 10)
+        cred = self.credential(inner)
+
+        cred.get_token(SCOPE)
+        cred.get_token(SCOPE)
+
+        self.assertEqual(inner.calls, 2)
+
+    def test_claims_bypass_cache(self):
+        """Claims challenges always reach the wrapped credential."""
+        inner = FakeCredential()
+        cred = self.credential(inner)
+
+        cred.get_token(SCOPE)
+        cred.get_token(SCOPE, claims='{"access_token": {}}')
+
+        self.assertEqual(inner.calls, 2)
+
+    def test_background_refresh(self):
+        """A token the wrapped credential still caches is re-fetched from a new instance."""
+        authority = FakeAuthority(lifetime=600)
+        inner = FakeCredential(authority=authority)
+        cred = self.credential(inner, factory=lambda: FakeCredential(authority=authority))
+        first = cred.get_token(SCOPE)
+        authority.lifetime = 700  # as if a minute passed: a new token expires later
+
+        with patch.object(self.tc, "TOKEN_REFRESH_SECONDS", 900):
+            self.assertEqual(cred.refresh_due(), 1)
+        with patch.object(self.tc, "TOKEN_REFRESH_SECONDS", 300):
+            self.assertEqual(cred.refresh_due(), 0)
+
+        token = cred.get_token(SCOPE)
+        self.assertEqual(token.token, "token-2")
+        self.assertGreater(token.expires_on, first.expires_on)
+        self.assertEqual(self.tc.get_token_stats()["background_refreshes"], 1)
+
+    def test_unchanged_token_is_not_a_refresh(self):
+        """Getting the same cached token back does not count as a refresh."""
+        inner = FakeCredential(lifetime=600)
+        cred = self.credential(inner)
+        cred.get_token(SCOPE)
+
+        with patch.object(self.tc, "TOKEN_REFRESH_SECONDS", 900):
+            self.assertEqual(cred.refresh_due(), 0)
+
+        self.assertEqual(inner.authority.issued, 1)
+        self.assertEqual(self.tc.get_token_stats()["background_refreshes"], 0)
+
+    def test_default_path_ignores_working_directory(self):
+        """A relative DATA_DIR resolves against the project root, not the cwd."""
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(tempfile.gettempdir())
+
+        with patch.dict(os.environ, {"DATA_DIR": "data"}):
+            os.environ.pop("AZURE_TOKEN_CACHE_PATH", None)
+            path = self.tc.default_cache_path()
+        with patch.dict(os.environ, {"DATA_DIR": "/srv/jexida"}):
+            os.environ.pop("AZURE_TOKEN_CACHE_PATH", None)
+            absolute = self.tc.default_cache_path()
+
+        self.assertEqual(path, str(WORKSPACE_ROOT.resolve() / "data" / "azure_token_cache.json"))
+        self.assertEqual(absolute, "/srv/jexida/azure_token_cache.json")
+
+    def test_fetch_errors_counted(self):
+        """Failures propagate and are counted; a corrupt file is ignored."""
+        Path(self.path).parent.mkdir(parents=True)
+        Path(self.path).write_text("not json")
+
+        class Failing:
+            def get_token(self, *scopes, **kwargs):
+                raise RuntimeError("no credential")
+
+        with self.assertRaises(RuntimeError):
+            self.credential(Failing()).get_token(SCOPE)
+        self.assertEqual(self.tc.get_token_stats()["fetch_errors"], 1)
+        self.assertEqual(self.credential(FakeCredential()).get_token(SCOPE).token, "token-1")
+
+
+if __name__ == "__main__":
+    unittest.main()
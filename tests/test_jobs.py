@@ -5,9 +5,18 @@ Tests cover:
 - Node config loading
 - RemoteExecutor with mocked SSH
 - JobManager submit/run/status flow
+- Job dispatcher concurrency limits and result recording
+- JobStore claims against a real SQLite database
 """
 
+import asyncio
+import os
+import sys
+import tempfile
+import threading
 import unittest
+from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 from dataclasses import dataclass
 
@@ -104,6 +113,253 @@ class TestWorkerSSHExecutor(unittest.TestCase):
         self.assertEqual(result.exit_code, 124)
         self.assertIn("timed out", result.stderr)
 
+    def test_run_command_async(self):
+        """The async runner collects output and exit code without blocking."""
+        from jexida_dashboard.mcp_tools_core.tools.jobs.executor import WorkerSSHExecutor
+
+        executor = WorkerSSHExecutor(timeout=30)
+        local = lambda node, command: [sys.executable, "-c", command]
+        with patch.object(executor, "ssh_args", local):
+            result = asyncio.run(executor.run_command_async(
+                MagicMock(), "import sys; print('hi'); sys.exit(3)"
+            ))
+
+        self.assertEqual(result.exit_code, 3)
+        self.assertEqual(result.stdout.strip(), "hi")
+
+    def test_run_command_async_timeout(self):
+        """A command outliving the timeout is killed and reported as 124."""
+        from jexida_dashboard.mcp_tools_core.tools.jobs.executor import WorkerSSHExecutor
+
+        executor = WorkerSSHExecutor(timeout=1)
+        local = lambda node, command: [sys.executable, "-c", command]
+        with patch.object(executor, "ssh_args", local):
+            result = asyncio.run(executor.run_command_async(
+                MagicMock(), "import time; time.sleep(10)"
+            ))
+
+        self.assertEqual(result.exit_code, 124)
+        self.assertIn("timed out", result.stderr)
+
+
+class MemoryJobStore:
+    """In-memory stand-in for JobStore."""
+
+    def __init__(self, nodes):
+        self.nodes = {name: SimpleNamespace(name=name, max_concurrent_jobs=limit) for name, limit in nodes.items()}
+        self.jobs = []
+
+    def add(self, node_name, command, timeout=300):
+        job = SimpleNamespace(
+            id=len(self.jobs) + 1, target_node=self.nodes[node_name],
+            command=command, timeout=timeout, status="queued", result=None,
+        )
+        self.jobs.append(job)
+        return job
+
+    def claim(self):
+        for job in self.jobs:
+            node = job.target_node
+            running = sum(1 for j in self.jobs if j.target_node is node and j.status == "running")
+            if job.status == "queued" and running < node.max_concurrent_jobs:
+                job.status = "running"
+                return job
+        return None
+
+    def finish(self, job_id, result):
+        job = self.jobs[job_id - 1]
+        job.status = "succeeded" if result.success else "failed"
+        job.result = result
+
+    def mark_lost(self, now, grace_seconds, keep):
+        return 0
+
+
+class TestJobDispatcher(unittest.TestCase):
+    """Tests for the job dispatcher with an in-memory queue."""
+
+    def setUp(self):
+        from jexida_dashboard.mcp_tools_core.tools.jobs import dispatcher
+        from jexida_dashboard.mcp_tools_core.tools.jobs.executor import ExecutionResult
+
+        self.dispatcher = dispatcher
+        self.ExecutionResult = ExecutionResult
+        self.store = MemoryJobStore({"node-a": 2, "node-b": 1})
+        self.active = {}
+        self.peak = {}
+
+    async def runner(self, node, command, timeout):
+        """Fake SSH run tracking how many jobs run per node at once."""
+        self.active[node.name] = self.active.get(node.name, 0) + 1
+        self.peak[node.name] = max(self.peak.get(node.name, 0), self.active[node.name])
+        self.peak["total"] = max(self.peak.get("total", 0), sum(self.active.values()))
+        await asyncio.sleep(0.01)
+        self.active[node.name] -= 1
+        if command == "boom":
+            raise RuntimeError("connection reset")
+        return self.ExecutionResult(stdout=command, stderr="", exit_code=0 if command != "false" else 1, duration_ms=10)
+
+    def drain(self, workers=8):
+        jd = self.dispatcher.JobDispatcher(store=self.store, runner=self.runner, workers=workers)
+        asyncio.run(jd.drain())
+
+    def test_per_node_limits(self):
+        """No node runs more jobs at once than its max_concurrent_jobs."""
+        for i in range(5):
+            self.store.add("node-a", f"echo a{i}")
+            self.store.add("node-b", f"echo b{i}")
+
+        self.drain()
+
+        self.assertEqual(self.peak["node-a"], 2)
+        self.assertEqual(self.peak["node-b"], 1)
+        self.assertTrue(all(job.status == "succeeded" for job in self.store.jobs))
+        self.assertEqual(self.store.jobs[0].result.stdout, "echo a0")
+
+    def test_worker_pool_limit(self):
+        """The dispatcher runs at most `workers` jobs at once."""
+        self.store = MemoryJobStore({"node-a": 10})
+        for i in range(6):
+            self.store.add("node-a", f"echo {i}")
+
+        self.drain(workers=3)
+
+        self.assertEqual(self.peak["total"], 3)
+        self.assertTrue(all(job.status == "succeeded" for job in self.store.jobs))
+
+    def test_failures_are_recorded(self):
+        """Non-zero exits and runner errors mark the job failed."""
+        failing = self.store.add("node-a", "false")
+        broken = self.store.add("node-a", "boom")
+
+        self.drain()
+
+        self.assertEqual(failing.status, "failed")
+        self.assertEqual(broken.status, "failed")
+        self.assertIn("connection reset", broken.result.stderr)
+
+
+def setup_django_sqlite(db_path):
+    """Configure Django with just mcp_tools_core on a fresh SQLite file.
+
+    Returns False if Django was already configured by someone else.
+    """
+    import django
+    from django.conf import settings
+
+    if settings.configured:
+        return False
+    sys.path.insert(0, str(Path(__file__).parent.parent / "jexida_dashboard"))
+    settings.configure(
+        INSTALLED_APPS=["mcp_tools_core"],
+        DATABASES={"default": {"ENGINE": "django.db.backends.sqlite3", "NAME": db_path}},
+        DEFAULT_AUTO_FIELD="django.db.models.BigAutoField",
+        USE_TZ=True,
+    )
+    django.setup()
+    from django.core.management import call_command
+    call_command("migrate", verbosity=0)
+    return True
+
+
+class TestJobStoreDatabase(unittest.TestCase):
+    """JobStore claims against the real ORM on SQLite."""
+
+    @classmethod
+    def setUpClass(cls):
+        try:
+            import django  # noqa: F401
+        except ImportError as e:
+            raise unittest.SkipTest(f"Django not installed: {e}")
+        cls.tmp = tempfile.TemporaryDirectory()
+        if not setup_django_sqlite(os.path.join(cls.tmp.name, "jobs.sqlite3")):
+            cls.tmp.cleanup()
+            raise unittest.SkipTest("Django is already configured for another database")
+
+    @classmethod
+    def tearDownClass(cls):
+        from django.db import connections
+        connections.close_all()
+        cls.tmp.cleanup()
+
+    def setUp(self):
+        from mcp_tools_core.models import Job, WorkerNode
+        from mcp_tools_core.tools.jobs.dispatcher import JobStore
+
+        Job.objects.all().delete()
+        WorkerNode.objects.all().delete()
+        self.Job = Job
+        self.store = JobStore()
+        self.node = WorkerNode.objects.create(name="node-a", host="h", user="u", max_concurrent_jobs=2)
+
+    def queue(self, count, node=None):
+        return [
+            self.Job.objects.create(target_node=node or self.node, command=f"echo {i}", status=self.Job.STATUS_QUEUED)
+            for i in range(count)
+        ]
+
+    def test_claims_oldest_within_limit(self):
+        """Claims go oldest first and stop at the node's limit until a job finishes."""
+        from mcp_tools_core.tools.jobs.executor import ExecutionResult
+
+        jobs = self.queue(3)
+
+        first, second = self.store.claim(), self.store.claim()
+        self.assertEqual([first.id, second.id], [jobs[0].id, jobs[1].id])
+        self.assertEqual(first.target_node.name, "node-a")
+        self.assertIsNotNone(first.started_at)
+        self.assertIsNone(self.store.claim())
+
+        self.store.finish(first.id, ExecutionResult(stdout="0", stderr="", exit_code=0, duration_ms=1))
+        self.assertEqual(self.store.claim().id, jobs[2].id)
+        self.assertEqual(self.Job.objects.get(id=first.id).status, self.Job.STATUS_SUCCEEDED)
+
+    def test_concurrent_claims_respect_limit(self):
+        """Claims racing from separate connections never share a job or exceed the limit."""
+        from django.db import connection
+
+        self.queue(6)
+        workers = 8
+        start = threading.Barrier(workers)
+        claimed, errors = [], []
+
+        def claim():
+            try:
+                start.wait()
+                job = self.store.claim()
+                if job is not None:
+                    claimed.append(job.id)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=claim) for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(claimed), 2)
+        self.assertEqual(len(set(claimed)), 2)
+        self.assertEqual(self.Job.objects.filter(status=self.Job.STATUS_RUNNING).count(), 2)
+
+    def test_mark_lost(self):
+        """Running jobs past timeout plus grace are lost unless this process runs them."""
+        from datetime import timedelta
+        from django.utils import timezone
+
+        stale, kept = self.queue(2)
+        long_ago = timezone.now() - timedelta(seconds=1000)
+        self.Job.objects.filter(id__in=[stale.id, kept.id]).update(
+            status=self.Job.STATUS_RUNNING, started_at=long_ago, timeout=60,
+        )
+
+        self.assertEqual(self.store.mark_lost(timezone.now(), 120, {kept.id}), 1)
+        self.assertEqual(self.Job.objects.get(id=stale.id).status, self.Job.STATUS_LOST)
+        self.assertEqual(self.Job.objects.get(id=kept.id).status, self.Job.STATUS_RUNNING)
+
 
 class TestCLIJobsCommands(unittest.TestCase):
     """Tests for CLI jobs command parsing."""
@@ -0,0 +1,126 @@
+"""Tests for network scan history and change detection.
+
+Covers the pure snapshot helpers in tools/unifi/scan_history.py; the ORM
+persistence layer is exercised on the server.
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+from pydantic import BaseModel
+
+# UniFi tools import config/logging_config from the MCP server package
+WORKSPACE_ROOT = Path(__file__).parent.parent
+sys.path.append(str(WORKSPACE_ROOT / "mcp_server_files"))
+
+
+class _Port(BaseModel):
+    port: int
+    protocol: str = "tcp"
+    service: str = ""
+    version: str = ""
+
+
+class _Host(BaseModel):
+    ip: str
+    mac: str = ""
+    hostname: str = ""
+    vendor: str = ""
+    ports: list = []
+
+
+def _import_scan_history():
+    try:
+        from jexida_dashboard.mcp_tools_core.tools.unifi import scan_history
+    except ImportError as e:
+        raise unittest.SkipTest(f"UniFi tool dependencies not installed: {e}")
+    return scan_history
+
+
+class TestDiffSnapshots(unittest.TestCase):
+    """Test diff_snapshots change detection."""
+
+    def setUp(self):
+        self.sh = _import_scan_history()
+
+    def test_no_changes(self):
+        """Identical snapshots produce empty change lists."""
+        hosts = [_Host(ip="10.0.0.1", mac="aa:bb", ports=[_Port(port=22, service="ssh")])]
+        snap = self.sh.snapshot_from_hosts(hosts)
+
+        changes = self.sh.diff_snapshots(snap, snap)
+
+        self.assertFalse(any(changes.values()))
+
+    def test_new_and_disappeared_hosts(self):
+        """Hosts only in one snapshot are reported as new or disappeared."""
+        before = self.sh.snapshot_from_hosts([_Host(ip="10.0.0.1"), _Host(ip="10.0.0.2")])
+        after = self.sh.snapshot_from_hosts([_Host(ip="10.0.0.2"), _Host(ip="10.0.0.10")])
+
+        changes = self.sh.diff_snapshots(before, after)
+
+        self.assertEqual([h["ip"] for h in changes["new_hosts"]], ["10.0.0.10"])
+        self.assertEqual([h["ip"] for h in changes["disappeared_hosts"]], ["10.0.0.1"])
+
+    def test_port_and_service_changes(self):
+        """Opened, closed and re-bannered ports on a known host are detected."""
+        before = self.sh.snapshot_from_hosts([_Host(ip="10.0.0.5", ports=[
+            _Port(port=22, service="ssh", version="OpenSSH 8.9"),
+            _Port(port=23, service="telnet"),
+        ])])
+        after = self.sh.snapshot_from_hosts([_Host(ip="10.0.0.5", ports=[
+            _Port(port=22, service="ssh", version="OpenSSH 9.6"),
+            _Port(port=443, service="https"),
+        ])])
+
+        changes = self.sh.diff_snapshots(before, after)
+
+        self.assertEqual([p["port"] for p in changes["new_ports"]], [443])
+        self.assertEqual([p["port"] for p in changes["closed_ports"]], [23])
+        self.assertEqual(len(changes["changed_services"]), 1)
+        self.assertEqual(changes["changed_services"][0]["new_version"], "OpenSSH 9.6")
+
+    def test_mac_change(self):
+        """A different MAC answering a known IP is reported."""
+        before = self.sh.snapshot_from_hosts([_Host(ip="10.0.0.7", mac="AA:AA:AA:AA:AA:AA")])
+        after = self.sh.snapshot_from_hosts([_Host(ip="10.0.0.7", mac="BB:BB:BB:BB:BB:BB")])
+
+        changes = self.sh.diff_snapshots(before, after)
+
+        self.assertEqual(changes["mac_changes"][0]["new_mac"], "BB:BB:BB:BB:BB:BB")
+
+
+class TestSelectHostsToRescan(unittest.TestCase):
+    """Test incremental scan target selection."""
+
+    def setUp(self):
+        self.sh = _import_scan_history()
+
+    def test_only_new_or_changed_hosts_selected(self):
+        """Stable hosts are skipped; new hosts and MAC changes are rescanned."""
+        previous = self.sh.snapshot_from_hosts([
+            _Host(ip="10.0.0.1", mac="aa:aa:aa:aa:aa:aa"),
+            _Host(ip="10.0.0.2", mac="bb:bb:bb:bb:bb:bb"),
+        ])
+        discovered = [
+            ("10.0.0.1", "AA:AA:AA:AA:AA:AA"),
+            ("10.0.0.2", "cc:cc:cc:cc:cc:cc"),
+            ("10.0.0.3", "dd:dd:dd:dd:dd:dd"),
+        ]
+
+        targets = self.sh.select_hosts_to_rescan(previous, discovered)
+
+        self.assertEqual(targets, ["10.0.0.2", "10.0.0.3"])
+
+    def test_hosts_in_subnet(self):
+        """Hosts are grouped by subnet membership."""
+        hosts = [_Host(ip="192.168.1.5"), _Host(ip="192.168.2.5")]
+
+        selected = self.sh.hosts_in_subnet(hosts, "192.168.1.0/24")
+
+        self.assertEqual([h.ip for h in selected], ["192.168.1.5"])
+
+
+if __name__ == "__main__":
+    unittest.main()
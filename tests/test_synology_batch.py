@@ -0,0 +1,160 @@
+"""Tests for batched Synology API calls (SYNO.Entry.Request).
+
+Uses an in-process fake DSM (httpx.MockTransport) that can advertise or
+hide SYNO.Entry.Request to exercise both the compound path and the DSM 6
+fallback.
+"""
+
+import asyncio
+import json
+import sys
+import unittest
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+# Synology tools import config/logging_config from the MCP server package
+WORKSPACE_ROOT = Path(__file__).parent.parent
+sys.path.append(str(WORKSPACE_ROOT / "mcp_server_files"))
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+
+def _import_client():
+    try:
+        from jexida_dashboard.mcp_tools_core.tools.synology import client, session_pool
+    except ImportError as e:
+        raise unittest.SkipTest(f"Synology tool dependencies not installed: {e}")
+    return client, session_pool
+
+
+RESPONSES = {
+    ("SYNO.Core.System", "info"): {"model": "DS920+", "hostname": "nas", "uptime": 100},
+    ("SYNO.Core.System.Utilization", "get"): {
+        "cpu": {"user_load": 5, "system_load": 3},
+        "memory": {"memory_size": 4 * 1024 * 1024 * 1024, "real_usage": 50},
+    },
+}
+
+
+class FakeDSM:
+    """Fake DSM answering plain and compound requests."""
+
+    def __init__(self, compound: bool):
+        self.compound = compound
+        self.http_requests = 0
+        self.transport = httpx.MockTransport(self.handle)
+
+    def answer(self, api, method):
+        data = RESPONSES.get((api, method))
+        if data is None:
+            return {"success": False, "error": {"code": 102}}
+        return {"success": True, "data": data}
+
+    def handle(self, request):
+        if request.method == "POST":
+            query = {k: v[0] for k, v in parse_qs(request.content.decode()).items()}
+        else:
+            query = {k: v[0] for k, v in parse_qs(urlparse(str(request.url)).query).items()}
+        api, method = query.get("api"), query.get("method")
+
+        if api == "SYNO.API.Auth":
+            return httpx.Response(200, json={"success": True, "data": {"sid": "sid-1"}})
+        if api == "SYNO.API.Info":
+            apis = {"SYNO.Core.System": {"path": "entry.cgi", "version": 3}}
+            if self.compound:
+                apis["SYNO.Entry.Request"] = {"path": "entry.cgi", "version": 1}
+            return httpx.Response(200, json={"success": True, "data": apis})
+
+        self.http_requests += 1
+        if api == "SYNO.Entry.Request":
+            calls = json.loads(query["compound"])
+            results = [
+                {"api": c["api"], "method": c["method"], **self.answer(c["api"], c["method"])}
+                for c in calls
+            ]
+            return httpx.Response(200, json={"success": True, "data": {"has_fail": False, "result": results}})
+        return httpx.Response(200, json=self.answer(api, method))
+
+
+class TestSynologyBatch(unittest.TestCase):
+    """Test SynologyClient.batch() compound requests and fallback."""
+
+    def setUp(self):
+        self.client_mod, self.pool_mod = _import_client()
+        self.pool_mod.get_session_pool()._sessions.clear()
+
+    def tearDown(self):
+        self.pool_mod.get_session_pool()._sessions.clear()
+
+    def _run(self, dsm, body):
+        async def run():
+            client = self.client_mod.SynologyClient(
+                base_url="https://nas.test:5001",
+                username="admin",
+                password="secret",
+                pooled=False,
+                transport=dsm.transport,
+            )
+            async with client:
+                dsm.http_requests = 0
+                return await body(client)
+
+        return asyncio.run(run())
+
+    def test_compound_request_is_one_round_trip(self):
+        """DSM 7 batches go out as a single SYNO.Entry.Request."""
+        dsm = FakeDSM(compound=True)
+
+        info = self._run(dsm, lambda client: client.get_system_info())
+
+        self.assertEqual(dsm.http_requests, 1)
+        self.assertEqual(info.model, "DS920+")
+        self.assertEqual(info.cpu_usage_percent, 8)
+        self.assertEqual(info.memory_total_mb, 4096)
+
+    def test_fallback_to_individual_requests(self):
+        """Without SYNO.Entry.Request each call is sent on its own."""
+        dsm = FakeDSM(compound=False)
+
+        info = self._run(dsm, lambda client: client.get_system_info())
+
+        self.assertEqual(dsm.http_requests, 2)
+        self.assertEqual(info.model, "DS920+")
+
+    def test_per_call_errors_fan_out(self):
+        """A failing call carries its own error; the others still succeed."""
+        dsm = FakeDSM(compound=True)
+
+        async def body(client):
+            batch = client.batch()
+            ok = batch.add("SYNO.Core.System", "info")
+            bad = batch.add("SYNO.Core.Package", "list")
+            await batch.execute()
+            return batch, ok, bad
+
+        batch, ok, bad = self._run(dsm, body)
+
+        self.assertTrue(batch.compound_used)
+        self.assertEqual(ok.result()["hostname"], "nas")
+        self.assertFalse(bad.ok)
+        self.assertEqual(bad.error.error_code, 102)
+        with self.assertRaises(self.client_mod.SynologyAPIError):
+            bad.result()
+
+    def test_system_overview_reports_partial_errors(self):
+        """Storage failure is reported without losing system info."""
+        dsm = FakeDSM(compound=True)
+
+        overview = self._run(dsm, lambda client: client.get_system_overview())
+
+        self.assertEqual(dsm.http_requests, 1)
+        self.assertEqual(overview["system"].model, "DS920+")
+        self.assertEqual(overview["network"]["hostname"], "nas")
+        self.assertIn("storage", overview["errors"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+"""Tests for Synology container resource sampling.
+
+Checks the batched stats request against a fake NAS, CPU% from cumulative
+counters, bounded series and the top-N ranking.
+"""
+
+import asyncio
+import json
+import sys
+import unittest
+from pathlib import Path
+from urllib.parse import parse_qs
+
+# Synology tools import config/logging_config from the MCP server package
+WORKSPACE_ROOT = Path(__file__).parent.parent
+sys.path.append(str(WORKSPACE_ROOT / "mcp_server_files"))
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+
+def _import_modules():
+    try:
+        from jexida_dashboard.mcp_tools_core.tools.synology import client, container_stats
+    except ImportError as e:
+        raise unittest.SkipTest(f"Synology tool dependencies not installed: {e}")
+    return client, container_stats
+
+
+class TestContainerStatsStore(unittest.TestCase):
+    """Test series bookkeeping and ranking."""
+
+    def setUp(self):
+        _, self.cs = _import_modules()
+
+    def test_cpu_from_cumulative_counters(self):
+        """Without a reported percentage CPU% comes from counter deltas."""
+        series = self.cs.ContainerSeries("db")
+        first = series.record(0, {"cpu_usage": 1000, "system_cpu_usage": 10000, "online_cpus": 4})
+        second = series.record(10, {"cpu_usage": 1500, "system_cpu_usage": 20000, "online_cpus": 4})
+        restarted = series.record(20, {"cpu_usage": 10, "system_cpu_usage": 30000, "online_cpus": 4})
+
+        self.assertIsNone(first.cpu_percent)
+        self.assertAlmostEqual(second.cpu_percent, 20.0)
+        self.assertIsNone(restarted.cpu_percent)
+
+    def test_series_is_bounded_and_tracks_memory_delta(self):
+        """Old samples fall off; each sample carries the memory change."""
+        store = self.cs.ContainerStatsStore(max_points=3)
+        for i in range(5):
+            store.record(i, [{"name": "app", "cpu_percent": 1, "memory_bytes": 100 * i}])
+
+        samples = list(store.series["app"].samples)
+        self.assertEqual([s.timestamp for s in samples], [2, 3, 4])
+        self.assertEqual(samples[-1].memory_delta_bytes, 100)
+
+    def test_top_ranks_over_window(self):
+        """Only samples inside the window count; vanished containers are forgotten."""
+        store = self.cs.ContainerStatsStore(forget_after=100)
+        store.record(0, [{"name": "gone", "cpu_percent": 99, "memory_bytes": 1}])
+        for t in range(200, 260, 10):
+            store.record(t, [
+                {"name": "web", "cpu_percent": 5, "memory_bytes": 500},
+                {"name": "leaky", "cpu_percent": 1, "memory_bytes": 100 + t},
+                {"name": "busy", "cpu_percent": 80 if t >= 230 else 0, "memory_bytes": 50},
+            ])
+
+        self.assertNotIn("gone", store.series)
+
+        by_cpu = store.top("cpu", window_seconds=30, limit=2, now=250)
+        self.assertEqual([r["name"] for r in by_cpu], ["busy", "web"])
+        self.assertEqual(by_cpu[0]["cpu_avg"], 60.0)
+        self.assertEqual(by_cpu[0]["samples"], 4)
+
+        growth = store.top("memory_growth", window_seconds=60, now=250)
+        self.assertEqual(growth[0]["name"], "leaky")
+        self.assertEqual(growth[0]["memory_growth_bytes"], 50)
+        with self.assertRaises(ValueError):
+            store.top("disk")
+
+
+class TestBatchedStatsRequest(unittest.TestCase):
+    """Test that one interval costs one compound request."""
+
+    def setUp(self):
+        self.client_mod, self.cs = _import_modules()
+        if httpx is None:
+            self.skipTest("httpx not installed")
+
+    def test_one_request_per_sample(self):
+        """Container list and resources come back in one compound request."""
+        requests = []
+
+        def handle(request):
+            body = request.content.decode() if request.method == "POST" else request.url.query.decode()
+            params = {k: v[0] for k, v in parse_qs(body).items()}
+            if params.get("api") == "SYNO.API.Auth":
+                return httpx.Response(200, json={"success": True, "data": {"sid": "sid-1"}})
+            if params.get("api") == "SYNO.API.Info":
+                return httpx.Response(200, json={"success": True, "data": {
+                    "SYNO.Entry.Request": {"path": "entry.cgi", "version": 1},
+                    "SYNO.Docker.Container": {"path": "entry.cgi", "version": 1},
+                    "SYNO.Docker.Container.Resource": {"path": "entry.cgi", "version": 1},
+                }})
+            requests.append(params.get("api"))
+            results = []
+            for call in json.loads(params["compound"]):
+                if call["api"] == "SYNO.Docker.Container":
+                    data = {"containers": [{"name": "plex", "state": "running"}]}
+                else:
+                    data = {"resources": [{"name": "plex", "cpu": 12.5, "memory": 2048, "memoryPercent": 1.5}]}
+                results.append({"api": call["api"], "method": call["method"], "success": True, "data": data})
+            return httpx.Response(200, json={"success": True, "data": {"has_fail": False, "result": results}})
+
+        store = self.cs.ContainerStatsStore()
+
+        async def run():
+            async with self.client_mod.SynologyClient(
+                base_url="https://nas.test:5001",
+                username="admin",
+                password="secret",
+                pooled=False,
+                transport=httpx.MockTransport(handle),
+            ) as client:
+                await self.cs.sample_containers(client, store)
+                await self.cs.sample_containers(client, store)
+
+        asyncio.run(run())
+
+        self.assertEqual([api for api in requests if api != "SYNO.DSM.Info"], ["SYNO.Entry.Request"] * 2)
+        sample = store.series["plex"].samples[-1]
+        self.assertEqual((sample.cpu_percent, sample.memory_bytes), (12.5, 2048))
+        self.assertEqual(store.series["plex"].state, "running")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,176 @@
+"""Tests for the local Synology metadata index.
+
+Crawls a fake NAS tree (httpx.MockTransport) into a temporary SQLite
+index and checks searches and incremental re-crawls.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+# Synology tools import config/logging_config from the MCP server package
+WORKSPACE_ROOT = Path(__file__).parent.parent
+sys.path.append(str(WORKSPACE_ROOT / "mcp_server_files"))
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+
+def _import_index():
+    try:
+        from jexida_dashboard.mcp_tools_core.tools.synology import client, file_index
+    except ImportError as e:
+        raise unittest.SkipTest(f"Synology tool dependencies not installed: {e}")
+    return client, file_index
+
+
+NOW = int(time.time())
+DAY = 86400
+
+
+class FakeTree:
+    """Fake NAS: {path: {"dir": bool, "size": int, "mtime": int}}."""
+
+    def __init__(self):
+        self.entries = {
+            "/media": {"dir": True, "mtime": 100},
+            "/media/movies": {"dir": True, "mtime": 100},
+            "/media/movies/Holiday_2023.mkv": {"dir": False, "size": 4_000_000_000, "mtime": NOW - 400 * DAY},
+            "/media/movies/trailer.mp4": {"dir": False, "size": 50_000_000, "mtime": NOW - 2 * DAY},
+            "/media/photos": {"dir": True, "mtime": 100},
+            "/media/photos/IMG_2024.jpg": {"dir": False, "size": 3_000_000, "mtime": NOW - DAY},
+            "/media/readme.txt": {"dir": False, "size": 10, "mtime": NOW - 10 * DAY},
+        }
+        self.calls = []
+        self.transport = httpx.MockTransport(self.handle)
+
+    def add(self, path, **entry):
+        self.entries[path] = entry
+        parent = path.rsplit("/", 1)[0]
+        self.entries[parent]["mtime"] += 1
+
+    def remove_tree(self, path):
+        for p in [p for p in self.entries if p == path or p.startswith(path + "/")]:
+            del self.entries[p]
+        self.entries[path.rsplit("/", 1)[0]]["mtime"] += 1
+
+    def _item(self, path):
+        entry = self.entries[path]
+        return {
+            "name": path.rsplit("/", 1)[1],
+            "path": path,
+            "isdir": entry["dir"],
+            "additional": {"size": entry.get("size", 0), "time": {"mtime": entry["mtime"]}, "owner": {"user": "admin"}},
+        }
+
+    def handle(self, request):
+        query = {k: v[0] for k, v in parse_qs(urlparse(str(request.url)).query).items()}
+        api, method = query.get("api"), query.get("method")
+        ok = lambda data: httpx.Response(200, json={"success": True, "data": data})
+
+        if api == "SYNO.API.Auth":
+            return ok({"sid": "sid-1"})
+        if api == "SYNO.FileStation.List" and method == "list_share":
+            return ok({"shares": [self._item("/media")]})
+        if api == "SYNO.FileStation.List" and method == "getinfo":
+            paths = json.loads(query["path"])
+            self.calls.append(("getinfo", tuple(paths)))
+            return ok({"files": [
+                self._item(p) if p in self.entries else {"path": p, "code": 408}
+                for p in paths
+            ]})
+        if api == "SYNO.FileStation.List" and method == "list":
+            folder = query["folder_path"]
+            self.calls.append(("list", folder))
+            children = sorted(p for p in self.entries if p.rsplit("/", 1)[0] == folder)
+            offset, limit = int(query["offset"]), int(query["limit"])
+            page = children[offset:offset + limit]
+            return ok({"files": [self._item(p) for p in page], "total": len(children)})
+        return httpx.Response(200, json={"success": False, "error": {"code": 102}})
+
+
+class TestFileIndex(unittest.TestCase):
+    """Test crawling, incremental updates and index queries."""
+
+    def setUp(self):
+        self.client_mod, self.fi = _import_index()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.index = self.fi.FileIndex(os.path.join(self.tmp.name, "index.db"))
+        self.tree = FakeTree()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _crawl(self, **kwargs):
+        self.tree.calls.clear()
+
+        async def run():
+            client = self.client_mod.SynologyClient(
+                base_url="https://nas.test:5001",
+                username="admin",
+                password="secret",
+                pooled=False,
+                transport=self.tree.transport,
+            )
+            async with client:
+                return await self.fi.crawl_index(client, self.index, concurrency=3, **kwargs)
+
+        return asyncio.run(run())
+
+    def test_full_crawl_and_queries(self):
+        """Every entry is indexed and searchable by substring, glob, size and age."""
+        stats = self._crawl()
+
+        self.assertEqual(stats["roots"], ["/media"])
+        self.assertEqual(stats["folders_listed"], 3)
+        self.assertEqual(self.index.counts()["entries"], 6)
+
+        self.assertEqual([r["name"] for r in self.index.search(query="holiday")], ["Holiday_2023.mkv"])
+        self.assertEqual([r["name"] for r in self.index.search(query="ai")], ["trailer.mp4"])
+        self.assertEqual([r["name"] for r in self.index.search(glob="*.jp*g")], ["IMG_2024.jpg"])
+        self.assertEqual(
+            [r["name"] for r in self.index.search(min_size=1_000_000, modified_within_days=7)],
+            ["IMG_2024.jpg", "trailer.mp4"],
+        )
+        self.assertEqual([r["name"] for r in self.index.search(older_than_days=365, file_type="file")], ["Holiday_2023.mkv"])
+        self.assertEqual(
+            [r["name"] for r in self.index.largest_files(path_prefix="/media/movies", limit=1)],
+            ["Holiday_2023.mkv"],
+        )
+
+    def test_unchanged_recrawl_lists_nothing(self):
+        """Folders with unchanged mtimes are checked with getinfo only."""
+        self._crawl()
+
+        stats = self._crawl()
+
+        self.assertEqual(stats["folders_listed"], 0)
+        self.assertEqual(stats["folders_skipped"], 3)
+        self.assertFalse([c for c in self.tree.calls if c[0] == "list"])
+
+    def test_incremental_recrawl_picks_up_changes(self):
+        """Only changed folders are re-listed; removed folders drop their subtree."""
+        self._crawl()
+        self.tree.add("/media/photos/IMG_2025.jpg", dir=False, size=5, mtime=NOW)
+        self.tree.remove_tree("/media/movies")
+
+        stats = self._crawl()
+
+        listed = sorted(c[1] for c in self.tree.calls if c[0] == "list")
+        self.assertEqual(listed, ["/media", "/media/photos"])
+        self.assertEqual(stats["folders_listed"], 2)
+        self.assertEqual(self.index.search(query="holiday"), [])
+        self.assertEqual(len(self.index.search(query="IMG_")), 2)
+        self.assertIsNone(self.index.folder_mtime("/media/movies"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,183 @@
+"""Tests for paged FileStation listings.
+
+Covers SynologyClient.iter_files() and the NDJSON stream mode of
+synology_list_files against an in-process fake DSM (httpx.MockTransport).
+"""
+
+import asyncio
+import json
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+# Synology tools import config/logging_config from the MCP server package
+WORKSPACE_ROOT = Path(__file__).parent.parent
+sys.path.append(str(WORKSPACE_ROOT / "mcp_server_files"))
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+
+def _import_filestation():
+    try:
+        from jexida_dashboard.mcp_tools_core.tools.synology import client, filestation
+    except ImportError as e:
+        raise unittest.SkipTest(f"Synology tool dependencies not installed: {e}")
+    return client, filestation
+
+
+class FakeFolder:
+    """Fake DSM serving one folder of `count` files through SYNO.FileStation.List."""
+
+    def __init__(self, count):
+        self.count = count
+        self.pages = []
+        self.transport = httpx.MockTransport(self.handle)
+
+    def handle(self, request):
+        query = {k: v[0] for k, v in parse_qs(urlparse(str(request.url)).query).items()}
+        api = query.get("api")
+        if api == "SYNO.API.Auth":
+            return httpx.Response(200, json={"success": True, "data": {"sid": "sid-1"}})
+        if api != "SYNO.FileStation.List":
+            return httpx.Response(200, json={"success": False, "error": {"code": 102}})
+
+        offset, limit = int(query["offset"]), int(query["limit"])
+        self.pages.append((offset, limit))
+        files = [
+            {
+                "name": f"f{i:05d}.txt",
+                "path": f"/share/f{i:05d}.txt",
+                "isdir": False,
+                "additional": {"size": i, "time": {"mtime": 1700000000 + i}, "owner": {"user": "admin"}},
+            }
+            for i in range(offset, min(offset + limit, self.count))
+        ]
+        return httpx.Response(200, json={"success": True, "data": {
+            "files": files, "offset": offset, "total": self.count,
+        }})
+
+
+class TestIterFiles(unittest.TestCase):
+    """Test automatic paging and prefetch."""
+
+    def setUp(self):
+        self.client_mod, self.fs = _import_filestation()
+
+    def _collect(self, folder, **kwargs):
+        async def run():
+            client = self.client_mod.SynologyClient(
+                base_url="https://nas.test:5001",
+                username="admin",
+                password="secret",
+                pooled=False,
+                transport=folder.transport,
+            )
+            async with client:
+                return [f async for f in client.iter_files("/share", **kwargs)]
+
+        return asyncio.run(run())
+
+    def test_pages_through_whole_folder(self):
+        """All items are yielded in order across pages."""
+        folder = FakeFolder(2500)
+
+        files = self._collect(folder, page_size=1000)
+
+        self.assertEqual(len(files), 2500)
+        self.assertEqual(files[-1].name, "f02499.txt")
+        self.assertEqual(folder.pages, [(0, 1000), (1000, 1000), (2000, 1000)])
+
+    def test_max_items_limits_last_page(self):
+        """max_items stops paging and shrinks the final request."""
+        folder = FakeFolder(2500)
+
+        files = self._collect(folder, page_size=1000, max_items=1200, prefetch=False)
+
+        self.assertEqual(len(files), 1200)
+        self.assertEqual(folder.pages, [(0, 1000), (1000, 200)])
+
+    def test_prefetch_requests_next_page_before_consumer_finishes(self):
+        """With prefetch the next page is in flight while a page is consumed."""
+        folder = FakeFolder(300)
+
+        async def run():
+            client = self.client_mod.SynologyClient(
+                base_url="https://nas.test:5001",
+                username="admin",
+                password="secret",
+                pooled=False,
+                transport=folder.transport,
+            )
+            async with client:
+                pages_seen_at_first_item = None
+                async for _ in client.iter_files("/share", page_size=100):
+                    if pages_seen_at_first_item is None:
+                        await asyncio.sleep(0)
+                        await asyncio.sleep(0)
+                        pages_seen_at_first_item = len(folder.pages)
+                return pages_seen_at_first_item
+
+        self.assertEqual(asyncio.run(run()), 2)
+
+
+class TestListFilesStreamMode(unittest.TestCase):
+    """Test NDJSON chunking of folder listings."""
+
+    def setUp(self):
+        self.client_mod, self.fs = _import_filestation()
+
+    def test_ndjson_chunks(self):
+        """Every file appears once, as one JSON object per line, in sized chunks."""
+        folder = FakeFolder(1050)
+        params = self.fs.SynologyListFilesInput(folder_path="/share", stream=True, limit=0, chunk_size=400)
+
+        async def run():
+            client = self.client_mod.SynologyClient(
+                base_url="https://nas.test:5001",
+                username="admin",
+                password="secret",
+                pooled=False,
+                transport=folder.transport,
+            )
+            async with client:
+                return [c async for c in self.fs.iter_files_ndjson(client, params)]
+
+        chunks = asyncio.run(run())
+
+        self.assertEqual([c.count("\n") for c in chunks], [400, 400, 250])
+        first = json.loads(chunks[0].splitlines()[0])
+        self.assertEqual(first["path"], "/share/f00000.txt")
+        self.assertEqual(first["modify_time"], 1700000000)
+
+    def test_tool_caps_stream_size(self):
+        """limit=0 stops at STREAM_MAX_ITEMS and flags the result as truncated."""
+        folder = FakeFolder(1050)
+        params = self.fs.SynologyListFilesInput(folder_path="/share", stream=True, limit=0, chunk_size=400)
+
+        def make_client():
+            return self.client_mod.SynologyClient(
+                base_url="https://nas.test:5001",
+                username="admin",
+                password="secret",
+                pooled=False,
+                transport=folder.transport,
+            )
+
+        with patch.object(self.fs, "SynologyClient", make_client), patch.object(self.fs, "STREAM_MAX_ITEMS", 600):
+            capped = asyncio.run(self.fs.synology_list_files(params))
+            within = asyncio.run(self.fs.synology_list_files(params.model_copy(update={"limit": 100})))
+
+        self.assertTrue(capped.success, capped.error)
+        self.assertEqual(capped.file_count, 600)
+        self.assertTrue(capped.truncated)
+        self.assertEqual(within.file_count, 100)
+        self.assertFalse(within.truncated)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,192 @@
+"""Tests for incremental Synology log ingestion.
+
+Tests entry normalization, cursor-based selection of new entries from
+newest-first pages, cursor advancement, and backfill of entries a run
+could not take because of max_entries.
+"""
+
+import asyncio
+import sys
+import unittest
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+# Synology tools import config/logging_config from the MCP server package
+WORKSPACE_ROOT = Path(__file__).parent.parent
+sys.path.append(str(WORKSPACE_ROOT / "mcp_server_files"))
+
+T0 = int(datetime(2024, 12, 1, 10, 0, tzinfo=timezone.utc).timestamp())
+
+
+class TestLogIngest(unittest.TestCase):
+    """Test log_ingest pure helpers."""
+
+    def setUp(self):
+        try:
+            from jexida_dashboard.mcp_tools_core.tools.synology import log_ingest
+        except ImportError as e:
+            self.skipTest(f"Synology tool dependencies not installed: {e}")
+        self.li = log_ingest
+
+    def _rows(self, *entries):
+        return [self.li.normalize_entry("connection", e) for e in entries]
+
+    def test_parse_log_time_formats(self):
+        """Epoch numbers, digit strings and DSM date strings are all UTC datetimes."""
+        expected = datetime(2024, 12, 1, 10, 0, tzinfo=timezone.utc)
+
+        self.assertEqual(self.li.parse_log_time(T0), expected)
+        self.assertEqual(self.li.parse_log_time(str(T0)), expected)
+        self.assertEqual(self.li.parse_log_time("2024/12/01 10:00:00"), expected)
+        self.assertIsNone(self.li.parse_log_time(""))
+        self.assertIsNone(self.li.parse_log_time(0))
+
+        # DSM date strings are NAS local time
+        self.assertEqual(self.li.parse_log_time("2024/12/01 11:00:00", ZoneInfo("Europe/Berlin")), expected)
+        self.assertEqual(self.li.parse_log_time(T0, ZoneInfo("Europe/Berlin")), expected)
+
+    def test_normalize_entry(self):
+        """Fields are mapped and the fingerprint is stable."""
+        raw = {"time": T0, "level": "warn", "user": "admin", "ip": "10.0.0.5",
+               "event": "login", "desc": "Failed login"}
+
+        row = self.li.normalize_entry("connection", raw)
+
+        self.assertEqual(row["description"], "Failed login")
+        self.assertEqual(row["level"], "warn")
+        self.assertEqual(len(row["fingerprint"]), 40)
+        self.assertEqual(row["fingerprint"], self.li.normalize_entry("connection", dict(raw))["fingerprint"])
+        self.assertNotEqual(row["fingerprint"], self.li.normalize_entry("transfer", raw)["fingerprint"])
+        self.assertIsNone(self.li.normalize_entry("connection", {"user": "x"}))
+
+    def test_first_run_takes_everything(self):
+        """Without a cursor every entry is new and paging continues."""
+        rows = self._rows({"time": T0 + 1, "event": "b"}, {"time": T0, "event": "a"})
+
+        new, reached = self.li.select_new_entries(rows, None)
+
+        self.assertEqual(new, rows)
+        self.assertFalse(reached)
+
+    def test_stops_at_cursor_and_skips_seen_same_second(self):
+        """Entries at the cursor second are deduplicated by fingerprint."""
+        seen = self._rows({"time": T0, "event": "a"})[0]
+        cursor = {"last_time": T0, "fingerprints": [seen["fingerprint"]]}
+        rows = self._rows(
+            {"time": T0 + 5, "event": "c"},
+            {"time": T0, "event": "b"},
+            {"time": T0, "event": "a"},
+            {"time": T0 - 1, "event": "old"},
+        )
+
+        new, reached = self.li.select_new_entries(rows, cursor)
+
+        self.assertEqual([r["event"] for r in new], ["c", "b"])
+        self.assertTrue(reached)
+
+    def test_advance_cursor(self):
+        """The cursor moves to the newest time and keeps its fingerprints."""
+        rows = self._rows({"time": T0 + 5, "event": "c"}, {"time": T0 + 5, "event": "d"}, {"time": T0, "event": "b"})
+
+        cursor = self.li.advance_cursor({"last_time": T0, "fingerprints": ["x"]}, rows)
+
+        self.assertEqual(cursor["last_time"], T0 + 5)
+        self.assertEqual(cursor["fingerprints"], sorted(r["fingerprint"] for r in rows[:2]))
+
+        # More entries in the same second extend the fingerprint set
+        later = self._rows({"time": T0 + 5, "event": "e"})
+        merged = self.li.advance_cursor(cursor, later)
+        self.assertEqual(len(merged["fingerprints"]), 3)
+        self.assertEqual(self.li.advance_cursor(cursor, []), cursor)
+
+
+class FakeLogCenter:
+    """Newest-first Log Center list with offset/limit paging."""
+
+    base_url = "https://nas.test:5001"
+
+    def __init__(self):
+        self.entries = []
+
+    def log(self, count):
+        start = len(self.entries)
+        self.entries[:0] = [{"time": T0 + start + i, "event": f"e{start + i}"} for i in reversed(range(count))]
+
+    async def list_logs(self, log_type, offset, limit):
+        return self.entries[offset:offset + limit]
+
+
+class TestLogBackfill(unittest.TestCase):
+    """Test that entries beyond max_entries are fetched by later runs."""
+
+    def setUp(self):
+        try:
+            from jexida_dashboard.mcp_tools_core.tools.synology import log_ingest
+        except ImportError as e:
+            self.skipTest(f"Synology tool dependencies not installed: {e}")
+        self.li = log_ingest
+        self.nas = FakeLogCenter()
+        self.cursor = None
+        self.stored = {}
+
+        async def load_cursor(nas, log_type):
+            return self.cursor
+
+        async def store_entries(nas, log_type, rows, cursor):
+            before = len(self.stored)
+            self.stored.update((row["fingerprint"], row) for row in rows)
+            self.cursor = cursor
+            return len(self.stored) - before
+
+        for name, fake in (("_load_cursor", load_cursor), ("_store_entries", store_entries)):
+            patcher = patch.object(log_ingest, name, fake)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _ingest(self):
+        return asyncio.run(self.li.ingest_logs(self.nas, "connection", page_size=4, max_entries=10))
+
+    def _events(self):
+        return sorted(row["event"] for row in self.stored.values())
+
+    def test_truncated_run_is_backfilled_later(self):
+        """A first run over 25 entries keeps the newest 10 and later runs fetch the rest."""
+        self.nas.log(25)
+
+        first = self._ingest()
+        self.assertEqual((first["fetched_new"], first["stored"]), (10, 10))
+        self.assertTrue(first["truncated"])
+        self.assertEqual(self.cursor["last_time"], T0 + 24)
+
+        self.nas.log(3)
+        second = self._ingest()
+        self.assertEqual((second["fetched_new"], second["backfilled"]), (3, 7))
+        self.assertTrue(second["truncated"])
+
+        third = self._ingest()
+        self.assertEqual((third["fetched_new"], third["backfilled"]), (0, 8))
+        self.assertFalse(third["truncated"])
+        self.assertNotIn("gaps", self.cursor)
+        self.assertEqual(self._events(), sorted(f"e{i}" for i in range(28)))
+
+        self.assertEqual(self._ingest()["stored"], 0)
+
+    def test_backfill_stops_at_previous_cursor(self):
+        """A gap opened after earlier runs only reaches back to the old cursor."""
+        self.nas.log(5)
+        self._ingest()
+        self.nas.log(14)
+
+        first = self._ingest()
+        second = self._ingest()
+
+        self.assertTrue(first["truncated"])
+        self.assertEqual(second["backfilled"], 4)
+        self.assertFalse(second["truncated"])
+        self.assertEqual(len(self.stored), 19)
+
+
+if __name__ == "__main__":
+    unittest.main()
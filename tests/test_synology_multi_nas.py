@@ -0,0 +1,134 @@
+"""Tests for the Synology multi-NAS inventory and fan-out executor.
+
+Builds the inventory from secret key/values and fans a client call out to
+fake NAS units (httpx.MockTransport), one of which is slow and one of
+which rejects the login.
+"""
+
+import asyncio
+import sys
+import time
+import unittest
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+# Synology tools import config/logging_config from the MCP server package
+WORKSPACE_ROOT = Path(__file__).parent.parent
+sys.path.append(str(WORKSPACE_ROOT / "mcp_server_files"))
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+
+def _import_multi_nas():
+    try:
+        from jexida_dashboard.mcp_tools_core.tools.synology import multi_nas
+    except ImportError as e:
+        raise unittest.SkipTest(f"Synology tool dependencies not installed: {e}")
+    return multi_nas
+
+
+def fake_nas(shares, delay=0.0, login_ok=True):
+    """MockTransport for a NAS with the given share names."""
+    async def handle(request):
+        query = {k: v[0] for k, v in parse_qs(urlparse(str(request.url)).query).items()}
+        if delay:
+            await asyncio.sleep(delay)
+        if query.get("api") == "SYNO.API.Auth":
+            if not login_ok:
+                return httpx.Response(200, json={"success": False, "error": {"code": 400}})
+            return httpx.Response(200, json={"success": True, "data": {"sid": "sid-1"}})
+        return httpx.Response(200, json={"success": True, "data": {"shares": [
+            {"name": name, "path": f"/{name}", "isdir": True} for name in shares
+        ]}})
+    return httpx.MockTransport(handle)
+
+
+class TestInventory(unittest.TestCase):
+    """Test grouping secrets into NAS targets."""
+
+    def setUp(self):
+        self.m = _import_multi_nas()
+
+    def test_build_inventory(self):
+        """Prefixed keys make named targets, bare keys the default target."""
+        targets = self.m.build_inventory({
+            "url": "https://main:5001/",
+            "username": "admin",
+            "password": "a",
+            "backup.url": "https://backup:5001",
+            "backup.username": "svc",
+            "backup.password": "hunter2",
+            "backup.verify_ssl": "false",
+            "offsite.username": "no-url",
+            "api_token": "ignored",
+        })
+
+        self.assertEqual([t.name for t in targets], ["default", "backup"])
+        self.assertEqual(targets[0].url, "https://main:5001")
+        self.assertIsNone(targets[0].verify_ssl)
+        self.assertEqual((targets[1].username, targets[1].verify_ssl), ("svc", False))
+        self.assertNotIn("hunter2", repr(targets[1]))
+
+    def test_select_targets(self):
+        """Unknown names are rejected; no names selects all."""
+        targets = self.m.build_inventory({"a.url": "https://a", "b.url": "https://b"})
+
+        self.assertEqual(self.m.select_targets(targets, []), targets)
+        self.assertEqual([t.name for t in self.m.select_targets(targets, ["b"])], ["b"])
+        with self.assertRaises(ValueError):
+            self.m.select_targets(targets, ["c"])
+
+
+class TestFanOut(unittest.TestCase):
+    """Test concurrent execution with per-target timeouts."""
+
+    def setUp(self):
+        self.m = _import_multi_nas()
+        if httpx is None:
+            self.skipTest("httpx not installed")
+
+        transports = {
+            "fast": fake_nas(["photo"]),
+            "second": fake_nas(["video", "music"], delay=0.05),
+            "slow": fake_nas(["x"], delay=5),
+            "locked": fake_nas([], login_ok=False),
+        }
+
+        class FakeTarget(self.m.NasTarget):
+            def client(self, **kwargs):
+                return super().client(pooled=False, transport=transports[self.name], **kwargs)
+
+        self.targets = [
+            FakeTarget(name, f"https://{name}.test:5001", "admin", "secret")
+            for name in transports
+        ]
+
+    def test_merged_results_with_per_target_errors(self):
+        """Every target gets a result; failures don't hold up the others."""
+        async def shares(client):
+            return await client.list_shares()
+
+        started = time.monotonic()
+        results = asyncio.run(self.m.fan_out(self.targets, shares, timeout=0.5))
+        elapsed = time.monotonic() - started
+
+        by_name = {r.target: r for r in results}
+        self.assertEqual([r.target for r in results], ["fast", "second", "slow", "locked"])
+        self.assertTrue(by_name["fast"].success)
+        self.assertEqual(
+            [s["name"] for s in self.m.to_jsonable(by_name["second"].data)],
+            ["video", "music"],
+        )
+        self.assertFalse(by_name["slow"].success)
+        self.assertIn("Timed out", by_name["slow"].error)
+        self.assertFalse(by_name["locked"].success)
+        self.assertIn("SynologyAuthError", by_name["locked"].error)
+        # Bounded by the timeout, not the slow NAS's 5s
+        self.assertLess(elapsed, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
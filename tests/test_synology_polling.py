@@ -0,0 +1,173 @@
+"""Tests for adaptive polling of Synology background tasks.
+
+Covers poll_task()/wait_task() with scripted status functions and
+SynologyClient.delete_files() against a fake DSM (httpx.MockTransport).
+"""
+
+import asyncio
+import sys
+import time
+import unittest
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+# Synology tools import config/logging_config from the MCP server package
+WORKSPACE_ROOT = Path(__file__).parent.parent
+sys.path.append(str(WORKSPACE_ROOT / "mcp_server_files"))
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+
+def _import_polling():
+    try:
+        from jexida_dashboard.mcp_tools_core.tools.synology import client, polling
+    except ImportError as e:
+        raise unittest.SkipTest(f"Synology tool dependencies not installed: {e}")
+    return client, polling
+
+
+class ScriptedTask:
+    """Status function that finishes after `checks` calls."""
+
+    def __init__(self, checks):
+        self.checks = checks
+        self.calls = 0
+        self.call_times = []
+        self.stopped = 0
+
+    async def status(self):
+        self.calls += 1
+        self.call_times.append(time.monotonic())
+        done = self.calls >= self.checks
+        return {"finished": done, "progress": min(1.0, self.calls / self.checks)}
+
+    async def stop(self):
+        self.stopped += 1
+
+
+def _finished(status):
+    return status["finished"]
+
+
+class TestPollTask(unittest.TestCase):
+    """Test backoff, deadline and cancellation."""
+
+    def setUp(self):
+        self.client_mod, self.polling = _import_polling()
+
+    def test_short_task_returns_quickly(self):
+        """A task finished on the first check costs ~50ms, not a full second."""
+        task = ScriptedTask(checks=1)
+
+        started = time.monotonic()
+        status = asyncio.run(self.polling.wait_task(task.status, _finished, stop=task.stop))
+
+        self.assertTrue(status["finished"])
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertEqual(task.stopped, 0)
+
+    def test_interval_backs_off(self):
+        """Without progress the gap between checks grows exponentially."""
+        task = ScriptedTask(checks=5)
+
+        asyncio.run(self.polling.wait_task(
+            task.status, _finished, progress=None, initial_interval=0.01, max_interval=1.0,
+        ))
+
+        gaps = [b - a for a, b in zip(task.call_times, task.call_times[1:])]
+        self.assertEqual(len(gaps), 4)
+        self.assertGreater(gaps[-1], gaps[0] * 3)
+
+    def test_yields_progress_events(self):
+        """Every check is yielded; only the last is finished."""
+        task = ScriptedTask(checks=3)
+
+        async def run():
+            return [e async for e in self.polling.poll_task(task.status, _finished, initial_interval=0.01)]
+
+        events = asyncio.run(run())
+
+        self.assertEqual([e.attempt for e in events], [1, 2, 3])
+        self.assertEqual([e.finished for e in events], [False, False, True])
+        self.assertAlmostEqual(events[0].progress, 1 / 3)
+        self.assertEqual(events[-1].progress, 1.0)
+
+    def test_deadline_stops_task(self):
+        """Passing the deadline stops the task on the NAS and raises."""
+        task = ScriptedTask(checks=10_000)
+
+        with self.assertRaises(self.client_mod.SynologyAPIError) as ctx:
+            asyncio.run(self.polling.wait_task(
+                task.status, _finished, stop=task.stop, timeout=0.2, label="Delete operation",
+            ))
+
+        self.assertIn("Delete operation timed out", str(ctx.exception))
+        self.assertEqual(task.stopped, 1)
+
+    def test_cancellation_stops_task(self):
+        """Cancelling the waiting coroutine stops the task on the NAS."""
+        task = ScriptedTask(checks=10_000)
+
+        async def run():
+            waiter = asyncio.ensure_future(self.polling.wait_task(task.status, _finished, stop=task.stop))
+            await asyncio.sleep(0.2)
+            waiter.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await waiter
+
+        asyncio.run(run())
+
+        self.assertEqual(task.stopped, 1)
+
+
+class TestDeleteFilesPolling(unittest.TestCase):
+    """Test the FileStation delete task through the client."""
+
+    def setUp(self):
+        self.client_mod, self.polling = _import_polling()
+        self.requests = []
+
+    def _handle(self, request):
+        query = {k: v[0] for k, v in parse_qs(urlparse(str(request.url)).query).items()}
+        api, method = query.get("api"), query.get("method")
+        self.requests.append((api, method))
+        if api == "SYNO.API.Auth":
+            return httpx.Response(200, json={"success": True, "data": {"sid": "sid-1"}})
+        if api == "SYNO.FileStation.Delete" and method == "start":
+            return httpx.Response(200, json={"success": True, "data": {"taskid": "FileStation_1"}})
+        if api == "SYNO.FileStation.Delete" and method == "status":
+            checks = sum(1 for r in self.requests if r == ("SYNO.FileStation.Delete", "status"))
+            return httpx.Response(200, json={"success": True, "data": {
+                "finished": checks >= 2, "progress": checks / 2,
+            }})
+        return httpx.Response(200, json={"success": False, "error": {"code": 102}})
+
+    def test_delete_files_completes_without_fixed_sleep(self):
+        """Delete returns after two quick checks and reports them."""
+        events = self.polling.PollEventLog()
+
+        async def run():
+            client = self.client_mod.SynologyClient(
+                base_url="https://nas.test:5001",
+                username="admin",
+                password="secret",
+                pooled=False,
+                transport=httpx.MockTransport(self._handle),
+            )
+            async with client:
+                return await client.delete_files(["/share/old"], on_progress=events)
+
+        started = time.monotonic()
+        self.assertTrue(asyncio.run(run()))
+
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(events.checks, 2)
+        self.assertTrue(events.to_list()[-1]["finished"])
+        self.assertNotIn(("SYNO.FileStation.Delete", "stop"), self.requests)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+"""Tests for the shared Synology session pool.
+
+Drives SynologyClient against an in-process fake DSM (httpx.MockTransport)
+to check that sessions are reused across clients and healed on expiry.
+"""
+
+import asyncio
+import sys
+import unittest
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+# Synology tools import config/logging_config from the MCP server package
+WORKSPACE_ROOT = Path(__file__).parent.parent
+sys.path.append(str(WORKSPACE_ROOT / "mcp_server_files"))
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+
+def _import_client():
+    try:
+        from jexida_dashboard.mcp_tools_core.tools.synology import client, session_pool
+    except ImportError as e:
+        raise unittest.SkipTest(f"Synology tool dependencies not installed: {e}")
+    return client, session_pool
+
+
+class FakeDSM:
+    """Minimal DSM Web API: login, API info, DSM info and system info."""
+
+    def __init__(self):
+        self.logins = 0
+        self.info_queries = 0
+        self.valid_sids = set()
+        self.transport = httpx.MockTransport(self.handle)
+
+    def expire_all(self):
+        self.valid_sids.clear()
+
+    def handle(self, request):
+        query = {k: v[0] for k, v in parse_qs(urlparse(str(request.url)).query).items()}
+        api = query.get("api")
+        method = query.get("method")
+
+        if api == "SYNO.API.Auth" and method == "login":
+            self.logins += 1
+            sid = f"sid-{self.logins}"
+            self.valid_sids.add(sid)
+            return httpx.Response(200, json={"success": True, "data": {"sid": sid}})
+        if api == "SYNO.API.Auth" and method == "logout":
+            self.valid_sids.discard(query.get("_sid"))
+            return httpx.Response(200, json={"success": True})
+        if api == "SYNO.API.Info":
+            self.info_queries += 1
+            return httpx.Response(200, json={"success": True, "data": {
+                "SYNO.Core.System": {"path": "entry.cgi", "maxVersion": 3, "version": 3},
+            }})
+
+        if query.get("_sid") not in self.valid_sids:
+            return httpx.Response(200, json={"success": False, "error": {"code": 119}})
+        if api == "SYNO.DSM.Info":
+            return httpx.Response(200, json={"success": True, "data": {"version_string": "DSM 7.2-64570"}})
+        if api == "SYNO.Core.System":
+            return httpx.Response(200, json={"success": True, "data": {"hostname": "nas"}})
+        return httpx.Response(200, json={"success": False, "error": {"code": 102}})
+
+
+class TestSynologySessionPool(unittest.TestCase):
+    """Test session reuse and automatic re-authentication."""
+
+    def setUp(self):
+        self.client_mod, self.pool_mod = _import_client()
+        self.dsm = FakeDSM()
+        self.pool_mod.get_session_pool()._sessions.clear()
+
+    def tearDown(self):
+        self.pool_mod.get_session_pool()._sessions.clear()
+
+    def _client(self, **kwargs):
+        return self.client_mod.SynologyClient(
+            base_url="https://nas.test:5001",
+            username="admin",
+            password="secret",
+            transport=self.dsm.transport,
+            **kwargs,
+        )
+
+    def test_pooled_clients_share_one_login(self):
+        """Consecutive pooled clients reuse the SID and API info."""
+        async def run():
+            for _ in range(3):
+                async with self._client() as client:
+                    info = await client.get_network_info()
+                    self.assertEqual(info["hostname"], "nas")
+
+        asyncio.run(run())
+
+        self.assertEqual(self.dsm.logins, 1)
+        self.assertEqual(self.dsm.info_queries, 1)
+        session = self.pool_mod.get_session_pool().sessions()[0]
+        self.assertEqual(session.dsm_version, "DSM 7.2-64570")
+        self.assertEqual(session.borrowers, 0)
+
+    def test_session_reused_across_event_loops(self):
+        """A new event loop gets a new HTTP client but keeps the SID."""
+        async def run():
+            async with self._client() as client:
+                await client.get_network_info()
+
+        asyncio.run(run())
+        asyncio.run(run())
+
+        self.assertEqual(self.dsm.logins, 1)
+
+    def test_expired_session_reauthenticates_once(self):
+        """Error 119 triggers a single re-login shared by concurrent borrowers."""
+        async def run():
+            async with self._client() as client:
+                await client.get_network_info()
+            self.dsm.expire_all()
+
+            async def call():
+                async with self._client() as client:
+                    return await client.get_network_info()
+
+            return await asyncio.gather(*(call() for _ in range(4)))
+
+        results = asyncio.run(run())
+
+        self.assertEqual([r["hostname"] for r in results], ["nas"] * 4)
+        self.assertEqual(self.dsm.logins, 2)
+
+    def test_unpooled_client_logs_out(self):
+        """pooled=False keeps the original login/logout per use."""
+        async def run():
+            async with self._client(pooled=False) as client:
+                await client.get_network_info()
+
+        asyncio.run(run())
+
+        self.assertEqual(self.dsm.logins, 1)
+        self.assertEqual(self.dsm.valid_sids, set())
+        self.assertEqual(self.pool_mod.get_session_pool().sessions(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
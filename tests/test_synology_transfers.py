@@ -0,0 +1,290 @@
+"""Tests for streamed FileStation uploads and downloads.
+
+Runs SynologyClient.upload_file/download_file against a local stand-in
+DSM HTTP server (http.server in a background thread) that implements
+login, multipart upload, ranged download and the MD5 task API.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+
+# Synology tools import config/logging_config from the MCP server package
+WORKSPACE_ROOT = Path(__file__).parent.parent
+sys.path.append(str(WORKSPACE_ROOT / "mcp_server_files"))
+
+
+def _import_client():
+    try:
+        from jexida_dashboard.mcp_tools_core.tools.synology import client
+    except ImportError as e:
+        raise unittest.SkipTest(f"Synology tool dependencies not installed: {e}")
+    return client
+
+
+class StandInDSM:
+    """State of the stand-in NAS shared with its request handler."""
+
+    def __init__(self):
+        self.files = {}
+        self.range_headers = []
+        self.ignore_range = False
+        self.corrupt_md5 = False
+
+
+def _make_handler(nas):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _json(self, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _query(self):
+            return {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+
+        def do_GET(self):
+            query = self._query()
+            api, method = query.get("api"), query.get("method")
+
+            if api == "SYNO.API.Auth":
+                return self._json({"success": True, "data": {"sid": "sid-1"}})
+            if api == "SYNO.API.Info":
+                return self._json({"success": True, "data": {}})
+            if api == "SYNO.FileStation.MD5" and method == "start":
+                return self._json({"success": True, "data": {"taskid": query["file_path"]}})
+            if api == "SYNO.FileStation.MD5" and method == "status":
+                md5 = hashlib.md5(nas.files[query["taskid"]]).hexdigest()
+                if nas.corrupt_md5:
+                    md5 = "0" * 32
+                return self._json({"success": True, "data": {"finished": True, "md5": md5}})
+            if api == "SYNO.FileStation.Download":
+                return self._download(query["path"])
+            return self._json({"success": False, "error": {"code": 102}})
+
+        def _download(self, path):
+            data = nas.files.get(path)
+            if data is None:
+                return self._json({"success": False, "error": {"code": 408}})
+
+            range_header = self.headers.get("Range")
+            nas.range_headers.append(range_header)
+            start = 0
+            if range_header and not nas.ignore_range:
+                start = int(range_header.split("=")[1].rstrip("-"))
+
+            self.send_response(206 if start else 200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(len(data) - start))
+            if start:
+                self.send_header("Content-Range", f"bytes {start}-{len(data) - 1}/{len(data)}")
+            self.end_headers()
+            self.wfile.write(data[start:])
+
+        def do_POST(self):
+            query = self._query()
+            if query.get("api") != "SYNO.FileStation.Upload":
+                return self._json({"success": False, "error": {"code": 102}})
+
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            message = BytesParser(policy=HTTP).parsebytes(
+                f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode() + body
+            )
+            fields = {}
+            for part in message.iter_parts():
+                name = part.get_param("name", header="content-disposition")
+                if part.get_filename():
+                    fields["filename"] = part.get_filename()
+                    fields["content"] = part.get_payload(decode=True)
+                else:
+                    fields[name] = part.get_payload(decode=True).decode()
+
+            nas.files[f"{fields['path']}/{fields['filename']}"] = fields["content"]
+            return self._json({"success": True, "data": {}})
+
+    return Handler
+
+
+class TestSynologyTransfers(unittest.TestCase):
+    """Test upload/download streaming, resume and verification."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.client_mod = _import_client()
+        cls.nas = StandInDSM()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(cls.nas))
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        self.nas.files.clear()
+        self.nas.range_headers.clear()
+        self.nas.ignore_range = False
+        self.nas.corrupt_md5 = False
+        self.tmp = tempfile.TemporaryDirectory()
+        self.payload = os.urandom(300 * 1024 + 17)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _run(self, body):
+        async def run():
+            client = self.client_mod.SynologyClient(
+                base_url=self.base_url,
+                username="admin",
+                password="secret",
+                pooled=False,
+            )
+            async with client:
+                return await body(client)
+
+        return asyncio.run(run())
+
+    def test_upload_streams_and_verifies(self):
+        """Upload arrives intact, reports chunked progress and verifies MD5."""
+        local = os.path.join(self.tmp.name, "backup.tar")
+        Path(local).write_bytes(self.payload)
+        progress = []
+
+        result = self._run(lambda c: c.upload_file(
+            local, "/backups", chunk_size=64 * 1024,
+            progress=lambda done, total: progress.append((done, total)),
+        ))
+
+        self.assertEqual(self.nas.files["/backups/backup.tar"], self.payload)
+        self.assertEqual(result["path"], "/backups/backup.tar")
+        self.assertTrue(result["verified"])
+        self.assertEqual(len(progress), 5)
+        self.assertEqual(progress[-1], (len(self.payload), len(self.payload)))
+
+    def test_download_full(self):
+        """A fresh download writes the file and removes the .part file."""
+        self.nas.files["/backups/db.dump"] = self.payload
+        local = os.path.join(self.tmp.name, "db.dump")
+
+        result = self._run(lambda c: c.download_file("/backups/db.dump", local, chunk_size=64 * 1024))
+
+        self.assertEqual(Path(local).read_bytes(), self.payload)
+        self.assertFalse(os.path.exists(local + ".part"))
+        self.assertEqual(result["resumed_from"], 0)
+        self.assertTrue(result["verified"])
+
+    def test_download_resumes_with_range(self):
+        """An existing .part file is continued with a Range request."""
+        self.nas.files["/backups/db.dump"] = self.payload
+        local = os.path.join(self.tmp.name, "db.dump")
+        Path(local + ".part").write_bytes(self.payload[:100000])
+
+        result = self._run(lambda c: c.download_file("/backups/db.dump", local))
+
+        self.assertEqual(self.nas.range_headers, ["bytes=100000-"])
+        self.assertEqual(result["resumed_from"], 100000)
+        self.assertEqual(Path(local).read_bytes(), self.payload)
+        self.assertTrue(result["verified"])
+
+    def test_download_restarts_when_range_ignored(self):
+        """A 200 answer to a Range request restarts the file from scratch."""
+        self.nas.files["/backups/db.dump"] = self.payload
+        self.nas.ignore_range = True
+        local = os.path.join(self.tmp.name, "db.dump")
+        Path(local + ".part").write_bytes(b"stale-bytes")
+
+        result = self._run(lambda c: c.download_file("/backups/db.dump", local))
+
+        self.assertEqual(result["resumed_from"], 0)
+        self.assertEqual(Path(local).read_bytes(), self.payload)
+
+    def test_checksum_mismatch_raises(self):
+        """A differing NAS-side MD5 fails the transfer and keeps the old file."""
+        self.nas.files["/backups/db.dump"] = self.payload
+        self.nas.corrupt_md5 = True
+        local = os.path.join(self.tmp.name, "db.dump")
+        Path(local).write_bytes(b"previous backup")
+
+        with self.assertRaises(self.client_mod.SynologyAPIError):
+            self._run(lambda c: c.download_file("/backups/db.dump", local))
+
+        self.assertEqual(Path(local).read_bytes(), b"previous backup")
+        self.assertFalse(os.path.exists(local + ".part"))
+
+    def test_missing_remote_file_reports_error(self):
+        """A DSM error envelope is raised instead of being saved as data."""
+        local = os.path.join(self.tmp.name, "missing.bin")
+
+        with self.assertRaises(self.client_mod.SynologyAPIError) as ctx:
+            self._run(lambda c: c.download_file("/backups/missing.bin", local, verify=False))
+
+        self.assertEqual(ctx.exception.error_code, 408)
+        self.assertFalse(os.path.exists(local))
+
+
+class TestTransferPaths(unittest.TestCase):
+    """Test that tool-supplied local paths stay inside the transfer directory."""
+
+    def setUp(self):
+        try:
+            from jexida_dashboard.mcp_tools_core.tools.synology import transfers
+        except ImportError as e:
+            self.skipTest(f"Synology tool dependencies not installed: {e}")
+        self.transfers = transfers
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name, "transfers")
+        settings = SimpleNamespace(synology_transfer_dir=str(self.root), data_dir=self.tmp.name)
+        patcher = patch.object(transfers, "get_settings", return_value=settings)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_relative_path_resolves_under_root(self):
+        """Nested relative paths land inside the transfer directory."""
+        resolved = self.transfers.resolve_transfer_path("db/./nightly.dump")
+
+        self.assertEqual(resolved, self.root.resolve() / "db" / "nightly.dump")
+
+    def test_absolute_and_escaping_paths_are_rejected(self):
+        """Absolute paths, .. escapes and symlinks out of the root raise ValueError."""
+        self.root.mkdir()
+        os.symlink(self.tmp.name, self.root / "outside")
+
+        for path in ("/etc/passwd", "../secrets.db", "db/../../x", "..", "", "outside/x"):
+            with self.subTest(path=path):
+                with self.assertRaises(ValueError):
+                    self.transfers.resolve_transfer_path(path)
+
+    def test_download_tool_rejects_escape_without_connecting(self):
+        """The tool reports the rejected path instead of touching the NAS."""
+        params = self.transfers.SynologyDownloadFileInput(path="/backups/db.dump", local_path="../db.dump")
+
+        with patch.object(self.transfers, "SynologyClient") as client:
+            result = asyncio.run(self.transfers.synology_download_file(params))
+
+        self.assertFalse(result.success)
+        self.assertIn("transfer directory", result.error)
+        client.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+"""Tests for Synology folder usage analytics.
+
+Walks a fake NAS tree (httpx.MockTransport) with walk_usage() and checks
+subtree roll-ups, the extension breakdown, the DirSize fallback and the
+per-folder mtime cache.
+"""
+
+import asyncio
+import json
+import sys
+import unittest
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+# Synology tools import config/logging_config from the MCP server package
+WORKSPACE_ROOT = Path(__file__).parent.parent
+sys.path.append(str(WORKSPACE_ROOT / "mcp_server_files"))
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover
+    httpx = None
+
+
+def _import_usage():
+    try:
+        from jexida_dashboard.mcp_tools_core.tools.synology import client, usage
+    except ImportError as e:
+        raise unittest.SkipTest(f"Synology tool dependencies not installed: {e}")
+    return client, usage
+
+
+class FakeTree:
+    """Fake NAS: {path: size} for files, None for folders (all mtime 1)."""
+
+    def __init__(self):
+        self.entries = {
+            "/v": None,
+            "/v/a.mkv": 1000,
+            "/v/movies": None,
+            "/v/movies/x.mkv": 5000,
+            "/v/movies/y.mp4": 3000,
+            "/v/movies/old": None,
+            "/v/movies/old/z.mkv": 2000,
+            "/v/docs": None,
+            "/v/docs/r.pdf": 10,
+            "/v/docs/notes": 20,
+        }
+        self.mtimes = {p: 1 for p, size in self.entries.items() if size is None}
+        self.calls = []
+        self.transport = httpx.MockTransport(self.handle)
+
+    def _item(self, path):
+        is_dir = self.entries[path] is None
+        return {
+            "name": path.rsplit("/", 1)[1],
+            "path": path,
+            "isdir": is_dir,
+            "additional": {
+                "size": 0 if is_dir else self.entries[path],
+                "time": {"mtime": self.mtimes.get(path, 1)},
+            },
+        }
+
+    def _subtree(self, folder):
+        return [p for p in self.entries if p.startswith(folder + "/")]
+
+    def handle(self, request):
+        query = {k: v[0] for k, v in parse_qs(urlparse(str(request.url)).query).items()}
+        api, method = query.get("api"), query.get("method")
+        ok = lambda data: httpx.Response(200, json={"success": True, "data": data})
+
+        if api == "SYNO.API.Auth":
+            return ok({"sid": "sid-1"})
+        if api == "SYNO.FileStation.List" and method == "getinfo":
+            paths = json.loads(query["path"])
+            return ok({"files": [
+                self._item(p) if p in self.entries else {"path": p, "code": 408}
+                for p in paths
+            ]})
+        if api == "SYNO.FileStation.List" and method == "list":
+            folder = query["folder_path"]
+            self.calls.append(("list", folder))
+            children = sorted(p for p in self.entries if p.rsplit("/", 1)[0] == folder)
+            offset, limit = int(query["offset"]), int(query["limit"])
+            return ok({"files": [self._item(p) for p in children[offset:offset + limit]], "total": len(children)})
+        if api == "SYNO.FileStation.DirSize" and method == "start":
+            folder = json.loads(query["path"])[0]
+            self.calls.append(("dirsize", folder))
+            return ok({"taskid": folder})
+        if api == "SYNO.FileStation.DirSize" and method == "status":
+            subtree = self._subtree(query["taskid"])
+            return ok({
+                "finished": True,
+                "total_size": sum(self.entries[p] or 0 for p in subtree),
+                "num_file": sum(1 for p in subtree if self.entries[p] is not None),
+                "num_dir": sum(1 for p in subtree if self.entries[p] is None),
+            })
+        return httpx.Response(200, json={"success": False, "error": {"code": 102}})
+
+
+class TestFolderUsage(unittest.TestCase):
+    """Test the concurrent usage walker."""
+
+    def setUp(self):
+        self.client_mod, self.usage = _import_usage()
+        self.tree = FakeTree()
+        self.cache = self.usage.FolderStatsCache()
+
+    def _walk(self, **kwargs):
+        self.tree.calls.clear()
+
+        async def run():
+            client = self.client_mod.SynologyClient(
+                base_url="https://nas.test:5001",
+                username="admin",
+                password="secret",
+                pooled=False,
+                transport=self.tree.transport,
+            )
+            async with client:
+                return await self.usage.walk_usage(client, "/v", concurrency=3, **kwargs)
+
+        return asyncio.run(run())
+
+    def test_rolls_up_subtrees_and_extensions(self):
+        """Subtree totals, top-N tree and extension totals are consistent."""
+        result = self._walk(cache=self.cache)
+
+        tree = self.usage.build_usage_tree(result["nodes"], "/v", depth=2, top_n=1)
+        self.assertEqual((tree["bytes"], tree["files"], tree["folders"]), (11030, 6, 3))
+        self.assertEqual([c["path"] for c in tree["children"]], ["/v/movies"])
+        self.assertEqual(tree["other_bytes"], 30)
+        self.assertEqual(tree["children"][0]["bytes"], 10000)
+        self.assertEqual(tree["children"][0]["children"][0]["path"], "/v/movies/old")
+        self.assertEqual(result["extensions"]["mkv"], [8000, 3])
+        self.assertEqual(result["extensions"][""], [20, 1])
+        self.assertEqual(result["folders_listed"], 4)
+
+    def test_deep_folders_use_dirsize(self):
+        """Folders at scan_depth are measured on the NAS, not listed."""
+        result = self._walk(scan_depth=1)
+
+        self.assertEqual(sorted(c[1] for c in self.tree.calls if c[0] == "dirsize"), ["/v/docs", "/v/movies"])
+        self.assertNotIn(("list", "/v/movies/old"), self.tree.calls)
+        root = result["nodes"]["/v"]
+        self.assertEqual((root.total_bytes, root.total_files, root.total_folders), (11030, 6, 3))
+        self.assertEqual(result["extensions"]["(unscanned)"], [10030, 5])
+
+    def test_unchanged_folders_come_from_cache(self):
+        """A second walk only re-lists folders whose mtime changed."""
+        self._walk(cache=self.cache)
+        self.tree.entries["/v/docs/new.txt"] = 70
+        self.tree.mtimes["/v/docs"] += 1
+
+        result = self._walk(cache=self.cache)
+
+        self.assertEqual([c for c in self.tree.calls if c[0] == "list"], [("list", "/v/docs")])
+        self.assertEqual(result["folders_cached"], 3)
+        self.assertEqual(result["nodes"]["/v"].total_bytes, 11100)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+"""Tests for the Synology utilization ring-buffer history."""
+
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Synology tools import config/logging_config from the MCP server package
+WORKSPACE_ROOT = Path(__file__).parent.parent
+sys.path.append(str(WORKSPACE_ROOT / "mcp_server_files"))
+
+
+def _import_utilization():
+    try:
+        from jexida_dashboard.mcp_tools_core.tools.synology import utilization
+    except ImportError as e:
+        raise unittest.SkipTest(f"Synology tool dependencies not installed: {e}")
+    return utilization
+
+
+class TestRingBuffers(unittest.TestCase):
+    """Test fixed-size buffers and tier downsampling."""
+
+    def setUp(self):
+        self.u = _import_utilization()
+
+    def test_ring_buffer_keeps_latest_points(self):
+        """Once full, the oldest points are overwritten."""
+        ring = self.u.RingBuffer(3)
+        for i in range(5):
+            ring.append(float(i), i * 10.0)
+
+        self.assertEqual(list(ring), [(2.0, 20.0), (3.0, 30.0), (4.0, 40.0)])
+        self.assertEqual(ring.oldest(), 2.0)
+        self.assertEqual(ring.latest(), (4.0, 40.0))
+
+    def test_minute_and_hour_tiers(self):
+        """Samples average into minute buckets, minutes into hours."""
+        series = self.u.MetricSeries({"raw": 10})
+        # Two hours of 30s samples: value = minute index
+        for i in range(240):
+            series.record(i * 30.0, float(i // 2))
+
+        self.assertEqual(len(series.tiers["raw"]), 10)
+        self.assertEqual(len(series.tiers["minute"]), 119)
+        self.assertEqual(list(series.tiers["minute"])[:2], [(0.0, 0.0), (60.0, 1.0)])
+        self.assertEqual(list(series.tiers["hour"]), [(0.0, 29.5)])
+        # Open buckets are included in queries
+        self.assertEqual(series.points("minute", 7140, 7200), [(7140.0, 119.0)])
+        self.assertEqual(series.points("hour", 3600, 7200), [(3600.0, 89.0)])
+
+    def test_auto_resolution_picks_finest_covering_tier(self):
+        """Ranges older than the raw buffer come from the minute tier."""
+        series = self.u.MetricSeries({"raw": 10})
+        for i in range(240):
+            series.record(i * 30.0, 1.0)
+
+        self.assertEqual(series.best_tier(7100), "raw")
+        self.assertEqual(series.best_tier(3600), "minute")
+
+    def test_summarize_percentiles(self):
+        """Percentiles interpolate between ranks."""
+        stats = self.u.summarize([float(v) for v in range(1, 101)])
+
+        self.assertEqual(stats["count"], 100)
+        self.assertEqual(stats["avg"], 50.5)
+        self.assertEqual(stats["p50"], 50.5)
+        self.assertAlmostEqual(stats["p95"], 95.05)
+        self.assertIsNone(self.u.summarize([])["p99"])
+
+
+class TestUtilizationHistory(unittest.TestCase):
+    """Test persistence and the query tool."""
+
+    def setUp(self):
+        self.u = _import_utilization()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "state", "utilization.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _history(self):
+        history = self.u.UtilizationHistory(self.path)
+        usage = {
+            "cpu": {"user_load": 0, "system_load": 0, "total_load": 0},
+            "memory": {"real_usage": 40, "total_swap": 100, "avail_swap": 75},
+            "network": [{"device": "eth0", "rx": 0, "tx": 0}],
+            "disk": {},
+        }
+        for i in range(100):
+            usage["cpu"]["total_load"] = i
+            usage["network"][0]["rx"] = i * 1000
+            history.record(1_700_000_000 + i * 10, self.u.flatten_usage(usage))
+        return history
+
+    def test_save_and_load_round_trip(self):
+        """A saved history reloads with identical points and open buckets."""
+        history = self._history()
+        history.save()
+
+        loaded = self.u.UtilizationHistory.load(self.path)
+
+        self.assertEqual(loaded.last_sample, history.last_sample)
+        self.assertEqual(loaded.match(["network.*"]), ["network.eth0.rx", "network.eth0.tx"])
+        for tier in self.u.TIERS:
+            self.assertEqual(
+                list(loaded.series["cpu.total_load"].tiers[tier]),
+                list(history.series["cpu.total_load"].tiers[tier]),
+            )
+        self.assertEqual(loaded.series["cpu.total_load"].pending, history.series["cpu.total_load"].pending)
+        self.assertEqual(loaded.series["memory.swap_usage"].tiers["raw"].latest()[1], 25.0)
+
+    def test_history_tool_reads_state_file(self):
+        """The query tool answers from the state file with stats and thinned points."""
+        self._history().save()
+        params = self.u.SynologyGetUtilizationHistoryInput(
+            metrics=["cpu.total_load"],
+            minutes=10,
+            end_time=1_700_000_990,
+            resolution="raw",
+            max_points=10,
+        )
+
+        with mock.patch.object(self.u, "default_state_path", return_value=self.path):
+            result = asyncio.run(self.u.synology_get_utilization_history(params))
+
+        self.assertTrue(result.success, result.error)
+        series = result.series[0]
+        self.assertEqual(series.resolution, "raw")
+        self.assertEqual(series.stats["count"], 61)
+        self.assertEqual(series.stats["min"], 39)
+        self.assertEqual(series.stats["max"], 99)
+        self.assertEqual(len(series.points), 10)
+
+    def test_missing_state_file_is_empty(self):
+        """Without a sampler run the tools report no metrics rather than failing."""
+        history = self.u.UtilizationHistory.load(self.path)
+
+        self.assertEqual(history.series, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+"""Tests for the UniFi per-port/per-radio statistics collector.
+
+Tests sample extraction from raw stat/device records, delta-based rate
+computation and hourly rollup aggregation.
+"""
+
+import sys
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# UniFi tools import config/logging_config from the MCP server package
+WORKSPACE_ROOT = Path(__file__).parent.parent
+sys.path.append(str(WORKSPACE_ROOT / "mcp_server_files"))
+
+T0 = datetime(2024, 12, 1, 10, 0, tzinfo=timezone.utc)
+
+
+class TestPortStats(unittest.TestCase):
+    """Test port_stats pure helpers."""
+
+    def setUp(self):
+        try:
+            from jexida_dashboard.mcp_tools_core.tools.unifi import port_stats
+        except ImportError as e:
+            self.skipTest(f"UniFi tool dependencies not installed: {e}")
+        self.ps = port_stats
+
+    def test_extract_port_and_radio_samples(self):
+        """Switch ports and AP radios each produce one row."""
+        raw = [
+            {
+                "mac": "AA:AA:AA:AA:AA:01",
+                "port_table": [
+                    {"port_idx": 1, "rx_bytes": 100, "tx_bytes": 200, "poe_power": "4.5",
+                     "mac_table": [{"mac": "x"}, {"mac": "y"}]},
+                ],
+            },
+            {
+                "mac": "AA:AA:AA:AA:AA:02",
+                "radio_table_stats": [{"radio": "ng", "num_sta": 3}, {"radio": "na", "num_sta": 7}],
+                "vap_table": [
+                    {"radio": "na", "rx_bytes": 10, "tx_bytes": 20},
+                    {"radio": "na", "rx_bytes": 5, "tx_bytes": 5},
+                ],
+            },
+        ]
+
+        rows = self.ps.extract_samples(raw, T0)
+
+        self.assertEqual(len(rows), 3)
+        port = rows[0]
+        self.assertEqual((port["device_mac"], port["kind"], port["port_idx"]), ("aa:aa:aa:aa:aa:01", "port", 1))
+        self.assertEqual(port["poe_power"], 4.5)
+        self.assertEqual(port["num_sta"], 2)
+        radio_na = rows[2]
+        self.assertEqual((radio_na["kind"], radio_na["name"], radio_na["num_sta"]), ("radio", "na", 7))
+        self.assertEqual(radio_na["rx_bytes"], 15)
+
+    def test_rates_from_counter_deltas(self):
+        """Rates are bytes per second between consecutive samples."""
+        prev = {"ts": T0, "rx_bytes": 1000, "tx_bytes": 0, "rx_errors": 0, "tx_errors": 0}
+        cur = {"ts": T0 + timedelta(seconds=10), "rx_bytes": 6000, "tx_bytes": 100, "rx_errors": 2, "tx_errors": 3}
+
+        row = self.ps.compute_rates(cur, prev)
+
+        self.assertEqual(row["rx_rate"], 500.0)
+        self.assertEqual(row["tx_rate"], 10.0)
+        self.assertEqual(row["error_rate"], 0.5)
+
+    def test_counter_reset_gives_no_rate(self):
+        """A counter going backwards (reboot) yields no rate instead of a negative one."""
+        prev = {"ts": T0, "rx_bytes": 5000, "tx_bytes": 0, "rx_errors": 0, "tx_errors": 0}
+        cur = {"ts": T0 + timedelta(seconds=10), "rx_bytes": 10, "tx_bytes": 0, "rx_errors": 0, "tx_errors": 0}
+
+        self.assertIsNone(self.ps.compute_rates(cur, prev)["rx_rate"])
+        self.assertIsNone(self.ps.compute_rates(cur, None)["rx_rate"])
+
+    def test_rollup_rows(self):
+        """Hourly rollups average rates, keep peak PoE and the last counters."""
+        base = {"device_mac": "m", "kind": "port", "port_idx": 1, "name": "",
+                "rx_errors": 0, "tx_errors": 0, "error_rate": None, "tx_rate": 1.0}
+        rows = [
+            dict(base, ts=T0, rx_bytes=10, tx_bytes=0, poe_power=3.0, num_sta=1, rx_rate=None),
+            dict(base, ts=T0 + timedelta(minutes=10), rx_bytes=20, tx_bytes=0, poe_power=6.0, num_sta=3, rx_rate=2.0),
+            dict(base, ts=T0 + timedelta(minutes=20), rx_bytes=40, tx_bytes=0, poe_power=5.0, num_sta=2, rx_rate=4.0),
+        ]
+
+        rollup = self.ps.rollup_rows(rows, T0)
+
+        self.assertEqual(rollup["resolution"], "hour")
+        self.assertEqual(rollup["rx_rate"], 3.0)
+        self.assertEqual(rollup["poe_power"], 6.0)
+        self.assertEqual(rollup["num_sta"], 2)
+        self.assertEqual(rollup["rx_bytes"], 40)
+        self.assertIsNone(rollup["error_rate"])
+
+
+if __name__ == "__main__":
+    unittest.main()
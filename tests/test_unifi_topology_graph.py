@@ -0,0 +1,124 @@
+"""Tests for the cached UniFi topology graph.
+
+Tests graph construction, incremental uplink updates, queries and export
+using device listings shaped like UniFiClient.get_all_device_details().
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+# UniFi tools import config/logging_config from the MCP server package
+WORKSPACE_ROOT = Path(__file__).parent.parent
+sys.path.append(str(WORKSPACE_ROOT / "mcp_server_files"))
+
+
+def _device(mac, name, dev_type="switch", uplink_mac="", uplink_port=0, lldp=None):
+    device = {"mac": mac, "name": name, "type": dev_type, "model": "", "ip": ""}
+    if uplink_mac:
+        device["uplink"] = {"uplink_mac": uplink_mac, "uplink_remote_port": uplink_port}
+    if lldp:
+        device["ports"] = [
+            {"port_idx": port, "mac_table": [{"mac": remote, "via": "lldp"}]}
+            for port, remote in lldp
+        ]
+    return device
+
+
+def _network():
+    return [
+        _device("gw", "gateway", "gateway"),
+        _device("sw1", "core-switch", uplink_mac="gw", uplink_port=1),
+        _device("sw2", "edge-switch", uplink_mac="sw1", uplink_port=5),
+        _device("ap1", "office-ap", "ap", uplink_mac="sw2", uplink_port=3),
+    ]
+
+
+class TestTopologyGraph(unittest.TestCase):
+    """Test TopologyGraph building and queries."""
+
+    def setUp(self):
+        try:
+            from jexida_dashboard.mcp_tools_core.tools.unifi.topology_graph import TopologyGraph
+        except ImportError as e:
+            self.skipTest(f"UniFi tool dependencies not installed: {e}")
+        self.TopologyGraph = TopologyGraph
+        self.clients = [
+            {"mac": "c1", "is_wired": True, "sw_mac": "sw2", "sw_port": 7},
+            {"mac": "c2", "is_wired": False, "ap_mac": "ap1"},
+            {"mac": "c3", "is_wired": True, "sw_mac": "sw1", "sw_port": 2},
+        ]
+
+    def test_path_between_devices(self):
+        """Path follows uplinks through the tree."""
+        graph = self.TopologyGraph.from_devices(_network())
+
+        self.assertEqual(graph.path("ap1", "gw"), ["ap1", "sw2", "sw1", "gw"])
+
+    def test_blast_radius(self):
+        """Blast radius of a switch covers downstream devices and their clients."""
+        graph = self.TopologyGraph.from_devices(_network(), self.clients)
+
+        radius = graph.blast_radius("sw2")
+
+        self.assertEqual(radius["devices"], ["ap1"])
+        self.assertEqual(radius["clients"], ["c1", "c2"])
+
+    def test_clients_behind_port(self):
+        """Clients behind a port include those behind downstream devices."""
+        graph = self.TopologyGraph.from_devices(_network(), self.clients)
+
+        self.assertEqual(graph.clients_behind_port("sw1", 5), ["c1", "c2"])
+        self.assertEqual(graph.clients_behind_port("sw1", 2), ["c3"])
+
+    def test_incremental_uplink_change(self):
+        """Moving a device bumps the version and rewires only its edges."""
+        graph = self.TopologyGraph.from_devices(_network())
+        version = graph.version
+
+        self.assertFalse(graph.sync_devices(_network()))
+        self.assertEqual(graph.version, version)
+
+        self.assertTrue(graph.update_device(_device("ap1", "office-ap", "ap", uplink_mac="sw1", uplink_port=9)))
+
+        self.assertEqual(graph.version, version + 1)
+        self.assertEqual(graph.path("ap1", "gw"), ["ap1", "sw1", "gw"])
+        self.assertNotIn("ap1", graph.adjacency["sw2"])
+
+    def test_removed_device_drops_edges(self):
+        """Devices missing from a refresh are removed from the graph."""
+        graph = self.TopologyGraph.from_devices(_network())
+
+        graph.sync_devices(_network()[:3])
+
+        self.assertNotIn("ap1", graph.nodes)
+        self.assertNotIn("ap1", graph.adjacency["sw2"])
+
+    def test_rewiring_keeps_the_other_sides_lldp_link(self):
+        """An uplink hides the neighbour's LLDP link only while it exists."""
+        devices = _network()
+        devices[1] = _device("sw1", "core-switch", uplink_mac="gw", uplink_port=1, lldp=[(5, "sw2")])
+        graph = self.TopologyGraph.from_devices(devices)
+        self.assertEqual(graph.adjacency["sw1"]["sw2"]["type"], "uplink")
+
+        # sw2 moves its uplink to the gateway; sw1 still sees it over LLDP
+        graph.update_device(_device("sw2", "edge-switch", uplink_mac="gw", uplink_port=2))
+
+        self.assertEqual(graph.adjacency["sw1"]["sw2"]["type"], "lldp")
+        self.assertEqual(graph.adjacency["sw2"]["sw1"]["local_port"], 5)
+        self.assertNotIn("sw2", graph.children.get("sw1", set()))
+
+    def test_lldp_edges_and_dot_export(self):
+        """LLDP neighbours become edges and show up dashed in DOT output."""
+        devices = _network() + [_device("sw3", "lab-switch", lldp=[(1, "sw1")])]
+        graph = self.TopologyGraph.from_devices(devices)
+
+        self.assertIn("sw1", graph.adjacency["sw3"])
+        dot = graph.to_dot()
+        self.assertTrue(dot.startswith('graph "unifi_default"'))
+        self.assertIn("style=dashed", dot)
+        self.assertEqual(len(graph.to_json()["edges"]), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()